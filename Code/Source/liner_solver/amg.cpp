@@ -0,0 +1,775 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+//-------------------------------------------------------------------------
+// Smoothed aggregation algebraic multigrid (AMG) preconditioner of
+// Vanek, Mandel and Brezina 1996 (https://doi.org/10.1007/BF02238511).
+//
+// The levels of the multigrid hierarchy are built from the matrix of
+// the finer level A(dof*dof,nnz):
+//
+//   1) Nodes are grouped into aggregates of strongly connected nodes,
+//      a connection is strong if the Frobenius norms of the dof x dof
+//      blocks satisfy ||A_ij|| > theta * sqrt(||A_ii|| ||A_jj||).
+//
+//   2) The tentative prolongator P_t copies the value of each degree
+//      of freedom of an aggregate to its nodes. It is smoothed by a
+//      damped Jacobi step, P = (I - omega D^-1 A) P_t.
+//
+//   3) The coarse level matrix is the Galerkin product P^T A P.
+//
+// Aggregation is uncoupled: aggregates are made of nodes owned by the
+// same processor, [0,mynNo), so the coarse levels are local to each
+// processor and are built from the processor's part of the matrix with
+// the diagonal of the complete matrix. The fine level is distributed: its
+// smoothing and residuals use the product with the complete matrix and
+// the values of the prolongated correction are exchanged using the FSILS
+// communication structure, which keeps the preconditioner symmetric.
+//
+// The V-cycle uses damped Jacobi smoothing with omega = 4 / (3 lambda),
+// lambda a Gershgorin bound of the spectral radius of D^-1 A. The coarsest
+// level is solved using an LU factorization.
+//-------------------------------------------------------------------------
+
+#include "amg.h"
+
+#include "fsils_api.hpp"
+
+#include "bsr.h"
+#include "spar_mul.h"
+
+#include <algorithm>
+#include <math.h>
+#include <vector>
+
+namespace amg {
+
+using namespace fsi_linear_solver;
+
+/// @brief Add the product of the dof x dof blocks A*B to C.
+//
+static inline void block_mul_add(const int dof, const double* A, const double* B, double* C)
+{
+  for (int k = 0; k < dof; k++) {
+    for (int m = 0; m < dof; m++) {
+      double sum = 0.0;
+      for (int l = 0; l < dof; l++) {
+        sum += A[k*dof+l] * B[l*dof+m];
+      }
+      C[k*dof+m] += sum;
+    }
+  }
+}
+
+/// @brief Add the product of the dof x dof blocks A^T*B to C.
+//
+static inline void block_tmul_add(const int dof, const double* A, const double* B, double* C)
+{
+  for (int k = 0; k < dof; k++) {
+    for (int m = 0; m < dof; m++) {
+      double sum = 0.0;
+      for (int l = 0; l < dof; l++) {
+        sum += A[l*dof+k] * B[l*dof+m];
+      }
+      C[k*dof+m] += sum;
+    }
+  }
+}
+
+/// @brief Group the first nOwn nodes of a level into aggregates of strongly
+/// connected nodes using the matrix A of the level.
+///
+/// Returns the number of aggregates, agg(a) is the aggregate of node a or -1
+/// if the node is not aggregated (isolated and Dirichlet nodes).
+//
+static int aggregate(const FSILS_amgLevelType& level, const int dof, const int nOwn, const Array<double>& A,
+    const double theta, Vector<int>& agg)
+{
+  const int nnz = level.colPtr.size();
+  const int nb = dof*dof;
+  Vector<double> nrm(nnz);
+
+  for (int i = 0; i < nnz; i++) {
+    double sum = 0.0;
+    for (int k = 0; k < nb; k++) {
+      sum += A(k,i) * A(k,i);
+    }
+    nrm(i) = sqrt(sum);
+  }
+
+  Vector<int> strong(nnz);
+  strong = 0;
+
+  for (int a = 0; a < nOwn; a++) {
+    double nrm_a = nrm(level.diagPtr(a));
+    for (int i = level.rowPtr(0,a); i <= level.rowPtr(1,a); i++) {
+      int b = level.colPtr(i);
+      if (b == a || b >= nOwn) {
+        continue;
+      }
+      double nrm_b = nrm(level.diagPtr(b));
+      if ((nrm_a > 0.0) && (nrm_b > 0.0) && (nrm(i) > theta * sqrt(nrm_a * nrm_b))) {
+        strong(i) = 1;
+      }
+    }
+  }
+
+  agg = -1;
+  int nAgg = 0;
+
+  // Make aggregates of a node and its strong neighbors when none of them
+  // is aggregated.
+  //
+  for (int a = 0; a < nOwn; a++) {
+    if (agg(a) != -1) {
+      continue;
+    }
+    int num_strong = 0;
+    bool free = true;
+
+    for (int i = level.rowPtr(0,a); i <= level.rowPtr(1,a); i++) {
+      if (strong(i)) {
+        num_strong += 1;
+        if (agg(level.colPtr(i)) != -1) {
+          free = false;
+          break;
+        }
+      }
+    }
+
+    if (!free || (num_strong == 0)) {
+      continue;
+    }
+
+    agg(a) = nAgg;
+    for (int i = level.rowPtr(0,a); i <= level.rowPtr(1,a); i++) {
+      if (strong(i)) {
+        agg(level.colPtr(i)) = nAgg;
+      }
+    }
+    nAgg += 1;
+  }
+
+  // Add the remaining nodes to the aggregate of their strongest
+  // aggregated neighbor.
+  //
+  Vector<int> agg1(agg);
+
+  for (int a = 0; a < nOwn; a++) {
+    if (agg(a) != -1) {
+      continue;
+    }
+    double max_nrm = 0.0;
+
+    for (int i = level.rowPtr(0,a); i <= level.rowPtr(1,a); i++) {
+      int b = level.colPtr(i);
+      if (strong(i) && (agg1(b) != -1) && (nrm(i) > max_nrm)) {
+        max_nrm = nrm(i);
+        agg(a) = agg1(b);
+      }
+    }
+  }
+
+  // Make aggregates of the nodes that are still not aggregated and
+  // their strong neighbors that are not aggregated.
+  //
+  for (int a = 0; a < nOwn; a++) {
+    if (agg(a) != -1) {
+      continue;
+    }
+    int num_strong = 0;
+    for (int i = level.rowPtr(0,a); i <= level.rowPtr(1,a); i++) {
+      num_strong += strong(i);
+    }
+    if (num_strong == 0) {
+      continue;
+    }
+
+    agg(a) = nAgg;
+    for (int i = level.rowPtr(0,a); i <= level.rowPtr(1,a); i++) {
+      int b = level.colPtr(i);
+      if (strong(i) && (agg(b) == -1)) {
+        agg(b) = nAgg;
+      }
+    }
+    nAgg += 1;
+  }
+
+  return nAgg;
+}
+
+/// @brief Factor the matrix of the coarsest level, A = P^T L U, with
+/// partial pivoting.
+///
+/// Zero pivots, from a singular matrix, are kept as zero and the
+/// corresponding solution components are set to zero by coarse_solve().
+//
+static void coarse_factor(FSILS_amgType& amg, const int dof)
+{
+  const auto& level = amg.levels.back();
+  const int n = dof * level.nNo;
+  auto& LU = amg.coarseLU;
+  auto& piv = amg.coarsePiv;
+
+  LU.resize(n, n);
+  piv.resize(n);
+  LU = 0.0;
+
+  for (int a = 0; a < level.nNo; a++) {
+    for (int i = level.rowPtr(0,a); i <= level.rowPtr(1,a); i++) {
+      int b = level.colPtr(i);
+      for (int k = 0; k < dof; k++) {
+        for (int m = 0; m < dof; m++) {
+          LU(a*dof+k, b*dof+m) = level.Val(k*dof+m, i);
+        }
+      }
+    }
+  }
+
+  double tol = 0.0;
+  for (int j = 0; j < n; j++) {
+    tol = std::max(tol, fabs(LU(j,j)));
+  }
+  tol = 1.0e-12 * tol;
+
+  for (int j = 0; j < n; j++) {
+    int p = j;
+    for (int i = j+1; i < n; i++) {
+      if (fabs(LU(i,j)) > fabs(LU(p,j))) {
+        p = i;
+      }
+    }
+
+    piv(j) = p;
+    if (p != j) {
+      for (int k = 0; k < n; k++) {
+        std::swap(LU(j,k), LU(p,k));
+      }
+    }
+
+    if (fabs(LU(j,j)) <= tol) {
+      for (int i = j; i < n; i++) {
+        LU(i,j) = 0.0;
+      }
+      continue;
+    }
+
+    for (int i = j+1; i < n; i++) {
+      LU(i,j) = LU(i,j) / LU(j,j);
+    }
+
+    for (int k = j+1; k < n; k++) {
+      double u = LU(j,k);
+      if (u == 0.0) {
+        continue;
+      }
+      for (int i = j+1; i < n; i++) {
+        LU(i,k) -= LU(i,j) * u;
+      }
+    }
+  }
+}
+
+/// @brief Solve the coarsest level using the factors of coarse_factor().
+//
+static void coarse_solve(const FSILS_amgType& amg, const Array<double>& R, Array<double>& X)
+{
+  const auto& LU = amg.coarseLU;
+  const auto& piv = amg.coarsePiv;
+  const int n = LU.nrows();
+
+  for (int i = 0; i < n; i++) {
+    X(i) = R(i);
+  }
+
+  for (int j = 0; j < n; j++) {
+    std::swap(X(j), X(piv(j)));
+  }
+
+  for (int j = 0; j < n; j++) {
+    double x = X(j);
+    for (int i = j+1; i < n; i++) {
+      X(i) -= LU(i,j) * x;
+    }
+  }
+
+  for (int j = n-1; j >= 0; j--) {
+    if (LU(j,j) == 0.0) {
+      X(j) = 0.0;
+      continue;
+    }
+    X(j) = X(j) / LU(j,j);
+    double x = X(j);
+    for (int i = 0; i < j; i++) {
+      X(i) -= LU(i,j) * x;
+    }
+  }
+}
+
+/// @brief Compute the diagonal D(dof,nNo) of the matrix of a level and the
+/// sums of the absolute values of its rows S(dof,nNo).
+//
+static void diag_row_sum(const FSILS_amgLevelType& level, const int dof, Array<double>& D, Array<double>& S)
+{
+  D.resize(dof, level.nNo);
+  S.resize(dof, level.nNo);
+
+  for (int a = 0; a < level.nNo; a++) {
+    for (int k = 0; k < dof; k++) {
+      double sum = 0.0;
+      for (int i = level.rowPtr(0,a); i <= level.rowPtr(1,a); i++) {
+        for (int m = 0; m < dof; m++) {
+          sum += fabs(level.Val(k*dof+m,i));
+        }
+      }
+      D(k,a) = level.Val(k*dof+k, level.diagPtr(a));
+      S(k,a) = sum;
+    }
+  }
+}
+
+/// @brief Compute the Galerkin product P^T A P of the matrix A of the first
+/// nOwn nodes of the fine level and its prolongator, the matrix of the
+/// coarse level.
+//
+static void galerkin(const FSILS_amgLevelType& fine, const int dof, const int nOwn, const Array<double>& A,
+    const int nAgg, FSILS_amgLevelType& coarse)
+{
+  const int nb = dof*dof;
+  const double* a_data = A.data();
+  const double* p_data = fine.pVal.data();
+
+  Vector<int> pos(nAgg);
+  pos = -1;
+
+  // AP = A*P
+  //
+  std::vector<int> apPtr(nOwn+1), apCol;
+  std::vector<double> apVal;
+
+  for (int a = 0; a < nOwn; a++) {
+    apPtr[a] = apCol.size();
+
+    for (int i = fine.rowPtr(0,a); i <= fine.rowPtr(1,a); i++) {
+      int b = fine.colPtr(i);
+      if (b >= nOwn) {
+        continue;
+      }
+
+      for (int p = fine.pRowPtr(0,b); p <= fine.pRowPtr(1,b); p++) {
+        int J = fine.pColPtr(p);
+        if (pos(J) == -1) {
+          pos(J) = apCol.size();
+          apCol.push_back(J);
+          apVal.resize(apVal.size() + nb, 0.0);
+        }
+        block_mul_add(dof, a_data + i*nb, p_data + p*nb, apVal.data() + pos(J)*nb);
+      }
+    }
+
+    for (int q = apPtr[a]; q < apCol.size(); q++) {
+      pos(apCol[q]) = -1;
+    }
+  }
+
+  apPtr[nOwn] = apCol.size();
+
+  // Rows of P^T.
+  //
+  std::vector<int> ptPtr(nAgg+1, 0), ptRow, ptIdx;
+
+  for (int a = 0; a < nOwn; a++) {
+    for (int p = fine.pRowPtr(0,a); p <= fine.pRowPtr(1,a); p++) {
+      ptPtr[fine.pColPtr(p)+1] += 1;
+    }
+  }
+
+  for (int J = 0; J < nAgg; J++) {
+    ptPtr[J+1] += ptPtr[J];
+  }
+
+  ptRow.resize(ptPtr[nAgg]);
+  ptIdx.resize(ptPtr[nAgg]);
+  std::vector<int> next(ptPtr.begin(), ptPtr.end()-1);
+
+  for (int a = 0; a < nOwn; a++) {
+    for (int p = fine.pRowPtr(0,a); p <= fine.pRowPtr(1,a); p++) {
+      int t = next[fine.pColPtr(p)]++;
+      ptRow[t] = a;
+      ptIdx[t] = p;
+    }
+  }
+
+  // Coarse matrix P^T*(AP).
+  //
+  std::vector<int> cols;
+  std::vector<double> vals;
+
+  coarse.nNo = nAgg;
+  coarse.rowPtr.resize(2, nAgg);
+  coarse.diagPtr.resize(nAgg);
+
+  for (int J = 0; J < nAgg; J++) {
+    int start = cols.size();
+
+    for (int t = ptPtr[J]; t < ptPtr[J+1]; t++) {
+      int a = ptRow[t];
+      int p = ptIdx[t];
+
+      for (int q = apPtr[a]; q < apPtr[a+1]; q++) {
+        int K = apCol[q];
+        if (pos(K) == -1) {
+          pos(K) = cols.size();
+          cols.push_back(K);
+          vals.resize(vals.size() + nb, 0.0);
+        }
+        block_tmul_add(dof, p_data + p*nb, apVal.data() + q*nb, vals.data() + pos(K)*nb);
+      }
+    }
+
+    coarse.rowPtr(0,J) = start;
+    coarse.rowPtr(1,J) = cols.size() - 1;
+    coarse.diagPtr(J) = pos(J);
+
+    for (int q = start; q < cols.size(); q++) {
+      pos(cols[q]) = -1;
+    }
+  }
+
+  coarse.colPtr.resize(cols.size());
+  coarse.Val.resize(nb, cols.size());
+
+  for (int i = 0; i < cols.size(); i++) {
+    coarse.colPtr(i) = cols[i];
+  }
+
+  for (int i = 0; i < vals.size(); i++) {
+    coarse.Val(i) = vals[i];
+  }
+}
+
+/// @brief Compute KU = K*U for the matrix of level l.
+//
+static void mat_vec(FSILS_lhsType& lhs, FSILS_amgLevelType& level, const int l, const int dof,
+    const Array<double>& U, Array<double>& KU)
+{
+  if (l == 0) {
+    spar_mul::fsils_spar_mul_vv(lhs, lhs.rowPtr, lhs.colPtr, dof, level.Val, U, KU);
+    return;
+  }
+
+  KU = 0.0;
+  bsr::dispatch(dof, [&](auto DOF) {
+    bsr::mul_rows<DOF()>(level.rowPtr, level.colPtr, dof, level.Val, U, KU, 0, level.nNo);
+  });
+}
+
+/// @brief Perform nSweep damped Jacobi sweeps X = X + omega D^-1 (R - A X)
+/// on level l.
+//
+static void jacobi(FSILS_lhsType& lhs, FSILS_amgLevelType& level, const int l, const int dof, const int nSweep,
+    const Array<double>& R, Array<double>& X)
+{
+  auto& W = level.W;
+
+  for (int s = 0; s < nSweep; s++) {
+    mat_vec(lhs, level, l, dof, X, W);
+    for (int i = 0; i < X.size(); i++) {
+      X(i) += level.omega * level.Dinv(i) * (R(i) - W(i));
+    }
+  }
+}
+
+/// @brief Compute the smoothed prolongator of the first nOwn nodes of a level
+/// from its matrix A and the aggregates of its nodes.
+//
+static void prolongator(FSILS_amgLevelType& level, const int dof, const int nOwn, const Array<double>& A,
+    const Vector<int>& agg, const int nAgg)
+{
+  const int nb = dof*dof;
+
+  // Scaling of the columns of the tentative prolongator.
+  //
+  Vector<double> c(nAgg);
+  c = 0.0;
+
+  for (int a = 0; a < nOwn; a++) {
+    if (agg(a) != -1) {
+      c(agg(a)) += 1.0;
+    }
+  }
+
+  for (int J = 0; J < nAgg; J++) {
+    c(J) = 1.0 / sqrt(c(J));
+  }
+
+  Vector<int> pos(nAgg);
+  pos = -1;
+  std::vector<int> cols;
+  std::vector<double> vals;
+
+  level.pRowPtr.resize(2, nOwn);
+
+  for (int a = 0; a < nOwn; a++) {
+    int start = cols.size();
+
+    if (agg(a) != -1) {
+      int J = agg(a);
+      pos(J) = cols.size();
+      cols.push_back(J);
+      vals.resize(vals.size() + nb, 0.0);
+      for (int k = 0; k < dof; k++) {
+        vals[pos(J)*nb + k*dof+k] = c(J);
+      }
+    }
+
+    for (int i = level.rowPtr(0,a); i <= level.rowPtr(1,a); i++) {
+      int b = level.colPtr(i);
+      if ((b >= nOwn) || (agg(b) == -1)) {
+        continue;
+      }
+
+      int J = agg(b);
+      if (pos(J) == -1) {
+        pos(J) = cols.size();
+        cols.push_back(J);
+        vals.resize(vals.size() + nb, 0.0);
+      }
+
+      double* p = vals.data() + pos(J)*nb;
+      for (int k = 0; k < dof; k++) {
+        double w = level.omega * c(J) * level.Dinv(k,a);
+        for (int m = 0; m < dof; m++) {
+          p[k*dof+m] -= w * A(k*dof+m,i);
+        }
+      }
+    }
+
+    level.pRowPtr(0,a) = start;
+    level.pRowPtr(1,a) = cols.size() - 1;
+
+    for (int q = start; q < cols.size(); q++) {
+      pos(cols[q]) = -1;
+    }
+  }
+
+  level.pColPtr.resize(cols.size());
+  level.pVal.resize(nb, cols.size());
+
+  for (int i = 0; i < cols.size(); i++) {
+    level.pColPtr(i) = cols[i];
+  }
+
+  for (int i = 0; i < vals.size(); i++) {
+    level.pVal(i) = vals[i];
+  }
+}
+
+/// @brief Set the inverse of the diagonal and the damping factor of the
+/// Jacobi smoother of a level from its diagonal D(dof,nNo) and the row sums
+/// S(dof,nNo) computed by diag_row_sum().
+///
+/// Rows with a zero diagonal (Dirichlet nodes) are not smoothed.
+//
+static void set_smoother(FSILS_commuType& commu, const bool global, const Array<double>& D, const Array<double>& S,
+    FSILS_amgLevelType& level)
+{
+  double lambda = 0.0;
+  level.Dinv.resize(D.nrows(), D.ncols());
+
+  for (int i = 0; i < D.size(); i++) {
+    if (D(i) != 0.0) {
+      level.Dinv(i) = 1.0 / D(i);
+      lambda = std::max(lambda, fabs(level.Dinv(i)) * S(i));
+    } else {
+      level.Dinv(i) = 0.0;
+    }
+  }
+
+  if (global) {
+    double lambda_g = 0.0;
+    MPI_Allreduce(&lambda, &lambda_g, 1, cm_mod::mpreal, MPI_MAX, commu.comm);
+    lambda = lambda_g;
+  }
+
+  level.omega = (lambda > 0.0) ? 4.0 / (3.0 * lambda) : 0.0;
+}
+
+/// @brief Apply a V-cycle on level l to R(dof,nNo) starting from a zero
+/// initial guess, the result is returned in X(dof,nNo).
+//
+static void vcycle(FSILS_lhsType& lhs, FSILS_amgType& amg, const int l, const int dof, const Array<double>& R,
+    Array<double>& X)
+{
+  auto& level = amg.levels[l];
+  const bool last = (l+1 == amg.levels.size());
+
+  if (last && (amg.coarseLU.size() != 0)) {
+    coarse_solve(amg, R, X);
+    return;
+  }
+
+  const bool global = (l == 0) && (lhs.commu.nTasks > 1);
+  const int nOwn = (l == 0) ? lhs.mynNo : level.nNo;
+  auto& W = level.W;
+
+  // Pre-smoothing.
+  //
+  for (int i = 0; i < X.size(); i++) {
+    X(i) = level.omega * level.Dinv(i) * R(i);
+  }
+  jacobi(lhs, level, l, dof, amg.nSweep-1, R, X);
+
+  // Coarse level correction.
+  //
+  // The fine level residual is computed and the correction exchanged on
+  // all processors, including those that have no coarse level.
+  //
+  if (!last || global) {
+    mat_vec(lhs, level, l, dof, X, W);
+
+    for (int i = 0; i < W.size(); i++) {
+      W(i) = R(i) - W(i);
+    }
+
+    if (!last) {
+      auto& coarse = amg.levels[l+1];
+      const double* p_data = level.pVal.data();
+      coarse.R = 0.0;
+
+      for (int a = 0; a < nOwn; a++) {
+        for (int p = level.pRowPtr(0,a); p <= level.pRowPtr(1,a); p++) {
+          int J = level.pColPtr(p);
+          for (int m = 0; m < dof; m++) {
+            for (int k = 0; k < dof; k++) {
+              coarse.R(m,J) += p_data[p*dof*dof + k*dof+m] * W(k,a);
+            }
+          }
+        }
+      }
+
+      vcycle(lhs, amg, l+1, dof, coarse.R, coarse.X);
+
+      W = 0.0;
+      for (int a = 0; a < nOwn; a++) {
+        for (int p = level.pRowPtr(0,a); p <= level.pRowPtr(1,a); p++) {
+          int J = level.pColPtr(p);
+          for (int k = 0; k < dof; k++) {
+            for (int m = 0; m < dof; m++) {
+              W(k,a) += p_data[p*dof*dof + k*dof+m] * coarse.X(m,J);
+            }
+          }
+        }
+      }
+
+    } else {
+      W = 0.0;
+    }
+
+    if (global) {
+      fsils_commuv(lhs, dof, W);
+    }
+
+    for (int i = 0; i < X.size(); i++) {
+      X(i) += W(i);
+    }
+  }
+
+  // Post-smoothing.
+  //
+  jacobi(lhs, level, l, dof, amg.nSweep, R, X);
+}
+
+/// @brief Apply the AMG preconditioner set by amg_setup(): Z = M^-1 R.
+///
+/// R(dof,nNo) and Z(dof,nNo) have the values of all nodes of the processor.
+//
+void amg_apply(FSILS_lhsType& lhs, FSILS_amgType& amg, const int dof, const Array<double>& R, Array<double>& Z)
+{
+  vcycle(lhs, amg, 0, dof, R, Z);
+}
+
+/// @brief Set the levels of the AMG preconditioner for the matrix
+/// Val(dof*dof,lhs.nnz).
+//
+void amg_setup(FSILS_lhsType& lhs, FSILS_amgType& amg, const int dof, const Array<double>& Val)
+{
+  const bool global = (lhs.commu.nTasks > 1);
+  const int nNo = lhs.nNo;
+
+  amg.levels.clear();
+  amg.levels.reserve(std::max(amg.maxLevels, 1));
+  amg.levels.resize(1);
+  amg.coarseLU.clear();
+  amg.coarsePiv.clear();
+
+  auto& fine = amg.levels[0];
+  fine.nNo = nNo;
+  fine.rowPtr = lhs.rowPtr;
+  fine.colPtr = lhs.colPtr;
+  fine.diagPtr = lhs.diagPtr;
+  fine.Val = Val;
+  fine.W.resize(dof, nNo);
+
+  Array<double> D, S;
+  diag_row_sum(fine, dof, D, S);
+
+  if (global) {
+    fsils_commuv(lhs, dof, D);
+    fsils_commuv(lhs, dof, S);
+  }
+
+  set_smoother(lhs.commu, global, D, S, fine);
+
+  // The coarse levels are built from the processor's part of the matrix
+  // with the diagonal of the complete matrix.
+  //
+  Array<double> A(Val);
+
+  for (int a = 0; a < nNo; a++) {
+    for (int k = 0; k < dof; k++) {
+      A(k*dof+k, lhs.diagPtr(a)) = D(k,a);
+    }
+  }
+
+  int nOwn = lhs.mynNo;
+
+  for (int l = 0; l+1 < amg.maxLevels; l++) {
+    if (nOwn*dof <= amg.coarseSize) {
+      break;
+    }
+
+    const Array<double>& Al = (l == 0) ? A : amg.levels[l].Val;
+    Vector<int> agg(nOwn);
+    int nAgg = aggregate(amg.levels[l], dof, nOwn, Al, amg.theta, agg);
+
+    if ((nAgg == 0) || (nAgg >= nOwn)) {
+      break;
+    }
+
+    prolongator(amg.levels[l], dof, nOwn, Al, agg, nAgg);
+
+    amg.levels.resize(l+2);
+    auto& coarse = amg.levels[l+1];
+    galerkin(amg.levels[l], dof, nOwn, Al, nAgg, coarse);
+
+    diag_row_sum(coarse, dof, D, S);
+    set_smoother(lhs.commu, false, D, S, coarse);
+
+    coarse.R.resize(dof, nAgg);
+    coarse.X.resize(dof, nAgg);
+    coarse.W.resize(dof, nAgg);
+    nOwn = nAgg;
+  }
+
+  // The coarsest level is solved directly if it is small and local
+  // to the processor.
+  //
+  const auto& last = amg.levels.back();
+
+  if (((amg.levels.size() > 1) || !global) && (last.nNo*dof <= amg.coarseSize)) {
+    coarse_factor(amg, dof);
+  }
+}
+
+};
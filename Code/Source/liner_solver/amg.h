@@ -0,0 +1,14 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#include "fils_struct.hpp"
+
+namespace amg {
+
+void amg_apply(fsi_linear_solver::FSILS_lhsType& lhs, fsi_linear_solver::FSILS_amgType& amg, const int dof,
+    const Array<double>& R, Array<double>& Z);
+
+void amg_setup(fsi_linear_solver::FSILS_lhsType& lhs, fsi_linear_solver::FSILS_amgType& amg, const int dof,
+    const Array<double>& Val);
+
+};
@@ -30,6 +30,29 @@ void fsils_bcast_v(const int n, Vector<double>& u, FSILS_commuType& commu)
   } 
 }
 
+/// @brief Wait for a sum started by fsils_ibcast_v() to complete.
+//
+void fsils_bcast_wait(MPI_Request& request)
+{
+  if (request != MPI_REQUEST_NULL) { 
+    MPI_Wait(&request, MPI_STATUS_IGNORE);
+  }
+}
+
+/// @brief Start summing the first 'n' values of 'u' over all processors 
+/// without waiting for the sum to complete.
+///
+/// 'u' must not be used until fsils_bcast_wait() has been called for 'request'.
+//
+void fsils_ibcast_v(const int n, Vector<double>& u, FSILS_commuType& commu, MPI_Request& request)
+{
+  if (commu.nTasks > 1) { 
+    MPI_Iallreduce(MPI_IN_PLACE, u.data(), n, cm_mod::mpreal, MPI_SUM, commu.comm, &request);
+  } else {
+    request = MPI_REQUEST_NULL;
+  }
+}
+
 };
 
 
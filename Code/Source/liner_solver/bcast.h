@@ -11,4 +11,8 @@ void fsils_bcast(double& u, FSILS_commuType& commu);
 
 void fsils_bcast_v(const int n, Vector<double>& u, FSILS_commuType& commu);
 
+void fsils_bcast_wait(MPI_Request& request);
+
+void fsils_ibcast_v(const int n, Vector<double>& u, FSILS_commuType& commu, MPI_Request& request);
+
 };
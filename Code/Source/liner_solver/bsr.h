@@ -0,0 +1,284 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+//--------------------------------------------------------------------
+// Kernels for the block sparse row (BSR) matrices used by FSILS.
+//
+// A matrix K(dof*dof,nnz) stores a dense dof x dof block for each
+// nonzero of the node graph given by rowPtr and colPtr. The entries
+// of a block are stored by rows, K(i*dof+j,nz) is the (i,j) entry of
+// block nz, so each block is contiguous in memory.
+//
+// The kernels are templates on the block size DOF so the block loops
+// are unrolled and vectorized by the compiler. They are instantiated
+// for dof = 1, 2, 3, 4 and 7 (FSI); DOF = 0 uses the runtime block
+// size 'dof' for any other block size.
+//--------------------------------------------------------------------
+
+#ifndef FSILS_BSR_H
+#define FSILS_BSR_H
+
+#include "fils_struct.hpp"
+
+#include <algorithm>
+#include <math.h>
+#include <type_traits>
+
+namespace bsr {
+
+/// @brief Return the block size: DOF if it is set at compile time
+/// or else the runtime block size 'dof'.
+//
+template <int DOF>
+inline int block_size(const int dof)
+{
+  return (DOF > 0) ? DOF : dof;
+}
+
+/// @brief Call f(std::integral_constant<int,DOF>()) with DOF = dof if kernels
+/// are instantiated for this block size, else with DOF = 0.
+///
+/// Use as
+///
+///   bsr::dispatch(dof, [&](auto DOF) { bsr::pre_mul<DOF()>(rowPtr, nNo, dof, Val, W); });
+//
+template <typename Function>
+void dispatch(const int dof, Function&& f)
+{
+  switch (dof) {
+    case 1: f(std::integral_constant<int,1>()); break;
+    case 2: f(std::integral_constant<int,2>()); break;
+    case 3: f(std::integral_constant<int,3>()); break;
+    case 4: f(std::integral_constant<int,4>()); break;
+    case 7: f(std::integral_constant<int,7>()); break;
+    default: f(std::integral_constant<int,0>()); break;
+  }
+}
+
+/// @brief Product of block rows s to e-1 of the block matrix K(dof*dof,nnz)
+/// and the vector U(dof,nNo), added to KU(dof,nNo).
+//
+template <int DOF>
+void mul_rows(const Array<int>& rowPtr, const Vector<int>& colPtr, const int dof, const Array<double>& K,
+    const Array<double>& U, Array<double>& KU, const int s, const int e)
+{
+  const int n = block_size<DOF>(dof);
+  const double* k_data = K.data();
+  const double* u_data = U.data();
+  double* ku_data = KU.data();
+
+  for (int i = s; i < e; i++) {
+    double* ku = ku_data + i*n;
+
+    for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
+      const double* blk = k_data + j*n*n;
+      const double* u = u_data + colPtr(j)*n;
+
+      for (int l = 0; l < n; l++) {
+        double sum = ku[l];
+        for (int m = 0; m < n; m++) {
+          sum += blk[l*n+m] * u[m];
+        }
+        ku[l] = sum;
+      }
+    }
+  }
+}
+
+/// @brief Product of rows s to e-1 of the matrix K(dof,nnz), with one
+/// column of blocks, and the scalar vector U(nNo), added to KU(dof,nNo).
+//
+template <int DOF>
+void mul_rows_sv(const Array<int>& rowPtr, const Vector<int>& colPtr, const int dof, const Array<double>& K,
+    const Vector<double>& U, Array<double>& KU, const int s, const int e)
+{
+  const int n = block_size<DOF>(dof);
+  const double* k_data = K.data();
+  double* ku_data = KU.data();
+
+  for (int i = s; i < e; i++) {
+    double* ku = ku_data + i*n;
+
+    for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
+      const double* blk = k_data + j*n;
+      const double u = U(colPtr(j));
+
+      for (int l = 0; l < n; l++) {
+        ku[l] = ku[l] + blk[l] * u;
+      }
+    }
+  }
+}
+
+/// @brief Product of rows s to e-1 of the matrix K(dof,nnz), with one
+/// row of blocks, and the vector U(dof,nNo), added to KU(nNo).
+//
+template <int DOF>
+void mul_rows_vs(const Array<int>& rowPtr, const Vector<int>& colPtr, const int dof, const Array<double>& K,
+    const Array<double>& U, Vector<double>& KU, const int s, const int e)
+{
+  const int n = block_size<DOF>(dof);
+  const double* k_data = K.data();
+  const double* u_data = U.data();
+
+  for (int i = s; i < e; i++) {
+    double sum = KU(i);
+
+    for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
+      const double* blk = k_data + j*n;
+      const double* u = u_data + colPtr(j)*n;
+
+      for (int m = 0; m < n; m++) {
+        sum += blk[m] * u[m];
+      }
+    }
+
+    KU(i) = sum;
+  }
+}
+
+/// @brief Post-multiply the block matrix Val by W(dof,nNo): Val = Val*W.
+//
+template <int DOF>
+void pos_mul(const Array<int>& rowPtr, const Vector<int>& colPtr, const int nNo, const int dof,
+    Array<double>& Val, const Array<double>& W)
+{
+  const int n = block_size<DOF>(dof);
+  double* val_data = Val.data();
+  const double* w_data = W.data();
+
+  for (int Ac = 0; Ac < nNo; Ac++) {
+    for (int i = rowPtr(0,Ac); i <= rowPtr(1,Ac); i++) {
+      double* blk = val_data + i*n*n;
+      const double* wc = w_data + colPtr(i)*n;
+
+      for (int k = 0; k < n; k++) {
+        for (int b = 0; b < n; b++) {
+          blk[k*n+b] = blk[k*n+b] * wc[b];
+        }
+      }
+    }
+  }
+}
+
+/// @brief Pre-multiply the block matrix Val by W(dof,nNo): Val = W*Val.
+//
+template <int DOF>
+void pre_mul(const Array<int>& rowPtr, const int nNo, const int dof, Array<double>& Val, const Array<double>& W)
+{
+  const int n = block_size<DOF>(dof);
+  double* val_data = Val.data();
+  const double* w_data = W.data();
+
+  for (int Ac = 0; Ac < nNo; Ac++) {
+    const double* wr = w_data + Ac*n;
+
+    for (int i = rowPtr(0,Ac); i <= rowPtr(1,Ac); i++) {
+      double* blk = val_data + i*n*n;
+
+      for (int k = 0; k < n; k++) {
+        const double w = wr[k];
+        for (int b = 0; b < n; b++) {
+          blk[k*n+b] = blk[k*n+b] * w;
+        }
+      }
+    }
+  }
+}
+
+/// @brief Pre-multiply the block matrix Val by Wr(dof,nNo) and post-multiply
+/// by Wc(dof,nNo): Val = Wr*Val*Wc.
+//
+template <int DOF>
+void pre_pos_mul(const Array<int>& rowPtr, const Vector<int>& colPtr, const int nNo, const int dof,
+    Array<double>& Val, const Array<double>& Wr, const Array<double>& Wc)
+{
+  const int n = block_size<DOF>(dof);
+  double* val_data = Val.data();
+  const double* wr_data = Wr.data();
+  const double* wc_data = Wc.data();
+
+  for (int Ac = 0; Ac < nNo; Ac++) {
+    const double* wr = wr_data + Ac*n;
+
+    for (int i = rowPtr(0,Ac); i <= rowPtr(1,Ac); i++) {
+      double* blk = val_data + i*n*n;
+      const double* wc = wc_data + colPtr(i)*n;
+
+      for (int k = 0; k < n; k++) {
+        for (int b = 0; b < n; b++) {
+          blk[k*n+b] = blk[k*n+b] * wr[k] * wc[b];
+        }
+      }
+    }
+  }
+}
+
+/// @brief Compute the maximum absolute value of the entries of each row,
+/// Wr(dof,nNo), and of each column, Wc(dof,nNo), of the block matrix Val.
+///
+/// Wr and Wc must be set to zero on entry.
+//
+template <int DOF>
+void row_col_max(const Array<int>& rowPtr, const Vector<int>& colPtr, const int nNo, const int dof,
+    const Array<double>& Val, Array<double>& Wr, Array<double>& Wc)
+{
+  const int n = block_size<DOF>(dof);
+  const double* val_data = Val.data();
+  double* wr_data = Wr.data();
+  double* wc_data = Wc.data();
+
+  for (int Ac = 0; Ac < nNo; Ac++) {
+    double* wr = wr_data + Ac*n;
+
+    for (int i = rowPtr(0,Ac); i <= rowPtr(1,Ac); i++) {
+      const double* blk = val_data + i*n*n;
+      double* wc = wc_data + colPtr(i)*n;
+
+      for (int k = 0; k < n; k++) {
+        for (int b = 0; b < n; b++) {
+          double value = fabs(blk[k*n+b]);
+          wr[k] = std::max(wr[k], value);
+          wc[b] = std::max(wc[b], value);
+        }
+      }
+    }
+  }
+}
+
+/// @brief Split the (NSD+1) x (NSD+1) blocks of a saddle point matrix
+/// Val = [K G; D L] into the blocks mK(NSD*NSD,nnz), mG(NSD,nnz), mD(NSD,nnz)
+/// and mL(nnz).
+//
+template <int NSD>
+void split_ns_blocks(const int nnz, const Array<double>& Val, Array<double>& mK, Array<double>& mG,
+    Array<double>& mD, Vector<double>& mL)
+{
+  constexpr int n = NSD + 1;
+  const double* val_data = Val.data();
+  double* mk_data = mK.data();
+  double* mg_data = mG.data();
+  double* md_data = mD.data();
+
+  for (int i = 0; i < nnz; i++) {
+    const double* blk = val_data + i*n*n;
+    double* mk = mk_data + i*NSD*NSD;
+    double* mg = mg_data + i*NSD;
+    double* md = md_data + i*NSD;
+
+    for (int k = 0; k < NSD; k++) {
+      for (int b = 0; b < NSD; b++) {
+        mk[k*NSD+b] = blk[k*n+b];
+      }
+      mg[k] = blk[k*n+NSD];
+      md[k] = blk[NSD*n+k];
+    }
+
+    mL(i) = blk[n*n-1];
+  }
+}
+
+};
+
+#endif
+
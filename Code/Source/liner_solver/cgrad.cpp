@@ -6,6 +6,7 @@
 
 #include "fsils_api.hpp"
 #include "add_bc_mul.h"
+#include "amg.h"
 #include "dot.h"
 #include "omp_la.h"
 #include "norm.h"
@@ -18,9 +19,12 @@ namespace cgrad {
 /// @brief Conjugate-gradient algorithm for scaler, vector and Schur
 /// complement cases.
 ///
+/// If amg.active then the AMG preconditioner set for an approximation of
+/// the Schur complement is used.
+///
 /// Reproduces 'SUBROUTINE CGRAD_SCHUR(lhs, ls, dof, D, G, L, R)'
 //
-void schur(FSILS_lhsType& lhs, FSILS_subLsType& ls, const int dof, const Array<double>& D, 
+void schur(FSILS_lhsType& lhs, FSILS_subLsType& ls, FSILS_amgType& amg, const int dof, const Array<double>& D, 
     const Array<double>& G, const Vector<double>& L, Vector<double>& R)
 {
   #define n_debug_schur
@@ -32,9 +36,17 @@ void schur(FSILS_lhsType& lhs, FSILS_subLsType& ls, const int dof, const Array<d
   int nNo = lhs.nNo;
   int mynNo = lhs.mynNo;
 
-  Vector<double> X(nNo), P(nNo), SP(nNo), DGP(nNo); 
+  Vector<double> X(nNo), P(nNo), SP(nNo), DGP(nNo), Z; 
   Array<double> GP(dof,nNo), unCondU(dof,nNo);
 
+  // Z = M^-1 R using the AMG preconditioner.
+  //
+  auto amg_apply = [&]() -> double {
+    Array<double> Ra(1, nNo, R.data()), Za(1, nNo, Z.data());
+    amg::amg_apply(lhs, amg, 1, Ra, Za);
+    return dot::fsils_dot_s(mynNo, lhs.commu, R, Z);
+  };
+
   double time = fsi_linear_solver::fsils_cpu_t();
   ls.suc = false;
   ls.iNorm = norm::fsi_ls_norms(mynNo, lhs.commu, R);
@@ -51,7 +63,16 @@ void schur(FSILS_lhsType& lhs, FSILS_subLsType& ls, const int dof, const Array<d
   #endif
 
   X = 0.0;
-  P = R;
+  double rz = 0.0;
+
+  if (amg.active) {
+    Z.resize(nNo);
+    rz = amg_apply();
+    P = Z;
+  } else {
+    P = R;
+  }
+
   int last_i = 0;
 
   for (int i = 0; i < ls.mItr; i++) {
@@ -90,7 +111,7 @@ void schur(FSILS_lhsType& lhs, FSILS_subLsType& ls, const int dof, const Array<d
     // SP = SP - DGP
     omp_la::omp_sum_s(nNo, -1.0, SP, DGP);
 
-    double alpha = errO / dot::fsils_dot_s(mynNo, lhs.commu, P, SP);
+    double alpha = (amg.active ? rz : errO) / dot::fsils_dot_s(mynNo, lhs.commu, P, SP);
 
     // X = X + alpha * P
     omp_la::omp_sum_s(nNo, alpha, X, P);
@@ -106,13 +127,22 @@ void schur(FSILS_lhsType& lhs, FSILS_subLsType& ls, const int dof, const Array<d
     dmsg << "err/errO: " << err/errO;
     #endif
 
-    // P = P + errO/err * R 
-    double c1 = errO / err;
-    omp_la::omp_sum_s(nNo, c1, P, R);
-
-    // P = err/errO * P
-    double c2 = err / errO;
-    omp_la::omp_mul_s(nNo, c2, P);
+    if (amg.active) {
+      // P = Z + rz/rzO * P, Z = M^-1 R
+      double rzO = rz;
+      rz = amg_apply();
+      omp_la::omp_mul_s(nNo, rz/rzO, P);
+      omp_la::omp_sum_s(nNo, 1.0, P, Z);
+
+    } else {
+      // P = P + errO/err * R 
+      double c1 = errO / err;
+      omp_la::omp_sum_s(nNo, c1, P, R);
+
+      // P = err/errO * P
+      double c2 = err / errO;
+      omp_la::omp_mul_s(nNo, c2, P);
+    }
   }
 
   R = X;
@@ -135,8 +165,10 @@ void schur(FSILS_lhsType& lhs, FSILS_subLsType& ls, const int dof, const Array<d
 //---------
 // cgrad_v
 //---------
+// If amg.active then the AMG preconditioner set for K is used.
 //
-void cgrad_v(FSILS_lhsType& lhs, FSILS_subLsType& ls, const int dof, const Array<double>& K, Array<double>& R)
+void cgrad_v(FSILS_lhsType& lhs, FSILS_subLsType& ls, FSILS_amgType& amg, const int dof, const Array<double>& K, 
+    Array<double>& R)
 {
   #define n_debug_cgrad_v 
   #ifdef debug_cgrad_v
@@ -153,7 +185,7 @@ void cgrad_v(FSILS_lhsType& lhs, FSILS_subLsType& ls, const int dof, const Array
   dmsg << "ls.mItr: " << ls.mItr;
   #endif
 
-  Array<double> P(dof,nNo), KP(dof,nNo), X(dof,nNo);
+  Array<double> P(dof,nNo), KP(dof,nNo), X(dof,nNo), Z;
 
   ls.callD = fsi_linear_solver::fsils_cpu_t();
   ls.suc = false;
@@ -162,8 +194,18 @@ void cgrad_v(FSILS_lhsType& lhs, FSILS_subLsType& ls, const int dof, const Array
 
   double errO = ls.iNorm * ls.iNorm;
   double err  = errO;
+  double rz = 0.0;
   X = 0.0;
-  P = R;
+
+  if (amg.active) {
+    Z.resize(dof,nNo);
+    amg::amg_apply(lhs, amg, dof, R, Z);
+    rz = dot::fsils_dot_v(dof, mynNo, lhs.commu, R, Z);
+    P = Z;
+  } else {
+    P = R;
+  }
+
   int last_i = 0;
   #ifdef debug_cgrad_v
   dmsg << "ls.iNorm: " << ls.iNorm;
@@ -189,15 +231,24 @@ void cgrad_v(FSILS_lhsType& lhs, FSILS_subLsType& ls, const int dof, const Array
 
     spar_mul::fsils_spar_mul_vv(lhs, lhs.rowPtr, lhs.colPtr, dof, K, P, KP);
 
-    double alpha = errO / dot::fsils_dot_v(dof, mynNo, lhs.commu, P, KP);
+    double alpha = (amg.active ? rz : errO) / dot::fsils_dot_v(dof, mynNo, lhs.commu, P, KP);
     omp_la::omp_sum_v(dof, nNo, alpha, X, P);
     omp_la::omp_sum_v(dof, nNo, -alpha, R, KP);
 
     err = norm::fsi_ls_normv(dof, mynNo, lhs.commu, R);
     err = err * err;
 
-    omp_la::omp_sum_v(dof, nNo, errO/err, P, R);
-    omp_la::omp_mul_v(dof, nNo, err/errO, P);
+    if (amg.active) {
+      double rzO = rz;
+      amg::amg_apply(lhs, amg, dof, R, Z);
+      rz = dot::fsils_dot_v(dof, mynNo, lhs.commu, R, Z);
+      omp_la::omp_mul_v(dof, nNo, rz/rzO, P);
+      omp_la::omp_sum_v(dof, nNo, 1.0, P, Z);
+
+    } else {
+      omp_la::omp_sum_v(dof, nNo, errO/err, P, R);
+      omp_la::omp_mul_v(dof, nNo, err/errO, P);
+    }
   }
 
   R = X;
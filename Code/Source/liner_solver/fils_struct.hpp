@@ -45,7 +45,8 @@ enum LinearSolverType
   LS_TYPE_CG = 798,
   LS_TYPE_GMRES = 797, 
   LS_TYPE_NS = 796, 
-  LS_TYPE_BICGS = 795
+  LS_TYPE_BICGS = 795,
+  LS_TYPE_PGMRES = 794
 };
 
 class FSILS_commuType 
@@ -86,6 +87,28 @@ class FSILS_cSType
     Vector<int> ptr;
 };
 
+/// @brief Buffers of an exchange of the values of shared nodes started 
+/// by fsils_commuv_start() and completed by fsils_commuv_finish().
+//
+class FSILS_commuBufType
+{
+  public:
+    /// Send buffer
+    Array<double> sB;
+
+    /// Receive buffer
+    Array<double> rB;
+
+    /// Send requests
+    std::vector<MPI_Request> sReq;
+
+    /// Receive requests
+    std::vector<MPI_Request> rReq;
+
+    /// Received messages
+    std::vector<bool> received;
+};
+
 class FSILS_faceType
 {
   public:
@@ -179,6 +202,9 @@ class FSILS_lhsType
     std::vector<FSILS_cSType> cS;
 
     std::vector<FSILS_faceType> face;
+
+    /// Buffers of the exchanges of the sparse matrix-vector products (TMP)
+    FSILS_commuBufType commuBuf;
 };
 
 class FSILS_subLsType 
@@ -229,6 +255,81 @@ class FSILS_subLsType
     double callD;  
 };
 
+/// @brief A level of the smoothed aggregation algebraic multigrid (AMG)
+/// preconditioner.
+///
+/// The level matrix is stored like the FSILS matrix: rowPtr(2,nNo), colPtr(nnz)
+/// and Val(dof*dof,nnz). The prolongator from the next coarser level is stored
+/// the same way: pRowPtr(2,nNo), pColPtr and pVal(dof*dof,.).
+//
+class FSILS_amgLevelType
+{
+  public:
+    /// Number of nodes                     (USE)
+    int nNo = 0;
+
+    /// Row pointer                         (USE)
+    Array<int> rowPtr;
+
+    /// Column pointer                      (USE)
+    Vector<int> colPtr;
+
+    /// Diagonal pointer                    (USE)
+    Vector<int> diagPtr;
+
+    /// Level matrix                        (USE)
+    Array<double> Val;
+
+    /// Inverse of the matrix diagonal      (USE)
+    Array<double> Dinv;
+
+    /// Jacobi smoother damping factor      (USE)
+    double omega = 0.0;
+
+    /// Prolongator row pointer             (USE)
+    Array<int> pRowPtr;
+
+    /// Prolongator column pointer          (USE)
+    Vector<int> pColPtr;
+
+    /// Prolongator values                  (USE)
+    Array<double> pVal;
+
+    /// Right hand side, solution and work array of a V-cycle (TMP)
+    Array<double> R, X, W;
+};
+
+/// @brief Smoothed aggregation algebraic multigrid (AMG) preconditioner,
+/// set by amg::amg_setup().
+//
+class FSILS_amgType
+{
+  public:
+    /// Use the AMG preconditioner          (IN)
+    bool active = false;
+
+    /// Maximum number of levels            (IN)
+    int maxLevels = 10;
+
+    /// Maximum number of unknowns of the coarsest level solved directly (IN)
+    int coarseSize = 400;
+
+    /// Number of pre- and post-smoothing Jacobi sweeps (IN)
+    int nSweep = 2;
+
+    /// Strength of connection threshold    (IN)
+    double theta = 0.08;
+
+    /// Levels, levels[0] is the fine level (USE)
+    std::vector<FSILS_amgLevelType> levels;
+
+    /// LU factors of the coarsest level matrix (USE)
+    Array<double> coarseLU;
+
+    /// Pivots of the coarsest level LU factors (USE)
+    Vector<int> coarsePiv;
+};
+
 class FSILS_lsType 
 {
   public:
@@ -247,6 +348,28 @@ class FSILS_lsType
     FSILS_subLsType GM;
     FSILS_subLsType CG;
     FSILS_subLsType RI;
+
+    /// Number of solves a preconditioner is used for (IN)
+    int precReuse = 1;
+
+    /// Recompute the preconditioner when the number of iterations
+    /// exceeds this ratio times the number of iterations of the 
+    /// first solve using it (IN)
+    double precReuseItrRatio = 1.5;
+
+    /// Number of solves the current preconditioner was used for (USE)
+    int precAge = 0;
+
+    /// Number of iterations of the first solve using the current 
+    /// preconditioner (USE)
+    int precItr = 0;
+
+    /// Row and column scaling of the current preconditioner (USE)
+    Array<double> precWr;
+    Array<double> precWc;
+
+    /// AMG preconditioner of the CG solves   (USE)
+    FSILS_amgType amg;
 };
 
 
@@ -22,8 +22,16 @@ void fsils_bc_update(FSILS_lhsType& lhs, int faIn, int nNo, int dof, const Array
     
 void fsils_commus(const FSILS_lhsType& lhs, Vector<double>& R); 
 
+void fsils_commus_finish(const FSILS_lhsType& lhs, Vector<double>& R, FSILS_commuBufType& buf);
+
+void fsils_commus_start(const FSILS_lhsType& lhs, const Vector<double>& R, FSILS_commuBufType& buf);
+
 void fsils_commuv(const FSILS_lhsType& lhs, const int dof, Array<double>& R);
 
+void fsils_commuv_finish(const FSILS_lhsType& lhs, const int dof, Array<double>& R, FSILS_commuBufType& buf);
+
+void fsils_commuv_start(const FSILS_lhsType& lhs, const int dof, const Array<double>& R, FSILS_commuBufType& buf);
+
 double fsils_cpu_t();
 
 void fsils_ls_create(FSILS_lsType& ls, LinearSolverType LS_type, double relTol = consts::double_inf, 
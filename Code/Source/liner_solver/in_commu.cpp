@@ -19,59 +19,108 @@
 
 namespace fsi_linear_solver {
 
-void fsils_commus(const FSILS_lhsType& lhs, Vector<double>& R)
+/// @brief Copy the values of the shared nodes of R(dof,nNo) to the send 
+/// buffer and start the exchange with the processors sharing them.
+///
+/// The buffers are only reallocated when their sizes change so they can
+/// be reused by repeated exchanges.
+//
+static void commu_start(const FSILS_lhsType& lhs, const int dof, const double* R, FSILS_commuBufType& buf)
 {
-  if (lhs.commu.nTasks == 1) {
-    return;
-  }
-
   int nReq = lhs.nReq;
-  if (lhs.cS.size() == 0) {
-    return;
-  }
-
   int nmax = std::max_element(lhs.cS.begin(), lhs.cS.end(), 
-    [](const FSILS_cSType& a, const FSILS_cSType& b){return a.n < b.n;})->n; 
+      [](const FSILS_cSType& a, const FSILS_cSType& b){return a.n < b.n;})->n; 
 
-  Array<double> sB(nmax,nReq); 
-  Array<double> rB(nmax,nReq); 
-  std::vector<MPI_Request> rReq(nReq); 
-  std::vector<MPI_Request> sReq(nReq);
+  if ((buf.sB.nrows() != dof*nmax) || (buf.sB.ncols() != nReq)) {
+    buf.sB.resize(dof*nmax, nReq);
+    buf.rB.resize(dof*nmax, nReq);
+  }
+  buf.rReq.resize(nReq); 
+  buf.sReq.resize(nReq);
+  buf.received.resize(nReq);
 
   for (int i = 0; i < nReq; i++) {
     for (int j = 0; j < lhs.cS[i].n; j++) { 
       int k = lhs.cS[i].ptr(j);
-      sB(j,i) = R(k);
+      for (int l = 0; l < dof; l++) { 
+        buf.sB(l+j*dof,i) = R[l+k*dof];
+      }
     }
   }
 
   int mpi_tag = 1;
 
   for (int i = 0; i < nReq; i++) {
-    auto rec_err = MPI_Irecv(rB.col_data(i), lhs.cS[i].n, mpreal, lhs.cS[i].iP, mpi_tag, lhs.commu.comm, &rReq[i]);
-    auto send_err = MPI_Isend(sB.col_data(i), lhs.cS[i].n, mpreal, lhs.cS[i].iP, mpi_tag, lhs.commu.comm, &sReq[i]);
-  }
-
-  // Wait for the MPI receive to complete.
-  //
-  for (int i = 0; i < nReq; i++) {
-    MPI_Status stat;
-    auto err = MPI_Wait(&rReq[i], &stat);
+    auto rec_err = MPI_Irecv(buf.rB.col_data(i), lhs.cS[i].n*dof, mpreal, lhs.cS[i].iP, mpi_tag, lhs.commu.comm, &buf.rReq[i]);
+    auto send_err = MPI_Isend(buf.sB.col_data(i), lhs.cS[i].n*dof, mpreal, lhs.cS[i].iP, mpi_tag, lhs.commu.comm, &buf.sReq[i]);
   }
+}
 
-  for (int i = 0; i < nReq; i++) {
-    for (int j = 0; j < lhs.cS[i].n; j++) { 
-      int k = lhs.cS[i].ptr(j);
-      R(k) = R(k) + rB(j,i);
+/// @brief Wait for the exchange started by commu_start() to complete and 
+/// add the received values to R(dof,nNo).
+///
+/// Messages are processed as they arrive but the received values are added 
+/// in the order of the processors so the sums don't depend on the order 
+/// in which the messages arrive.
+//
+static void commu_finish(const FSILS_lhsType& lhs, const int dof, double* R, FSILS_commuBufType& buf)
+{
+  int nReq = lhs.nReq;
+  auto& received = buf.received;
+  std::fill(received.begin(), received.end(), false);
+  int next = 0;
+
+  for (int n = 0; n < nReq; n++) {
+    int i;
+    auto err = MPI_Waitany(nReq, buf.rReq.data(), &i, MPI_STATUS_IGNORE);
+    received[i] = true;
+
+    while ((next < nReq) && received[next]) { 
+      for (int j = 0; j < lhs.cS[next].n; j++) { 
+        int k = lhs.cS[next].ptr(j);
+        for (int l = 0; l < dof; l++) { 
+          R[l+k*dof] += buf.rB(l+j*dof,next);
+        }
+      }
+      next += 1;
     }
   }
 
   // Wait for the MPI send to complete.
   //
-  for (int i = 0; i < nReq; i++) {
-    MPI_Status stat;
-    auto err = MPI_Wait(&sReq[i], &stat);
+  auto err = MPI_Waitall(nReq, buf.sReq.data(), MPI_STATUSES_IGNORE);
+}
+
+void fsils_commus(const FSILS_lhsType& lhs, Vector<double>& R)
+{
+  FSILS_commuBufType buf;
+  fsils_commus_start(lhs, R, buf);
+  fsils_commus_finish(lhs, R, buf);
+}
+
+/// @brief Complete the exchange started by fsils_commus_start().
+//
+void fsils_commus_finish(const FSILS_lhsType& lhs, Vector<double>& R, FSILS_commuBufType& buf)
+{
+  if ((lhs.commu.nTasks == 1) || (lhs.cS.size() == 0)) {
+    return;
   }
+
+  commu_finish(lhs, 1, R.data(), buf);
+}
+
+/// @brief Start the exchange of the values of the shared nodes of R.
+///
+/// R may be modified at nodes that are not shared before the exchange is 
+/// completed by fsils_commus_finish().
+//
+void fsils_commus_start(const FSILS_lhsType& lhs, const Vector<double>& R, FSILS_commuBufType& buf)
+{
+  if ((lhs.commu.nTasks == 1) || (lhs.cS.size() == 0)) {
+    return;
+  }
+
+  commu_start(lhs, 1, R.data(), buf);
 }
 
 /// @brief This a both way communication with three main part:
@@ -83,65 +132,34 @@ void fsils_commus(const FSILS_lhsType& lhs, Vector<double>& R)
 //
 void fsils_commuv(const FSILS_lhsType& lhs, int dof, Array<double>& R)
 {
-  if (lhs.commu.nTasks == 1) {
-    return;
-  }
+  FSILS_commuBufType buf;
+  fsils_commuv_start(lhs, dof, R, buf);
+  fsils_commuv_finish(lhs, dof, R, buf);
+}
 
-  if (lhs.cS.size() == 0) {
+/// @brief Complete the exchange started by fsils_commuv_start().
+//
+void fsils_commuv_finish(const FSILS_lhsType& lhs, const int dof, Array<double>& R, FSILS_commuBufType& buf)
+{
+  if ((lhs.commu.nTasks == 1) || (lhs.cS.size() == 0)) {
     return;
   }
 
-  int nReq = lhs.nReq;
-  int nmax = std::max_element(lhs.cS.begin(), lhs.cS.end(), 
-      [](const FSILS_cSType& a, const FSILS_cSType& b){return a.n < b.n;})->n; 
-
-  Array3<double> sB(dof,nmax,nReq); 
-  Array3<double> rB(dof,nmax,nReq); 
-  std::vector<MPI_Request> rReq(nReq); 
-  std::vector<MPI_Request> sReq(nReq);
-
-  int n = 1;
-
-  for (int i = 0; i < nReq; i++) {
-    for (int j = 0; j < lhs.cS[i].n; j++) { 
-      int k = lhs.cS[i].ptr(j);
-      for (int l = 0; l < dof; l++) { 
-        sB(l,j,i) = R(l,k);
-      }
-    }
-  }
-
-  int mpi_tag = 1;
-
-  for (int i = 0; i < nReq; i++) {
-    auto rec_err = MPI_Irecv(rB.slice_data(i), lhs.cS[i].n*dof, mpreal, lhs.cS[i].iP, mpi_tag, lhs.commu.comm, &rReq[i]);
-    auto send_err = MPI_Isend(sB.slice_data(i), lhs.cS[i].n*dof, mpreal, lhs.cS[i].iP, mpi_tag, lhs.commu.comm, &sReq[i]);
-  }
-
-  // Wait for the MPI receive to complete.
-  //
-  for (int i = 0; i < nReq; i++) {
-    MPI_Status stat;
-    auto err = MPI_Wait(&rReq[i], &stat);
-  }
+  commu_finish(lhs, dof, R.data(), buf);
+}
 
-  for (int i = 0; i < nReq; i++) {
-    for (int j = 0; j < lhs.cS[i].n; j++) { 
-      int k = lhs.cS[i].ptr(j);
-      for (int l = 0; l < dof; l++) { 
-        R(l,k) = R(l,k) + rB(l,j,i);
-      }
-    }
+/// @brief Start the exchange of the values of the shared nodes of R(dof,nNo).
+///
+/// R may be modified at nodes that are not shared before the exchange is 
+/// completed by fsils_commuv_finish().
+//
+void fsils_commuv_start(const FSILS_lhsType& lhs, const int dof, const Array<double>& R, FSILS_commuBufType& buf)
+{
+  if ((lhs.commu.nTasks == 1) || (lhs.cS.size() == 0)) {
+    return;
   }
 
-  // Wait for the MPI send to complete.
-  //
-  for (int i = 0; i < nReq; i++) {
-    MPI_Status stat;
-    auto err = MPI_Wait(&sReq[i], &stat);
-  }
+  commu_start(lhs, dof, R.data(), buf);
 }
 
 };
-
-
@@ -38,6 +38,12 @@ void fsils_ls_create(FSILS_lsType& ls, LinearSolverType LS_type, double relTol,
       ls.RI.sD     = 250;
     break;
 
+    case LinearSolverType::LS_TYPE_PGMRES:
+      ls.RI.relTol = 0.1;
+      ls.RI.mItr   = 1000;
+      ls.RI.sD     = 50;
+    break;
+
     case LinearSolverType::LS_TYPE_CG:
       ls.RI.relTol = 1.E-2;
       ls.RI.mItr   = 1000;
@@ -11,6 +11,8 @@
 #include "fils_struct.hpp"
 
 #include "add_bc_mul.h"
+#include "amg.h"
+#include "bsr.h"
 #include "cgrad.h"
 #include "dot.h"
 #include "ge.h"
@@ -64,51 +66,11 @@ void bc_pre(fsi_linear_solver::FSILS_lhsType& lhs, const int nsd, const int dof,
 void depart(fsi_linear_solver::FSILS_lhsType& lhs, const int nsd, const int dof, const int nNo, const int nnz, 
     const Array<double>& Val, Array<double>& Gt, Array<double>& mK, Array<double>& mG, Array<double>& mD, Vector<double>& mL)
 {
-  Vector<double> tmp((nsd+1)*(nsd+1));
-
   if (nsd == 2) {
-    for (int i = 0; i < nnz; i++) {
-      auto tmp = Val.col(i);
-
-      mK(0,i) = tmp(0);
-      mK(1,i) = tmp(1);
-      mK(2,i) = tmp(3);
-      mK(3,i) = tmp(4);
-
-      mG(0,i) = tmp(2);
-      mG(1,i) = tmp(5);
-
-      mD(0,i) = tmp(6);
-      mD(1,i) = tmp(7);
-
-      mL(i) = tmp(8);
-    }
+    bsr::split_ns_blocks<2>(nnz, Val, mK, mG, mD, mL);
 
   } else if (nsd == 3) {
-
-    for (int i = 0; i < nnz; i++) {
-      auto tmp = Val.col(i);
-
-      mK(0,i) = tmp(0);
-      mK(1,i) = tmp(1);
-      mK(2,i) = tmp(2);
-      mK(3,i) = tmp(4);
-      mK(4,i) = tmp(5);
-      mK(5,i) = tmp(6);
-      mK(6,i) = tmp(8);
-      mK(7,i) = tmp(9);
-      mK(8,i) = tmp(10);
-
-      mG(0,i) = tmp(3);
-      mG(1,i) = tmp(7);
-      mG(2,i) = tmp(11);
-
-      mD(0,i) = tmp(12);
-      mD(1,i) = tmp(13);
-      mD(2,i) = tmp(14);
-
-      mL(i)   = tmp(15);
-    }
+    bsr::split_ns_blocks<3>(nnz, Val, mK, mG, mD, mL);
 
   } else {
     //PRINT *, "FSILS: Not defined nsd for DEPART", nsd
@@ -218,6 +180,14 @@ void ns_solver(fsi_linear_solver::FSILS_lhsType& lhs, fsi_linear_solver::FSILS_l
   //
   depart(lhs, nsd, dof, nNo, nnz, Val, Gt, mK, mG, mD, mL);
 
+  // Set the AMG preconditioner of the Schur complement solves.
+  //
+  if (ls.amg.active) {
+    Array<double> S(1,nnz);
+    schur_matrix(lhs, nsd, Gt, mG, mL, S);
+    amg::amg_setup(lhs, ls.amg, 1, S);
+  }
+
   // Computes lhs.face[].nS for each face.
   //
   bc_pre(lhs, nsd, dof, nNo, mynNo);
@@ -273,7 +243,7 @@ void ns_solver(fsi_linear_solver::FSILS_lhsType& lhs, fsi_linear_solver::FSILS_l
     // P = [L + G^t*G]^-1*P
     //
     P_col = P.rcol(i);
-    cgrad::schur(lhs, ls.CG, nsd, Gt, mG, mL, P_col);
+    cgrad::schur(lhs, ls.CG, ls.amg, nsd, Gt, mG, mL, P_col);
     //P.set_col(i, P_col);
 
     // MU1 = G*P
@@ -471,5 +441,45 @@ void ns_solver(fsi_linear_solver::FSILS_lhsType& lhs, fsi_linear_solver::FSILS_l
   #endif
 }
 
+/// @brief Compute the approximation S(1,nnz) of the Schur complement L - D*G
+/// solved by cgrad::schur() used to set its AMG preconditioner.
+///
+/// The entries of D*G outside the sparsity pattern of the matrix are dropped.
+//
+void schur_matrix(fsi_linear_solver::FSILS_lhsType& lhs, const int nsd, const Array<double>& Gt, const Array<double>& mG,
+    const Vector<double>& mL, Array<double>& S)
+{
+  Vector<int> pos(lhs.nNo);
+  pos = -1;
+
+  for (int a = 0; a < lhs.nNo; a++) {
+    for (int i = lhs.rowPtr(0,a); i <= lhs.rowPtr(1,a); i++) {
+      pos(lhs.colPtr(i)) = i;
+      S(0,i) = mL(i);
+    }
+
+    for (int i = lhs.rowPtr(0,a); i <= lhs.rowPtr(1,a); i++) {
+      int k = lhs.colPtr(i);
+
+      for (int j = lhs.rowPtr(0,k); j <= lhs.rowPtr(1,k); j++) {
+        int l = pos(lhs.colPtr(j));
+        if (l == -1) {
+          continue;
+        }
+
+        double sum = 0.0;
+        for (int m = 0; m < nsd; m++) {
+          sum += Gt(m,i) * mG(m,j);
+        }
+        S(0,l) -= sum;
+      }
+    }
+
+    for (int i = lhs.rowPtr(0,a); i <= lhs.rowPtr(1,a); i++) {
+      pos(lhs.colPtr(i)) = -1;
+    }
+  }
+}
+
 };
 
@@ -12,5 +12,8 @@ void depart(fsi_linear_solver::FSILS_lhsType& lhs, const int nsd, const int dof,
 
 void ns_solver(fsi_linear_solver::FSILS_lhsType& lhs, fsi_linear_solver::FSILS_lsType& ls, const int dof, const Array<double>& Val, Array<double>& Ri);
 
+void schur_matrix(fsi_linear_solver::FSILS_lhsType& lhs, const int nsd, const Array<double>& Gt, const Array<double>& mG,
+    const Vector<double>& mL, Array<double>& S);
+
 
 };
@@ -0,0 +1,224 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+//-------------------------------------------------------------------------
+// Pipelined generalized minimum residual algorithm, the p(1)-GMRES method 
+// of Ghysels et al. 2013 (https://doi.org/10.1137/12086563X).
+//
+// Standard GMRES must finish the global reduction computing the Arnoldi 
+// coefficients of a Krylov vector before the next matrix-vector product 
+// can start. Here the basis vectors v_j are used together with the 
+// vectors z_j = A*v_j so the product needed by the next iteration,
+// A*z_i, can be computed while the reduction is in progress:
+//
+//   h_{j,i} = <v_j, z_i>,  j <= i,   and  <z_i, z_i>  (one reduction)
+//   q = A*z_i                                         (overlapped)
+//   h_{i+1,i} = sqrt(<z_i, z_i> - sum_j h_{j,i}^2)
+//   v_{i+1} = (z_i - sum_j h_{j,i} v_j) / h_{i+1,i}
+//   z_{i+1} = (q - sum_j h_{j,i} z_j) / h_{i+1,i}
+//
+// The recurrence for z_{i+1} accumulates rounding errors so a smaller 
+// Krylov subspace dimension than for GMRES may be needed to converge.
+//-------------------------------------------------------------------------
+
+#include "pgmres.h"
+
+#include "fsils_api.hpp"
+
+#include "add_bc_mul.h"
+#include "bcast.h"
+#include "dot.h"
+#include "norm.h"
+#include "omp_la.h"
+#include "spar_mul.h"
+
+#include "Array3.h"
+
+#include <math.h>
+
+namespace pgmres {
+
+/// @brief Compute the matrix-vector product KU = Val * U including the 
+/// contribution of coupled boundary conditions.
+//
+static void mat_vec(fsi_linear_solver::FSILS_lhsType& lhs, const int dof, const Array<double>& Val, 
+    const Array<double>& U, Array<double>& KU)
+{
+  using namespace fsi_linear_solver;
+
+  spar_mul::fsils_spar_mul_vv(lhs, lhs.rowPtr, lhs.colPtr, dof, Val, U, KU);
+  add_bc_mul::add_bc_mul(lhs, BcopType::BCOP_TYPE_ADD, dof, U, KU);
+}
+
+/// @brief Solve the system Val * X = R using the pipelined GMRES method.
+///
+/// On return R contains the solution X. The solver statistics stored in 
+/// 'ls' are the same as those set by gmres::gmres_v().
+///
+/// As in gmres::gmres_v(), which this function replaces, the preconditioner
+/// of coupled boundary conditions (BCOP_TYPE_PRE) is not applied.
+//
+void pgmres_v(fsi_linear_solver::FSILS_lhsType& lhs, fsi_linear_solver::FSILS_subLsType& ls, const int dof,
+    const Array<double>& Val, Array<double>& R)
+{
+  using namespace fsi_linear_solver;
+
+  int nNo = lhs.nNo;
+  int mynNo = lhs.mynNo;
+
+  Array<double> h(ls.sD+1,ls.sD), X(dof,nNo), q(dof,nNo);
+  Array3<double> u(dof,nNo,ls.sD+1), z(dof,nNo,ls.sD);
+  Vector<double> y(ls.sD), c(ls.sD), s(ls.sD), err(ls.sD+1), hc(ls.sD+1);
+
+  ls.callD = fsi_linear_solver::fsils_cpu_t();
+  ls.suc = false;
+  double eps = norm::fsi_ls_normv(dof, mynNo, lhs.commu, R);
+  ls.iNorm = eps;
+  ls.fNorm = eps;
+  eps = std::max(ls.absTol, ls.relTol*eps);
+  ls.itr = 0;
+  int last_i = 0;
+
+  if (ls.iNorm <= ls.absTol) {
+    ls.callD = std::numeric_limits<double>::epsilon();
+    ls.dB = 0.0;
+    return; 
+  }
+
+  for (int l = 0; l < ls.mItr; l++) {
+    ls.dB = ls.fNorm;
+    ls.itr = ls.itr + 1;
+    auto u_slice = u.rslice(0);
+    mat_vec(lhs, dof, Val, X, u_slice);
+    u_slice = R - u_slice;
+
+    err[0] = norm::fsi_ls_normv(dof, mynNo, lhs.commu, u.rslice(0));
+
+    // Check the true residual of a restarted cycle, the previous cycle 
+    // may have stopped because of a breakdown.
+    if ((l != 0) && (err[0] < eps)) {
+      ls.fNorm = err[0];
+      ls.suc = true;
+      break;
+    }
+
+    if (err[0] == 0.0) { 
+      throw std::runtime_error("FSILS: A zero matrix norm has been computed. This is probably caused by ill-posed boundary conditions.");
+    }
+
+    u_slice = u.rslice(0) / err[0];
+
+    auto z_slice = z.rslice(0);
+    mat_vec(lhs, dof, Val, u.rslice(0), z_slice);
+
+    for (int i = 0; i < ls.sD; i++) {
+      ls.itr = ls.itr + 1;
+      last_i = i;
+      auto z_slice = z.rslice(i);
+
+      // Start the reduction for the Arnoldi coefficients and the norm of z_i.
+      //
+      for (int j = 0; j <= i; j++) {
+        hc(j) = dot::fsils_nc_dot_v(dof, mynNo, u.rslice(j), z_slice);
+      }
+      hc(i+1) = dot::fsils_nc_dot_v(dof, mynNo, z_slice, z_slice);
+
+      MPI_Request request;
+      bcast::fsils_ibcast_v(i+2, hc, lhs.commu, request);
+
+      // Compute A*z_i while the reduction is in progress.
+      //
+      bool next_z = (i+1 < ls.sD);
+
+      if (next_z) {
+        mat_vec(lhs, dof, Val, z_slice, q);
+      }
+
+      bcast::fsils_bcast_wait(request);
+
+      double nu = hc(i+1);
+
+      for (int j = 0; j <= i; j++) {
+        h(j,i) = hc(j);
+        nu = nu - hc(j)*hc(j);
+      }
+
+      // If the norm can't be computed from the reduction then v_{i+1} can't 
+      // be formed. Finish this cycle and restart from the true residual.
+      bool breakdown = (nu <= 0.0);
+
+      if (breakdown) {
+        h(i+1,i) = 0.0;
+
+      } else {
+        h(i+1,i) = sqrt(nu);
+
+        auto u_slice_1 = u.rslice(i+1);
+        u_slice_1 = z_slice;
+        for (int j = 0; j <= i; j++) {
+          omp_la::omp_sum_v(dof, nNo, -h(j,i), u_slice_1, u.rslice(j));
+        }
+        omp_la::omp_mul_v(dof, nNo, 1.0/h(i+1,i), u_slice_1);
+
+        if (next_z) {
+          auto z_slice_1 = z.rslice(i+1);
+          z_slice_1 = q;
+          for (int j = 0; j <= i; j++) {
+            omp_la::omp_sum_v(dof, nNo, -h(j,i), z_slice_1, z.rslice(j));
+          }
+          omp_la::omp_mul_v(dof, nNo, 1.0/h(i+1,i), z_slice_1);
+        }
+      }
+
+      for (int j = 0; j <= i-1; j++) {
+        double tmp = c(j)*h(j,i) + s(j)*h(j+1,i);
+        h(j+1,i) = -s(j)*h(j,i) + c(j)*h(j+1,i);
+        h(j,i) = tmp;
+      }
+
+      double tmp = sqrt(h(i,i)*h(i,i) + h(i+1,i)*h(i+1,i));
+      c(i) = h(i,i) / tmp;
+      s(i) = h(i+1,i) / tmp;
+      h(i,i) = tmp;
+      h(i+1,i) = 0.0;
+      err(i+1) = -s(i)*err(i);
+      err(i) = c(i)*err(i);
+
+      if (breakdown) {
+        break;
+      }
+
+      if (fabs(err(i+1)) < eps) {
+        ls.suc = true;
+        break;
+      }
+    } // for int i = 0; i < ls.sD
+
+    for (int i = 0; i <= last_i; i++) {
+      y(i) = err(i);
+    }
+
+    for (int j = last_i; j >= 0; j--) { 
+      for (int k = j+1; k <= last_i; k++) {
+        y(j) = y(j) - h(j,k)*y(k);
+      }
+      y(j) = y(j) / h(j,j);
+    }
+
+    for (int j = 0; j <= last_i; j++) {
+      omp_la::omp_sum_v(dof, nNo, y(j), X, u.rslice(j));
+    }
+
+    ls.fNorm = fabs(err(last_i+1));
+    if (ls.suc) {
+      break;
+    }
+  }
+
+  R = X;
+  ls.callD = fsi_linear_solver::fsils_cpu_t() - ls.callD;
+  ls.dB  = 10.0 * log(ls.fNorm / ls.dB);
+}
+
+};
+
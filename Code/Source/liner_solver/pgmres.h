@@ -0,0 +1,11 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#include "fils_struct.hpp"
+
+namespace pgmres {
+
+void pgmres_v(fsi_linear_solver::FSILS_lhsType& lhs, fsi_linear_solver::FSILS_subLsType& ls, const int dof,
+    const Array<double>& Val, Array<double>& R);
+
+};
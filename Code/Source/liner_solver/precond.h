@@ -5,6 +5,18 @@
 
 namespace precond {
 
+void apply_diag(fsi_linear_solver::FSILS_lhsType& lhs, const Array<int>& rowPtr, const Vector<int>& colPtr, 
+    const int dof, Array<double>& Val, Array<double>& R, Array<double>& W);
+
+void apply_rcs(fsi_linear_solver::FSILS_lhsType& lhs, const Array<int>& rowPtr, const Vector<int>& colPtr,
+    const Vector<int>& diagPtr, const int dof, Array<double>& Val, Array<double>& R, const Array<double>& W1, 
+    const Array<double>& W2);
+
+void dirichlet_rows(fsi_linear_solver::FSILS_lhsType& lhs, const int dof, Array<double>& W);
+
+void get_diag_scaling(fsi_linear_solver::FSILS_lhsType& lhs, const Vector<int>& diagPtr, const int dof, 
+    const Array<double>& Val, Array<double>& W);
+
 void pos_mul(const Array<int>& rowPtr, const Vector<int>& colPtr, const int nNo, const int nnz, const int dof, Array<double>& Val, const Array<double>& W);
 
 void precond_diag(fsi_linear_solver::FSILS_lhsType& lhs, const Array<int>& rowPtr, const Vector<int>& colPtr, const Vector<int>& diagPtr, 
@@ -13,6 +25,9 @@ void precond_diag(fsi_linear_solver::FSILS_lhsType& lhs, const Array<int>& rowPt
 void precond_rcs(fsi_linear_solver::FSILS_lhsType& lhs, const Array<int>& rowPtr, const Vector<int>& colPtr,
     const Vector<int>& diagPtr, const int dof, Array<double>& Val, Array<double>& R, Array<double>& W1, Array<double>& W2);
 
+void pre_pos_mul(const Array<int>& rowPtr, const Vector<int>& colPtr, const int nNo, const int dof, Array<double>& Val, 
+    const Array<double>& Wr, const Array<double>& Wc);
+
 void pre_mul(const Array<int>& rowPtr, const int nNo, const int nnz, const int dof, Array<double>& Val, const Array<double>& W);
 
 };
@@ -3,10 +3,12 @@
 
 #include "lhs.h"
 #include "CmMod.h"
+#include "amg.h"
 #include "bicgs.h"
 #include "cgrad.h"
 #include "gmres.h"
 #include "ns_solver.h"
+#include "pgmres.h"
 #include "precond.h"
 
 namespace fsi_linear_solver {
@@ -96,15 +98,52 @@ void fsils_solve(FSILS_lhsType& lhs, FSILS_lsType& ls, const int dof, Array<doub
   //
   // Modifies Val and R.
   //
+  // The preconditioner scaling is reused for ls.precReuse solves.
+  //
+  // The AMG preconditioner is applied by the CG solves to the diagonally
+  // scaled matrix.
+  //
+  const bool reuse_prec = (ls.precReuse > 1) && (ls.precAge > 0) && (ls.precAge < ls.precReuse) && 
+      (ls.precWc.nrows() == dof) && (ls.precWc.ncols() == nNo);
+
+  ls.amg.active = (prec == PreconditionerType::PREC_FSILS_AMG);
+
+  if (ls.amg.active && (ls.LS_type != LinearSolverType::LS_TYPE_CG) && (ls.LS_type != LinearSolverType::LS_TYPE_NS)) {
+    throw std::runtime_error("FSILS: the fsils-amg preconditioner can only be used with the CG and NS linear solvers");
+  }
+
+  if ((prec == PreconditionerType::PREC_FSILS) || (prec == PreconditionerType::PREC_FSILS_AMG)) {
+    if (reuse_prec) {
+      Wc = ls.precWc;
+    } else {
+      precond::get_diag_scaling(lhs, lhs.diagPtr, dof, Val, Wc);
+      if (ls.precReuse > 1) {
+        ls.precWc = Wc;
+      }
+    }
+    precond::apply_diag(lhs, lhs.rowPtr, lhs.colPtr, dof, Val, R, Wc);
 
-  if (prec == PreconditionerType::PREC_FSILS) {
-    precond::precond_diag(lhs, lhs.rowPtr, lhs.colPtr, lhs.diagPtr, dof, Val, R, Wc);
   } else if (prec == PreconditionerType::PREC_RCS) {
-    precond::precond_rcs(lhs, lhs.rowPtr, lhs.colPtr, lhs.diagPtr, dof, Val, R, Wr, Wc);
+    if (reuse_prec) {
+      Wr = ls.precWr;
+      Wc = ls.precWc;
+      precond::apply_rcs(lhs, lhs.rowPtr, lhs.colPtr, lhs.diagPtr, dof, Val, R, Wr, Wc);
+    } else {
+      precond::precond_rcs(lhs, lhs.rowPtr, lhs.colPtr, lhs.diagPtr, dof, Val, R, Wr, Wc);
+      if (ls.precReuse > 1) {
+        ls.precWr = Wr;
+        ls.precWc = Wc;
+      }
+    }
+
   } else {
     //PRINT *, "This linear solver and preconditioner combination is not supported."
   }
 
+  if (!reuse_prec) {
+    ls.precAge = 0;
+  }
+
   // Solve for 'R'.
   //
   switch (ls.LS_type) {
@@ -124,15 +163,22 @@ void fsils_solve(FSILS_lhsType& lhs, FSILS_lsType& ls, const int dof, Array<doub
       }
     break;
 
+    case LinearSolverType::LS_TYPE_PGMRES:
+      pgmres::pgmres_v(lhs, ls.RI, dof, Val, R);
+    break;
+
     case LinearSolverType::LS_TYPE_CG:
-      if (dof == 1) {
+      if (ls.amg.active) {
+        amg::amg_setup(lhs, ls.amg, dof, Val);
+        cgrad::cgrad_v(lhs, ls.RI, ls.amg, dof, Val, R);
+      } else if (dof == 1) {
         auto Valv = Val.row(0);
         auto Rv = R.row(0);
         cgrad::cgrad_s(lhs, ls.RI, Valv, Rv);
         Val.set_row(0,Valv);
         R.set_row(0,Rv);
       } else {
-        cgrad::cgrad_v(lhs, ls.RI, dof, Val, R);
+        cgrad::cgrad_v(lhs, ls.RI, ls.amg, dof, Val, R);
       }
     break;
 
@@ -152,6 +198,20 @@ void fsils_solve(FSILS_lhsType& lhs, FSILS_lsType& ls, const int dof, Array<doub
       throw std::runtime_error("FSILS: LS_type not defined");
   }
 
+  // Force recomputing the preconditioner for the next solve if the number 
+  // of iterations has grown too much since it was computed.
+  //
+  if (ls.precReuse > 1) {
+    int itr = (ls.LS_type == LinearSolverType::LS_TYPE_NS) ? ls.GM.itr : ls.RI.itr;
+    ls.precAge += 1;
+
+    if (ls.precAge == 1) {
+      ls.precItr = itr;
+    } else if (itr > ls.precReuseItrRatio * std::max(ls.precItr, 1)) {
+      ls.precAge = ls.precReuse;
+    }
+  }
+
   // Element-wise multiplication.
   //
   for (int i = 0; i < Wc.size(); i++) {
@@ -10,25 +10,67 @@
 
 #include "spar_mul.h"
 
+#include "bsr.h"
 #include "fsils_api.hpp"
 
 namespace spar_mul {
 
+/// @brief Compute the rows of a product using mul_rows(s,e), which computes 
+/// rows s to e-1, and sum the values of the nodes shared with other processors.
+///
+/// fsils_lhs_create() orders the nodes so that the nodes shared with other 
+/// processors are the first lhs.shnNo nodes and the nodes from lhs.mynNo on. 
+/// Those rows are computed first and the exchange of their values is started. 
+/// The rows of the interior nodes are then computed while the messages are 
+/// in flight. The exchange buffers lhs.commuBuf are reused by all products.
+//
+template <typename MulRows>
+void mul_rows_commus(FSILS_lhsType& lhs, Vector<double>& KU, MulRows& mul_rows)
+{
+  mul_rows(0, lhs.shnNo);
+  mul_rows(lhs.mynNo, lhs.nNo);
+
+  fsils_commus_start(lhs, KU, lhs.commuBuf);
+
+  mul_rows(lhs.shnNo, lhs.mynNo);
+
+  fsils_commus_finish(lhs, KU, lhs.commuBuf);
+}
+
+/// @brief Compute the rows of a product using mul_rows(s,e) and sum the 
+/// values of the nodes shared with other processors. 
+///
+/// See mul_rows_commus().
+//
+template <typename MulRows>
+void mul_rows_commuv(FSILS_lhsType& lhs, const int dof, Array<double>& KU, MulRows& mul_rows)
+{
+  mul_rows(0, lhs.shnNo);
+  mul_rows(lhs.mynNo, lhs.nNo);
+
+  fsils_commuv_start(lhs, dof, KU, lhs.commuBuf);
+
+  mul_rows(lhs.shnNo, lhs.mynNo);
+
+  fsils_commuv_finish(lhs, dof, KU, lhs.commuBuf);
+}
+
 /// @brief Reproduces 'SUBROUTINE FSILS_SPARMULSS(lhs, rowPtr, colPtr, K, U, KU)'
 //
 void fsils_spar_mul_ss(FSILS_lhsType& lhs, const Array<int>& rowPtr, const Vector<int>& colPtr, 
     const Vector<double>& K, const Vector<double>& U, Vector<double>& KU)
 {
-  int nNo = lhs.nNo;
   KU = 0.0;
 
-  for (int i = 0; i < nNo; i++) {
-    for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-      KU(i) = KU(i) + K(j) * U(colPtr(j));
-    } 
-  }
+  auto mul_rows = [&](const int s, const int e) {
+    for (int i = s; i < e; i++) {
+      for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
+        KU(i) = KU(i) + K(j) * U(colPtr(j));
+      } 
+    }
+  };
 
-  fsils_commus(lhs, KU);
+  mul_rows_commus(lhs, KU, mul_rows);
 }
 
 /// @brief Reproduces 'SUBROUTINE FSILS_SPARMULSV(lhs, rowPtr, colPtr, dof, K, U, KU)'. 
@@ -36,65 +78,15 @@ void fsils_spar_mul_ss(FSILS_lhsType& lhs, const Array<int>& rowPtr, const Vecto
 void fsils_spar_mul_sv(FSILS_lhsType& lhs, const Array<int>& rowPtr, const Vector<int>& colPtr, 
     const int dof, const Array<double>& K, const Vector<double>& U, Array<double>& KU)
 {
-  int nNo = lhs.nNo;
   KU = 0.0;
 
-  switch (dof) {
-
-    case 1:
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          KU(0,i) = KU(0,i) + K(0,j)*U(colPtr(j));
-        }
-      }
-    break; 
-
-    case 2: {
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          int col = colPtr(j);
-          KU(0,i) = KU(0,i) + K(0,j)*U(col);
-          KU(1,i) = KU(1,i) + K(1,j)*U(col);
-        }
-      }
-
-    } break; 
-
-    case 3: {
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          int col = colPtr(j);
-          KU(0,i) += K(0,j) * U(col);
-          KU(1,i) += K(1,j) * U(col);
-          KU(2,i) += K(2,j) * U(col);
-        }
-      }
-    } break; 
-
-    case 4:
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          int col = colPtr(j);
-          KU(0,i) = KU(0,i) + K(0,j)*U(col);
-          KU(1,i) = KU(1,i) + K(1,j)*U(col);
-          KU(2,i) = KU(2,i) + K(2,j)*U(col);
-          KU(3,i) = KU(3,i) + K(3,j)*U(col);
-        }
-      }
-    break; 
-
-    default: 
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          int col = colPtr(j);
-          for (int m = 0; m < KU.nrows(); m++) {
-            KU(m,i) = KU(m,i) + K(m,j) * U(col);
-          }
-        }
-      }
-  } 
-
-  fsils_commuv(lhs, dof, KU);
+  auto mul_rows = [&](const int s, const int e) {
+    bsr::dispatch(dof, [&](auto DOF) { 
+      bsr::mul_rows_sv<DOF()>(rowPtr, colPtr, dof, K, U, KU, s, e); 
+    });
+  };
+
+  mul_rows_commuv(lhs, dof, KU, mul_rows);
 }
 
 /// @brief Reproduces 'SUBROUTINE FSILS_SPARMULVS(lhs, rowPtr, colPtr, dof, K, U, KU)'.
@@ -102,61 +94,15 @@ void fsils_spar_mul_sv(FSILS_lhsType& lhs, const Array<int>& rowPtr, const Vecto
 void fsils_spar_mul_vs(FSILS_lhsType& lhs, const Array<int>& rowPtr, const Vector<int>& colPtr, 
     const int dof, const Array<double>& K, const Array<double>& U, Vector<double>& KU)
 {
-  int nNo = lhs.nNo;
   KU = 0.0;
 
-  switch (dof) {
-
-    case 1:
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          KU(i) = KU(i) + K(0,j) * U(0,colPtr(j));
-        }
-      }
-    break; 
-
-    case 2:
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          int col = colPtr(j);
-          KU(i) = KU(i) + K(0,j)*U(0,col) + K(1,j)*U(1,col);
-        }
-      }
-    break; 
-
-    case 3:
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          int col = colPtr(j);
-          KU(i) = KU(i) + K(0,j)*U(0,col) + K(1,j)*U(1,col) + K(2,j)*U(2,col);
-        }
-      }
-    break; 
-
-    case 4:
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          int col = colPtr(j);
-          KU(i) = KU(i) + K(0,j)*U(0,col) + K(1,j)*U(1,col) + K(2,j)*U(2,col) + K(3,j)*U(3,col);
-        }
-      }
-    break; 
-
-    default: 
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          int col = colPtr(j);
-          double sum = 0.0;
-          for (int m = 0; m < K.nrows(); m++) {
-            sum += K(m,j) * U(m,col);
-          }
-          KU(i) = KU(i) + sum; 
-          //KU(i) = KU(i) + SUM(K(:,j)*U(:,colPtr(j)))
-        }
-     }
-  } 
-
-  fsils_commus(lhs, KU);
+  auto mul_rows = [&](const int s, const int e) {
+    bsr::dispatch(dof, [&](auto DOF) { 
+      bsr::mul_rows_vs<DOF()>(rowPtr, colPtr, dof, K, U, KU, s, e); 
+    });
+  };
+
+  mul_rows_commus(lhs, KU, mul_rows);
 }
 
 /// @brief Reproduces 'SUBROUTINE FSILS_SPARMULVV(lhs, rowPtr, colPtr, dof, K, U, KU)'. 
@@ -164,70 +110,15 @@ void fsils_spar_mul_vs(FSILS_lhsType& lhs, const Array<int>& rowPtr, const Vecto
 void fsils_spar_mul_vv(FSILS_lhsType& lhs, const Array<int>& rowPtr, const Vector<int>& colPtr, 
     const int dof, const Array<double>& K, const Array<double>& U, Array<double>& KU)
 {
-  int nNo = lhs.nNo;
   KU = 0.0;
 
-  switch (dof) {
-
-    case 1:
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          KU(0,i) = KU(0,i) + K(0,j)*U(0,colPtr(j));
-        }
-      }
-    break;
-
-    case 2:
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          int col = colPtr(j);
-          KU(0,i) = KU(0,i) + K(0,j)*U(0,col) + K(1,j)*U(1,col);
-          KU(1,i) = KU(1,i) + K(2,j)*U(0,col) + K(3,j)*U(1,col);
-        }
-      }
-    break;
-
-    case 3:
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          int col = colPtr(j);
-          KU(0,i) = KU(0,i) + K(0,j)*U(0,col) + K(1,j)*U(1,col) + K(2,j)*U(2,col);
-          KU(1,i) = KU(1,i) + K(3,j)*U(0,col) + K(4,j)*U(1,col) + K(5,j)*U(2,col);
-          KU(2,i) = KU(2,i) + K(6,j)*U(0,col) + K(7,j)*U(1,col) + K(8,j)*U(2,col);
-        }
-      }
-    break;
-
-    case 4:
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          int col = colPtr(j);
-          KU(0,i) = KU(0,i) + K(0 ,j)*U(0,col) + K(1 ,j)*U(1,col) + K(2 ,j)*U(2,col) + K(3 ,j)*U(3,col);
-          KU(1,i) = KU(1,i) + K(4 ,j)*U(0,col) + K(5 ,j)*U(1,col) + K(6 ,j)*U(2,col) + K(7 ,j)*U(3,col);
-          KU(2,i) = KU(2,i) + K(8 ,j)*U(0,col) + K(9,j)*U(1,col) + K(10,j)*U(2,col) + K(11,j)*U(3,col);
-          KU(3,i) = KU(3,i) + K(12,j)*U(0,col) + K(13,j)*U(1,col) + K(14,j)*U(2,col) + K(15,j)*U(3,col);
-        }
-      }
-    break;
-
-    default: 
-      for (int i = 0; i < nNo; i++) {
-        for (int j = rowPtr(0,i); j <= rowPtr(1,i); j++) {
-          int col = colPtr(j);
-          for (int l = 0; l < dof; l++) {
-            int e = l*dof;
-            int s = e - dof + 1;;
-            double sum = 0.0;
-            for (int k = 0; k < dof; k++) {
-              sum += K(k+s,j) * U(k,col);
-            }
-            KU(l,i) = KU(l,i) + sum;
-          }
-        }
-     }
-  } 
-
-  fsils_commuv(lhs, dof, KU);
+  auto mul_rows = [&](const int s, const int e) {
+    bsr::dispatch(dof, [&](auto DOF) { 
+      bsr::mul_rows<DOF()>(rowPtr, colPtr, dof, K, U, KU, s, e); 
+    });
+  };
+
+  mul_rows_commuv(lhs, dof, KU, mul_rows);
 }
 
 };
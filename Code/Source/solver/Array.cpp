@@ -9,19 +9,22 @@ template<>
 bool Array<bool>::show_index_check_message = true;
 
 template<>
-int Array<bool>::id = 0;
+std::atomic<int> Array<bool>::id{0};
 
 template<>
-double Array<bool>::memory_in_use = 0;
+std::atomic<long> Array<bool>::memory_in_use{0};
 
 template<>
-double Array<bool>::memory_returned = 0;
+std::atomic<long> Array<bool>::memory_returned{0};
 
 template<>
-int Array<bool>::num_allocated = 0;
+std::atomic<int> Array<bool>::num_allocated{0};
 
 template<>
-int Array<bool>::active = 0;
+std::atomic<int> Array<bool>::active{0};
+
+template<>
+std::atomic<long> Array<bool>::num_data_allocations{0};
 
 template<>
 bool Array<bool>::write_enabled = false;
@@ -32,19 +35,22 @@ template<>
 bool Array<double>::show_index_check_message = true;
 
 template<>
-int Array<double>::id = 0;
+std::atomic<int> Array<double>::id{0};
+
+template<>
+std::atomic<long> Array<double>::memory_in_use{0};
 
 template<>
-double Array<double>::memory_in_use = 0;
+std::atomic<long> Array<double>::memory_returned{0};
 
 template<>
-double Array<double>::memory_returned = 0;
+std::atomic<int> Array<double>::num_allocated{0};
 
 template<>
-int Array<double>::num_allocated = 0;
+std::atomic<int> Array<double>::active{0};
 
 template<>
-int Array<double>::active = 0;
+std::atomic<long> Array<double>::num_data_allocations{0};
 
 template<>
 void Array<double>::memory(const std::string& prefix)
@@ -67,19 +73,22 @@ template<>
 bool Array<int>::show_index_check_message = true;
 
 template<>
-int Array<int>::id = 0;
+std::atomic<int> Array<int>::id{0};
+
+template<>
+std::atomic<long> Array<int>::memory_in_use{0};
 
 template<>
-double Array<int>::memory_in_use = 0;
+std::atomic<long> Array<int>::memory_returned{0};
 
 template<>
-double Array<int>::memory_returned = 0;
+std::atomic<int> Array<int>::num_allocated{0};
 
 template<>
-int Array<int>::num_allocated = 0;
+std::atomic<int> Array<int>::active{0};
 
 template<>
-int Array<int>::active = 0;
+std::atomic<long> Array<int>::num_data_allocations{0};
 
 template<>
 void Array<int>::memory(const std::string& prefix)
@@ -9,6 +9,7 @@
 
 #include <algorithm>
 #include <array>
+#include <atomic>
 #include <cstring>
 #include <float.h>
 #include <iostream>
@@ -27,16 +28,20 @@ template<typename T>
 class Array 
 {
   public:
-    // Some variables used to monitor Array object allocation.
-    static int id;
-    static int num_allocated;
-    static int active;
+    // Some variables used to monitor Array object allocation, atomic since
+    // arrays may be allocated inside OpenMP parallel regions.
+    static std::atomic<int> id;
+    static std::atomic<int> num_allocated;
+    static std::atomic<int> active;
     static bool show_index_check_message;
-    static double memory_in_use;
-    static double memory_returned;
+    static std::atomic<long> memory_in_use;
+    static std::atomic<long> memory_returned;
     static void memory(const std::string& prefix="");
     static void stats(const std::string& prefix="");
     static bool write_enabled;
+    /// @brief Number of times memory has been allocated for array data. 
+    /// This is used to check that a section of code does not allocate memory.
+    static std::atomic<long> num_data_allocations;
 
     Array() 
     {
@@ -934,6 +939,7 @@ class Array
       if (size_ != 0) {
         data_ = new T [size_];
         memset(data_, 0, sizeof(T)*size_);
+        num_data_allocations += 1;
       }
     }
 
@@ -8,16 +8,19 @@ template<>
 bool Array3<double>::show_index_check_message = true;
 
 template<>
-double Array3<double>::memory_in_use = 0;
+std::atomic<long> Array3<double>::memory_in_use{0};
 
 template<>
-double Array3<double>::memory_returned = 0;
+std::atomic<long> Array3<double>::memory_returned{0};
 
 template<>
-int Array3<double>::num_allocated = 0;
+std::atomic<int> Array3<double>::num_allocated{0};
 
 template<>
-int Array3<double>::active = 0;
+std::atomic<int> Array3<double>::active{0};
+
+template<>
+std::atomic<long> Array3<double>::num_data_allocations{0};
 
 template<>
 bool Array3<double>::write_enabled = false;
@@ -42,16 +45,19 @@ template<>
 bool Array3<int>::show_index_check_message = true;
 
 template<>
-double Array3<int>::memory_in_use = 0;
+std::atomic<long> Array3<int>::memory_in_use{0};
+
+template<>
+std::atomic<long> Array3<int>::memory_returned{0};
 
 template<>
-double Array3<int>::memory_returned = 0;
+std::atomic<int> Array3<int>::num_allocated{0};
 
 template<>
-int Array3<int>::num_allocated = 0;
+std::atomic<int> Array3<int>::active{0};
 
 template<>
-int Array3<int>::active = 0;
+std::atomic<long> Array3<int>::num_data_allocations{0};
 
 template<>
 bool Array3<int>::write_enabled = false;
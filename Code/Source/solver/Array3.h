@@ -25,14 +25,17 @@ class Array3
 {
   public:
 
-    static int num_allocated;
-    static int active;
+    static std::atomic<int> num_allocated;
+    static std::atomic<int> active;
     static bool show_index_check_message;
-    static double memory_in_use;
-    static double memory_returned;
+    static std::atomic<long> memory_in_use;
+    static std::atomic<long> memory_returned;
     static bool write_enabled;
     static void memory(const std::string& prefix="");
     static void stats(const std::string& prefix="");
+    /// @brief Number of times memory has been allocated for array data. 
+    /// This is used to check that a section of code does not allocate memory.
+    static std::atomic<long> num_data_allocations;
 
     Array3() 
     {
@@ -101,6 +104,7 @@ class Array3
       data_ = new T [size_];
       memset(data_, 0, sizeof(T)*size_);
       memory_in_use += sizeof(T) * size_;;
+      num_data_allocations += 1;
     }
 
     void check_index(const int i, const int j, const int k) const
@@ -0,0 +1,106 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#include "AssemblyWorkspace.h"
+
+#include "fs.h"
+
+/// @brief Get the workspace of the calling thread.
+//
+AssemblyWorkspace& AssemblyWorkspace::get()
+{
+  static thread_local AssemblyWorkspace workspace;
+  return workspace;
+}
+
+/// @brief Set the size of the element arrays for elements with 'eNoN' nodes
+/// and 'nFn' fiber directions.
+///
+/// All arrays are set to zero, as if they had just been allocated.
+//
+void AssemblyWorkspace::set_element_arrays(const ComMod& com_mod, const int eNoN, const int nFn)
+{
+  const int nsd = com_mod.nsd;
+  const int tDof = com_mod.tDof;
+  const int dof = com_mod.dof;
+  const int nsymd = com_mod.nsymd;
+
+  set_size(ptr, eNoN);
+  set_size(N, eNoN);
+  set_size(ya_l, eNoN);
+  set_size(pSl, nsymd);
+  set_size(distSrf, com_mod.nUris);
+
+  set_size(xl, nsd, eNoN);
+  set_size(al, tDof, eNoN);
+  set_size(yl, tDof, eNoN);
+  set_size(dl, tDof, eNoN);
+  set_size(bfl, nsd, eNoN);
+  set_size(fN, nsd, nFn);
+  set_size(pS0l, nsymd, eNoN);
+  set_size(vwpl, 2, eNoN);
+  set_size(Nx, nsd, eNoN);
+  set_size(ksix, nsd, nsd);
+  set_size(lR, dof, eNoN);
+
+  set_size(lK, dof*dof, eNoN, eNoN);
+  set_size(lKd, dof*nsd, eNoN, eNoN);
+}
+
+/// @brief Set the size of the element coordinate and shape function
+/// derivative arrays for the Taylor-Hood function spaces fs_1.
+///
+/// The function spaces must have been set using set_thood_fs().
+//
+void AssemblyWorkspace::set_thood_arrays(const ComMod& com_mod)
+{
+  const int nsd = com_mod.nsd;
+  const int nsymd = com_mod.nsymd;
+
+  set_size(xwl, nsd, fs_1[0].eNoN);
+  set_size(Nwx, nsd, fs_1[0].eNoN);
+  set_size(Nwxx, nsymd, fs_1[0].eNoN);
+  set_size(xql, nsd, fs_1[1].eNoN);
+  set_size(Nqx, nsd, fs_1[1].eNoN);
+}
+
+/// @brief Set the Taylor-Hood function spaces for velocity and pressure
+/// for the first (fs_1) and second (fs_2) Gauss integration of the elements
+/// of mesh 'lM'.
+///
+/// The function spaces do not depend on the element so they are set once
+/// before an element loop.
+//
+void AssemblyWorkspace::set_thood_fs(ComMod& com_mod, const mshType& lM, const bool lStab)
+{
+  fs::get_thood_fs(com_mod, fs_1, lM, lStab, 1);
+  fs::get_thood_fs(com_mod, fs_2, lM, lStab, 2);
+}
+
+template<typename T>
+void AssemblyWorkspace::set_size(Vector<T>& vector, const int size)
+{
+  if (vector.size() != size) {
+    vector.resize(size);
+  }
+  vector = 0;
+}
+
+template<typename T>
+void AssemblyWorkspace::set_size(Array<T>& array, const int num_rows, const int num_cols)
+{
+  if ((array.nrows() != num_rows) || (array.ncols() != num_cols)) {
+    array.resize(num_rows, num_cols);
+  }
+  array = 0;
+}
+
+template<typename T>
+void AssemblyWorkspace::set_size(Array3<T>& array, const int num_rows, const int num_cols, const int num_slices)
+{
+  if ((array.nrows() != num_rows) || (array.ncols() != num_cols) || (array.nslices() != num_slices)) {
+    array.resize(num_rows, num_cols, num_slices);
+  }
+  array = 0;
+}
+
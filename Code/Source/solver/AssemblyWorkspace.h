@@ -0,0 +1,56 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#ifndef ASSEMBLY_WORKSPACE_H
+#define ASSEMBLY_WORKSPACE_H
+
+#include "ComMod.h"
+
+#include <array>
+
+/// @brief The AssemblyWorkspace class stores the scratch arrays used by the
+/// construct_* routines to compute and assemble element arrays.
+///
+/// Arrays are sized once before an element loop and are only reallocated
+/// when their sizes change so the element loops do not allocate memory.
+/// Each thread has its own workspace returned by AssemblyWorkspace::get().
+///
+/// Array names are those used by the construct_* routines
+///
+///   ptr - element node IDs
+///   xl, al, yl, dl - element coordinates, acceleration, velocity and displacement
+///   bfl - element body force
+///   lR, lK, lKd - element residual and tangent matrices
+///   fs_1, fs_2 - Taylor-Hood function spaces for the two Gauss integrations
+//
+class AssemblyWorkspace {
+
+  public:
+    static AssemblyWorkspace& get();
+
+    void set_element_arrays(const ComMod& com_mod, const int eNoN, const int nFn=1);
+    void set_thood_arrays(const ComMod& com_mod);
+    void set_thood_fs(ComMod& com_mod, const mshType& lM, const bool lStab);
+
+    Vector<int> ptr;
+    Vector<double> N, pSl, ya_l, distSrf;
+
+    Array<double> xl, al, yl, dl, bfl, fN, pS0l, vwpl, Nx, ksix, lR;
+    Array3<double> lK, lKd;
+
+    Array<double> xwl, Nwx, Nwxx, xql, Nqx;
+    std::array<fsType,2> fs_1, fs_2;
+
+  private:
+    template<typename T>
+    static void set_size(Vector<T>& vector, const int size);
+
+    template<typename T>
+    static void set_size(Array<T>& array, const int num_rows, const int num_cols);
+
+    template<typename T>
+    static void set_size(Array3<T>& array, const int num_rows, const int num_cols, const int num_slices);
+};
+
+#endif
+
@@ -0,0 +1,92 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#include "CepLookupTable.h"
+
+#include <algorithm>
+#include <cmath>
+#include <stdexcept>
+#include <string>
+
+/// @brief Tabulate 'num_functions' functions at the membrane potentials
+///
+///   v_min + k * resolution,  k = 0, 1, ...
+///
+/// up to and including the first potential not less than v_max.
+//
+void CepLookupTable::build(const double v_min, const double v_max, const double resolution, const int num_functions,
+    const Function& evaluate)
+{
+  if ((resolution <= 0.0) || (v_max <= v_min) || (num_functions <= 0)) {
+    throw std::runtime_error("[CepLookupTable] Invalid lookup table range [" + std::to_string(v_min) + "," +
+        std::to_string(v_max) + "] or resolution " + std::to_string(resolution) + ".");
+  }
+
+  clear();
+
+  int num_intervals = static_cast<int>(std::ceil((v_max - v_min) / resolution));
+  num_points_ = num_intervals + 1;
+  num_functions_ = num_functions;
+  v_min_ = v_min;
+  resolution_ = resolution;
+  inv_resolution_ = 1.0 / resolution;
+  max_index_ = static_cast<double>(num_intervals);
+
+  values_.resize(static_cast<size_t>(num_points_) * num_functions_);
+
+  for (int k = 0; k < num_points_; k++) {
+    evaluate(v_min_ + k * resolution_, &values_[static_cast<size_t>(k) * num_functions_]);
+  }
+}
+
+void CepLookupTable::clear()
+{
+  v_min_ = 0.0;
+  resolution_ = 0.0;
+  inv_resolution_ = 0.0;
+  max_index_ = 0.0;
+  num_functions_ = 0;
+  num_points_ = 0;
+  values_.clear();
+}
+
+/// @brief Return the maximum error of the interpolated values of each
+/// function.
+///
+/// The error is computed at four points within each interval of the table.
+/// It is relative to the maximum magnitude of the function if this is
+/// larger than one.
+//
+std::vector<double> CepLookupTable::max_error(const Function& evaluate) const
+{
+  const int num_samples = 4;
+  std::vector<double> max_diff(num_functions_, 0.0);
+  std::vector<double> max_value(num_functions_, 1.0);
+  std::vector<double> exact(num_functions_);
+  std::vector<double> interp(num_functions_);
+
+  for (int k = 0; k < num_points_ - 1; k++) {
+    for (int s = 0; s < num_samples; s++) {
+      double v = v_min_ + (k + (s + 0.5) / num_samples) * resolution_;
+      evaluate(v, exact.data());
+
+      if (!interpolate(v, interp.data())) {
+        continue;
+      }
+
+      for (int n = 0; n < num_functions_; n++) {
+        if (!std::isfinite(exact[n])) {
+          continue;
+        }
+        max_diff[n] = std::max(max_diff[n], std::fabs(interp[n] - exact[n]));
+        max_value[n] = std::max(max_value[n], std::fabs(exact[n]));
+      }
+    }
+  }
+
+  for (int n = 0; n < num_functions_; n++) {
+    max_diff[n] /= max_value[n];
+  }
+
+  return max_diff;
+}
@@ -0,0 +1,75 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#ifndef CEP_LOOKUP_TABLE_H
+#define CEP_LOOKUP_TABLE_H
+
+#include <functional>
+#include <vector>
+
+/// @brief The CepLookupTable class stores the values of a set of functions
+/// of the membrane potential at equally spaced points.
+///
+/// Ionic models use lookup tables to replace the evaluation of exponential
+/// rate functions by a linear interpolation between the two nearest points.
+//
+class CepLookupTable {
+  public:
+    /// @brief Evaluate the functions for a membrane potential, evaluate(v, values).
+    using Function = std::function<void(const double, double[])>;
+
+    CepLookupTable() {}
+
+    void build(const double v_min, const double v_max, const double resolution, const int num_functions,
+        const Function& evaluate);
+    void clear();
+
+    /// @brief Set values[0:num_functions) to the interpolated function values
+    /// at 'v'. Returns false if the table is not built or 'v' is outside of
+    /// the table.
+    //
+    bool interpolate(const double v, double values[]) const
+    {
+      double x = (v - v_min_) * inv_resolution_;
+
+      // This is also false for NaN.
+      if (!(x >= 0.0 && x < max_index_)) {
+        return false;
+      }
+
+      int k = static_cast<int>(x);
+      double w = x - k;
+      const double* values_0 = &values_[k * num_functions_];
+      const double* values_1 = values_0 + num_functions_;
+
+      for (int n = 0; n < num_functions_; n++) {
+        values[n] = values_0[n] + w * (values_1[n] - values_0[n]);
+      }
+
+      return true;
+    }
+
+    std::vector<double> max_error(const Function& evaluate) const;
+
+    bool is_built() const { return num_points_ > 0; }
+    int num_functions() const { return num_functions_; }
+    int num_points() const { return num_points_; }
+    double resolution() const { return resolution_; }
+
+  private:
+    double v_min_ = 0.0;
+    double resolution_ = 0.0;
+    double inv_resolution_ = 0.0;
+
+    // The largest interpolation coordinate, 0 if the table is not built.
+    double max_index_ = 0.0;
+
+    int num_functions_ = 0;
+    int num_points_ = 0;
+
+    // The function values stored as a (num_functions, num_points) column-major array.
+    std::vector<double> values_;
+};
+
+#endif
+
@@ -28,7 +28,13 @@ const std::map<std::string,TimeIntegratioType> cep_time_int_to_type
 
   {"rk", TimeIntegratioType::RK4},
   {"rk4", TimeIntegratioType::RK4},
-  {"runge", TimeIntegratioType::RK4}
+  {"runge", TimeIntegratioType::RK4},
+
+  {"rl", TimeIntegratioType::RL},
+  {"rush-larsen", TimeIntegratioType::RL},
+
+  {"adaptive", TimeIntegratioType::RL_ADAPTIVE},
+  {"rl-adaptive", TimeIntegratioType::RL_ADAPTIVE}
 
 };
 
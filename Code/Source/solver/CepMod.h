@@ -51,7 +51,9 @@ enum class TimeIntegratioType {
   NA = 200, 
   FE = 201,
   RK4 = 202, 
-  CN2 = 203
+  CN2 = 203,
+  RL = 204,
+  RL_ADAPTIVE = 205
 };
 
 extern const std::map<std::string,TimeIntegratioType> cep_time_int_to_type;
@@ -63,6 +65,8 @@ static std::ostream &operator << ( std::ostream& strm, TimeIntegratioType type)
     {TimeIntegratioType::FE, "FE"}, 
     {TimeIntegratioType::RK4, "RK4"}, 
     {TimeIntegratioType::CN2, "CN2"}, 
+    {TimeIntegratioType::RL, "RL"},
+    {TimeIntegratioType::RL_ADAPTIVE, "RL_ADAPTIVE"},
   };
   return strm << names.at(type);
 }
@@ -84,6 +88,12 @@ class odeType {
 
     /// @brief Relative tolerance
     double relTol = 1.E-4;
+
+    /// @brief Max. change in membrane potential over an adaptive time step
+    double dVmax = 1.0;
+
+    /// @brief Min. adaptive time step
+    double dtMin = 1.E-3;
 };
 
 /// @brief External stimulus type
@@ -165,6 +175,13 @@ class cepModelType
 
     /// @brief  Time integration options
     odeType odes;
+
+    /// @brief  Membrane potential spacing of the ionic model lookup tables,
+    /// lookup tables are not used if 0
+    double lutResolution = 0.0;
+
+    /// @brief  Report the errors of the lookup tables
+    bool lutValidate = false;
 };
 
 /// @brief Cardiac electromechanics model type
@@ -72,10 +72,15 @@ void CepModBo::getf(const int zone_id, const int n, const Vector<double>& X, Vec
   double H_umv = step(u - thetam_v[i]);
   double H_uo = step(u - theta_o[i]);
 
+  // Functions of u interpolated from the lookup table
+  double lut[LUT_NUM_FUNCTIONS];
+  bool use_lut = lookup_table.interpolate(u, lut);
+  const double* zone_lut = lut + 3*i;
+
   // Define additional constants
   double taum_v = (1.0-H_umv)*taum_v1[i] + H_umv*taum_v2[i];
-  double taum_w = taum_w1[i] + 0.5*(taum_w2[i]-taum_w1[i])* (1.0 + tanh(km_w[i]*(u-um_w[i])));
-  double tau_so = tau_so1[i] + 0.5*(tau_so2[i]-tau_so1[i])* (1.0 + tanh(k_so[i]*(u-u_so[i])));
+  double taum_w = use_lut ? zone_lut[0] : taum_w1[i] + 0.5*(taum_w2[i]-taum_w1[i])* (1.0 + tanh(km_w[i]*(u-um_w[i])));
+  double tau_so = use_lut ? zone_lut[1] : tau_so1[i] + 0.5*(tau_so2[i]-tau_so1[i])* (1.0 + tanh(k_so[i]*(u-u_so[i])));
   double tau_s  = (1.0-H_uw)*tau_s1[i] + H_uw*tau_s2[i];
   double tau_o  = (1.0-H_uo)*tau_o1[i] + H_uo*tau_o2[i];
   double v_inf  = (1.0-H_umv);
@@ -92,7 +97,8 @@ void CepModBo::getf(const int zone_id, const int n, const Vector<double>& X, Vec
 
   f(2) = (1.0-H_uw)*(w_inf-w)/taum_w - H_uw*w/taup_w[i];
 
-  f(3) = (0.5*(1.0 + tanh(k_s[i]*(u-u_s[i])))-s)/tau_s;
+  double s_inf = use_lut ? zone_lut[2] : 0.5*(1.0 + tanh(k_s[i]*(u-u_s[i])));
+  f(3) = (s_inf-s)/tau_s;
 
   RPAR(2) = I_fi;
   RPAR(3) = I_so;
@@ -158,6 +164,44 @@ void CepModBo::getj(const int i, const int n, const Vector<double>& X, Array<dou
   JAC(3,3) = -n3;
 }
 
+/// @brief Compute the steady-state values and time constants of the v, w
+/// and s gating variables for the scaled membrane potential 'u'.
+///
+/// The gating equations in getf() are written as dg/dt = (g_inf - g) / g_tau.
+//
+void CepModBo::gating_rates(const int zone_id, const double u, double g_inf[3], double g_tau[3]) const
+{
+  int i = zone_id - 1;
+
+  double H_uv = step(u - theta_v[i]);
+  double H_uw = step(u - theta_w[i]);
+  double H_umv = step(u - thetam_v[i]);
+  double H_uo = step(u - theta_o[i]);
+
+  double lut[LUT_NUM_FUNCTIONS];
+  bool use_lut = lookup_table.interpolate(u, lut);
+  const double* zone_lut = lut + 3*i;
+
+  if (H_uv == 0.0) {
+    g_inf[0] = 1.0 - H_umv;
+    g_tau[0] = (1.0-H_umv)*taum_v1[i] + H_umv*taum_v2[i];
+  } else {
+    g_inf[0] = 0.0;
+    g_tau[0] = taup_v[i];
+  }
+
+  if (H_uw == 0.0) {
+    g_inf[1] = (1.0-H_uo)*(1.0 - u/tau_winf[i]) + H_uo*ws_inf[i];
+    g_tau[1] = use_lut ? zone_lut[0] : taum_w1[i] + 0.5*(taum_w2[i]-taum_w1[i])* (1.0 + tanh(km_w[i]*(u-um_w[i])));
+  } else {
+    g_inf[1] = 0.0;
+    g_tau[1] = taup_w[i];
+  }
+
+  g_inf[2] = use_lut ? zone_lut[2] : 0.5*(1.0 + tanh(k_s[i]*(u-u_s[i])));
+  g_tau[2] = (1.0-H_uw)*tau_s1[i] + H_uw*tau_s2[i];
+}
+
 void CepModBo::init(const int nX, Vector<double> &X)
 {
   X(0) = Voffset;
@@ -166,6 +210,15 @@ void CepModBo::init(const int nX, Vector<double> &X)
   X(3) = 0.0;
 }
 
+/// @brief Build the lookup table of the functions of the scaled membrane
+/// potential with a spacing of 'resolution' (mV).
+//
+void CepModBo::init_lookup_table(const double resolution)
+{
+  lookup_table.build((lookup_table_vmin - Voffset) / Vscale, (lookup_table_vmax - Voffset) / Vscale, resolution / Vscale,
+      LUT_NUM_FUNCTIONS, [this](const double u, double values[]) { lookup_table_functions(u, values); });
+}
+
 void CepModBo::integ_cn2(const int imyo, const int nX, Vector<double>& Xn, const double Ts, const double Ti, 
     const double Istim, const double Ksac, Vector<int>& IPAR, Vector<double>& RPAR)
 {
@@ -292,7 +345,60 @@ void CepModBo::integ_rk(const int imyo, const int nX, Vector<double>& X, const d
 
 }
 
-double CepModBo::step(const double r)
+/// @brief Time integration using the Rush-Larsen method.
+///
+/// The membrane potential is integrated using forward Euler and the gating
+/// variables using the exact solution of their linear equations for a
+/// frozen membrane potential, which is stable for large time steps.
+//
+void CepModBo::integ_rl(const int imyo, const int nX, Vector<double>& X, const double Ts, const double Ti,
+    const double Istim, const double Ksac, Vector<double>& RPAR)
+{
+  double dt = Ti / Tscale;
+
+  double Isac = Ksac * (Vrest - X(0));
+  double fext = (Istim + Isac) * Tscale / Vscale;
+
+  X(0) = (X(0) - Voffset) / Vscale;
+
+  Vector<double> f(nX);
+  getf(imyo, nX, X, f, fext, RPAR);
+
+  double g_inf[3], g_tau[3];
+  gating_rates(imyo, X(0), g_inf, g_tau);
+
+  for (int k = 0; k < 3; k++) {
+    X(k+1) = g_inf[k] + (X(k+1) - g_inf[k]) * exp(-dt/g_tau[k]);
+  }
+
+  X(0) = X(0) + dt*f(0);
+  X(0) = X(0)*Vscale + Voffset;
+}
+
+/// @brief Return the maximum errors of the functions interpolated from
+/// lookup_table, see CepLookupTable::max_error().
+//
+std::vector<double> CepModBo::lookup_table_errors() const
+{
+  return lookup_table.max_error([this](const double u, double values[]) { lookup_table_functions(u, values); });
+}
+
+/// @brief Compute the functions of the scaled membrane potential u stored
+/// in lookup_table.
+///
+/// values[3*i], values[3*i+1] and values[3*i+2] are taum_w, tau_so and the
+/// steady-state value of s for myocardium zone i+1.
+//
+void CepModBo::lookup_table_functions(const double u, double values[]) const
+{
+  for (int i = 0; i < 3; i++) {
+    values[3*i] = taum_w1[i] + 0.5*(taum_w2[i]-taum_w1[i])* (1.0 + tanh(km_w[i]*(u-um_w[i])));
+    values[3*i+1] = tau_so1[i] + 0.5*(tau_so2[i]-tau_so1[i])* (1.0 + tanh(k_so[i]*(u-u_so[i])));
+    values[3*i+2] = 0.5*(1.0 + tanh(k_s[i]*(u-u_s[i])));
+  }
+}
+
+double CepModBo::step(const double r) const
 {
   double result;
 
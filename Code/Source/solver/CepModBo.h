@@ -5,6 +5,7 @@
 #define CEP_MOD_BO_H 
 
 #include "Array.h"
+#include "CepLookupTable.h"
 #include "Vector.h"
 #include <array>
 
@@ -107,6 +108,15 @@ class CepModBo
     /// rho: Cellular resistivity
     double rho = 1.0;
 
+    // Lookup table of the functions of the scaled membrane potential u:
+    // taum_w, tau_so and the steady-state value of s for each of the three
+    // myocardium zones.
+    static constexpr int LUT_NUM_FUNCTIONS = 9;
+    /// Membrane potential range of the lookup table (mV)
+    double lookup_table_vmin = -150.0;
+    double lookup_table_vmax = 100.0;
+    CepLookupTable lookup_table;
+
     void actv_strn(const double c, const double I4f, const double dt, double& gf);
     void actv_strs(const double X, const double dt, double& Tact, double& epsX);
 
@@ -115,9 +125,13 @@ class CepModBo
     void getf(const int i, const int n, const Vector<double>& X, Vector<double>& f, const double fext, 
         Vector<double>& RPAR);
     void getj(const int i, const int n, const Vector<double>& X, Array<double>& JAC);
+
+    void gating_rates(const int zone_id, const double u, double g_inf[3], double g_tau[3]) const;
               
     void init(const int nX, Vector<double> &X);
 
+    void init_lookup_table(const double resolution);
+
     void integ_cn2(const int imyo, const int nX, Vector<double>& X, const double Ts, const double Ti,
         const double Istim, const double Ksac, Vector<int>& IPAR, Vector<double>& RPAR);
 
@@ -127,7 +141,14 @@ class CepModBo
     void integ_rk(const int imyo, const int nX, Vector<double>& X, const double Ts, const double Ti,
         const double Istim, const double Ksac, Vector<double>& RPAR);
 
-    double step(const double r);
+    void integ_rl(const int imyo, const int nX, Vector<double>& X, const double Ts, const double Ti,
+        const double Istim, const double Ksac, Vector<double>& RPAR);
+
+    std::vector<double> lookup_table_errors() const;
+
+    void lookup_table_functions(const double u, double values[]) const;
+
+    double step(const double r) const;
 
 };
 
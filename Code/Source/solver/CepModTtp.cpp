@@ -4,6 +4,8 @@
 #include "CepModTtp.h"
 
 #include "mat_fun.h"
+
+#include <algorithm>
 #include <math.h>
 
 CepModTtp::CepModTtp()
@@ -41,6 +43,126 @@ void CepModTtp::actv_strs(const double c_Ca, const double dt, double& Tact, doub
   Tact = nr / (1.0 + epsX*dt);
 }
 
+/// @brief Compute the functions of the membrane potential V stored in
+/// current_table:
+///
+///   values[0] = a / (exp(a) - 1) for I_CaL, a = 2 (V - 15) / RT
+///   values[1] = a exp(a) / (exp(a) - 1) for I_CaL
+///   values[2] = exp(gamma V / RT) for I_NaCa
+///   values[3] = exp((gamma-1) V / RT) for I_NaCa
+///   values[4] = denominator factor of I_NaK
+///   values[5] = denominator of I_pK
+///
+/// The I_CaL factors are tabulated instead of exp(a) because they are smooth
+/// at V = 15 where exp(a) - 1 vanishes.
+//
+void CepModTtp::current_table_functions(const double V, double values[]) const
+{
+  double RT = Rc * Tc / Fc;
+  double a = 2.0*(V-15.)/RT;
+
+  if (fabs(a) < 1.0e-6) {
+    values[0] = 1.0 - 0.5*a;
+    values[1] = 1.0 + 0.5*a;
+  } else {
+    double ea = exp(a);
+    values[0] = a / (ea-1.0);
+    values[1] = a*ea / (ea-1.0);
+  }
+
+  values[2] = exp(gamma*V/RT);
+  values[3] = exp((gamma-1.)*V/RT);
+  values[4] = 1.0 + 0.1245*exp(-0.1*V/RT) + 0.0353*exp(-V/RT);
+  values[5] = 1.0 + exp((25.0-V)/5.98);
+}
+
+/// @brief Compute the functions of the membrane potential V stored in
+/// gate_table.
+///
+/// values[3*g], values[3*g+1] and values[3*g+2] are the steady-state value,
+/// the time constant and the decay factor exp(-dt/tau) of gate 'g'.
+//
+void CepModTtp::gate_table_functions(const double V, const double dt, double values[]) const
+{
+  double a, b, c, tau;
+
+  auto set_gate = [&](const int g, const double g_inf, const double g_tau) {
+    values[3*g] = g_inf;
+    values[3*g+1] = g_tau;
+    values[3*g+2] = exp(-dt/g_tau);
+  };
+
+  // xr1: activation gate for I_Kr
+  a = 450.0/(1.0 + exp(-(45.0+V)/10.0));
+  b = 6.0/(1.0 + exp((30.0+V)/11.50));
+  set_gate(0, 1.0/(1.0 + exp(-(26.0+V)/7.0)), a*b);
+
+  // xr2: inactivation gate for I_Kr
+  a = 3.0 /(1.0 + exp(-(60.0+V)/20.0));
+  b = 1.120/(1.0 + exp(-(60.0-V)/20.0));
+  set_gate(1, 1.0 /(1.0 + exp((88.0+V)/24.0)), a*b);
+
+  // xs: activation gate for I_Ks
+  a = 1400.0/sqrt(1.0 + exp((5.0-V)/6.0));
+  b = 1.0/(1.0 + exp((V-35.0)/15.0));
+  set_gate(2, 1.0/(1.0 + exp(-(5.0+V)/14.0)), a*b + 80.0);
+
+  // m: activation gate for I_Na
+  a = 1.0/(1.0 + exp(-(60.0+V)/5.0));
+  b = 0.10/(1.0 + exp((35.0+V)/5.0)) + 0.10/(1.0 + exp((V-50.0)/200.0));
+  set_gate(3, 1.0 / pow(1.0 + exp(-(56.860+V)/9.030),2.0), a*b);
+
+  // h: fast inactivation gate for I_Na
+  if (V >= -40.0) {
+    a = 0.0;
+    b = 0.770/(0.130*(1.0 + exp(-(10.660+V)/11.10)));
+  } else {
+    a = 5.7E-2*exp(-(80.0+V)/6.80);
+    b = 2.70*exp(0.0790*V) + 310000.0*exp(0.34850*V);
+  }
+  set_gate(4, 1.0 / pow(1.0 + exp((71.550+V)/7.430),2.0), 1.0 / (a + b));
+
+  // j: slow inactivation gate for I_Na
+  if (V >= -40.0) {
+    a = 0.0;
+    b = 0.60*exp(5.7E-2*V) / (1.0 + exp(-0.10*(V+32.0)));
+  } else {
+    a = -(25428.0*exp(0.24440*V) + 6.948E-6*exp(-0.043910*V)) * (V+37.780) / (1.0 + exp(0.3110*(79.230+V)));
+    b = 0.024240*exp(-0.010520*V) / (1.0 + exp(-0.13780*(40.140+V)));
+  }
+  set_gate(5, 1.0/ pow(1.0 + exp((71.550+V)/7.430),2.0), 1.0 / (a + b));
+
+  // d: activation gate for I_CaL
+  a = 1.40/(1.0 + exp(-(35.0+V)/13.0)) + 0.250;
+  b = 1.40/(1.0 + exp((5.0+V)/5.0));
+  c = 1.0/(1.0 + exp((50.0-V)/20.0));
+  set_gate(6, 1.0/(1.0 + exp(-(8.0+V)/7.50)), a*b + c);
+
+  // f: slow inactivation gate for I_CaL
+  a = 1102.50*exp(-pow(V+27.0,2.0) / 225.0);
+  b = 200.0/(1.0 + exp((13.0-V)/10.0));
+  c = 180.0/(1.0 + exp((30.0+V)/10.0)) + 20.0;
+  set_gate(7, 1.0/(1.0 + exp((20.0+V)/7.0)), a + b + c);
+
+  // f2: fast inactivation gate for I_CaL
+  a = 562.0*exp(-pow(27.0+V,2.0) /240.0);
+  b = 31.0/(1.0 + exp((25.0-V)/10.0));
+  c = 80.0/(1.0 + exp((30.0+V)/10.0));
+  set_gate(8, 0.670/(1.0 + exp((35.0+V)/7.0)) + 0.330, a + b + c);
+
+  // s: inactivation gate for I_to, zones 1 and 3
+  tau = 85.0*exp(-pow(V+45.0,2.0) / 320.0) + 5.0/(1.0+exp((V-20.0)/5.0)) + 3.0;
+  set_gate(9, 1.0/(1.0 + exp((20.0+V)/5.0)), tau);
+
+  // s: inactivation gate for I_to, zone 2
+  tau = 1000.0*exp(-pow(V+67.0,2.0) /1000.0) + 8.0;
+  set_gate(10, 1.0/(1.0 + exp((28.0+V)/5.0)), tau);
+
+  // r: activation gate for I_to
+  tau = 9.50*exp(-pow(V+40.0,2.0) / 1800.0) + 0.80;
+  set_gate(11, 1.0/(1.0 + exp((20.0-V)/6.0)), tau);
+}
+
 /// @brief Compute currents and time derivatives of state variables
 ///
 /// Note that is 'i' the myocardium zone id: 1, 2 or 3.
@@ -75,6 +197,10 @@ void CepModTtp::getf(const int i, const int nX, const int nG, const Vector<doubl
   // Stretch-activated currents
   double I_sac = K_sac * (Vrest - V);
 
+  // Functions of V interpolated from the lookup table
+  double lut[LUT_NUM_CURRENT_FUNCTIONS];
+  bool use_lut = current_table.interpolate(V, lut);
+
   // Diff = 1. / (1.0D1 * rho * Cm * sV)
   double RT   = Rc * Tc / Fc;
   double E_K  = RT * log(K_o/K_i);
@@ -108,12 +234,17 @@ void CepModTtp::getf(const int i, const int nX, const int nG, const Vector<doubl
 
   // I_CaL: L-type Ca current
   a = 2.0*(V-15.)/RT;
-  b = 2.0*a*Fc * (0.25*Ca_ss*exp(a) - Ca_o) / (exp(a)-1.0);
+  if (use_lut) {
+    b = 2.0*Fc * (0.25*Ca_ss*lut[1] - Ca_o*lut[0]);
+  } else {
+    double ea = exp(a);
+    b = 2.0*a*Fc * (0.25*Ca_ss*ea - Ca_o) / (ea-1.0);
+  }
   double I_CaL = G_CaL * d * f * f2 * fcass * b;
 
   // I_NaCa: Na-Ca exchanger current
-  e1 = exp(gamma*V/RT);
-  e2 = exp((gamma-1.)*V/RT);
+  e1 = use_lut ? lut[2] : exp(gamma*V/RT);
+  e2 = use_lut ? lut[3] : exp((gamma-1.)*V/RT);
   double n1 = e1*pow(Na_i,3.0)*Ca_o - e2*pow(Na_o,3.0)*Ca_i*alpha;
   double d1 = pow(K_mNai,3.0) + pow(Na_o,3.0);
   double d2 = K_mCa + Ca_o;
@@ -121,19 +252,23 @@ void CepModTtp::getf(const int i, const int nX, const int nG, const Vector<doubl
   I_NaCa = K_NaCa * n1 / (d1*d2*d3);
 
   // I_NaK: Na-K pump current
-  e1 = exp(-0.1*V/RT);
-  e2 = exp(-V/RT);
   n1 = p_NaK * K_o * Na_i;
   d1 = K_o + K_mK;
   d2 = Na_i + K_mNa;
-  d3 = 1.0 + 0.1245*e1 + 0.0353*e2;
+  if (use_lut) {
+    d3 = lut[4];
+  } else {
+    e1 = exp(-0.1*V/RT);
+    e2 = exp(-V/RT);
+    d3 = 1.0 + 0.1245*e1 + 0.0353*e2;
+  }
   double I_NaK = n1 / (d1*d2*d3);
 
   // I_pCa: plateau Ca current
   double I_pCa = G_pCa * Ca_i / (K_pCa + Ca_i);
 
   // I_pK: plateau K current
-  double I_pK  = G_pK * (V-E_K) / (1.0 + exp((25.0-V)/5.98));
+  double I_pK  = G_pK * (V-E_K) / (use_lut ? lut[5] : 1.0 + exp((25.0-V)/5.98));
 
   // I_bCa: background Ca current
   double I_bCa = G_bCa * (V - E_Ca);
@@ -543,6 +678,23 @@ void CepModTtp::init(const int imyo, const int nX, const int nG, Vector<double>&
   }
 }
 
+/// @brief Build the lookup tables of the functions of the membrane
+/// potential with a spacing of 'resolution' [mV].
+///
+/// The gate decay factors are tabulated for the time step 'dt', other time
+/// steps use the tabulated time constants.
+//
+void CepModTtp::init_lookup_tables(const double resolution, const double dt)
+{
+  lookup_table_dt = dt;
+
+  gate_table.build(lookup_table_vmin, lookup_table_vmax, resolution, LUT_NUM_GATE_FUNCTIONS,
+      [this](const double V, double values[]) { gate_table_functions(V, lookup_table_dt, values); });
+
+  current_table.build(lookup_table_vmin, lookup_table_vmax, resolution, LUT_NUM_CURRENT_FUNCTIONS,
+      [this](const double V, double values[]) { current_table_functions(V, values); });
+}
+
 /// @brief Time integration performed using Crank-Nicholson method
 void CepModTtp::integ_cn2(const int imyo, const int nX, const int nG, Vector<double>& Xn, Vector<double>& Xg, 
     const double Ts, const double dt, const double Istim, const double Ksac, Vector<int>& IPAR, Vector<double>& RPAR)
@@ -659,6 +811,32 @@ void CepModTtp::integ_rk(const int imyo, const int nX, const int nG, Vector<doub
   Xg = Xgr;
 }
 
+/// @brief Return the value of gate 'gate' with the current value 'x' after
+/// a time step 'dt' using the values 'lut' interpolated from gate_table.
+//
+double CepModTtp::lookup_gate(const double lut[], const int gate, const double dt, const double x) const
+{
+  const double* values = lut + 3*gate;
+  double decay = (dt == lookup_table_dt) ? values[2] : exp(-dt/values[1]);
+  return values[0] - (values[0] - x)*decay;
+}
+
+/// @brief Return the maximum errors of the functions interpolated from
+/// gate_table followed by those interpolated from current_table, see
+/// CepLookupTable::max_error().
+//
+std::vector<double> CepModTtp::lookup_table_errors() const
+{
+  auto errors = gate_table.max_error(
+      [this](const double V, double values[]) { gate_table_functions(V, lookup_table_dt, values); });
+
+  auto current_errors = current_table.max_error(
+      [this](const double V, double values[]) { current_table_functions(V, values); });
+
+  errors.insert(errors.end(), current_errors.begin(), current_errors.end());
+  return errors;
+}
+
 /// @brief Update all the gating variables
 void CepModTtp::update_g(const int i, const double dt, const int n, const int nG, const Vector<double>& X, Vector<double>& Xg)
 {
@@ -680,6 +858,30 @@ void CepModTtp::update_g(const int i, const double dt, const int n, const int nG
 
   double a, b, c, tau;
 
+  // Gates that depend only on V are interpolated from the lookup table.
+  double lut[LUT_NUM_GATE_FUNCTIONS];
+
+  if (gate_table.interpolate(V, lut)) {
+    Xg(0) = lookup_gate(lut, 0, dt, xr1);
+    Xg(1) = lookup_gate(lut, 1, dt, xr2);
+    Xg(2) = lookup_gate(lut, 2, dt, xs);
+    Xg(3) = lookup_gate(lut, 3, dt, m);
+    Xg(4) = lookup_gate(lut, 4, dt, h);
+    Xg(5) = lookup_gate(lut, 5, dt, j);
+    Xg(6) = lookup_gate(lut, 6, dt, d);
+    Xg(7) = lookup_gate(lut, 7, dt, f);
+    Xg(8) = lookup_gate(lut, 8, dt, f2);
+
+    c = 1.0 / (1.0 + pow(Ca_ss/0.050,2.0));
+    fcassi = 0.60*c  + 0.40;
+    tau = 80.0*c + 2.0;
+    Xg(9) = fcassi - (fcassi - fcass)*exp(-dt/tau);
+
+    Xg(10) = lookup_gate(lut, (i == 2) ? 10 : 9, dt, s);
+    Xg(11) = lookup_gate(lut, 11, dt, r);
+    return;
+  }
+
   // xr1: activation gate for I_Kr
   xr1i = 1.0/(1.0 + exp(-(26.0+V)/7.0));
   a = 450.0/(1.0 + exp(-(45.0+V)/10.0));
@@ -793,3 +995,389 @@ void CepModTtp::update_g(const int i, const double dt, const int n, const int nG
 
 
 
+
+/// @brief Compute the time derivatives of the state variables for a batch of
+/// cells.
+///
+/// This is getf() for the cells of a batch, the currents are not saved.
+//
+void CepModTtp::getf_batch(const int i, const double X[][TTP_BATCH_SIZE], const double Xg[][TTP_BATCH_SIZE],
+    double dX[][TTP_BATCH_SIZE], const double I_stim[], const double K_sac[]) const
+{
+  constexpr int B = TTP_BATCH_SIZE;
+
+  const double RT = Rc * Tc / Fc;
+  const double sq5 = sqrt(K_o/5.4);
+
+  for (int c = 0; c < B; c++) {
+    // Local copies of state variables
+    double V     = X[0][c];
+    double K_i   = X[1][c];
+    double Na_i  = X[2][c];
+    double Ca_i  = X[3][c];
+    double Ca_ss = X[4][c];
+    double Ca_sr = X[5][c];
+    double R_bar = X[6][c];
+
+    // Local copies of gating variables
+    double xr1   = Xg[0][c];
+    double xr2   = Xg[1][c];
+    double xs    = Xg[2][c];
+    double m     = Xg[3][c];
+    double h     = Xg[4][c];
+    double j     = Xg[5][c];
+    double d     = Xg[6][c];
+    double f     = Xg[7][c];
+    double f2    = Xg[8][c];
+    double fcass = Xg[9][c];
+    double s     = Xg[10][c];
+    double r     = Xg[11][c];
+
+    // Stretch-activated currents
+    double I_sac = K_sac[c] * (Vrest - V);
+
+    // Functions of V interpolated from the lookup table
+    double lut[LUT_NUM_CURRENT_FUNCTIONS];
+    bool use_lut = current_table.interpolate(V, lut);
+
+    double E_K  = RT * log(K_o/K_i);
+    double E_Na = RT * log(Na_o/Na_i);
+    double E_Ca = 0.5 * RT * log(Ca_o/Ca_i);
+    double E_Ks = RT * log( (K_o + p_KNa*Na_o)/(K_i + p_KNa*Na_i) );
+
+    // I_Na: Fast sodium current
+    double I_Na = G_Na * pow(m,3.0) * h * j * (V - E_Na);
+
+    // I_to: transient outward current
+    double I_to = G_to[i-1] * r * s * (V - E_K);
+
+    // I_K1: inward rectifier outward current
+    double e1   = exp(0.06*(V - E_K - 200.0));
+    double e2   = exp(2.E-4*(V - E_K + 100.0));
+    double e3   = exp(0.1*(V - E_K - 10.0));
+    double e4   = exp(-0.5*(V - E_K));
+    double a    = 0.1/(1.0 + e1);
+    double b    = (3.0*e2 + e3) / (1.0 + e4);
+    double tau  = a / (a + b);
+    double I_K1 = G_K1 * sq5 * tau * (V - E_K);
+
+    // I_Kr: rapid delayed rectifier current
+    double I_Kr = G_Kr * sq5 * xr1 * xr2 * (V - E_K);
+
+    // I_Ks: slow delayed rectifier current
+    double I_Ks = G_Ks[i-1] * pow(xs,2.0) * (V - E_Ks);
+
+    // I_CaL: L-type Ca current
+    a = 2.0*(V-15.)/RT;
+    if (use_lut) {
+      b = 2.0*Fc * (0.25*Ca_ss*lut[1] - Ca_o*lut[0]);
+    } else {
+      double ea = exp(a);
+      b = 2.0*a*Fc * (0.25*Ca_ss*ea - Ca_o) / (ea-1.0);
+    }
+    double I_CaL = G_CaL * d * f * f2 * fcass * b;
+
+    // I_NaCa: Na-Ca exchanger current
+    e1 = use_lut ? lut[2] : exp(gamma*V/RT);
+    e2 = use_lut ? lut[3] : exp((gamma-1.)*V/RT);
+    double n1 = e1*pow(Na_i,3.0)*Ca_o - e2*pow(Na_o,3.0)*Ca_i*alpha;
+    double d1 = pow(K_mNai,3.0) + pow(Na_o,3.0);
+    double d2 = K_mCa + Ca_o;
+    double d3 = 1.0 + K_sat*e2;
+    double I_NaCa = K_NaCa * n1 / (d1*d2*d3);
+
+    // I_NaK: Na-K pump current
+    n1 = p_NaK * K_o * Na_i;
+    d1 = K_o + K_mK;
+    d2 = Na_i + K_mNa;
+    if (use_lut) {
+      d3 = lut[4];
+    } else {
+      e1 = exp(-0.1*V/RT);
+      e2 = exp(-V/RT);
+      d3 = 1.0 + 0.1245*e1 + 0.0353*e2;
+    }
+    double I_NaK = n1 / (d1*d2*d3);
+
+    // I_pCa: plateau Ca current
+    double I_pCa = G_pCa * Ca_i / (K_pCa + Ca_i);
+
+    // I_pK: plateau K current
+    double I_pK  = G_pK * (V-E_K) / (use_lut ? lut[5] : 1.0 + exp((25.0-V)/5.98));
+
+    // I_bCa: background Ca current
+    double I_bCa = G_bCa * (V - E_Ca);
+
+    // I_bNa: background Na current
+    double I_bNa = G_bNa * (V - E_Na);
+
+    // I_leak: Sacroplasmic Reticulum Ca leak current
+    double I_leak = V_leak * (Ca_sr - Ca_i);
+
+    // I_up: Sacroplasmic Reticulum Ca pump current
+    double I_up  = Vmax_up / (1.0 + pow(K_up/Ca_i,2.0));
+
+    // I_rel: Ca induced Ca current (CICR)
+    double k_casr = max_sr - ((max_sr-min_sr) / (1.0 + pow(EC/Ca_sr,2.0)));
+    double k1 = k1p / k_casr;
+    double O = k1 * R_bar * pow(Ca_ss,2.0) / (k3 + k1*pow(Ca_ss,2.0));
+    double I_rel  = V_rel * O * (Ca_sr - Ca_ss);
+
+    //  I_xfer: diffusive Ca current between Ca subspae and cytoplasm
+    double I_xfer = V_xfer * (Ca_ss - Ca_i);
+
+    // dV/dt: rate of change of transmembrane voltage
+    dX[0][c] = -(I_Na + I_to + I_K1 + I_Kr + I_Ks + I_CaL + I_NaCa +
+        I_NaK + I_pCa + I_pK + I_bCa + I_bNa  + I_stim[c]) + I_sac;
+
+    // dK_i/dt
+    dX[1][c] = -(Cm/(V_c*Fc)) * (I_K1 + I_to + I_Kr + I_Ks + I_pK - 2.0*I_NaK + I_stim[c]);
+
+    //  dNa_i/dt
+    dX[2][c] = -(Cm/(V_c*Fc)) * (I_Na + I_bNa + 3.0*(I_NaK + I_NaCa));
+
+    // dCa_i/dt
+    n1 = (I_leak - I_up)*V_sr/V_c + I_xfer;
+    double n2 = -(Cm/(V_c*Fc)) * (I_bCa + I_pCa - 2.0*I_NaCa) / 2.0;
+    d1 = 1.0 + K_bufc*Buf_c/ pow(Ca_i + K_bufc,2.0);
+    dX[3][c] = (n1 + n2)/d1;
+
+    // dCa_ss: rate of change of Ca_ss
+    n1 = (-I_CaL*Cm/(2.0*Fc) + I_rel*V_sr - V_c*I_xfer)/V_ss;
+    d1 = 1.0 + K_bufss*Buf_ss/ pow(Ca_ss + K_bufss,2.0);
+    dX[4][c] = n1 / d1;
+
+    // dCa_sr: rate of change of Ca_sr
+    n1 = I_up - I_leak - I_rel;
+    d1 = 1. + K_bufsr*Buf_sr/ pow(Ca_sr + K_bufsr,2.0);
+    dX[5][c] = n1 / d1;
+
+    // Rbar: ryanodine receptor
+    double k2 = k2p * k_casr;
+    dX[6][c] = -k2*Ca_ss*R_bar + k4*(1.0 - R_bar);
+  }
+}
+
+/// @brief Forward Euler integration for a batch of cells, see integ_fe().
+///
+/// Cell 'c' is integrated with the time step dt[c] and stimulus Istim[c].
+//
+void CepModTtp::integ_fe_batch(const int imyo, TtpBatch& batch, const double dt[], const double Istim[]) const
+{
+  constexpr int B = TtpBatch::B;
+  constexpr int nX = TtpBatch::nX;
+  double f[nX][B];
+
+  // Get time derivatives (RHS)
+  getf_batch(imyo, batch.X, batch.Xg, f, Istim, batch.Ksac);
+
+  // Update gating variables
+  update_g_batch(imyo, dt, batch.X, batch.Xg);
+
+  //  Update state variables
+  for (int k = 0; k < nX; k++) {
+    for (int c = 0; c < B; c++) {
+      batch.X[k][c] = batch.X[k][c] + dt[c]*f[k][c];
+    }
+  }
+}
+
+/// @brief Runge-Kutta integration for a batch of cells, see integ_rk().
+//
+void CepModTtp::integ_rk_batch(const int imyo, TtpBatch& batch, const double dt, const double Istim) const
+{
+  constexpr int B = TtpBatch::B;
+  constexpr int nX = TtpBatch::nX;
+  constexpr int nG = TtpBatch::nG;
+  const double dt6 = dt / 6.0;
+  const double dt2 = 0.5 * dt;
+
+  double frk1[nX][B], frk2[nX][B], frk3[nX][B], frk4[nX][B];
+  double Xrk[nX][B];
+  double Xgr[nG][B];
+
+  double dt_c[B], dt2_c[B], Istim_c[B];
+  std::fill(dt_c, dt_c + B, dt);
+  std::fill(dt2_c, dt2_c + B, dt2);
+  std::fill(Istim_c, Istim_c + B, Istim);
+
+  auto& X = batch.X;
+  auto& Xg = batch.Xg;
+
+  // RK4: 1st pass
+  getf_batch(imyo, X, Xg, frk1, Istim_c, batch.Ksac);
+
+  // Update gating variables by half-dt
+  std::copy(&Xg[0][0], &Xg[0][0] + nG*B, &Xgr[0][0]);
+  update_g_batch(imyo, dt2_c, X, Xgr);
+
+  // RK4: 2nd pass
+  for (int k = 0; k < nX; k++) {
+    for (int c = 0; c < B; c++) {
+      Xrk[k][c] = X[k][c] + dt2*frk1[k][c];
+    }
+  }
+  getf_batch(imyo, Xrk, Xgr, frk2, Istim_c, batch.Ksac);
+
+  // RK4: 3rd pass
+  for (int k = 0; k < nX; k++) {
+    for (int c = 0; c < B; c++) {
+      Xrk[k][c] = X[k][c] + dt2*frk2[k][c];
+    }
+  }
+  getf_batch(imyo, Xrk, Xgr, frk3, Istim_c, batch.Ksac);
+
+  // Update gating variables by full-dt
+  std::copy(&Xg[0][0], &Xg[0][0] + nG*B, &Xgr[0][0]);
+  update_g_batch(imyo, dt_c, X, Xgr);
+
+  // RK4: 4th pass
+  for (int k = 0; k < nX; k++) {
+    for (int c = 0; c < B; c++) {
+      Xrk[k][c] = X[k][c] + dt*frk3[k][c];
+    }
+  }
+  getf_batch(imyo, Xrk, Xgr, frk4, Istim_c, batch.Ksac);
+
+  for (int k = 0; k < nX; k++) {
+    for (int c = 0; c < B; c++) {
+      X[k][c] = X[k][c] + dt6 * ((frk1[k][c] + 2.0*(frk2[k][c] + frk3[k][c])) + frk4[k][c]);
+    }
+  }
+
+  std::copy(&Xgr[0][0], &Xgr[0][0] + nG*B, &Xg[0][0]);
+}
+
+/// @brief Update the gating variables for a batch of cells using the time
+/// step dt[c] for cell 'c', see update_g().
+//
+void CepModTtp::update_g_batch(const int i, const double dt[], const double X[][TTP_BATCH_SIZE],
+    double Xg[][TTP_BATCH_SIZE]) const
+{
+  constexpr int B = TTP_BATCH_SIZE;
+
+  for (int c = 0; c < B; c++) {
+    double V = X[0][c];
+    double Ca_ss = X[4][c];
+    double a, b, cc, tau;
+
+    // Gates that depend only on V are interpolated from the lookup table.
+    double lut[LUT_NUM_GATE_FUNCTIONS];
+
+    if (gate_table.interpolate(V, lut)) {
+      for (int k = 0; k < 9; k++) {
+        Xg[k][c] = lookup_gate(lut, k, dt[c], Xg[k][c]);
+      }
+
+      cc = 1.0 / (1.0 + pow(Ca_ss/0.050,2.0));
+      double fcassi = 0.60*cc  + 0.40;
+      tau = 80.0*cc + 2.0;
+      Xg[9][c] = fcassi - (fcassi - Xg[9][c])*exp(-dt[c]/tau);
+
+      Xg[10][c] = lookup_gate(lut, (i == 2) ? 10 : 9, dt[c], Xg[10][c]);
+      Xg[11][c] = lookup_gate(lut, 11, dt[c], Xg[11][c]);
+      continue;
+    }
+
+    // xr1: activation gate for I_Kr
+    double xr1i = 1.0/(1.0 + exp(-(26.0+V)/7.0));
+    a = 450.0/(1.0 + exp(-(45.0+V)/10.0));
+    b = 6.0/(1.0 + exp((30.0+V)/11.50));
+    tau = a*b;
+    Xg[0][c] = xr1i - (xr1i - Xg[0][c])*exp(-dt[c]/tau);
+
+    // xr2: inactivation gate for I_Kr
+    double xr2i = 1.0 /(1.0 + exp((88.0+V)/24.0));
+    a = 3.0 /(1.0 + exp(-(60.0+V)/20.0));
+    b = 1.120/(1.0 + exp(-(60.0-V)/20.0));
+    tau = a*b;
+    Xg[1][c] = xr2i - (xr2i - Xg[1][c])*exp(-dt[c]/tau);
+
+    // xs: activation gate for I_Ks
+    double xsi = 1.0/(1.0 + exp(-(5.0+V)/14.0));
+    a = 1400.0/sqrt(1.0 + exp((5.0-V)/6.0));
+    b = 1.0/(1.0 + exp((V-35.0)/15.0));
+    tau  = a*b + 80.0;
+    Xg[2][c] = xsi - (xsi - Xg[2][c])*exp(-dt[c]/tau);
+
+    // m: activation gate for I_Na
+    double mi = 1.0 / pow(1.0 + exp(-(56.860+V)/9.030),2.0);
+    a = 1.0/(1.0 + exp(-(60.0+V)/5.0));
+    b = 0.10/(1.0 + exp((35.0+V)/5.0)) + 0.10/(1.0 + exp((V-50.0)/200.0));
+    tau = a*b;
+    Xg[3][c] = mi - (mi - Xg[3][c])*exp(-dt[c]/tau);
+
+    // h: fast inactivation gate for I_Na
+    double hi = 1.0 / pow(1.0 + exp((71.550+V)/7.430),2.0);
+
+    if (V >= -40.0) {
+      a = 0.0;
+      b = 0.770/(0.130*(1.0 + exp(-(10.660+V)/11.10)));
+    } else {
+      a = 5.7E-2*exp(-(80.0+V)/6.80);
+      b = 2.70*exp(0.0790*V) + 310000.0*exp(0.34850*V);
+    }
+
+    tau  = 1.0 / (a + b);
+    Xg[4][c] = hi - (hi - Xg[4][c])*exp(-dt[c]/tau);
+
+    // j: slow inactivation gate for I_Na
+    double ji = 1.0/ pow(1.0 + exp((71.550+V)/7.430),2.0);
+
+    if (V >= -40.0) {
+      a = 0.0;
+      b = 0.60*exp(5.7E-2*V) / (1.0 + exp(-0.10*(V+32.0)));
+    } else {
+      a = -(25428.0*exp(0.24440*V) + 6.948E-6*exp(-0.043910*V)) * (V+37.780) / (1.0 + exp(0.3110*(79.230+V)));
+      b = 0.024240*exp(-0.010520*V) / (1.0 + exp(-0.13780*(40.140+V)));
+    }
+    tau = 1.0 / (a + b);
+    Xg[5][c] = ji - (ji - Xg[5][c])*exp(-dt[c]/tau);
+
+    // d: activation gate for I_CaL
+    double di = 1.0/(1.0 + exp(-(8.0+V)/7.50));
+    a = 1.40/(1.0 + exp(-(35.0+V)/13.0)) + 0.250;
+    b = 1.40/(1.0 + exp((5.0+V)/5.0));
+    cc = 1.0/(1.0 + exp((50.0-V)/20.0));
+    tau = a*b + cc;
+    Xg[6][c] = di - (di - Xg[6][c])*exp(-dt[c]/tau);
+
+    // f: slow inactivation gate for I_CaL
+    double fi = 1.0/(1.0 + exp((20.0+V)/7.0));
+    a = 1102.50*exp(-pow(V+27.0,2.0) / 225.0);
+    b = 200.0/(1.0 + exp((13.0-V)/10.0));
+    cc = 180.0/(1.0 + exp((30.0+V)/10.0)) + 20.0;
+    tau = a + b + cc;
+    Xg[7][c] = fi - (fi - Xg[7][c])*exp(-dt[c]/tau);
+
+    // f2: fast inactivation gate for I_CaL
+    double f2i = 0.670/(1.0 + exp((35.0+V)/7.0)) + 0.330;
+    a = 562.0*exp(-pow(27.0+V,2.0) /240.0);
+    b = 31.0/(1.0 + exp((25.0-V)/10.0));
+    cc = 80.0/(1.0 + exp((30.0+V)/10.0));
+    tau = a + b + cc;
+    Xg[8][c] = f2i - (f2i - Xg[8][c])*exp(-dt[c]/tau);
+
+    // fCass: inactivation gate for I_CaL into subspace
+    cc = 1.0 / (1.0 + pow(Ca_ss/0.050,2.0));
+    double fcassi = 0.60*cc  + 0.40;
+    tau = 80.0*cc + 2.0;
+    Xg[9][c] = fcassi - (fcassi - Xg[9][c])*exp(-dt[c]/tau);
+
+    // s: inactivation gate for I_to
+    double si;
+    if (i == 2) {
+      si = 1.0/(1.0 + exp((28.0+V)/5.0));
+      tau = 1000.0*exp(-pow(V+67.0,2.0) /1000.0) + 8.0;
+    } else {
+      si = 1.0/(1.0 + exp((20.0+V)/5.0));
+      tau = 85.0*exp(-pow(V+45.0,2.0) / 320.0) + 5.0/(1.0+exp((V-20.0)/5.0)) + 3.0;
+    }
+    Xg[10][c] = si - (si - Xg[10][c])*exp(-dt[c]/tau);
+
+    // r: activation gate for I_to
+    double ri = 1.0/(1.0 + exp((20.0-V)/6.0));
+    tau = 9.50*exp(-pow(V+40.0,2.0) / 1800.0) + 0.80;
+    Xg[11][c] = ri - (ri - Xg[11][c])*exp(-dt[c]/tau);
+  }
+}
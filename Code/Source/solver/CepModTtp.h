@@ -5,6 +5,7 @@
 #define CEP_MOD_TTP_H 
 
 #include "Array.h"
+#include "CepLookupTable.h"
 #include "Vector.h"
 #include <array>
 
@@ -14,6 +15,34 @@
 template <class T>
 T& make_ref(T&& x) { return x; }
 
+/// @brief Number of cells integrated at once by the batched ten
+/// Tusscher-Panfilov routines.
+constexpr int TTP_BATCH_SIZE = 8;
+
+/// @brief The TtpBatch struct stores the state of a batch of cells for the
+/// batched ten Tusscher-Panfilov routines.
+///
+/// Arrays are stored in structure-of-arrays layout: the last index of each
+/// array is the cell in the batch so that the loops over the batch cells can
+/// be vectorized. Unused batch entries are copies of the last cell of the
+/// batch.
+///
+///   X - state variables
+///   Xg - gating variables
+///   Ksac - feedback coefficient for stretch-activated currents
+//
+struct TtpBatch {
+  static constexpr int B = TTP_BATCH_SIZE;
+  static constexpr int nX = 7;
+  static constexpr int nG = 12;
+
+  int num_cells = 0;
+
+  double X[nX][B];
+  double Xg[nG][B];
+  double Ksac[B];
+};
+
 /// @brief This module defines data structures for ten Tusscher-Panfilov
 /// epicardial cellular activation model for cardiac electrophysiology
 ///
@@ -367,9 +396,37 @@ class CepModTtp
       double I_xfer_Cai, I_xfer_Cass;
       double k_casr_sr, k1_casr, O_Casr, O_Cass, O_Rbar;
 
+//-----------------------------------------------------------------------
+//     Lookup tables of the functions of the membrane potential
+//
+//     gate_table: steady-state value, time constant and decay factor
+//     exp(-lookup_table_dt/tau) of the gating variables xr1, xr2, xs, m,
+//     h, j, d, f, f2, s (zones 1 and 3), s (zone 2) and r.
+//
+//     current_table: factors of the I_CaL current and exponentials used by
+//     the I_NaCa, I_NaK and I_pK currents.
+//
+      static constexpr int LUT_NUM_GATES = 12;
+      static constexpr int LUT_NUM_GATE_FUNCTIONS = 3 * LUT_NUM_GATES;
+      static constexpr int LUT_NUM_CURRENT_FUNCTIONS = 6;
+
+      /// Membrane potential range of the lookup tables [mV]
+      double lookup_table_vmin = -150.0;
+      double lookup_table_vmax = 100.0;
+
+      /// Time step of the tabulated decay factors
+      double lookup_table_dt = 0.0;
+
+      CepLookupTable gate_table;
+      CepLookupTable current_table;
+
     void actv_strn(const double c_Ca, const double I4f, const double dt, double& gf);
     void actv_strs(const double c_Ca, const double dt, double& Tact, double& epsX);
 
+    void current_table_functions(const double V, double values[]) const;
+
+    void gate_table_functions(const double V, const double dt, double values[]) const;
+
     void getf(const int i, const int nX, const int nG, const Vector<double>& X, const Vector<double>& Xg, 
         Vector<double>& dX, const double I_stim, const double K_sac, Vector<double>& RPAR);
 
@@ -381,6 +438,8 @@ class CepModTtp
     void init(const int imyo, const int nX, const int nG, Vector<double>& X, Vector<double>& Xg,
         Vector<double>& X0, Vector<double>& Xg0);
 
+    void init_lookup_tables(const double resolution, const double dt);
+
     void integ_cn2(const int imyo, const int nX, const int nG, Vector<double>& X, Vector<double>& Xg,
         const double Ts, const double dt, const double Istim, const double Ksac, 
         Vector<int>& IPAR, Vector<double>& RPAR);
@@ -391,9 +450,26 @@ class CepModTtp
     void integ_rk(const int imyo, const int nX, const int nG, Vector<double>& X, Vector<double>& Xg, 
         const double Ts, const double dt, const double Istim, const double Ksac, Vector<double>& RPAR);
 
+    double lookup_gate(const double lut[], const int gate, const double dt, const double x) const;
+
+    std::vector<double> lookup_table_errors() const;
+
     void update_g(const int i, const double dt, const int n, const int nG, const Vector<double>& X, 
         Vector<double>& Xg);
 
+    // Batched routines, these do not modify the model data so a model can
+    // be shared by threads.
+    //
+    void getf_batch(const int i, const double X[][TTP_BATCH_SIZE], const double Xg[][TTP_BATCH_SIZE],
+        double dX[][TTP_BATCH_SIZE], const double I_stim[], const double K_sac[]) const;
+
+    void integ_fe_batch(const int imyo, TtpBatch& batch, const double dt[], const double Istim[]) const;
+
+    void integ_rk_batch(const int imyo, TtpBatch& batch, const double dt, const double Istim) const;
+
+    void update_g_batch(const int i, const double dt[], const double X[][TTP_BATCH_SIZE],
+        double Xg[][TTP_BATCH_SIZE]) const;
+
 };
 
 #endif
@@ -139,6 +139,8 @@ void faceType::destroy()
     fs[i].destroy();
   } 
 
+  geom.clear();
+
   eType = consts::ElementType::NA;
   nEl = 0;
   nNo = 0;
@@ -17,6 +17,8 @@
 #include "CmMod.h"
 #include "Parameters.h"
 #include "RobinBoundaryCondition.h"
+#include "PrecomputedSolution.h"
+#include "SpatialGrid.h"
 #include "Timer.h"
 #include "Vector.h"
 
@@ -505,6 +507,20 @@ class traceType
     Array<double> xiG;
 };
 
+/// @brief Geometry at the Gauss points of the elements of a face in the
+/// reference configuration, cached by all_fun::integ() for a function space
+/// of the face.
+//
+class faceGeomType
+{
+  public:
+    // Area-weighted normals at the Gauss points (nsd, nG, nEl)
+    Array3<double> n;
+
+    // Gauss point weights times the Jacobians (nG, nEl)
+    Array<double> wJ;
+};
+
 /// @brief The face type containing mesh at boundary
 //
 class faceType
@@ -599,6 +615,10 @@ class faceType
 
     // TRI3 quadrature modifier
     double qmTRI3 = 2.0/3.0;
+
+    // Cached geometry for each function space, only used when the mesh
+    // does not move so the reference configuration does not change
+    mutable std::vector<faceGeomType> geom;
 };
 
 /// @brief Store options for output types.
@@ -724,6 +744,10 @@ class cntctModelType
 
     // Tolerance
     double tol = 0.0; 
+
+    // Grids of the deformed shell mesh nodes used to find the nodes that
+    // may be in contact, kept between calls to construct_contact_pnlty()
+    std::vector<SpatialGrid> grid;
 };
 
 class cplFaceType
@@ -833,6 +857,10 @@ class cplBCType
     /// @brief Path to the 0D code binary file
     std::string binPath;
 
+    /// @brief Path to the genBC shared library, used instead of the
+    /// genBC binary file if set
+    std::string libPath;
+
     /// @brief File name for communication between 0D and 3D
     std::string commuName;
     //std::string commuName = ".CPLBC_0D_3D.tmp";
@@ -980,6 +1008,10 @@ class mshType
     /// @brief Shells: extended IEN array with neighboring nodes
     Array<int> eIEN;
 
+    /// @brief Position in colPtr (and Val) of the (a,b) node pairs of each 
+    /// element: eValPtr(a+b*eNoN, e), (eNoN*eNoN, nEl)
+    Array<int> eValPtr;
+
     /// @brief Shells: boundary condition variable
     Array<int> sbc;
 
@@ -1022,10 +1054,6 @@ class mshType
     /// davep double Nxx(:,:,:)
     Array3<double> Nxx;
 
-    /// @brief Solution field (displacement, velocity, pressure, etc.) for a known, potentially
-    /// time-varying, quantity of interest across a mesh
-    Array3<double> Ys;
-
     /// @brief Mesh Name
     std::string name;
 
@@ -1054,6 +1082,10 @@ class mshType
     /// @brief RIS: processor ids to change element partitions to
     Vector<int> partRIS;
 
+    /// @brief Element coloring used for threaded assembly: the elements 
+    /// of a color do not share any nodes
+    std::vector<std::vector<int>> eColor;
+
     /// @brief TET4 quadrature modifier
     double qmTET4 = (5.0+3.0*sqrt(5.0))/20.0;
 
@@ -1102,6 +1134,16 @@ class eqType
     /// @brief Minimum iteration for this eq.
     int minItr = 1;
 
+    /// @brief Number of threads used for element assembly
+    int nAssmThreads = 1;
+
+    /// @brief Assemble linear tetrahedral fluid elements in batches
+    bool batchAssm = false;
+
+    /// @brief Number of threads used to integrate the cellular activation
+    /// model (cardiac electrophysiology)
+    int nIonThreads = 1;
+
     /// @brief Number of possible outputs
     int nOutput = 0;
 
@@ -1464,6 +1506,11 @@ class urisType
     // Default distance value of the valve boundary when the valve is closed.
     double sdf_deps_close = 0.25;
 
+    // Width of the band around the valve where the signed distance is
+    // computed, the nodes outside the band get sdf_default. If 0 the signed
+    // distance is computed for all nodes in the bounding box of the valve.
+    double sdf_band = 0.0;
+
     // Displacements of the valve when it opens (3D array).
     Array3<double> DxOpen;
 
@@ -1500,6 +1547,9 @@ class urisType
     // Array to count how many times a uris node is found in the fluid mesh of a processor (1D array).
     Vector<int> elemCounter;
 
+    // Parametric coordinates of the uris nodes in the fluid mesh elements in elemId (2D array).
+    Array<double> elemXi;
+
     // Derived type variables
     // IB meshes
     std::vector<mshType> msh;
@@ -1531,6 +1581,12 @@ class ComMod {
     /// @brief Whether to save to VTK files
     bool saveVTK = false;
 
+    /// @brief Whether to write VTK files on a background thread
+    bool saveAsync = false;
+
+    /// @brief Whether each process writes its part of the VTK files (.pvtu)
+    bool savePVTU = false;
+
     /// @brief Whether any file being saved
     bool savedOnce = false;
 
@@ -1543,6 +1599,13 @@ class ComMod {
     /// @brief Whether to overwrite restart file or not
     bool stFileRepl = false;
 
+    /// @brief Whether to write restart files keyed by global node ID that 
+    /// can be read by any number of processes
+    bool stFileGlob = false;
+
+    /// @brief Whether to write restart files on a background thread
+    bool stFileAsync = false;
+
     /// @brief Restart simulation after remeshing
     bool resetSim = false;
 
@@ -1703,6 +1766,9 @@ class ComMod {
 
     /// @brief Precomputed state-variable field name
     std::string precompFieldName;
+
+    /// @brief Precomputed state-variable binary file name read by all processes
+    std::string precompBinFileName;
     // ALLOCATABLE DATA
 
     /// @brief Column pointer (for sparse LHS matrix structure)
@@ -1815,6 +1881,9 @@ class ComMod {
     /// @brief All the meshes are stored in this variable
     std::vector<mshType> msh;
 
+    /// @brief Precomputed state-variable solution
+    PrecomputedSolution precompSol;
+
     /// @brief Input/output to the screen is handled by this structure
     chnlType std, err, wrn, dbg;
 
@@ -51,6 +51,14 @@ void FsilsLinearAlgebra::assemble(ComMod& com_mod, const int num_elem_nodes, con
   lhsa_ns::do_assem(com_mod, num_elem_nodes, eqN, lK, lR);
 }
 
+/// @brief Assemble the local arrays of element 'e' of mesh 'lM' using the 
+/// precomputed element-to-matrix position map.
+void FsilsLinearAlgebra::assemble(ComMod& com_mod, const mshType& lM, const int e, const Vector<int>& eqN,
+        const Array3<double>& lK, const Array<double>& lR)
+{
+  lhsa_ns::do_assem(com_mod, lM, e, eqN, lK, lR);
+}
+
 /// @brief Check the validity of the preconditioner and assembly types options. 
 void FsilsLinearAlgebra::check_options(const consts::PreconditionerType prec_cond_type, 
   const consts::LinearAlgebraType assembly_type)
@@ -18,6 +18,8 @@ class FsilsLinearAlgebra : public virtual LinearAlgebra {
     virtual void alloc(ComMod& com_mod, eqType& lEq);
     virtual void assemble(ComMod& com_mod, const int num_elem_nodes, const Vector<int>& eqN,
         const Array3<double>& lK, const Array<double>& lR);
+    virtual void assemble(ComMod& com_mod, const mshType& lM, const int e, const Vector<int>& eqN,
+        const Array3<double>& lK, const Array<double>& lR);
     virtual void check_options(const consts::PreconditionerType prec_cond_type, const consts::LinearAlgebraType assembly_type);
     virtual void initialize(ComMod& com_mod, eqType& lEq);
     virtual void solve(ComMod& com_mod, eqType& lEq, const Vector<int>& incL, const Vector<double>& res);
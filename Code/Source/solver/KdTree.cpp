@@ -0,0 +1,129 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#include "KdTree.h"
+
+#include <algorithm>
+#include <numeric>
+
+/// @brief Build the tree for the points x(:,a).
+//
+void KdTree::build(const Array<double>& x)
+{
+  nsd_ = x.nrows();
+  x_ = x;
+
+  index_.resize(x.ncols());
+  std::iota(index_.begin(), index_.end(), 0);
+  nodes_.clear();
+
+  if (size() > 0) {
+    build_node(0, size());
+  }
+}
+
+/// @brief Create the node for the points index_[begin:end-1] and its
+/// children, the points are split at the median of the coordinate with the
+/// largest extent.
+///
+/// Returns the position of the node in nodes_.
+//
+int KdTree::build_node(const int begin, const int end)
+{
+  int node = nodes_.size();
+  nodes_.push_back(Node());
+  nodes_[node].begin = begin;
+  nodes_[node].end = end;
+
+  if (end - begin <= leaf_size_) {
+    return node;
+  }
+
+  int dim = 0;
+  double max_extent = -1.0;
+
+  for (int i = 0; i < nsd_; i++) {
+    double xmin = std::numeric_limits<double>::max();
+    double xmax = std::numeric_limits<double>::lowest();
+    for (int n = begin; n < end; n++) {
+      xmin = std::min(xmin, x_(i,index_[n]));
+      xmax = std::max(xmax, x_(i,index_[n]));
+    }
+    if (xmax - xmin > max_extent) {
+      max_extent = xmax - xmin;
+      dim = i;
+    }
+  }
+
+  int mid = (begin + end) / 2;
+  std::nth_element(index_.begin()+begin, index_.begin()+mid, index_.begin()+end,
+      [this, dim](const int a, const int b) { return x_(dim,a) < x_(dim,b); });
+
+  // Set the split before the children reorder the points.
+  nodes_[node].dim = dim;
+  nodes_[node].split = x_(dim,index_[mid]);
+
+  int left = build_node(begin, mid);
+  int right = build_node(mid, end);
+
+  nodes_[node].left = left;
+  nodes_[node].right = right;
+
+  return node;
+}
+
+/// @brief Find the point nearest to xp.
+///
+/// Only the points whose squared distance to xp is not larger than
+/// 'max_dist_sq' are considered. If several points are at the same distance
+/// the one with the lowest index is returned.
+///
+/// Returns the index of the point, or -1 if there is no point within the
+/// maximum distance, and sets 'dist_sq' to its squared distance.
+//
+int KdTree::nearest(const Vector<double>& xp, double& dist_sq, const double max_dist_sq) const
+{
+  int point = -1;
+  dist_sq = max_dist_sq;
+
+  if (size() > 0) {
+    search(0, xp, point, dist_sq);
+  }
+
+  return point;
+}
+
+/// @brief Search the points of 'node' for a point nearer to xp than the
+/// current nearest point.
+//
+void KdTree::search(const int node, const Vector<double>& xp, int& point, double& dist_sq) const
+{
+  const auto& nd = nodes_[node];
+
+  if (nd.dim == -1) {
+    for (int n = nd.begin; n < nd.end; n++) {
+      int a = index_[n];
+      double d = 0.0;
+      for (int i = 0; i < nsd_; i++) {
+        d += (xp(i) - x_(i,a)) * (xp(i) - x_(i,a));
+      }
+      if (d < dist_sq || (d == dist_sq && (point == -1 || a < point))) {
+        dist_sq = d;
+        point = a;
+      }
+    }
+    return;
+  }
+
+  // Search the side of the split containing xp first, then the other side
+  // if it may contain a nearer point.
+  double diff = xp(nd.dim) - nd.split;
+  int near = (diff <= 0.0) ? nd.left : nd.right;
+  int far = (diff <= 0.0) ? nd.right : nd.left;
+
+  search(near, xp, point, dist_sq);
+
+  if (diff*diff <= dist_sq) {
+    search(far, xp, point, dist_sq);
+  }
+}
@@ -0,0 +1,53 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#ifndef KD_TREE_H
+#define KD_TREE_H
+
+#include "Array.h"
+#include "Vector.h"
+
+#include <limits>
+#include <vector>
+
+/// @brief The KdTree class is a k-d tree of a set of points used to find the
+/// point nearest to a given point.
+///
+/// The points are stored as the columns of an (nsd, nNo) array, a copy of
+/// the points is stored in the tree so they can be changed after the tree
+/// is built. The tree must be rebuilt when the points move.
+//
+class KdTree {
+  public:
+    KdTree() {}
+
+    void build(const Array<double>& x);
+    int nearest(const Vector<double>& xp, double& dist_sq,
+        const double max_dist_sq = std::numeric_limits<double>::max()) const;
+
+    int size() const { return static_cast<int>(index_.size()); }
+
+  private:
+    // A node of the tree, the leaf nodes store the points index_[begin:end-1].
+    struct Node {
+      int begin = 0;
+      int end = 0;
+      int dim = -1;
+      double split = 0.0;
+      int left = -1;
+      int right = -1;
+    };
+
+    int build_node(const int begin, const int end);
+    void search(const int node, const Vector<double>& xp, int& point, double& dist_sq) const;
+
+    static const int leaf_size_ = 8;
+
+    int nsd_ = 0;
+    Array<double> x_;
+    std::vector<int> index_;
+    std::vector<Node> nodes_;
+};
+
+#endif
+
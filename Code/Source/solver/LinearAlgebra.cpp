@@ -41,6 +41,17 @@ LinearAlgebra::LinearAlgebra()
 {
 }
 
+/// @brief Assemble the local arrays of element 'e' of mesh 'lM'.
+///
+/// Interfaces that cannot use the element-to-matrix position map built by 
+/// lhsa_ns::set_val_ptr() assemble the element arrays using its nodes.
+//
+void LinearAlgebra::assemble(ComMod& com_mod, const mshType& lM, const int e, const Vector<int>& eqN, 
+    const Array3<double>& lK, const Array<double>& lR)
+{
+  assemble(com_mod, lM.eNoN, eqN, lK, lR);
+}
+
 /// @brief Create objects derived from LinearAlgebra. 
 LinearAlgebra* LinearAlgebraFactory::create_interface(consts::LinearAlgebraType interface_type)
 {
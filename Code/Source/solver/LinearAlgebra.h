@@ -22,6 +22,8 @@ class LinearAlgebra {
     virtual void alloc(ComMod& com_mod, eqType& lEq) = 0;
     virtual void assemble(ComMod& com_mod, const int num_elem_nodes, const Vector<int>& eqN, 
         const Array3<double>& lK, const Array<double>& lR) = 0;
+    virtual void assemble(ComMod& com_mod, const mshType& lM, const int e, const Vector<int>& eqN, 
+        const Array3<double>& lK, const Array<double>& lR);
     virtual void check_options(const consts::PreconditionerType prec_cond_type, const consts::LinearAlgebraType assembly_type) = 0;
     virtual void initialize(ComMod& com_mod, eqType& lEq) = 0;
     virtual void set_assembly(consts::LinearAlgebraType assembly_type) = 0;
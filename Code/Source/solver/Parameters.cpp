@@ -1081,7 +1081,10 @@ CoupleGenBCParameters::CoupleGenBCParameters()
 
   type = Parameter<std::string>("type", "", required);
 
-  set_parameter("ZeroD_code_file_path", "", required, zerod_code_file_path);
+  // The genBC executable or the genBC shared library, loaded once
+  // and called directly without the GenBC.int file, must be given.
+  set_parameter("Shared_library_file_path", "", !required, shared_library_file_path);
+  set_parameter("ZeroD_code_file_path", "", !required, zerod_code_file_path);
 };
 
 void CoupleGenBCParameters::set_values(tinyxml2::XMLElement* xml_elem)
@@ -1103,6 +1106,11 @@ void CoupleGenBCParameters::set_values(tinyxml2::XMLElement* xml_elem)
       std::bind( &CoupleGenBCParameters::set_parameter_value, *this, _1, _2);
   
   xml_util_set_parameters(ftpr, xml_elem, error_msg);
+
+  if (zerod_code_file_path.defined() == shared_library_file_path.defined()) {
+    throw std::runtime_error("One of the ZeroD_code_file_path or Shared_library_file_path parameters must be given "
+        "in the XML <Couple_to_genBC> element.");
+  }
   
   value_set = true;
 }
@@ -1619,8 +1627,12 @@ DomainParameters::DomainParameters()
   set_parameter("Include_xml", "", !required, include_xml);
   set_parameter("Isotropic_conductivity", 0.0, !required, isotropic_conductivity);
 
+  set_parameter("Lookup_table_resolution", 0.0, !required, lookup_table_resolution);
+
   set_parameter("Mass_damping", 0.0, !required, mass_damping);
   set_parameter("Maximum_iterations", 5, !required, maximum_iterations);
+  set_parameter("Maximum_voltage_change", 1.0, !required, maximum_voltage_change);
+  set_parameter("Minimum_time_step_for_integration", 1.0e-3, !required, minimum_time_step_for_integration);
   set_parameter("Momentum_stabilization_coefficient", 0.0, !required, momentum_stabilization_coefficient);
   set_parameter("Myocardial_zone", "epicardium", !required, myocardial_zone);
 
@@ -1644,6 +1656,8 @@ DomainParameters::DomainParameters()
   set_parameter("Source_term", 0.0, !required, source_term);
   set_parameter("Time_step_for_integration", 0.0, !required, time_step_for_integration);
 
+  set_parameter("Validate_lookup_table", false, !required, validate_lookup_table);
+
   set_parameter("Inverse_darcy_permeability", 0.0, !required, inverse_darcy_permeability);
 }
 
@@ -2024,6 +2038,7 @@ EquationParameters::EquationParameters()
 
   // Define equation parameters.
   //
+  set_parameter("Batched_element_assembly", false, !required, batched_element_assembly);
   set_parameter("Coupled", false, !required, coupled);
 
   set_parameter(IncludeParametersFile::NAME, "", !required, include_xml);
@@ -2033,6 +2048,9 @@ EquationParameters::EquationParameters()
   set_parameter("Max_iterations", 1, !required, max_iterations);
   set_parameter("Min_iterations", 1, !required, min_iterations);
 
+  set_parameter("Number_of_assembly_threads", 1, !required, number_of_assembly_threads);
+  set_parameter("Number_of_ionic_model_threads", 1, !required, number_of_ionic_model_threads);
+
   set_parameter("Prestress", false, !required, prestress);
 
   set_parameter("Tolerance", 0.5, !required, tolerance);
@@ -2245,8 +2263,12 @@ GeneralSimulationParameters::GeneralSimulationParameters()
   set_parameter("Restart_file_name", "stFile", !required, restart_file_name);
 
   set_parameter("Save_averaged_results", false, !required, save_averaged_results);
+  set_parameter("Save_partition_independent_restart_files", false, !required, save_partition_independent_restart_files);
+  set_parameter("Save_restart_files_asynchronously", false, !required, save_restart_files_asynchronously);
   set_parameter("Save_results_in_folder", "", !required, save_results_in_folder);
   set_parameter("Save_results_to_VTK_format", false, required, save_results_to_vtk_format);
+  set_parameter("Save_VTK_files_asynchronously", false, !required, save_vtk_files_asynchronously);
+  set_parameter("Save_VTK_files_in_parallel", false, !required, save_vtk_files_in_parallel);
   set_parameter("Searched_file_name_to_trigger_stop", "", !required, searched_file_name_to_trigger_stop);
   set_parameter("Simulation_initialization_file_path", "", !required, simulation_initialization_file_path);
   set_parameter("Simulation_requires_remeshing", false, !required, simulation_requires_remeshing);
@@ -2257,6 +2279,10 @@ GeneralSimulationParameters::GeneralSimulationParameters()
 
   set_parameter("Time_step_size", 0.0, required, time_step_size);
   set_parameter("Verbose", false, !required, verbose);
+  set_parameter("VTK_file_compression_level", 0, !required, vtk_file_compression_level, {0,9});
+  set_parameter("VTK_file_compressor", "", !required, vtk_file_compressor);
+  set_parameter("VTK_file_data_mode", "", !required, vtk_file_data_mode);
+  set_parameter("VTK_file_single_precision_fields", {}, !required, vtk_file_single_precision_fields);
   set_parameter("Warning", false, !required, warning);
 }
 
@@ -2713,6 +2739,7 @@ URISMeshParameters::URISMeshParameters()
   set_parameter("Mesh_scale_factor", 1.0,  !required, mesh_scale_factor);
   set_parameter("Thickness", 0.04,  !required, thickness);
   set_parameter("Closed_thickness", 0.25,  !required, close_thickness);
+  set_parameter("SDF_narrow_band_width", 0.0,  !required, sdf_narrow_band_width);
   set_parameter("Resistance", 1.0e5,  !required, resistance);
   set_parameter("Closed_resistance", 1.0e5,  !required, resistance_close);
   set_parameter("Valve_starts_as_closed", true,  !required, valve_starts_as_closed);
@@ -2963,6 +2990,8 @@ LinearSolverParameters::LinearSolverParameters()
   set_parameter("NS_GM_tolerance", 1.0e-2, !required, ns_gm_tolerance);
 
   //set_parameter("Preconditioner", "", !required, preconditioner);
+  set_parameter("Preconditioner_reuse", 1, !required, preconditioner_reuse);
+  set_parameter("Preconditioner_reuse_iteration_ratio", 1.5, !required, preconditioner_reuse_iteration_ratio);
 
   set_parameter("Tolerance", 0.5, !required, tolerance);
 }
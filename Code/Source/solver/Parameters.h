@@ -659,6 +659,7 @@ class CoupleGenBCParameters : public ParameterLists
     Parameter<std::string> type;
 
     // String parameters.
+    Parameter<std::string> shared_library_file_path;
     Parameter<std::string> zerod_code_file_path;
 
     bool value_set = false;
@@ -843,6 +844,10 @@ class OutputParameters : public ParameterLists
 /// @brief The PrecomputedSolutionParameters class stores parameters for the
 /// 'Precomputed_solution' XML element used to read in the data from a precomputed solution 
 /// for the simulation state
+///
+/// The solution read from a VTU file is written to the binary file
+/// 'precomputed_<Field_name>.bin' in the results directory. File_path can be set
+/// to this file to skip reading the VTU file.
 /// \code {.xml}
 /// <Precomputed_solution>
 ///   <Project_from_face> lumen_wall </Project_from_face>
@@ -1056,6 +1061,8 @@ class LinearSolverParameters : public ParameterLists
     Parameter<double> ns_gm_tolerance;
 
     //Parameter<std::string> preconditioner;
+    Parameter<int> preconditioner_reuse;
+    Parameter<double> preconditioner_reuse_iteration_ratio;
 
     Parameter<double> tolerance;
 
@@ -1200,8 +1207,12 @@ class DomainParameters : public ParameterLists
     Parameter<std::string> include_xml;
     Parameter<double> isotropic_conductivity;
 
+    Parameter<double> lookup_table_resolution;
+
     Parameter<double> mass_damping;
     Parameter<int> maximum_iterations;
+    Parameter<double> maximum_voltage_change;
+    Parameter<double> minimum_time_step_for_integration;
     Parameter<double> momentum_stabilization_coefficient;
     Parameter<std::string> myocardial_zone;
 
@@ -1222,7 +1233,15 @@ class DomainParameters : public ParameterLists
     Parameter<double> shell_thickness;
     Parameter<double> solid_density;
     Parameter<double> source_term;
+
+    // Time step for the integration of the ionic model, the simulation time
+    // step if not given. For the adaptive ODE solver it is the maximum time
+    // step: cells at rest take steps of this size and it must be larger than
+    // the time step needed for explicit integration for adaptive steps to
+    // reduce the cost.
     Parameter<double> time_step_for_integration;
+
+    Parameter<bool> validate_lookup_table;
     
     // Inverse of Darcy permeability. Default value of 0.0 for Navier-Stokes and non-zero for Navier-Stokes-Brinkman
     Parameter<double> inverse_darcy_permeability;
@@ -1313,6 +1332,7 @@ class EquationParameters : public ParameterLists
     void set_values(tinyxml2::XMLElement* xml_elem, DomainParameters* default_domain=nullptr);
 
     Parameter<double> backflow_stabilization_coefficient;
+    Parameter<bool> batched_element_assembly;
 
     Parameter<double> conductivity;
     Parameter<double> continuity_stabilization_coefficient;
@@ -1331,6 +1351,9 @@ class EquationParameters : public ParameterLists
     Parameter<int> min_iterations;
     Parameter<double> momentum_stabilization_coefficient;
 
+    Parameter<int> number_of_assembly_threads;
+    Parameter<int> number_of_ionic_model_threads;
+
     Parameter<double> penalty_parameter;
     Parameter<double> poisson_ratio;
     Parameter<bool> prestress;
@@ -1390,7 +1413,15 @@ class EquationParameters : public ParameterLists
 ///   <Name_prefix_of_saved_VTK_files> result </Name_prefix_of_saved_VTK_files>
 ///   <Increment_in_saving_VTK_files> 1 </Increment_in_saving_VTK_files>
 ///   <Start_saving_after_time_step> 1 </Start_saving_after_time_step>
+///   <Save_VTK_files_asynchronously> true </Save_VTK_files_asynchronously>
+///   <Save_VTK_files_in_parallel> true </Save_VTK_files_in_parallel>
+///   <VTK_file_data_mode> appended_raw </VTK_file_data_mode>
+///   <VTK_file_compressor> lz4 </VTK_file_compressor>
+///   <VTK_file_compression_level> 1 </VTK_file_compression_level>
+///   <VTK_file_single_precision_fields> (Velocity, Pressure) </VTK_file_single_precision_fields>
 ///   <Increment_in_saving_restart_files> 1 </Increment_in_saving_restart_files>
+///   <Save_partition_independent_restart_files> true </Save_partition_independent_restart_files>
+///   <Save_restart_files_asynchronously> true </Save_restart_files_asynchronously>
 ///   <Convert_BIN_to_VTK_format> 0 </Convert_BIN_to_VTK_format>
 ///   <Verbose> 1 </Verbose>
 ///   <Warning> 0 </Warning>
@@ -1414,7 +1445,11 @@ class GeneralSimulationParameters : public ParameterLists
     Parameter<bool> debug;
     Parameter<bool> overwrite_restart_file;
     Parameter<bool> save_averaged_results;
+    Parameter<bool> save_partition_independent_restart_files;
+    Parameter<bool> save_restart_files_asynchronously;
     Parameter<bool> save_results_to_vtk_format;
+    Parameter<bool> save_vtk_files_asynchronously;
+    Parameter<bool> save_vtk_files_in_parallel;
     Parameter<bool> simulation_requires_remeshing;
     Parameter<bool> start_averaging_from_zero;
     Parameter<bool> verbose;
@@ -1431,12 +1466,17 @@ class GeneralSimulationParameters : public ParameterLists
     Parameter<int> start_saving_after_time_step;
     Parameter<int> starting_time_step;
     Parameter<int> number_of_time_steps;
+    Parameter<int> vtk_file_compression_level;
 
     Parameter<std::string> name_prefix_of_saved_vtk_files;
     Parameter<std::string> restart_file_name; 
     Parameter<std::string> searched_file_name_to_trigger_stop; 
     Parameter<std::string> save_results_in_folder; 
     Parameter<std::string> simulation_initialization_file_path;
+    Parameter<std::string> vtk_file_compressor;
+    Parameter<std::string> vtk_file_data_mode;
+
+    VectorParameter<std::string> vtk_file_single_precision_fields;
 };
 
 /// @brief The FaceParameters class is used to store parameters for the
@@ -1609,6 +1649,7 @@ class URISMeshParameters : public ParameterLists
     Parameter<double> mesh_scale_factor; // Scale factor for the mesh
     Parameter<double> thickness; // Thickness of the valve
     Parameter<double> close_thickness; // Thickness of the valve when it is closed
+    Parameter<double> sdf_narrow_band_width; // Width of the band around the valve where the signed distance is computed
     Parameter<double> resistance; // Resistance of the valve
     Parameter<double> resistance_close; // Resistance of the valve when it is closed
     Parameter<bool> valve_starts_as_closed; // Whether the valve starts as closed
@@ -61,6 +61,13 @@ void PetscLinearAlgebra::assemble(ComMod& com_mod, const int num_elem_nodes, con
   fsils_solver->assemble(com_mod, num_elem_nodes, eqN, lK, lR);
 }
 
+/// @brief Assemble the local arrays of element 'e' of mesh 'lM'.
+void PetscLinearAlgebra::assemble(ComMod& com_mod, const mshType& lM, const int e, const Vector<int>& eqN, 
+    const Array3<double>& lK, const Array<double>& lR)
+{
+  fsils_solver->assemble(com_mod, lM, e, eqN, lK, lR);
+}
+
 /// @brief Check the validity of the precondition and assembly types options. 
 void PetscLinearAlgebra::check_options(const consts::PreconditionerType prec_cond_type, 
     const consts::LinearAlgebraType assembly_type)
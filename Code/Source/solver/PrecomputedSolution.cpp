@@ -0,0 +1,275 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#include "PrecomputedSolution.h"
+
+#include <algorithm>
+#include <cmath>
+#include <cstring>
+#include <fstream>
+#include <stdexcept>
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+const char PrecomputedSolution::file_id_[8] = {'s','v','P','R','E','C','M','P'};
+
+PrecomputedSolution::~PrecomputedSolution()
+{
+  close();
+}
+
+/// @brief Write the slices Ys(:,:,n) of a precomputed solution to a binary
+/// file.
+//
+void PrecomputedSolution::write(const std::string& file_name, const Array3<double>& Ys)
+{
+  Header header;
+  std::memcpy(header.id, file_id_, sizeof(header.id));
+  header.num_components = Ys.nrows();
+  header.num_nodes = Ys.ncols();
+  header.num_slices = Ys.nslices();
+  header.unused = 0;
+
+  std::ofstream file(file_name, std::ios::out | std::ios::binary | std::ios::trunc);
+  file.write(reinterpret_cast<const char*>(&header), sizeof(header));
+  file.write(reinterpret_cast<const char*>(Ys.data()), Ys.msize());
+  file.close();
+
+  if (!file) {
+    throw std::runtime_error("[PrecomputedSolution] Failed to write the precomputed solution file '" + file_name + "'.");
+  }
+}
+
+/// @brief Find the slices n1, n2 and the weight alpha used to interpolate
+/// the solution at time step 'cTS' of size 'dt', the slices are
+/// 'precomp_dt' apart and repeat periodically.
+///
+/// If the time steps are equal the solution at time step 'cTS' is slice
+/// cTS mod num_slices and n1 = n2.
+//
+void PrecomputedSolution::time_step_slices(const int cTS, const double dt, const double precomp_dt,
+    const int num_slices, int& n1, int& n2, double& alpha)
+{
+  if (precomp_dt == dt) {
+    n1 = cTS % num_slices;
+    n2 = n1;
+    alpha = 0.0;
+    return;
+  }
+
+  double period = precomp_dt * (num_slices - 1);
+  double rT = std::fmod(cTS * dt, period);
+  n1 = std::min(static_cast<int>(rT / precomp_dt), num_slices - 2);
+  n2 = n1 + 1;
+  alpha = (rT - n1 * precomp_dt) / precomp_dt;
+}
+
+/// @brief Memory map a precomputed solution file written by write().
+///
+/// The values of file node nodes(a) are copied for node 'a' of the process.
+//
+void PrecomputedSolution::open(const std::string& file_name, const Vector<int>& nodes)
+{
+  close();
+
+  int fd = ::open(file_name.c_str(), O_RDONLY);
+  if (fd < 0) {
+    throw std::runtime_error("[PrecomputedSolution] The precomputed solution file '" + file_name + "' can't be read.");
+  }
+
+  struct stat file_stat;
+  size_t file_size = 0;
+  if (fstat(fd, &file_stat) == 0) {
+    file_size = static_cast<size_t>(file_stat.st_size);
+  }
+
+  Header header;
+  bool valid = (file_size >= sizeof(header)) && (::read(fd, &header, sizeof(header)) == sizeof(header)) &&
+      (std::memcmp(header.id, file_id_, sizeof(header.id)) == 0) &&
+      (header.num_components > 0) && (header.num_nodes > 0) && (header.num_slices > 0);
+
+  if (valid) {
+    size_t num_values = static_cast<size_t>(header.num_components) * header.num_nodes * header.num_slices;
+    valid = (file_size == sizeof(header) + num_values*sizeof(double));
+  }
+
+  if (!valid) {
+    ::close(fd);
+    throw std::runtime_error("[PrecomputedSolution] The file '" + file_name + "' is not a valid precomputed solution file.");
+  }
+
+  map_ = mmap(nullptr, file_size, PROT_READ, MAP_SHARED, fd, 0);
+  ::close(fd);
+
+  if (map_ == MAP_FAILED) {
+    map_ = nullptr;
+    throw std::runtime_error("[PrecomputedSolution] Failed to map the precomputed solution file '" + file_name + "'.");
+  }
+
+  file_name_ = file_name;
+  map_size_ = file_size;
+  data_ = reinterpret_cast<const double*>(static_cast<const char*>(map_) + sizeof(header));
+  num_components_ = header.num_components;
+  num_nodes_ = header.num_nodes;
+  num_slices_ = header.num_slices;
+
+  nodes_.resize(nodes.size());
+  for (int a = 0; a < nodes.size(); a++) {
+    if ((nodes(a) < 0) || (nodes(a) >= num_nodes_)) {
+      close();
+      throw std::runtime_error("[PrecomputedSolution] The node " + std::to_string(nodes(a)) +
+          " is not in the precomputed solution file '" + file_name + "' which has " + std::to_string(num_nodes_) + " nodes.");
+    }
+    nodes_[a] = nodes(a);
+  }
+}
+
+/// @brief Unmap the file and free the copied slices.
+//
+void PrecomputedSolution::close()
+{
+  if (prefetch_.valid()) {
+    prefetch_.wait();
+    prefetch_ = {};
+  }
+  prefetch_index_ = -1;
+
+  if (map_ != nullptr) {
+    munmap(map_, map_size_);
+  }
+
+  map_ = nullptr;
+  map_size_ = 0;
+  data_ = nullptr;
+  file_name_.clear();
+  nodes_.clear();
+  num_components_ = 0;
+  num_nodes_ = 0;
+  num_slices_ = 0;
+
+  slice_index_ = {-1, -1};
+  slice_used_ = {-1, -1};
+  slice_values_ = {};
+}
+
+/// @brief Copy the first 'num_comp' components of slice 'n' into Y.
+//
+void PrecomputedSolution::copy(const int n, const int num_comp, Array<double>& Y)
+{
+  interpolate(n, n, 0.0, num_comp, Y);
+}
+
+/// @brief Set Y to the first 'num_comp' components of
+///
+///   (1 - alpha) * slice(n1) + alpha * slice(n2)
+///
+/// Only slice 'n1' is used if alpha is 0.
+//
+void PrecomputedSolution::interpolate(const int n1, const int n2, const double alpha, const int num_comp,
+    Array<double>& Y)
+{
+  if (num_comp > num_components_) {
+    throw std::runtime_error("[PrecomputedSolution] The precomputed solution file '" + file_name_ + "' has " +
+        std::to_string(num_components_) + " components but " + std::to_string(num_comp) + " are needed.");
+  }
+
+  int num_nodes = nodes_.size();
+  int s1 = load_slice(n1, n2);
+  const auto& y1 = slice_values_[s1];
+
+  if (alpha == 0.0) {
+    for (int a = 0; a < num_nodes; a++) {
+      for (int i = 0; i < num_comp; i++) {
+        Y(i,a) = y1[a*num_components_ + i];
+      }
+    }
+
+  } else {
+    int s2 = load_slice(n2, n1);
+    const auto& y2 = slice_values_[s2];
+    for (int a = 0; a < num_nodes; a++) {
+      for (int i = 0; i < num_comp; i++) {
+        Y(i,a) = (1.0 - alpha) * y1[a*num_components_ + i] + alpha * y2[a*num_components_ + i];
+      }
+    }
+  }
+
+  // Read the next slice while the time step is solved.
+  prefetch_slice((std::max(n1, n2) + 1) % num_slices_);
+}
+
+/// @brief Copy slice 'n' for the nodes of the process if it has not been
+/// copied, replacing the least recently used slice that is not slice 'keep'.
+///
+/// Returns the index into slice_values_ of the slice.
+//
+int PrecomputedSolution::load_slice(const int n, const int keep)
+{
+  if ((n < 0) || (n >= num_slices_)) {
+    throw std::runtime_error("[PrecomputedSolution] The slice " + std::to_string(n) +
+        " is not in the precomputed solution file '" + file_name_ + "' which has " + std::to_string(num_slices_) + " slices.");
+  }
+
+  num_loads_ += 1;
+
+  for (int s = 0; s < 2; s++) {
+    if (slice_index_[s] == n) {
+      slice_used_[s] = num_loads_;
+      return s;
+    }
+  }
+
+  int s = 0;
+  if ((slice_index_[0] == keep) || ((slice_index_[1] != keep) && (slice_used_[1] < slice_used_[0]))) {
+    s = 1;
+  }
+
+  if (prefetch_.valid() && (prefetch_index_ == n)) {
+    slice_values_[s] = prefetch_.get();
+    prefetch_index_ = -1;
+  } else {
+    slice_values_[s] = read_slice(n);
+  }
+
+  slice_index_[s] = n;
+  slice_used_[s] = num_loads_;
+  return s;
+}
+
+/// @brief Start reading slice 'n' on a background thread if it has not been
+/// copied or is not already being read.
+//
+void PrecomputedSolution::prefetch_slice(const int n)
+{
+  if ((n == slice_index_[0]) || (n == slice_index_[1]) || (n == prefetch_index_)) {
+    return;
+  }
+
+  if (prefetch_.valid()) {
+    prefetch_.wait();
+  }
+
+  prefetch_ = std::async(std::launch::async, [this, n]() { return read_slice(n); });
+  prefetch_index_ = n;
+}
+
+/// @brief Copy the values of slice 'n' for the nodes of the process from
+/// the memory mapped file.
+//
+std::vector<double> PrecomputedSolution::read_slice(const int n) const
+{
+  int num_nodes = nodes_.size();
+  std::vector<double> values(static_cast<size_t>(num_nodes) * num_components_);
+  const double* slice = data_ + static_cast<size_t>(n) * num_nodes_ * num_components_;
+
+  for (int a = 0; a < num_nodes; a++) {
+    const double* node_values = slice + static_cast<size_t>(nodes_[a]) * num_components_;
+    std::copy(node_values, node_values + num_components_, values.begin() + static_cast<size_t>(a) * num_components_);
+  }
+
+  return values;
+}
+
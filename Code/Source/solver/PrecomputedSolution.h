@@ -0,0 +1,91 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#ifndef PRECOMPUTED_SOLUTION_H
+#define PRECOMPUTED_SOLUTION_H
+
+#include "Array.h"
+#include "Array3.h"
+#include "Vector.h"
+
+#include <array>
+#include <cstdint>
+#include <future>
+#include <string>
+#include <vector>
+
+/// @brief The PrecomputedSolution class provides the time slices of a
+/// precomputed state-variable solution (e.g. velocity) read from a binary
+/// file.
+///
+/// The file stores a header followed by each time slice as a (num_components,
+/// num_nodes) column-major array of doubles. The file is memory mapped, only
+/// the two slices used to interpolate the solution at the current time step
+/// are copied for the nodes of a process. The slice following the last one
+/// copied is read on a background thread.
+//
+class PrecomputedSolution {
+  public:
+    PrecomputedSolution() {}
+    ~PrecomputedSolution();
+
+    PrecomputedSolution(const PrecomputedSolution&) = delete;
+    PrecomputedSolution& operator=(const PrecomputedSolution&) = delete;
+
+    static void write(const std::string& file_name, const Array3<double>& Ys);
+    static void time_step_slices(const int cTS, const double dt, const double precomp_dt, const int num_slices,
+        int& n1, int& n2, double& alpha);
+
+    void open(const std::string& file_name, const Vector<int>& nodes);
+    void close();
+
+    void copy(const int n, const int num_comp, Array<double>& Y);
+    void interpolate(const int n1, const int n2, const double alpha, const int num_comp, Array<double>& Y);
+
+    bool is_open() const { return data_ != nullptr; }
+    int num_components() const { return num_components_; }
+    int num_nodes() const { return num_nodes_; }
+    int num_slices() const { return num_slices_; }
+
+  private:
+    // The header at the start of the file.
+    struct Header {
+      char id[8];
+      int32_t num_components;
+      int32_t num_nodes;
+      int32_t num_slices;
+      int32_t unused;
+    };
+
+    static const char file_id_[8];
+
+    int load_slice(const int n, const int keep);
+    void prefetch_slice(const int n);
+    std::vector<double> read_slice(const int n) const;
+
+    int num_components_ = 0;
+    int num_nodes_ = 0;
+    int num_slices_ = 0;
+
+    // The memory mapped file.
+    std::string file_name_;
+    void* map_ = nullptr;
+    size_t map_size_ = 0;
+    const double* data_ = nullptr;
+
+    // The file nodes copied for each node of the process.
+    std::vector<int> nodes_;
+
+    // The slices copied from the file and the time they were last used.
+    std::array<int,2> slice_index_{-1, -1};
+    std::array<int64_t,2> slice_used_{-1, -1};
+    std::array<std::vector<double>,2> slice_values_;
+    int64_t num_loads_ = 0;
+
+    // The slice being read on a background thread.
+    std::future<std::vector<double>> prefetch_;
+    int prefetch_index_ = -1;
+};
+
+#endif
+
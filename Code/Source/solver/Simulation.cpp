@@ -5,6 +5,7 @@
 
 #include "all_fun.h"
 #include "load_msh.h"
+#include "VtkData.h"
 
 #include "mpi.h"
 
@@ -62,6 +63,18 @@ void Simulation::set_module_parameters()
   com_mod.stopTrigName = general.searched_file_name_to_trigger_stop.value();
   com_mod.ichckIEN = general.check_ien_order.value();
   com_mod.saveVTK = general.save_results_to_vtk_format.value();
+  com_mod.saveAsync = general.save_vtk_files_asynchronously.value();
+  com_mod.savePVTU = general.save_vtk_files_in_parallel.value();
+
+  VtkWriteOptions vtk_write_options;
+  vtk_write_options.data_mode = general.vtk_file_data_mode.value();
+  vtk_write_options.compressor = general.vtk_file_compressor.value();
+  vtk_write_options.compression_level = general.vtk_file_compression_level.value();
+  for (auto& name : general.vtk_file_single_precision_fields.value()) {
+    vtk_write_options.float32_data.insert(name);
+  }
+  VtkData::set_write_options(vtk_write_options);
+
   com_mod.saveName = general.name_prefix_of_saved_vtk_files.value();
   com_mod.saveName = chnl_mod.appPath + com_mod.saveName;
   com_mod.saveIncr = general.increment_in_saving_vtk_files.value();
@@ -69,6 +82,8 @@ void Simulation::set_module_parameters()
   com_mod.saveAve = general.save_averaged_results.value();
   com_mod.zeroAve = general.start_averaging_from_zero.value();
   com_mod.stFileRepl = general.overwrite_restart_file.value();
+  com_mod.stFileGlob = general.save_partition_independent_restart_files.value();
+  com_mod.stFileAsync = general.save_restart_files_asynchronously.value();
   com_mod.stFileName = chnl_mod.appPath + general.restart_file_name.value();
   com_mod.stFileIncr = general.increment_in_saving_restart_files.value();
   com_mod.rmsh.isReqd = general.simulation_requires_remeshing.value();
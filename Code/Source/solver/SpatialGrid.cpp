@@ -0,0 +1,175 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#include "SpatialGrid.h"
+
+#include <cmath>
+#include <stdexcept>
+#include <string>
+
+/// @brief Add point 'a' to the list of points of its cell.
+//
+void SpatialGrid::add_point(const int a)
+{
+  auto& cell = cells_[point_cell_[a]];
+  point_pos_[a] = cell.size();
+  cell.push_back(a);
+}
+
+/// @brief Bin the points x(:,a) into cells of size 'cell_size'.
+//
+void SpatialGrid::build(const Array<double>& x, const double cell_size)
+{
+  if (!(cell_size > 0.0)) {
+    throw std::runtime_error("[SpatialGrid] The cell size " + std::to_string(cell_size) + " must be positive.");
+  }
+
+  if (x.nrows() < 1 || x.nrows() > 3) {
+    throw std::runtime_error("[SpatialGrid] The number of coordinates " + std::to_string(x.nrows()) +
+        " must be between 1 and 3.");
+  }
+
+  nsd_ = x.nrows();
+  cell_size_ = cell_size;
+
+  int nNo = x.ncols();
+  point_cell_.resize(nNo);
+  point_pos_.resize(nNo);
+  cells_.clear();
+
+  for (int a = 0; a < nNo; a++) {
+    point_cell_[a] = cell_key(x, a);
+    add_point(a);
+  }
+}
+
+/// @brief Return the key of the cell containing the point x(:,a).
+//
+SpatialGrid::CellKey SpatialGrid::cell_key(const Array<double>& x, const int a) const
+{
+  CellKey key{0, 0, 0};
+
+  for (int i = 0; i < nsd_; i++) {
+    key[i] = static_cast<int64_t>(std::floor(x(i,a) / cell_size_));
+  }
+
+  return key;
+}
+
+/// @brief Find the points lying in the box [xmin,xmax], including its
+/// boundary.
+//
+void SpatialGrid::find(const Array<double>& x, const Vector<double>& xmin, const Vector<double>& xmax,
+    std::vector<int>& points) const
+{
+  points.clear();
+
+  if (cells_.empty()) {
+    return;
+  }
+
+  auto in_box = [&](const int a) -> bool {
+    for (int i = 0; i < nsd_; i++) {
+      if (x(i,a) < xmin(i) || x(i,a) > xmax(i)) {
+        return false;
+      }
+    }
+    return true;
+  };
+
+  CellKey lo{0, 0, 0};
+  CellKey hi{0, 0, 0};
+  double num_cells = 1.0;
+
+  for (int i = 0; i < nsd_; i++) {
+    lo[i] = static_cast<int64_t>(std::floor(xmin(i) / cell_size_));
+    hi[i] = static_cast<int64_t>(std::floor(xmax(i) / cell_size_));
+    num_cells *= static_cast<double>(hi[i] - lo[i] + 1);
+  }
+
+  // Check all of the cells if the box covers more cells than there are
+  // cells containing points.
+  //
+  if (num_cells > static_cast<double>(cells_.size())) {
+    for (const auto& [key, cell] : cells_) {
+      bool overlap = true;
+      for (int i = 0; i < nsd_; i++) {
+        if (key[i] < lo[i] || key[i] > hi[i]) {
+          overlap = false;
+        }
+      }
+      if (overlap) {
+        for (int a : cell) {
+          if (in_box(a)) {
+            points.push_back(a);
+          }
+        }
+      }
+    }
+    return;
+  }
+
+  CellKey key{0, 0, 0};
+
+  for (key[0] = lo[0]; key[0] <= hi[0]; key[0]++) {
+    for (key[1] = lo[1]; key[1] <= hi[1]; key[1]++) {
+      for (key[2] = lo[2]; key[2] <= hi[2]; key[2]++) {
+        auto it = cells_.find(key);
+        if (it == cells_.end()) {
+          continue;
+        }
+        for (int a : it->second) {
+          if (in_box(a)) {
+            points.push_back(a);
+          }
+        }
+      }
+    }
+  }
+}
+
+/// @brief Remove point 'a' from the list of points of its cell.
+//
+void SpatialGrid::remove_point(const int a)
+{
+  auto it = cells_.find(point_cell_[a]);
+  auto& cell = it->second;
+
+  // Move the last point of the cell into the position of point 'a'.
+  int b = cell.back();
+  cell[point_pos_[a]] = b;
+  point_pos_[b] = point_pos_[a];
+  cell.pop_back();
+
+  if (cell.empty()) {
+    cells_.erase(it);
+  }
+}
+
+/// @brief Move the points x(:,a) whose cell changed since the grid was built
+/// or last updated.
+///
+/// Returns the number of points that were moved.
+//
+int SpatialGrid::update(const Array<double>& x)
+{
+  if (x.nrows() != nsd_ || x.ncols() != size()) {
+    throw std::runtime_error("[SpatialGrid] The points passed to update() do not match the points used to build the grid.");
+  }
+
+  int num_moved = 0;
+
+  for (int a = 0; a < size(); a++) {
+    auto key = cell_key(x, a);
+
+    if (key != point_cell_[a]) {
+      remove_point(a);
+      point_cell_[a] = key;
+      add_point(a);
+      num_moved += 1;
+    }
+  }
+
+  return num_moved;
+}
+
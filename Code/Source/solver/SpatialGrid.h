@@ -0,0 +1,69 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#ifndef SPATIAL_GRID_H
+#define SPATIAL_GRID_H
+
+#include "Array.h"
+#include "Vector.h"
+
+#include <array>
+#include <cstdint>
+#include <unordered_map>
+#include <vector>
+
+/// @brief The SpatialGrid class is a uniform grid hash of a set of points
+/// used to find the points lying in an axis-aligned box.
+///
+/// The points, stored as the columns of an (nsd, nNo) array, are binned into
+/// cubic cells of size 'cell_size'. Only the cells containing points are
+/// stored so the grid does not depend on the extent of the points.
+///
+/// The grid does not keep a copy of the point coordinates, the same array
+/// passed to build() must be passed to update() and find().
+///
+/// When the points are displaced update() only moves the points whose cell
+/// changed, so the grid does not need to be rebuilt when the displacements
+/// change only slightly (e.g. between nonlinear iterations).
+//
+class SpatialGrid {
+  public:
+    SpatialGrid() {}
+
+    void build(const Array<double>& x, const double cell_size);
+    void find(const Array<double>& x, const Vector<double>& xmin, const Vector<double>& xmax,
+        std::vector<int>& points) const;
+    int update(const Array<double>& x);
+
+    double cell_size() const { return cell_size_; }
+    int size() const { return static_cast<int>(point_cell_.size()); }
+
+  private:
+    using CellKey = std::array<int64_t,3>;
+
+    struct CellKeyHash {
+      std::size_t operator()(const CellKey& key) const
+      {
+        uint64_t h = static_cast<uint64_t>(key[0]) * 73856093ULL;
+        h ^= static_cast<uint64_t>(key[1]) * 19349663ULL;
+        h ^= static_cast<uint64_t>(key[2]) * 83492791ULL;
+        return static_cast<std::size_t>(h);
+      }
+    };
+
+    void add_point(const int a);
+    CellKey cell_key(const Array<double>& x, const int a) const;
+    void remove_point(const int a);
+
+    int nsd_ = 0;
+    double cell_size_ = 0.0;
+
+    // The cell of each point and its position in the cell's list of points.
+    std::vector<CellKey> point_cell_;
+    std::vector<int> point_pos_;
+
+    std::unordered_map<CellKey, std::vector<int>, CellKeyHash> cells_;
+};
+
+#endif
+
@@ -82,6 +82,21 @@ void TrilinosLinearAlgebra::assemble(ComMod& com_mod, const int num_elem_nodes,
   }
 }
 
+/// @brief Assemble the local arrays of element 'e' of mesh 'lM'.
+///
+/// The element-to-matrix position map is only used for fsils assembly,
+/// Trilinos assembly sums into its own matrix using global node IDs.
+///
+void TrilinosLinearAlgebra::assemble(ComMod& com_mod, const mshType& lM, const int e, const Vector<int>& eqN,
+        const Array3<double>& lK, const Array<double>& lR)
+{
+  if (use_fsils_assembly) {
+    fsils_solver->assemble(com_mod, lM, e, eqN, lK, lR);
+  } else {
+    impl->assemble(com_mod, lM.eNoN, eqN, lK, lR);
+  }
+}
+
 /// @brief Check the validity of the precondition and assembly options. 
 /// 
 /// Trilinos can use fsils or trilinos for assembly.
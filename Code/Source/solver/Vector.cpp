@@ -8,16 +8,19 @@ template<>
 bool Vector<double>::show_index_check_message = true;
 
 template<>
-double Vector<double>::memory_in_use = 0;
+std::atomic<long> Vector<double>::memory_in_use{0};
 
 template<>
-double Vector<double>::memory_returned = 0;
+std::atomic<long> Vector<double>::memory_returned{0};
 
 template<>
-int Vector<double>::num_allocated = 0;
+std::atomic<int> Vector<double>::num_allocated{0};
 
 template<>
-int Vector<double>::active = 0;
+std::atomic<int> Vector<double>::active{0};
+
+template<>
+std::atomic<long> Vector<double>::num_data_allocations{0};
 
 template<>
 bool Vector<double>::write_enabled = false;
@@ -42,16 +45,19 @@ template<>
 bool Vector<int>::show_index_check_message = true;
 
 template<>
-double Vector<int>::memory_in_use = 0;
+std::atomic<long> Vector<int>::memory_in_use{0};
+
+template<>
+std::atomic<long> Vector<int>::memory_returned{0};
 
 template<>
-double Vector<int>::memory_returned = 0;
+std::atomic<int> Vector<int>::num_allocated{0};
 
 template<>
-int Vector<int>::num_allocated = 0;
+std::atomic<int> Vector<int>::active{0};
 
 template<>
-int Vector<int>::active = 0;
+std::atomic<long> Vector<int>::num_data_allocations{0};
 
 template<>
 bool Vector<int>::write_enabled = false;
@@ -74,16 +80,19 @@ template<>
 bool Vector<Vector<double>>::show_index_check_message = true;
 
 template<>
-double Vector<Vector<double>>::memory_in_use = 0;
+std::atomic<long> Vector<Vector<double>>::memory_in_use{0};
 
 template<>
-double Vector<Vector<double>>::memory_returned = 0;
+std::atomic<long> Vector<Vector<double>>::memory_returned{0};
 
 template<>
-int Vector<Vector<double>>::num_allocated = 0;
+std::atomic<int> Vector<Vector<double>>::num_allocated{0};
 
 template<>
-int Vector<Vector<double>>::active = 0;
+std::atomic<int> Vector<Vector<double>>::active{0};
+
+template<>
+std::atomic<long> Vector<Vector<double>>::num_data_allocations{0};
 
 template<>
 bool Vector<Vector<double>>::write_enabled = false;
@@ -93,16 +102,19 @@ template<>
 bool Vector<float>::show_index_check_message = true;
 
 template<>
-double Vector<float>::memory_in_use = 0;
+std::atomic<long> Vector<float>::memory_in_use{0};
+
+template<>
+std::atomic<long> Vector<float>::memory_returned{0};
 
 template<>
-double Vector<float>::memory_returned = 0;
+std::atomic<int> Vector<float>::num_allocated{0};
 
 template<>
-int Vector<float>::num_allocated = 0;
+std::atomic<int> Vector<float>::active{0};
 
 template<>
-int Vector<float>::active = 0;
+std::atomic<long> Vector<float>::num_data_allocations{0};
 
 template<>
 bool Vector<float>::write_enabled = false;
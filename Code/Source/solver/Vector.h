@@ -5,6 +5,7 @@
 #define VECTOR_H 
 
 #include <algorithm>
+#include <atomic>
 #include <float.h>
 #include <iostream>
 #include <string>
@@ -23,14 +24,17 @@ class Vector
 {
   public:
 
-    static int num_allocated;
-    static int active;
-    static double memory_in_use;
-    static double memory_returned;
+    static std::atomic<int> num_allocated;
+    static std::atomic<int> active;
+    static std::atomic<long> memory_in_use;
+    static std::atomic<long> memory_returned;
     static bool write_enabled;
     static bool show_index_check_message;
     static void memory(const std::string& prefix="");
     static void stats(const std::string& prefix="");
+    /// @brief Number of times memory has been allocated for array data. 
+    /// This is used to check that a section of code does not allocate memory.
+    static std::atomic<long> num_data_allocations;
 
     Vector() 
     {
@@ -167,6 +171,7 @@ class Vector
       memory_in_use += sizeof(T) * size;;
       int new_size = size_ + size;
       T* new_data = new T [new_size];
+      num_data_allocations += 1;
       for (int i = 0; i < size; i++) {
         new_data[i+size_] = value;
       }
@@ -570,6 +575,7 @@ class Vector
       data_ = new T [size_];
       memset(data_, 0, sizeof(T)*(size_));
       memory_in_use += sizeof(T)*size_;
+      num_data_allocations += 1;
     }
 
     void check_index(const int i) const
@@ -6,11 +6,13 @@
 #include "DebugMsg.h"
 
 #include <vtkDoubleArray.h>
+#include <vtkFloatArray.h>
 #include "vtkCellArray.h"
 #include "vtkCellData.h"
 #include <vtkGenericCell.h>
 #include <vtkIntArray.h>
 #include <vtkPointData.h>
+#include <vtkPoints.h>
 #include <vtkPolyData.h>
 #include <vtkSmartPointer.h>
 #include <vtkUnsignedCharArray.h>
@@ -19,9 +21,163 @@
 #include <vtkXMLPolyDataWriter.h>
 #include <vtkXMLUnstructuredGridReader.h>
 #include <vtkXMLUnstructuredGridWriter.h>
+#include <vtkXMLWriter.h>
+#include <algorithm>
 #include <string>
 #include <map>
 
+//-------------------
+// set_writer_options
+//-------------------
+// Set the data mode and compression of a VTK XML writer from 
+// VtkData::write_options.
+//
+static void set_writer_options(vtkXMLWriter* writer)
+{
+  const auto& options = VtkData::write_options;
+
+  if (options.data_mode == "ascii") {
+    writer->SetDataModeToAscii();
+  } else if (options.data_mode == "binary") {
+    writer->SetDataModeToBinary();
+  } else if (options.data_mode == "appended") {
+    writer->SetDataModeToAppended();
+  } else if (options.data_mode == "appended_raw") {
+    writer->SetDataModeToAppended();
+    writer->EncodeAppendedDataOff();
+  }
+
+  if (options.compressor == "none") {
+    writer->SetCompressorTypeToNone();
+  } else if (options.compressor == "zlib") {
+    writer->SetCompressorTypeToZLib();
+  } else if (options.compressor == "lz4") {
+    writer->SetCompressorTypeToLZ4();
+  } else if (options.compressor == "lzma") {
+    writer->SetCompressorTypeToLZMA();
+  }
+
+  if (options.compression_level > 0) {
+    writer->SetCompressionLevel(options.compression_level);
+  }
+}
+
+//-------------------
+// copy_to_vtk_array
+//-------------------
+// Copy an Array into a VTK data array.
+//
+// Array data is stored in column-major order with the components of each
+// tuple stored in a column, the same layout as the array-of-structures
+// storage used by vtkDoubleArray, vtkFloatArray and vtkIntArray, so the
+// values are copied in a single pass rather than one component at a time
+// using virtual SetComponent() calls.
+//
+// The values are copied rather than wrapped using SetArray() because the
+// Arrays passed to the set_*_data() methods are often reused for the next
+// data set before the file is written.
+//
+template<typename T, typename VtkArrayType>
+static void copy_to_vtk_array(const std::string& data_name, const Array<T>& data, VtkArrayType* data_array)
+{
+  int num_vals = data.ncols();
+  int num_comp = data.nrows();
+  data_array->SetNumberOfComponents(num_comp);
+  data_array->SetNumberOfTuples(num_vals);
+  data_array->SetName(data_name.c_str());
+
+  auto values = data_array->WritePointer(0, data.size());
+  std::copy(data.data(), data.data() + data.size(), values);
+}
+
+//---------------------
+// copy_from_vtk_array
+//---------------------
+// Copy the values of a VTK data array into an Array with a row for each
+// component.
+//
+// The values are copied in a single pass if the Array has the same number
+// of rows as the VTK data array has components.
+//
+template<typename T, typename VtkArrayType>
+static void copy_from_vtk_array(VtkArrayType* vtk_data, Array<T>& data)
+{
+  int num_data = vtk_data->GetNumberOfTuples();
+  int num_comp = vtk_data->GetNumberOfComponents();
+  auto values = vtk_data->GetPointer(0);
+
+  if (data.nrows() == num_comp) {
+    std::copy(values, values + num_data*num_comp, data.data());
+    return;
+  }
+
+  for (int i = 0; i < num_data; i++) {
+    for (int j = 0; j < num_comp; j++) {
+      data(j, i) = values[i*num_comp + j];
+    }
+  }
+}
+
+//-----------------
+// copy_vtk_points
+//-----------------
+// Copy the coordinates of VTK points into an Array with 3 rows.
+//
+static void copy_vtk_points(vtkPoints* vtk_points, Array<double>& points)
+{
+  auto num_points = vtk_points->GetNumberOfPoints();
+
+  if (points.nrows() == 3) {
+    if (auto coords = vtkDoubleArray::SafeDownCast(vtk_points->GetData())) {
+      copy_from_vtk_array(coords, points);
+      return;
+    }
+    if (auto coords = vtkFloatArray::SafeDownCast(vtk_points->GetData())) {
+      copy_from_vtk_array(coords, points);
+      return;
+    }
+  }
+
+  double point[3];
+  for (int i = 0; i < num_points; i++) {
+    vtk_points->GetPoint(i, point);
+    points(0,i) = point[0];
+    points(1,i) = point[1];
+    points(2,i) = point[2];
+  }
+}
+
+//----------------
+// new_vtk_points
+//----------------
+// Create VTK points from an Array of 3D coordinates.
+//
+// The coordinates are stored as floats, the default data type of vtkPoints,
+// in an array named "Points" like the one created by vtkPoints.
+//
+static vtkSmartPointer<vtkPoints> new_vtk_points(const Array<double>& points)
+{
+  auto node_coords = vtkSmartPointer<vtkPoints>::New();
+  auto coords = vtkSmartPointer<vtkFloatArray>::New();
+
+  if (points.nrows() == 3) {
+    copy_to_vtk_array("Points", points, coords.GetPointer());
+  } else {
+    int num_coords = points.ncols();
+    coords->SetNumberOfComponents(3);
+    coords->SetNumberOfTuples(num_coords);
+    coords->SetName("Points");
+    for (int i = 0; i < num_coords; i++) {
+      for (int j = 0; j < 3; j++) {
+        coords->SetValue(3*i + j, (j < points.nrows()) ? points(j,i) : 0.0);
+      }
+    }
+  }
+
+  node_coords->SetData(coords);
+  return node_coords;
+}
+
 /////////////////////////////////////////////////////////////////
 //        I n t e r n a l   I m p l e m e n t a t i o n        //
 /////////////////////////////////////////////////////////////////
@@ -227,22 +383,17 @@ void VtkVtpData::VtkVtpDataImpl::set_points(const Array<double>& points)
   dmsg << "[VtkVtpData.set_points] num_coords: " << num_coords;
   #endif
 
-  auto node_coords = vtkSmartPointer<vtkPoints>::New();
-  node_coords->Allocate(num_coords, 1000);
-  node_coords->SetNumberOfPoints(num_coords);
-
   auto node_ids = vtkSmartPointer<vtkIntArray>::New();
   node_ids->SetNumberOfComponents(1);
-  node_ids->Allocate(num_coords,1000);
   node_ids->SetNumberOfTuples(num_coords);
   node_ids->SetName("GlobalNodeID");
 
+  auto ids = node_ids->GetPointer(0);
   for (int i = 0; i < num_coords; i++ ) {
-    node_coords->SetPoint(i, points(0,i), points(1,i), points(2,i));
-    node_ids->SetTuple1(i,i+1);
+    ids[i] = i+1;
   }
 
-  vtk_polydata->SetPoints(node_coords);
+  vtk_polydata->SetPoints(new_vtk_points(points));
   vtk_polydata->GetPointData()->AddArray(node_ids);
 }
 
@@ -255,6 +406,7 @@ void VtkVtpData::VtkVtpDataImpl::write(const std::string& file_name)
   auto writer = vtkSmartPointer<vtkXMLPolyDataWriter>::New();
   writer->SetInputDataObject(vtk_polydata);
   writer->SetFileName(file_name.c_str());
+  set_writer_options(writer);
   writer->Write();
 }
 
@@ -281,20 +433,17 @@ class VtkVtuData::VtkVtuDataImpl {
     template<typename T1, typename T2>
     void set_element_data(const std::string& data_name, const T1& data, T2& data_array)
     {
-      int num_vals = data.ncols();
-      int num_comp = data.nrows();
-      data_array->SetNumberOfComponents(num_comp);
-      data_array->Allocate(num_vals,1000);
-      data_array->SetNumberOfTuples(num_vals);
-      data_array->SetName(data_name.c_str());
-      for (int i = 0; i < num_vals; i++) {
-        for (int j = 0; j < num_comp; j++) {
-          data_array->SetComponent(i, j, data(j,i));
-        }
-      }
+      copy_to_vtk_array(data_name, data, data_array.GetPointer());
       vtk_ugrid->GetCellData()->AddArray(data_array);
     };
 
+    template<typename T1, typename T2>
+    void set_point_data(const std::string& data_name, const T1& data, T2& data_array)
+    {
+      copy_to_vtk_array(data_name, data, data_array.GetPointer());
+      vtk_ugrid->GetPointData()->AddArray(data_array);
+    };
+
     vtkSmartPointer<vtkUnstructuredGrid> vtk_ugrid;
     int elem_type;
     int num_elems;
@@ -465,42 +614,14 @@ void VtkVtuData::VtkVtuDataImpl::set_element_data(const std::string& data_name,
 //
 void VtkVtuData::VtkVtuDataImpl::set_point_data(const std::string& data_name, const Array<double>& data)
 {
-  int num_vals = data.ncols();
-  int num_comp = data.nrows();
-
   auto data_array = vtkSmartPointer<vtkDoubleArray>::New();
-  data_array->SetNumberOfComponents(num_comp);
-  data_array->Allocate(num_vals,1000);
-  data_array->SetNumberOfTuples(num_vals);
-  data_array->SetName(data_name.c_str());
-
-  for (int i = 0; i < num_vals; i++) {
-    for (int j = 0; j < num_comp; j++) {
-      data_array->SetComponent(i, j, data(j,i));
-    }
-  }
-
-  vtk_ugrid->GetPointData()->AddArray(data_array);
+  set_point_data(data_name, data, data_array);
 }
 
 void VtkVtuData::VtkVtuDataImpl::set_point_data(const std::string& data_name, const Array<int>& data)
 {
-  int num_vals = data.ncols();
-  int num_comp = data.nrows();
-
   auto data_array = vtkSmartPointer<vtkIntArray>::New();
-  data_array->SetNumberOfComponents(num_comp);
-  data_array->Allocate(num_vals,1000);
-  data_array->SetNumberOfTuples(num_vals);
-  data_array->SetName(data_name.c_str());
-
-  for (int i = 0; i < num_vals; i++) {
-    for (int j = 0; j < num_comp; j++) {
-      data_array->SetComponent(i, j, data(j,i));
-    }
-  }
-
-  vtk_ugrid->GetPointData()->AddArray(data_array);
+  set_point_data(data_name, data, data_array);
 }
 
 void VtkVtuData::VtkVtuDataImpl::set_point_data(const std::string& data_name, const Vector<int>& data)
@@ -512,18 +633,7 @@ void VtkVtuData::VtkVtuDataImpl::set_point_data(const std::string& data_name, co
 //
 void VtkVtuData::VtkVtuDataImpl::set_points(const Array<double>& points)
 {
-  int num_coords = points.ncols();
-  auto node_coords = vtkSmartPointer<vtkPoints>::New();
-  node_coords->Allocate(num_coords ,1000);
-  node_coords->SetNumberOfPoints(num_coords);
-  //std::cout << "[VtkVtuData.set_points] " << std::endl;
-  //std::cout << "[VtkVtuData.set_points] num_coords: " << num_coords << std::endl;
-
-  for (int i = 0; i < num_coords; i++ ) {
-    node_coords->SetPoint(i, points(0,i), points(1,i), points(2,i)); 
-  }
-
-  vtk_ugrid->SetPoints(node_coords);
+  vtk_ugrid->SetPoints(new_vtk_points(points));
 }
 
 void VtkVtuData::VtkVtuDataImpl::write(const std::string& file_name)
@@ -531,6 +641,7 @@ void VtkVtuData::VtkVtuDataImpl::write(const std::string& file_name)
   auto writer = vtkSmartPointer<vtkXMLUnstructuredGridWriter>::New();
   writer->SetInputDataObject(vtk_ugrid);
   writer->SetFileName(file_name.c_str());
+  set_writer_options(writer);
   writer->Write();
 }
 
@@ -538,6 +649,8 @@ void VtkVtuData::VtkVtuDataImpl::write(const std::string& file_name)
 //          V t k D a t a     I m p l e m e n t a t i o n      //
 /////////////////////////////////////////////////////////////////
 
+VtkWriteOptions VtkData::write_options;
+
 VtkData::VtkData()
 {
 }
@@ -567,6 +680,31 @@ VtkData* VtkData::create_writer(const std::string& file_name)
   }
 }
 
+/// @brief Set the options used by all VTK XML file writers.
+//
+void VtkData::set_write_options(const VtkWriteOptions& options)
+{
+  const std::set<std::string> data_modes{"", "ascii", "binary", "appended", "appended_raw"};
+  const std::set<std::string> compressors{"", "none", "zlib", "lz4", "lzma"};
+
+  if (data_modes.count(options.data_mode) == 0) {
+    throw std::runtime_error("Unknown VTK file data mode '" + options.data_mode + 
+        "'. Valid data modes are: ascii, binary, appended or appended_raw.");
+  }
+
+  if (compressors.count(options.compressor) == 0) {
+    throw std::runtime_error("Unknown VTK file compressor '" + options.compressor + 
+        "'. Valid compressors are: none, zlib, lz4 or lzma.");
+  }
+
+  if ((options.compression_level < 0) || (options.compression_level > 9)) {
+    throw std::runtime_error("The VTK file compression level " + std::to_string(options.compression_level) + 
+        " is not between 0 and 9.");
+  }
+
+  write_options = options;
+}
+
 //void VtkData::write(const std::string& file_name)
 //{
 //}
@@ -643,15 +781,8 @@ void VtkVtpData::copy_point_data(const std::string& data_name, Array<double>& me
     return; 
   }
 
-  int num_comp = vtk_data->GetNumberOfComponents();
-
   // Set the data.
-  for (int i = 0; i < num_data; i++) {
-    auto tuple = vtk_data->GetTuple(i);
-    for (int j = 0; j < num_comp; j++) {
-      mesh_data(j, i) = tuple[j];
-    }
-  }
+  copy_from_vtk_array(vtk_data, mesh_data);
 }
 
 void VtkVtpData::copy_point_data(const std::string& data_name, Vector<double>& mesh_data)
@@ -666,12 +797,9 @@ void VtkVtpData::copy_point_data(const std::string& data_name, Vector<double>& m
     return; 
   }
 
-  int num_comp = vtk_data->GetNumberOfComponents();
-
   // Set the data.
-  for (int i = 0; i < num_data; i++) {
-    mesh_data(i) = vtk_data->GetValue(i);
-  }
+  auto values = vtk_data->GetPointer(0);
+  std::copy(values, values + num_data, mesh_data.data());
 }
 
 void VtkVtpData::copy_point_data(const std::string& data_name, Vector<int>& mesh_data)
@@ -686,31 +814,16 @@ void VtkVtpData::copy_point_data(const std::string& data_name, Vector<int>& mesh
     return;
   }
 
-  int num_comp = vtk_data->GetNumberOfComponents();
-
   // Set the data.
-  for (int i = 0; i < num_data; i++) {
-    mesh_data(i) = vtk_data->GetValue(i);
-  }
+  auto values = vtk_data->GetPointer(0);
+  std::copy(values, values + num_data, mesh_data.data());
 }
 
 /// @brief Copy points into the given array.
 //
 void VtkVtpData::copy_points(Array<double>& points)
 {
-  auto vtk_points = impl->vtk_polydata->GetPoints();
-  auto num_points = vtk_points->GetNumberOfPoints();
-  Array<double> points_array(3, num_points);
-
-  double point[3];
-  for (int i = 0; i < num_points; i++) {
-    vtk_points->GetPoint(i, point);
-    points(0,i) = point[0];
-    points(1,i) = point[1];
-    points(2,i) = point[2];
-  }
-
-  return;
+  copy_vtk_points(impl->vtk_polydata->GetPoints(), points);
 }
 
 /// @brief Get an array of point data from an unstructured grid.
@@ -731,10 +844,10 @@ Array<double> VtkVtpData::get_point_data(const std::string& data_name)
 
   // Set the data.
   Array<double> data(num_data, num_comp);
+  auto values = vtk_data->GetPointer(0);
   for (int i = 0; i < num_data; i++) {
-    auto tuple = vtk_data->GetTuple(i);
     for (int j = 0; j < num_comp; j++) {
-      data(i, j) = tuple[j];
+      data(i, j) = values[i*num_comp + j];
     }
   }
 
@@ -763,13 +876,7 @@ Array<double> VtkVtpData::get_points() const
   auto num_points = vtk_points->GetNumberOfPoints();
   Array<double> points_array(3, num_points);
 
-  double point[3];
-  for (int i = 0; i < num_points; i++) {
-    vtk_points->GetPoint(i, point);
-    points_array(0,i) = point[0];
-    points_array(1,i) = point[1];
-    points_array(2,i) = point[2];
-  }
+  copy_vtk_points(vtk_points, points_array);
 
   return points_array;
 }
@@ -926,15 +1033,8 @@ void VtkVtuData::copy_point_data(const std::string& data_name, Array<double>& me
     return; 
   }
 
-  int num_comp = vtk_data->GetNumberOfComponents();
-
   // Set the data.
-  for (int i = 0; i < num_data; i++) {
-    auto tuple = vtk_data->GetTuple(i);
-    for (int j = 0; j < num_comp; j++) {
-      mesh_data(j, i) = tuple[j];
-    }
-  }
+  copy_from_vtk_array(vtk_data, mesh_data);
 }
 
 void VtkVtuData::copy_point_data(const std::string& data_name, Vector<double>& mesh_data)
@@ -949,12 +1049,9 @@ void VtkVtuData::copy_point_data(const std::string& data_name, Vector<double>& m
     return;
   }
 
-  int num_comp = vtk_data->GetNumberOfComponents();
-
   // Set the data.
-  for (int i = 0; i < num_data; i++) {
-    mesh_data[i] = vtk_data->GetValue(i);
-  }
+  auto values = vtk_data->GetPointer(0);
+  std::copy(values, values + num_data, mesh_data.data());
 }
 
 void VtkVtuData::copy_point_data(const std::string& data_name, Vector<int>& mesh_data)
@@ -969,31 +1066,16 @@ void VtkVtuData::copy_point_data(const std::string& data_name, Vector<int>& mesh
     return;
   }
 
-  int num_comp = vtk_data->GetNumberOfComponents();
-
   // Set the data.
-  for (int i = 0; i < num_data; i++) {
-    mesh_data[i] = vtk_data->GetValue(i);
-  }
+  auto values = vtk_data->GetPointer(0);
+  std::copy(values, values + num_data, mesh_data.data());
 }
 
 /// @brief Copy points into the given array.
 //
 void VtkVtuData::copy_points(Array<double>& points)
-{ 
-  auto vtk_points = impl->vtk_ugrid->GetPoints();
-  auto num_points = vtk_points->GetNumberOfPoints();
-  Array<double> points_array(3, num_points);
-  
-  double point[3];
-  for (int i = 0; i < num_points; i++) {
-    vtk_points->GetPoint(i, point);
-    points(0,i) = point[0];
-    points(1,i) = point[1];
-    points(2,i) = point[2];
-  } 
-  
-  return;
+{
+  copy_vtk_points(impl->vtk_ugrid->GetPoints(), points);
 }
 
 bool VtkVtuData::has_point_data(const std::string& data_name)
@@ -1027,10 +1109,10 @@ Array<double> VtkVtuData::get_point_data(const std::string& data_name)
 
   // Set the data.
   Array<double> data(num_data, num_comp);
+  auto values = vtk_data->GetPointer(0);
   for (int i = 0; i < num_data; i++) {
-    auto tuple = vtk_data->GetTuple(i);
     for (int j = 0; j < num_comp; j++) {
-      data(i, j) = tuple[j];
+      data(i, j) = values[i*num_comp + j];
     }
   }
 
@@ -1043,13 +1125,7 @@ Array<double> VtkVtuData::get_points() const
   auto num_points = vtk_points->GetNumberOfPoints();
   Array<double> points_array(3, num_points);
 
-  double point[3];
-  for (int i = 0; i < num_points; i++) {
-    vtk_points->GetPoint(i, point);
-    points_array(0,i) = point[0];
-    points_array(1,i) = point[1];
-    points_array(2,i) = point[2];
-  }
+  copy_vtk_points(vtk_points, points_array);
 
   return points_array;
 }
@@ -1087,8 +1163,13 @@ void VtkVtuData::set_connectivity(const int nsd, const Array<int>& conn, const i
 
 void VtkVtuData::set_element_data(const std::string& data_name, const Array<double>& data)
 {
-  auto data_array = vtkSmartPointer<vtkDoubleArray>::New();
-  impl->set_element_data(data_name, data, data_array); 
+  if (write_options.float32_data.count(data_name) != 0) {
+    auto data_array = vtkSmartPointer<vtkFloatArray>::New();
+    impl->set_element_data(data_name, data, data_array); 
+  } else {
+    auto data_array = vtkSmartPointer<vtkDoubleArray>::New();
+    impl->set_element_data(data_name, data, data_array); 
+  }
   //impl->set_element_data(data_name, data);
 }
 
@@ -1101,7 +1182,12 @@ void VtkVtuData::set_element_data(const std::string& data_name, const Array<int>
 
 void VtkVtuData::set_point_data(const std::string& data_name, const Array<double>& data)
 {
-  impl->set_point_data(data_name, data);
+  if (write_options.float32_data.count(data_name) != 0) {
+    auto data_array = vtkSmartPointer<vtkFloatArray>::New();
+    impl->set_point_data(data_name, data, data_array);
+  } else {
+    impl->set_point_data(data_name, data);
+  }
 }
 
 void VtkVtuData::set_point_data(const std::string& data_name, const Array<int>& data)
@@ -7,8 +7,30 @@
 #include "Array.h"
 #include "Vector.h"
 
+#include <set>
 #include <string>
 
+/// @brief Options used by the VTK XML file writers. The VTK writer
+/// defaults are used for options that are not set.
+//
+class VtkWriteOptions {
+  public:
+    /// @brief Data mode: ascii, binary, appended or appended_raw (appended
+    /// binary data that is not base64 encoded)
+    std::string data_mode;
+
+    /// @brief Compressor: none, zlib, lz4 or lzma
+    std::string compressor;
+
+    /// @brief Compression level from 1 (fastest) to 9 (smallest), 0 uses
+    /// the compressor default
+    int compression_level = 0;
+
+    /// @brief Names of the point and element data arrays written in single
+    /// precision
+    std::set<std::string> float32_data;
+};
+
 class VtkData {
   public:
     VtkData();
@@ -41,8 +63,12 @@ class VtkData {
 
     static VtkData* create_reader(const std::string& file_name);
     static VtkData* create_writer(const std::string& file_name);
+    static void set_write_options(const VtkWriteOptions& options);
 
     std::string file_name;
+
+    /// @brief Options used by all writers, set by set_write_options()
+    static VtkWriteOptions write_options;
 };
 
 class VtkVtpData : public VtkData {
@@ -0,0 +1,126 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#include "VtkWriteQueue.h"
+
+#include <algorithm>
+#include <iostream>
+
+VtkWriteQueue::VtkWriteQueue(const int max_pending) : max_pending_(std::max(max_pending, 1))
+{
+}
+
+/// @brief Write the remaining objects and stop the writer thread.
+//
+VtkWriteQueue::~VtkWriteQueue()
+{
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    stop_ = true;
+  }
+  cond_.notify_all();
+
+  if (thread_.joinable()) {
+    thread_.join();
+  }
+
+  if (error_) {
+    try {
+      std::rethrow_exception(error_);
+    } catch (const std::exception& exception) {
+      std::cerr << "[VtkWriteQueue] ERROR: Writing a VTK file failed: " << exception.what() << std::endl;
+    } catch (...) {
+      std::cerr << "[VtkWriteQueue] ERROR: Writing a VTK file failed." << std::endl;
+    }
+  }
+}
+
+/// @brief Rethrow an exception thrown by the writer thread.
+///
+/// The mutex must be locked.
+//
+void VtkWriteQueue::check_error()
+{
+  if (error_) {
+    auto error = error_;
+    error_ = nullptr;
+    std::rethrow_exception(error);
+  }
+}
+
+/// @brief Wait until all objects have been written.
+//
+void VtkWriteQueue::flush()
+{
+  std::unique_lock<std::mutex> lock(mutex_);
+  cond_.wait(lock, [this] { return queue_.empty() && !writing_; });
+  check_error();
+}
+
+/// @brief Add an object to be written, the queue takes ownership of it.
+//
+void VtkWriteQueue::push(VtkData* vtk_data)
+{
+  std::unique_lock<std::mutex> lock(mutex_);
+  cond_.wait(lock, [this] { return static_cast<int>(queue_.size()) < max_pending_; });
+
+  try {
+    check_error();
+  } catch (...) {
+    delete vtk_data;
+    throw;
+  }
+
+  queue_.push_back(vtk_data);
+
+  if (!thread_.joinable()) {
+    thread_ = std::thread(&VtkWriteQueue::run, this);
+  }
+
+  lock.unlock();
+  cond_.notify_all();
+}
+
+/// @brief The writer thread loop.
+//
+void VtkWriteQueue::run()
+{
+  while (true) {
+    VtkData* vtk_data = nullptr;
+
+    {
+      std::unique_lock<std::mutex> lock(mutex_);
+      cond_.wait(lock, [this] { return stop_ || !queue_.empty(); });
+
+      if (queue_.empty()) {
+        return;
+      }
+
+      vtk_data = queue_.front();
+      queue_.pop_front();
+      writing_ = true;
+    }
+
+    // Don't keep the mutex while writing.
+    std::exception_ptr error;
+
+    try {
+      vtk_data->write();
+    } catch (...) {
+      error = std::current_exception();
+    }
+
+    delete vtk_data;
+
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      writing_ = false;
+      if (error && !error_) {
+        error_ = error;
+      }
+    }
+
+    cond_.notify_all();
+  }
+}
+
@@ -0,0 +1,56 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#ifndef VTK_WRITE_QUEUE_H
+#define VTK_WRITE_QUEUE_H
+
+#include "VtkData.h"
+
+#include <condition_variable>
+#include <deque>
+#include <exception>
+#include <mutex>
+#include <thread>
+
+/// @brief The VtkWriteQueue class writes VtkData objects to their files on a
+/// background thread so the solver can continue while the files are encoded
+/// and written.
+///
+/// The VtkData objects passed to push() must contain a copy of all the data
+/// to write, they are written in the order they were pushed and are deleted
+/// after they are written. push() waits if there are already 'max_pending'
+/// objects waiting to be written. flush() waits until all objects have been
+/// written.
+///
+/// An exception thrown when writing a file is rethrown by the next call
+/// to push() or flush().
+//
+class VtkWriteQueue {
+  public:
+    VtkWriteQueue(const int max_pending = 2);
+    ~VtkWriteQueue();
+
+    VtkWriteQueue(const VtkWriteQueue&) = delete;
+    VtkWriteQueue& operator=(const VtkWriteQueue&) = delete;
+
+    void flush();
+    void push(VtkData* vtk_data);
+
+  private:
+    void check_error();
+    void run();
+
+    int max_pending_;
+    bool stop_ = false;
+    bool writing_ = false;
+
+    std::deque<VtkData*> queue_;
+    std::exception_ptr error_;
+
+    std::mutex mutex_;
+    std::condition_variable cond_;
+    std::thread thread_;
+};
+
+#endif
+
@@ -669,6 +669,53 @@ double integ(const ComMod& com_mod, const CmMod& cm_mod, int dId, const Array<do
   return result;
 }
 
+/// @brief Return the geometry at the Gauss points of the face lFa in the
+/// reference configuration for the function space iFs, computing it the
+/// first time it is used.
+///
+/// The area-weighted normals computed by nn::gnnb() in the reference
+/// configuration only depend on the mesh coordinates, so they are cached
+/// for the face integrals computed every nonlinear iteration. The cache
+/// must not be used if the mesh moves (com_mod.mvMsh).
+//
+static const faceGeomType& face_geom(const ComMod& com_mod, const faceType& lFa, const int iFs, const int nG,
+    const int eNoN, const Vector<double>& w, const Array3<double>& Nx)
+{
+  using namespace consts;
+
+  int nsd = com_mod.nsd;
+
+  if (static_cast<int>(lFa.geom.size()) <= iFs) {
+    lFa.geom.resize(iFs+1);
+  }
+
+  auto& geom = lFa.geom[iFs];
+
+  if ((lFa.nEl == 0) || (geom.wJ.nrows() == nG && geom.wJ.ncols() == lFa.nEl)) {
+    return geom;
+  }
+
+  geom.n.resize(nsd, nG, lFa.nEl);
+  geom.wJ.resize(nG, lFa.nEl);
+  Vector<double> n(nsd);
+
+  for (int e = 0; e < lFa.nEl; e++) {
+    for (int g = 0; g < nG; g++) {
+      auto Nx_g = Nx.slice(g);
+      nn::gnnb(com_mod, lFa, e, g, nsd, nsd-1, eNoN, Nx_g, n, MechanicalConfigurationType::reference);
+
+      for (int i = 0; i < nsd; i++) {
+        geom.n(i,g,e) = n(i);
+      }
+
+      double Jac = sqrt(utils::norm(n));
+      geom.wJ(g,e) = Jac*w(g);
+    }
+  }
+
+  return geom;
+}
+
 /// @brief This routine integrate a scalar field s over the face lFa.
 ///
 /// Reproduces 'FUNCTION IntegS(lFa, s, pflag)'.
@@ -780,6 +827,16 @@ double integ(const ComMod& com_mod, const CmMod& cm_mod, const faceType& lFa, co
   dmsg << "fs.w: " << fs.w;
   #endif
 
+  // Use the cached geometry for the reference configuration if the mesh
+  // does not move.
+  //
+  const faceGeomType* geom = nullptr;
+
+  if (!isIB && !com_mod.mvMsh && (cfg == MechanicalConfigurationType::reference) &&
+      (fs.eType != ElementType::NRB) && (insd == nsd-1)) {
+    geom = &face_geom(com_mod, lFa, flag ? 1 : 0, fs.nG, fs.eNoN, fs.w, fs.Nx);
+  }
+
   // Initialize integral to 0
   double result = 0.0;
 
@@ -799,15 +856,22 @@ double integ(const ComMod& com_mod, const CmMod& cm_mod, const faceType& lFa, co
 
     // Loop over the Gauss points
     for (int g = 0; g < fs.nG; g++) {
-      Vector<double> n(nsd);
-      if (!isIB) {
-        // Get normal vector in cfg configuration
-        auto Nx = fs.Nx.slice(g);
-        nn::gnnb(com_mod, lFa, e, g, nsd, insd, fs.eNoN, Nx, n, cfg);
-      }
+      double wJ = 0.0;
 
-      // Calculating the Jacobian (encodes area of face element)
-      double Jac = sqrt(utils::norm(n));
+      if (geom != nullptr) {
+        wJ = geom->wJ(g,e);
+      } else {
+        Vector<double> n(nsd);
+        if (!isIB) {
+          // Get normal vector in cfg configuration
+          auto Nx = fs.Nx.slice(g);
+          nn::gnnb(com_mod, lFa, e, g, nsd, insd, fs.eNoN, Nx, n, cfg);
+        }
+
+        // Calculating the Jacobian (encodes area of face element)
+        double Jac = sqrt(utils::norm(n));
+        wJ = Jac*fs.w(g);
+      }
 
       // Calculating the function value at Gauss point
       double sHat = 0.0;
@@ -817,7 +881,7 @@ double integ(const ComMod& com_mod, const CmMod& cm_mod, const faceType& lFa, co
       }
 
       // Now integrating
-      result = result + Jac*fs.w(g)*sHat;
+      result = result + wJ*sHat;
      }
   }
 
@@ -901,6 +965,16 @@ double integ(const ComMod& com_mod, const CmMod& cm_mod, const faceType& lFa,
     }
   }
 
+  // Use the cached geometry for the reference configuration if the mesh
+  // does not move.
+  //
+  const faceGeomType* geom = nullptr;
+
+  if (!isIB && !com_mod.mvMsh && (cfg == MechanicalConfigurationType::reference) &&
+      (lFa.eType != ElementType::NRB)) {
+    geom = &face_geom(com_mod, lFa, 0, lFa.nG, lFa.eNoN, lFa.w, lFa.Nx);
+  }
+
   // Initialize integral to 0
   double result =  0.0;
 
@@ -920,7 +994,11 @@ double integ(const ComMod& com_mod, const CmMod& cm_mod, const faceType& lFa,
     for (int g = 0; g < lFa.nG; g++) {
       //dmsg << ">>> g: " << g+1;
       Vector<double> n(nsd);
-      if (!isIB) {
+      if (geom != nullptr) {
+        for (int i = 0; i < nsd; i++) {
+          n(i) = geom->n(i,g,e);
+        }
+      } else if (!isIB) {
         // Get normal vector in cfg configuration
         auto Nx = lFa.Nx.slice(g);
         nn::gnnb(com_mod, lFa, e, g, nsd, nsd-1, lFa.eNoN, Nx, n, cfg);
@@ -555,7 +555,7 @@ void construct_cep(ComMod& com_mod, CepMod& cep_mod, const mshType& lM, const Ar
     } 
 
     // Assembly
-    eq.linear_algebra->assemble(com_mod, eNoN, ptr, lK, lR);
+    eq.linear_algebra->assemble(com_mod, lM, e, ptr, lK, lR);
   }
 
   // Communications among processors for ECG leads computation
@@ -6,6 +6,9 @@
 #include "all_fun.h"
 #include "post.h"
 #include "utils.h"
+
+#include <algorithm>
+#include <map>
 #include <math.h>
 
 namespace cep_ion {
@@ -41,6 +44,8 @@ void cep_init(Simulation* simulation)
       continue;
     }
 
+    cep_init_lookup_tables(simulation, eq);
+
     if (com_mod.dmnId.size() != 0) {
       Vector<double> sA(tnNo); 
       Array<double> sF(nXion,tnNo);
@@ -110,6 +115,98 @@ void cep_init(Simulation* simulation)
   }
 }
 
+//-----------------------------
+// check_lookup_table_settings
+//-----------------------------
+// Check that all the domains of equation 'eq' using the same ionic model
+// have the same lookup table resolution.
+//
+// The lookup tables of a model are shared by all the domains using it so
+// a domain would otherwise use tables set for another domain.
+//
+void check_lookup_table_settings(const eqType& eq)
+{
+  using namespace consts;
+  std::map<ElectrophysiologyModelType, double> model_resolution;
+
+  for (int iDmn = 0; iDmn < eq.nDmn; iDmn++) {
+    const auto& cep = eq.dmn[iDmn].cep;
+    if ((eq.dmn[iDmn].phys != EquationType::phys_CEP) || ((cep.cepType != ElectrophysiologyModelType::TTP) &&
+        (cep.cepType != ElectrophysiologyModelType::BO))) {
+      continue;
+    }
+
+    auto entry = model_resolution.find(cep.cepType);
+    if (entry == model_resolution.end()) {
+      model_resolution[cep.cepType] = cep.lutResolution;
+    } else if (entry->second != cep.lutResolution) {
+      std::string model_name = (cep.cepType == ElectrophysiologyModelType::TTP) ? "tenTusscher-Panfilov" : "Bueno-Orovio";
+      throw std::runtime_error("[check_lookup_table_settings] The domains using the " + model_name +
+          " ionic model must all have the same Lookup_table_resolution because the lookup tables of a model " +
+          "are shared by all domains.");
+    }
+  }
+}
+
+//------------------------
+// cep_init_lookup_tables
+//------------------------
+// Build the lookup tables of the ionic models used by the domains of
+// equation 'eq'.
+//
+// A model is shared by all the domains using it so its tables are built
+// using the resolution and time step of the first of these domains.
+//
+void cep_init_lookup_tables(Simulation* simulation, eqType& eq)
+{
+  using namespace consts;
+  auto& com_mod = simulation->com_mod;
+  auto& cep_mod = simulation->cep_mod;
+  auto& logger = simulation->logger;
+
+  check_lookup_table_settings(eq);
+
+  for (int iDmn = 0; iDmn < eq.nDmn; iDmn++) {
+    auto& cep = eq.dmn[iDmn].cep;
+    if ((eq.dmn[iDmn].phys != EquationType::phys_CEP) || (cep.lutResolution <= 0.0)) {
+      continue;
+    }
+
+    std::string model_name;
+    std::vector<double> errors;
+
+    if (cep.cepType == ElectrophysiologyModelType::TTP) {
+      if (cep_mod.ttp.gate_table.is_built()) {
+        continue;
+      }
+      model_name = "tenTusscher-Panfilov";
+      cep_mod.ttp.init_lookup_tables(cep.lutResolution, cep.dt);
+      if (cep.lutValidate) {
+        errors = cep_mod.ttp.lookup_table_errors();
+      }
+
+    } else if (cep.cepType == ElectrophysiologyModelType::BO) {
+      if (cep_mod.bo.lookup_table.is_built()) {
+        continue;
+      }
+      model_name = "Bueno-Orovio";
+      cep_mod.bo.init_lookup_table(cep.lutResolution);
+      if (cep.lutValidate) {
+        errors = cep_mod.bo.lookup_table_errors();
+      }
+
+    } else {
+      continue;
+    }
+
+    if (!errors.empty() && com_mod.cm.mas(simulation->cm_mod)) {
+      double max_error = *std::max_element(errors.begin(), errors.end());
+      logger << "The " << model_name << " model lookup tables with a resolution of " << cep.lutResolution
+             << " mV have a maximum relative error of " << max_error << "." << std::endl;
+    }
+  }
+}
+
 //------------
 // cep_init_l
 //------------
@@ -205,61 +302,50 @@ void cep_integ(Simulation* simulation, const int iEq, const int iDof, const Arra
 
   // Integrate electric potential based on cellular activation model
   //
+  std::vector<bool> cep_node(tnNo);
+  for (int Ac = 0; Ac < tnNo; Ac++) {
+    cep_node[Ac] = all_fun::is_domain(com_mod, eq, Ac, Equation_CEP);
+  }
+
+  Array<double> Xn;
+  Vector<double> Yn;
+
   if (com_mod.dmnId.size() != 0) {
     Vector<double> sA(tnNo); 
     Array<double> sF(nXion,tnNo); 
     Vector<double> sY(tnNo);
 
-    for (int Ac = 0; Ac < tnNo; Ac++) {
-      if (!all_fun::is_domain(com_mod, eq, Ac, Equation_CEP)) {
+    for (int iDmn = 0; iDmn < eq.nDmn; iDmn++) {
+      auto& dmn = eq.dmn[iDmn];
+      if (dmn.phys != Equation_CEP) {
         continue;
       }
 
-      for (int iDmn = 0; iDmn < eq.nDmn; iDmn++) {
-        auto& dmn = eq.dmn[iDmn];
-        auto cPhys = dmn.phys;
-        int dID = dmn.Id;
-
-        if (cPhys != Equation_CEP || !utils::btest(com_mod.dmnId(Ac),dID)) {
-          continue;
-	}
-
-        int nX = dmn.cep.nX;
-        int nG = dmn.cep.nG;
-        #ifdef debug_cep_integ
-        dmsg << "nX: " << nX ;
-        dmsg << "nG: " << nG ;
-        #endif
-
-        auto Xl = Xion.rows(0,nX-1,Ac);
-
-        // [NOTE] nG can be 0.
-        Vector<double> Xgl;
-        if (nG != 0) {
-          Xgl.resize(nG);
-          for (int i = 0; i < nG; i++) {
-            Xgl(i) = Xion(i+nX,Ac);
-          }
+      std::vector<int> nodes;
+      for (int Ac = 0; Ac < tnNo; Ac++) {
+        if (cep_node[Ac] && utils::btest(com_mod.dmnId(Ac),dmn.Id)) {
+          nodes.push_back(Ac);
         }
+      }
 
-        double yl = 0.0;
-        if (cem.cpld) {
-          yl = cem.Ya(Ac);
-        }
+      int nX = dmn.cep.nX;
+      int nG = dmn.cep.nG;
+      #ifdef debug_cep_integ
+      dmsg << "nX: " << nX ;
+      dmsg << "nG: " << nG ;
+      #endif
 
-        cep_integ_l(cep_mod, dmn.cep, nX, nG, Xl, Xgl, time-dt, yl, I4f(Ac), dt);
+      cep_integ_nodes(cep_mod, dmn.cep, nodes, I4f, time-dt, dt, eq.nIonThreads, Xn, Yn);
 
+      for (int k = 0; k < nodes.size(); k++) {
+        int Ac = nodes[k];
         sA(Ac) = sA(Ac) + 1.0;
-        for (int i = 0; i < nX; i++) {
-          sF(i,Ac) += Xl(i);
-        }
-
-        for (int i = 0; i < nG; i++) {
-          sF(nX+i,Ac) += Xgl(i);
+        for (int i = 0; i < nX+nG; i++) {
+          sF(i,Ac) += Xn(i,k);
         }
 
         if (cem.cpld) {
-          sY(Ac) = sY(Ac) + yl;
+          sY(Ac) = sY(Ac) + Yn(k);
         }
       }
     }
@@ -281,39 +367,425 @@ void cep_integ(Simulation* simulation, const int iEq, const int iDof, const Arra
     }
 
   } else {
+    std::vector<int> nodes;
     for (int Ac = 0; Ac < tnNo; Ac++) {
-      if (!all_fun::is_domain(com_mod, eq, Ac, Equation_CEP)) {
-        continue;
+      if (cep_node[Ac]) {
+        nodes.push_back(Ac);
       }
+    }
 
-      int nX = eq.dmn[0].cep.nX;
-      int nG = eq.dmn[0].cep.nG;
-      auto Xl = Xion.rows(0,nX-1,Ac);
-      auto Xgl = Xion.rows(nX,nX+nG-1,Ac);
+    int nX = eq.dmn[0].cep.nX;
+    int nG = eq.dmn[0].cep.nG;
+
+    cep_integ_nodes(cep_mod, eq.dmn[0].cep, nodes, I4f, time-dt, dt, eq.nIonThreads, Xn, Yn);
+
+    for (int k = 0; k < nodes.size(); k++) {
+      int Ac = nodes[k];
+      for (int i = 0; i < nX+nG; i++) {
+        Xion(i,Ac) = Xn(i,k);
+      }
 
-      double yl = 0.0;
       if (cem.cpld) {
-        yl = cem.Ya(Ac);
+        cem.Ya(Ac) = Yn(k);
       }
+    }
+  }
+
+  for (int Ac = 0; Ac < tnNo; Ac++) {
+    Yo(iDof,Ac) = Xion(0,Ac);
+  }
+}
+
+//--------------------
+// adaptive_step_size
+//--------------------
+// Return the size of an adaptive time step from time t for the proposed
+// step 'h'. Steps end at the start and end of the external stimulus
+// [Ts,Te] and at the end time t_end.
+//
+static double adaptive_step_size(const cepModelType& cep, const double t, const double t_end, const double Ts,
+    const double Te, const double h)
+{
+  const double tol = 1.0e-6 * cep.dt;
+  double step = std::min(h, t_end - t);
+
+  if (t < Ts-tol) {
+    step = std::min(step, Ts - t);
+  } else if (t < Te-tol) {
+    step = std::min(step, Te - t);
+  }
+
+  return step;
+}
+
+//-------------------------
+// adaptive_next_step_size
+//-------------------------
+// Return the size of the adaptive time step following a step 'h' that
+// changed the membrane potential by dV.
+//
+// The step is scaled so that the membrane potential changes by about
+// cep.odes.dVmax, it is bounded by cep.odes.dtMin and cep.dt.
+//
+static double adaptive_next_step_size(const cepModelType& cep, const double h, const double dV)
+{
+  // Safety factor so that a step is not rejected when the membrane
+  // potential changes at a constant rate.
+  const double safety = 0.9;
+  double next = cep.dt;
+
+  if (dV > 0.0) {
+    next = safety * h * cep.odes.dVmax / dV;
+  }
+
+  return std::max(cep.odes.dtMin, std::min(next, cep.dt));
+}
+
+//-------------------
+// adaptive_stimulus
+//-------------------
+// Return the external stimulus for an adaptive time step starting at
+// time t.
+//
+static double adaptive_stimulus(const cepModelType& cep, const double t, const double Ts, const double Te)
+{
+  const double tol = 1.0e-6 * cep.dt;
 
-      cep_integ_l(cep_mod, eq.dmn[0].cep, nX, nG, Xl, Xgl, time-dt, yl, I4f(Ac), dt);
+  if (t >= Ts-tol && t < Te-tol) {
+    return cep.Istim.A;
+  }
+
+  return 0.0;
+}
 
-      for (int i = 0; i < nX; i++) {
-        Xion(i,Ac) = Xl(i);
+//--------------------
+// cep_integ_adaptive
+//--------------------
+// Integrate the local electrophysiology variables X and Xg of a cell from
+// t1 to t1+nt*cep.dt using adaptive time steps.
+//
+// step(t,h,Istim) integrates X and Xg from t to t+h and activate(h)
+// integrates the excitation-activation variables over an accepted step.
+// Steps of size cep.dt are used at rest, a step that changes the membrane
+// potential X(0) by more than cep.odes.dVmax is repeated with a smaller
+// step down to cep.odes.dtMin.
+//
+template <typename StepFunction, typename ActivationFunction>
+static void cep_integ_adaptive(const cepModelType& cep, const double t1, const int nt, const double Ts,
+    const double Te, Vector<double>& X, Vector<double>& Xg, StepFunction step, ActivationFunction activate)
+{
+  const double t_end = t1 + static_cast<double>(nt) * cep.dt;
+  const double tol = 1.0e-6 * cep.dt;
+
+  Vector<double> X0(X.size());
+  Vector<double> Xg0(Xg.size());
+  double t = t1;
+  double h = cep.dt;
+
+  while (t_end - t > tol) {
+    double hs = adaptive_step_size(cep, t, t_end, Ts, Te, h);
+    double Istim = adaptive_stimulus(cep, t, Ts, Te);
+    X0 = X;
+    Xg0 = Xg;
+
+    step(t, hs, Istim);
+
+    double dV = fabs(X(0) - X0(0));
+    h = adaptive_next_step_size(cep, hs, dV);
+
+    if ((dV > cep.odes.dVmax) && (hs > cep.odes.dtMin + tol)) {
+      X = X0;
+      Xg = Xg0;
+      continue;
+    }
+
+    t += hs;
+    activate(hs);
+  }
+}
+
+//------------------------------
+// cep_integ_ttp_batch_adaptive
+//------------------------------
+// Integrate the ten Tusscher-Panfilov model variables of a batch of cells
+// from t1 to t1+nt*cep.dt using adaptive time steps, see cep_integ_adaptive().
+//
+// Each cell of the batch has its own time step. The cells that are done or
+// have a rejected step are restored after each batch step.
+//
+static void cep_integ_ttp_batch_adaptive(CepMod& cep_mod, cepModelType& cep, TtpBatch& batch, const double t1,
+    const int nt, const double Ts, const double Te, double yl[], const double I4f[])
+{
+  constexpr int B = TtpBatch::B;
+  constexpr int nX = TtpBatch::nX;
+  constexpr int nG = TtpBatch::nG;
+  auto& cem = cep_mod.cem;
+  auto& ttp = cep_mod.ttp;
+
+  const double t_end = t1 + static_cast<double>(nt) * cep.dt;
+  const double tol = 1.0e-6 * cep.dt;
+
+  double t[B], h[B], dt[B], Istim[B];
+  bool done[B];
+
+  for (int c = 0; c < B; c++) {
+    t[c] = t1;
+    h[c] = cep.dt;
+    done[c] = (c >= batch.num_cells) || !(t_end - t1 > tol);
+  }
+
+  TtpBatch batch0;
+
+  while (!std::all_of(done, done+B, [](const bool d) { return d; })) {
+    for (int c = 0; c < B; c++) {
+      if (done[c]) {
+        dt[c] = 0.0;
+        Istim[c] = 0.0;
+      } else {
+        dt[c] = adaptive_step_size(cep, t[c], t_end, Ts, Te, h[c]);
+        Istim[c] = adaptive_stimulus(cep, t[c], Ts, Te);
       }
+    }
 
-      for (int i = 0; i < nG; i++) {
-        Xion(nX+i,Ac) = Xgl(i);
+    batch0 = batch;
+    ttp.integ_fe_batch(cep.imyo, batch, dt, Istim);
+
+    for (int c = 0; c < B; c++) {
+      bool accept = !done[c];
+
+      if (accept) {
+        double dV = fabs(batch.X[0][c] - batch0.X[0][c]);
+        h[c] = adaptive_next_step_size(cep, dt[c], dV);
+        accept = (dV <= cep.odes.dVmax) || (dt[c] <= cep.odes.dtMin + tol);
       }
 
-      if (cem.cpld) {
-        cem.Ya(Ac) = yl;
+      if (!accept) {
+        for (int i = 0; i < nX; i++) {
+          batch.X[i][c] = batch0.X[i][c];
+        }
+        for (int i = 0; i < nG; i++) {
+          batch.Xg[i][c] = batch0.Xg[i][c];
+        }
+        continue;
+      }
+
+      t[c] += dt[c];
+
+      // Electromechanics excitation-activation
+      if (cem.aStress) {
+        double epsX;
+        ttp.actv_strs(batch.X[3][c], dt[c], yl[c], epsX);
+      } else if (cem.aStrain) {
+        ttp.actv_strn(batch.X[3][c], I4f[c], dt[c], yl[c]);
       }
+
+      done[c] = !(t_end - t[c] > tol);
     }
   }
+}
 
-  for (int Ac = 0; Ac < tnNo; Ac++) {
-    Yo(iDof,Ac) = Xion(0,Ac);
+//-----------------
+// cep_integ_nodes
+//-----------------
+// Integrate the local electrophysiology variables of a domain from t1 to
+// t1+dt at the nodes 'nodes'.
+//
+// The variables of node nodes[k] are read from cep_mod.Xion and cep_mod.cem.Ya,
+// the integrated values are returned in Xn(:,k) and Yn(k). Nodes are
+// integrated by 'num_threads' threads. The ten Tusscher-Panfilov model is
+// integrated for batches of nodes when explicit or Rush-Larsen time
+// integration is used.
+//
+void cep_integ_nodes(CepMod& cep_mod, cepModelType& cep, const std::vector<int>& nodes, const Vector<double>& I4f,
+    const double t1, const double dt, const int num_threads, Array<double>& Xn, Vector<double>& Yn)
+{
+  using namespace consts;
+
+  const auto& cem = cep_mod.cem;
+  const auto& Xion = cep_mod.Xion;
+  const int nX = cep.nX;
+  const int nG = cep.nG;
+  const int num_nodes = nodes.size();
+
+  Xn.resize(nX+nG, num_nodes);
+  Yn.resize(num_nodes);
+
+  const bool use_batch = (cep.cepType == ElectrophysiologyModelType::TTP) &&
+      ((cep.odes.tIntType == TimeIntegratioType::FE) || (cep.odes.tIntType == TimeIntegratioType::RK4) ||
+       (cep.odes.tIntType == TimeIntegratioType::RL) || (cep.odes.tIntType == TimeIntegratioType::RL_ADAPTIVE));
+
+  // The scalar ten Tusscher-Panfilov routines store intermediate values in
+  // the model so they can't be used by several threads.
+  int nthreads = num_threads;
+  if ((cep.cepType == ElectrophysiologyModelType::TTP) && !use_batch) {
+    nthreads = 1;
+  }
+
+  // Exceptions can't propagate out of a parallel region so the first
+  // error message is saved and rethrown after all threads are done.
+  std::string error_msg;
+
+  #pragma omp parallel num_threads(nthreads)
+  {
+    if (use_batch) {
+      constexpr int B = TtpBatch::B;
+      TtpBatch batch;
+      double yl[B];
+      double I4fl[B];
+
+      #pragma omp for schedule(static)
+      for (int k = 0; k < num_nodes; k += B) {
+        batch.num_cells = std::min(B, num_nodes - k);
+
+        for (int c = 0; c < B; c++) {
+          int Ac = nodes[k + std::min(c, batch.num_cells-1)];
+          for (int i = 0; i < nX; i++) {
+            batch.X[i][c] = Xion(i,Ac);
+          }
+          for (int i = 0; i < nG; i++) {
+            batch.Xg[i][c] = Xion(nX+i,Ac);
+          }
+          yl[c] = cem.cpld ? cem.Ya(Ac) : 0.0;
+          I4fl[c] = I4f(Ac);
+        }
+
+        try {
+          cep_integ_ttp_batch(cep_mod, cep, batch, t1, yl, I4fl, dt);
+        } catch (const std::exception& exception) {
+          #pragma omp critical
+          if (error_msg.empty()) {
+            error_msg = exception.what();
+          }
+        }
+
+        for (int c = 0; c < batch.num_cells; c++) {
+          for (int i = 0; i < nX; i++) {
+            Xn(i,k+c) = batch.X[i][c];
+          }
+          for (int i = 0; i < nG; i++) {
+            Xn(nX+i,k+c) = batch.Xg[i][c];
+          }
+          Yn(k+c) = yl[c];
+        }
+      }
+
+    } else {
+      Vector<double> Xl(nX);
+      Vector<double> Xgl(nG);
+
+      #pragma omp for schedule(static)
+      for (int k = 0; k < num_nodes; k++) {
+        int Ac = nodes[k];
+        for (int i = 0; i < nX; i++) {
+          Xl(i) = Xion(i,Ac);
+        }
+        for (int i = 0; i < nG; i++) {
+          Xgl(i) = Xion(nX+i,Ac);
+        }
+        double yl = cem.cpld ? cem.Ya(Ac) : 0.0;
+
+        try {
+          cep_integ_l(cep_mod, cep, nX, nG, Xl, Xgl, t1, yl, I4f(Ac), dt);
+        } catch (const std::exception& exception) {
+          #pragma omp critical
+          if (error_msg.empty()) {
+            error_msg = exception.what();
+          }
+        }
+
+        for (int i = 0; i < nX; i++) {
+          Xn(i,k) = Xl(i);
+        }
+        for (int i = 0; i < nG; i++) {
+          Xn(nX+i,k) = Xgl(i);
+        }
+        Yn(k) = yl;
+      }
+    }
+  }
+
+  if (!error_msg.empty()) {
+    throw std::runtime_error(error_msg);
+  }
+}
+
+//---------------------
+// cep_integ_ttp_batch
+//---------------------
+// Integrate the ten Tusscher-Panfilov model variables of a batch of cells
+// from t1 to t1+dt using explicit or adaptive time integration.
+//
+// This is cep_integ_l() for a batch of cells, 'yl' and 'I4f' are the
+// excitation-activation variables and fiber stretch of the cells.
+//
+void cep_integ_ttp_batch(CepMod& cep_mod, cepModelType& cep, TtpBatch& batch, const double t1,
+    double yl[], const double I4f[], const double dt)
+{
+  constexpr int B = TtpBatch::B;
+  auto& cem = cep_mod.cem;
+  auto& ttp = cep_mod.ttp;
+
+  // Feedback coefficient for stretch-activated-currents
+  for (int c = 0; c < B; c++) {
+    if (I4f[c] > 1.0) {
+      batch.Ksac[c] = cep.Ksac * (sqrt(I4f[c]) - 1.0);
+    } else {
+      batch.Ksac[c] = 0.0;
+    }
+  }
+
+  // Total time steps
+  int nt = static_cast<int>(dt/cep.dt);
+
+  // External stimulus duration
+  int icl = static_cast<int>(fmax(floor(t1/cep.Istim.CL),0.0));
+  double Ts = cep.Istim.Ts + static_cast<double>(icl)*cep.Istim.CL;
+  double Te = Ts + cep.Istim.Td;
+  double eps = std::numeric_limits<double>::epsilon();
+
+  if (cep.odes.tIntType == TimeIntegratioType::RL_ADAPTIVE) {
+    cep_integ_ttp_batch_adaptive(cep_mod, cep, batch, t1, nt, Ts, Te, yl, I4f);
+
+  } else {
+    double dt_c[B], Istim_c[B];
+    std::fill(dt_c, dt_c + B, cep.dt);
+
+    for (int i = 0; i < nt; i++) {
+      double t = t1 + static_cast<double>(i) * cep.dt;
+      double Istim;
+      if (t >= Ts-eps &&  t <= Te+eps) {
+        Istim = cep.Istim.A;
+      } else {
+        Istim = 0.0;
+      }
+
+      // The gating variables are always integrated using the Rush-Larsen
+      // method so RL is the forward Euler method.
+      if (cep.odes.tIntType == TimeIntegratioType::RK4) {
+        ttp.integ_rk_batch(cep.imyo, batch, cep.dt, Istim);
+      } else {
+        std::fill(Istim_c, Istim_c + B, Istim);
+        ttp.integ_fe_batch(cep.imyo, batch, dt_c, Istim_c);
+      }
+
+      // Electromechanics excitation-activation
+      if (cem.aStress) {
+        for (int c = 0; c < batch.num_cells; c++) {
+          double epsX;
+          ttp.actv_strs(batch.X[3][c], cep.dt, yl[c], epsX);
+        }
+      } else if (cem.aStrain) {
+        for (int c = 0; c < batch.num_cells; c++) {
+          ttp.actv_strn(batch.X[3][c], I4f[c], cep.dt, yl[c]);
+        }
+      }
+    }
+  }
+
+  for (int c = 0; c < batch.num_cells; c++) {
+    if (isnan(batch.X[0][c]) ||  isnan(yl[c])) {
+      throw std::runtime_error("[cep_integ_ttp_batch] A NaN has been computed during time integration of electrophysiology variables.");
+    }
   }
 }
 
@@ -508,6 +980,46 @@ void cep_integ_l(CepMod& cep_mod, cepModelType& cep, int nX, int nG, Vector<doub
             }
           }
         } break;
+
+        case TimeIntegratioType::RL: {
+          for (int i = 0; i < nt; i++) {
+            double t = t1 + static_cast<double>(i) * cep.dt;
+            double Istim;
+            if (t >= Ts-eps &&  t <= Te+eps) {
+              Istim = cep.Istim.A;
+            } else {
+              Istim = 0.0;
+            }
+
+            cep_mod.bo.integ_rl(cep.imyo, nX, X, t, cep.dt, Istim, Ksac, RPAR);
+
+            // Electromechanics excitation-activation
+            if (cem.aStress) {
+              double epsX;
+              cep_mod.bo.actv_strs(X(0), cep.dt, yl, epsX);
+            } else if (cem.aStrain) {
+              cep_mod.bo.actv_strn(X(3), I4f, cep.dt, yl);
+            }
+          }
+        } break;
+
+        case TimeIntegratioType::RL_ADAPTIVE: {
+          auto step = [&](const double t, const double h, const double Istim) {
+            cep_mod.bo.integ_rl(cep.imyo, nX, X, t, h, Istim, Ksac, RPAR);
+          };
+
+          // Electromechanics excitation-activation
+          auto activate = [&](const double h) {
+            if (cem.aStress) {
+              double epsX;
+              cep_mod.bo.actv_strs(X(0), h, yl, epsX);
+            } else if (cem.aStrain) {
+              cep_mod.bo.actv_strn(X(3), I4f, h, yl);
+            }
+          };
+
+          cep_integ_adaptive(cep, t1, nt, Ts, Te, X, Xg, step, activate);
+        } break;
       } 
     } break; 
 
@@ -571,7 +1083,10 @@ void cep_integ_l(CepMod& cep_mod, cepModelType& cep, int nX, int nG, Vector<doub
       RPAR(1) = cep.odes.relTol;
 
       switch (cep.odes.tIntType) {
-        case TimeIntegratioType::FE: {
+        // The gating variables are always integrated using the Rush-Larsen
+        // method so RL is the forward Euler method.
+        case TimeIntegratioType::FE:
+        case TimeIntegratioType::RL: {
           for (int i = 0; i < nt; i++) {
             double t = t1 + static_cast<double>(i) * cep.dt;
             double Istim;
@@ -635,6 +1150,24 @@ void cep_integ_l(CepMod& cep_mod, cepModelType& cep, int nX, int nG, Vector<doub
             }
           }
         } break;
+
+        case TimeIntegratioType::RL_ADAPTIVE: {
+          auto step = [&](const double t, const double h, const double Istim) {
+            cep_mod.ttp.integ_fe(cep.imyo, nX, nG, X, Xg, t, h, Istim, Ksac, RPAR);
+          };
+
+          // Electromechanics excitation-activation
+          auto activate = [&](const double h) {
+            if (cem.aStress) {
+              double epsX;
+              cep_mod.ttp.actv_strs(X(3), h, yl, epsX);
+            } else if (cem.aStrain) {
+              cep_mod.ttp.actv_strn(X(3), I4f, h, yl);
+            }
+          };
+
+          cep_integ_adaptive(cep, t1, nt, Ts, Te, X, Xg, step, activate);
+        } break;
       }
     } break; 
   } 
@@ -12,6 +12,7 @@
 #include "consts.h"
 
 #include <string>
+#include <vector>
 
 namespace cep_ion {
 
@@ -19,11 +20,21 @@ void cep_init(Simulation* simulation);
 
 void cep_init_l(CepMod& cep_mod, cepModelType& cep, int nX, int nG, Vector<double>& X, Vector<double>& Xg);
 
+void cep_init_lookup_tables(Simulation* simulation, eqType& eq);
+
+void check_lookup_table_settings(const eqType& eq);
+
 void cep_integ(Simulation* simulation, const int iEq, const int iDof, const Array<double>& Dg);
 
 void cep_integ_l(CepMod& cep_mod, cepModelType& cep, int nX, int nG, Vector<double>& X, Vector<double>& Xg,
     const double t1, double& yl, const double I4f, const double dt);
 
+void cep_integ_nodes(CepMod& cep_mod, cepModelType& cep, const std::vector<int>& nodes, const Vector<double>& I4f,
+    const double t1, const double dt, const int num_threads, Array<double>& Xn, Vector<double>& Yn);
+
+void cep_integ_ttp_batch(CepMod& cep_mod, cepModelType& cep, TtpBatch& batch, const double t1,
+    double yl[], const double I4f[], const double dt);
+
 };
 
 #endif
@@ -5,6 +5,7 @@
 
 #include "cmm.h"
 
+#include "AssemblyWorkspace.h"
 #include "all_fun.h"
 #include "fluid.h"
 #include "lhsa.h"
@@ -792,12 +793,25 @@ void construct_cmm(ComMod& com_mod, const mshType& lM, const Array<double>& Ag,
   // CMM: dof = nsd+1
   // CMM init: dof = nsd
   //
-  Vector<int> ptr(eNoN);
-  Vector<double> pSl(nsymd), N(eNoN);
-  Array<double> xl(nsd,eNoN), al(tDof,eNoN), yl(tDof,eNoN), dl(tDof,eNoN), vwpl(2,eNoN),
-                bfl(nsd,eNoN), pS0l(nsymd,eNoN), Nx(nsd,eNoN), lR(dof,eNoN);
-  Array3<double> lK(dof*dof,eNoN,eNoN);
-
+  // The local element arrays are taken from the thread's assembly workspace.
+  //
+  auto& ws = AssemblyWorkspace::get();
+  ws.set_element_arrays(com_mod, eNoN);
+
+  auto& ptr = ws.ptr;
+  auto& pSl = ws.pSl;
+  auto& N = ws.N;
+  auto& xl = ws.xl;
+  auto& al = ws.al;
+  auto& yl = ws.yl;
+  auto& dl = ws.dl;
+  auto& vwpl = ws.vwpl;
+  auto& bfl = ws.bfl;
+  auto& pS0l = ws.pS0l;
+  auto& Nx = ws.Nx;
+  auto& ksix = ws.ksix;
+  auto& lR = ws.lR;
+  auto& lK = ws.lK;
 
   for (int e = 0; e < lM.nEl; e++) {
     // Change the current domain which will be used in later function calls.
@@ -837,11 +851,11 @@ void construct_cmm(ComMod& com_mod, const mshType& lM, const Array<double>& Ag,
       }
 
       if (pS0.size() != 0) {
-        pS0l.set_col(a, pS0.col(Ac));
+        pS0l.set_col(a, pS0.rcol(Ac));
       }
 
       if (cmmVarWall) {
-        vwpl.set_col(a, varWallProps.col(Ac));
+        vwpl.set_col(a, varWallProps.rcol(Ac));
       }
     }
 
@@ -867,23 +881,22 @@ void construct_cmm(ComMod& com_mod, const mshType& lM, const Array<double>& Ag,
       lK = 0.0;
 
       double Jac{0.0};
-      Array<double> ksix(nsd,nsd);
 
       for (int g = 0; g < lM.nG; g++) {
         if (g == 0 || !lM.lShpF) {
-          auto Nx_g = lM.Nx.slice(g);
+          auto Nx_g = lM.Nx.rslice(g);
           nn::gnn(eNoN, nsd, nsd, Nx_g, xl, Nx, Jac, ksix);
           if (utils::is_zero(Jac)) {
             throw std::runtime_error("[construct_dsolid] Jacobian for element " + std::to_string(e) + " is < 0.");
           }
         }
         double w = lM.w(g) * Jac;
-        N = lM.N.col(g);
+        N = lM.N.rcol(g);
 
         cmm_3d(com_mod, eNoN, w, N, Nx, al, yl, bfl, ksix, lR, lK);
       }
 
-      eq.linear_algebra->assemble(com_mod, eNoN, ptr, lK, lR);
+      eq.linear_algebra->assemble(com_mod, lM, e, ptr, lK, lR);
     }
   }
 }
@@ -263,7 +263,8 @@ const std::set<PreconditionerType> trilinos_preconditioners = {
 /// @brief The list of FSILS preconditioners. 
 const std::set<PreconditionerType> fsils_preconditioners = {
   PreconditionerType::PREC_FSILS,
-  PreconditionerType::PREC_RCS
+  PreconditionerType::PREC_RCS,
+  PreconditionerType::PREC_FSILS_AMG
 };
 
 /// @brief The list of PETSc preconditioners. 
@@ -281,6 +282,7 @@ const std::map<std::string,PreconditionerType> preconditioner_name_to_type =
   {"fsils", PreconditionerType::PREC_FSILS},
   {"rcs", PreconditionerType::PREC_RCS},
   {"row-column-scaling", PreconditionerType::PREC_RCS},
+  {"fsils-amg", PreconditionerType::PREC_FSILS_AMG},
 
   {"trilinos-diagonal", PreconditionerType::PREC_TRILINOS_DIAGONAL},
   {"trilinos-blockjacobi", PreconditionerType::PREC_TRILINOS_BLOCK_JACOBI},
@@ -300,6 +302,7 @@ const std::map<PreconditionerType, std::string> preconditioner_type_to_name {
   {PreconditionerType::PREC_FSILS, "fsils"}, 
   {PreconditionerType::PREC_NONE, "none"}, 
   {PreconditionerType::PREC_RCS, "row-column-scaling"}, 
+  {PreconditionerType::PREC_FSILS_AMG, "fsils-amg"}, 
   {PreconditionerType::PREC_TRILINOS_DIAGONAL, "trilinos-diagonal"}, 
   {PreconditionerType::PREC_TRILINOS_BLOCK_JACOBI, "trilinos-blockjacobi"}, 
   {PreconditionerType::PREC_TRILINOS_ILU, "trilinos-ilu"}, 
@@ -322,6 +325,9 @@ const std::map<std::string,SolverType> solver_name_to_type
 
   {"gmres", SolverType::lSolver_GMRES},
 
+  {"pipelined-gmres", SolverType::lSolver_PGMRES},
+  {"pgmres", SolverType::lSolver_PGMRES},
+
   {"conjugate-gradient", SolverType::lSolver_CG},
   {"cg", SolverType::lSolver_CG},
 
@@ -8,6 +8,8 @@
 #include "lhsa.h"
 #include "nn.h"
 #include "utils.h"
+
+#include <algorithm>
 #include <math.h>
 
 namespace contact {
@@ -27,7 +29,7 @@ void construct_contact_pnlty(ComMod& com_mod, CmMod& cm_mod, const Array<double>
   const int dof = com_mod.dof;
   const int cEq = com_mod.cEq;
   const auto& eq = com_mod.eq[cEq];
-  const auto& cntctM = com_mod.cntctM;
+  auto& cntctM = com_mod.cntctM;
 
   #define n_debug_construct_contact_pnlty
   #ifdef debug_construct_contact_pnlty
@@ -118,11 +120,52 @@ void construct_contact_pnlty(ComMod& com_mod, CmMod& cm_mod, const Array<double>
   // Create a bounding box around possible region of contact and bin
   // the box with neighboring nodes
   //
-  int maxNnb = 15;
-  label_101: maxNnb = maxNnb + 5;
+  // The nodes of each shell mesh in the current configuration are binned
+  // into a grid so the nodes of the other shell meshes lying in the box
+  // around a node are found without checking all of them. The grids are
+  // only rebuilt if the meshes change, otherwise the nodes that moved to
+  // another cell are updated.
+  //
+  // Any cell size gives the same neighbors, it only changes the number of
+  // cells searched.
+  //
+  double cell_size = (cntctM.c > 0.0) ? 2.0*cntctM.c : 1.0;
+  std::vector<Array<double>> shell_x(com_mod.nMsh);
 
-  Array<int> bBox(maxNnb,tnNo);
-  bBox = -1;
+  if (static_cast<int>(cntctM.grid.size()) != com_mod.nMsh) {
+    cntctM.grid.clear();
+    cntctM.grid.resize(com_mod.nMsh);
+  }
+
+  for (int iM = 0; iM < com_mod.nMsh; iM++) {
+    auto& msh = com_mod.msh[iM];
+
+    if (!msh.lShl) {
+      continue;
+    }
+
+    auto& x = shell_x[iM];
+    x.resize(nsd, msh.nNo);
+
+    for (int a = 0; a < msh.nNo; a++) {
+      int Ac = msh.gN(a);
+      x(0,a) = com_mod.x(0,Ac) + Dg(i,Ac);
+      x(1,a) = com_mod.x(1,Ac) + Dg(j,Ac);
+      x(2,a) = com_mod.x(2,Ac) + Dg(k,Ac);
+    }
+
+    auto& grid = cntctM.grid[iM];
+
+    if (grid.size() != msh.nNo || grid.cell_size() != cell_size) {
+      grid.build(x, cell_size);
+    } else {
+      grid.update(x);
+    }
+  }
+
+  // The neighbors of each node, sorted by node ID.
+  std::vector<std::vector<int>> nbr(tnNo);
+  std::vector<int> points;
 
   for (int iM = 0; iM < com_mod.nMsh; iM++) {
     auto& msh = com_mod.msh[iM];
@@ -135,9 +178,7 @@ void construct_contact_pnlty(ComMod& com_mod, CmMod& cm_mod, const Array<double>
 
     for (int a = 0; a < msh.nNo; a++) {
       int Ac = msh.gN(a);
-      x1(0) = com_mod.x(0,Ac) + Dg(i,Ac);
-      x1(1) = com_mod.x(1,Ac) + Dg(j,Ac);
-      x1(2) = com_mod.x(2,Ac) + Dg(k,Ac);
+      x1 = shell_x[iM].col(a);
 
       // Box limits for each node
       xmin = x1 - cntctM.c;
@@ -151,47 +192,35 @@ void construct_contact_pnlty(ComMod& com_mod, CmMod& cm_mod, const Array<double>
           continue;
         }
 
-        Vector<double> x2(nsd); 
-
-        for (int b = 0; b < msh_jM.nNo; b++) {
-          int Bc = msh_jM.gN(b);
-          x2(0) = com_mod.x(0,Bc) + Dg(i,Bc);
-          x2(1) = com_mod.x(1,Bc) + Dg(j,Bc);
-          x2(2) = com_mod.x(2,Bc) + Dg(k,Bc);
-
-          if ((x2(0) >= xmin(0)) && (x2(0) <= xmax(0)) && (x2(1) >= xmin(1)) && (x2(1) <= xmax(1)) && 
-              (x2(2) >= xmin(2)) && (x2(2) <= xmax(2))) {
-
-            int l = 0;
-
-            for (int i = 0; i < maxNnb; i++, l++) {
-              if (bBox(l,Ac) == -1) {
-                bBox(l,Ac) = Bc;
-                break; 
-              }
-              if (Bc > bBox(l,Ac)) {
-                continue;
-              }
-
-              if (Bc == bBox(l,Ac)) {
-                break;
-              } 
-
-              if (bBox(maxNnb-1,Ac) != -1) goto label_101;
-
-              for (int m = maxNnb-1; m >= l; m--) {
-                bBox(m,Ac) = bBox(m-1,Ac);
-              }
-              bBox(l,Ac) = Bc;
-              break; 
-            }
-            if (l > maxNnb-1) goto label_101;
-          }
-        } // b
+        cntctM.grid[jM].find(shell_x[jM], xmin, xmax, points);
+
+        for (int b : points) {
+          nbr[Ac].push_back(msh_jM.gN(b));
+        }
       } // jM
     } // a
   } // iM
 
+  int maxNnb = 20;
+
+  for (auto& nodes : nbr) {
+    std::sort(nodes.begin(), nodes.end());
+    nodes.erase(std::unique(nodes.begin(), nodes.end()), nodes.end());
+
+    while (static_cast<int>(nodes.size()) > maxNnb) {
+      maxNnb = maxNnb + 5;
+    }
+  }
+
+  Array<int> bBox(maxNnb,tnNo);
+  bBox = -1;
+
+  for (int Ac = 0; Ac < tnNo; Ac++) {
+    for (size_t l = 0; l < nbr[Ac].size(); l++) {
+      bBox(l,Ac) = nbr[Ac][l];
+    }
+  }
+
   // Check if any node is strictly involved in contact and compute
   // corresponding penalty forces assembled to the residual
   //
@@ -10,6 +10,7 @@
 #include "consts.h"
 #include "nn.h"
 #include "utils.h"
+#include "VtkData.h"
 
 #include "CmMod.h"
 
@@ -314,12 +315,17 @@ void distribute(Simulation* simulation)
     cm.bcast(cm_mod, &com_mod.stFileFlag);
     cm.bcast(cm_mod, &com_mod.stFileIncr);
     cm.bcast(cm_mod, &com_mod.stFileRepl);
+    cm.bcast(cm_mod, &com_mod.stFileGlob);
+    cm.bcast(cm_mod, &com_mod.stFileAsync);
     cm.bcast(cm_mod, &com_mod.saveIncr);
 
     cm.bcast(cm_mod, &com_mod.saveATS);
     cm.bcast(cm_mod, &com_mod.saveAve);
     cm.bcast(cm_mod, &com_mod.saveVTK);
+    cm.bcast(cm_mod, &com_mod.saveAsync);
+    cm.bcast(cm_mod, &com_mod.savePVTU);
     cm.bcast(cm_mod, &com_mod.bin2VTK);
+    dist_vtk_write_options(cm_mod, cm);
 
     cm.bcast(cm_mod, &com_mod.mvMsh);
 
@@ -329,6 +335,7 @@ void distribute(Simulation* simulation)
     cm.bcast(cm_mod, &com_mod.nEq);
     cm.bcast(cm_mod, &com_mod.dt);
     cm.bcast(cm_mod, &com_mod.precompDt);
+    cm.bcast(cm_mod, com_mod.precompBinFileName);
 
     cm.bcast(cm_mod, &com_mod.zeroAve);
     cm.bcast(cm_mod, &com_mod.cmmInit);
@@ -848,6 +855,32 @@ void dist_bc(ComMod& com_mod, const CmMod& cm_mod, const cmType& cm, bcType& lBc
 }
 
 
+//------------------------
+// dist_vtk_write_options
+//------------------------
+// Set the VTK file write options read by the master on all processes,
+// every process writes its own piece of a .pvtu file.
+//
+void dist_vtk_write_options(const CmMod& cm_mod, const cmType& cm)
+{
+  auto options = VtkData::write_options;
+  cm.bcast(cm_mod, options.data_mode);
+  cm.bcast(cm_mod, options.compressor);
+  cm.bcast(cm_mod, &options.compression_level);
+
+  std::vector<std::string> float32_data(options.float32_data.begin(), options.float32_data.end());
+  int num_float32_data = float32_data.size();
+  cm.bcast(cm_mod, &num_float32_data);
+  float32_data.resize(num_float32_data);
+
+  for (auto& name : float32_data) {
+    cm.bcast(cm_mod, name);
+  }
+
+  options.float32_data = std::set<std::string>(float32_data.begin(), float32_data.end());
+  VtkData::set_write_options(options);
+}
+
 //---------
 // dist_bf
 //---------
@@ -1169,6 +1202,7 @@ void dist_uris(ComMod& com_mod, const CmMod& cm_mod, const cmType& cm) {
     cm.bcast(cm_mod, &uris[iUris].sdf_default);
     cm.bcast(cm_mod, &uris[iUris].sdf_deps);
     cm.bcast(cm_mod, &uris[iUris].sdf_deps_close);
+    cm.bcast(cm_mod, &uris[iUris].sdf_band);
     cm.bcast(cm_mod, &uris[iUris].clsFlg);
     cm.bcast(cm_mod, &uris[iUris].cnt);
     cm.bcast(cm_mod, &uris[iUris].scF);
@@ -1462,6 +1496,9 @@ void dist_eq(ComMod& com_mod, const CmMod& cm_mod, const cmType& cm, const std::
   cm.bcast(cm_mod, &lEq.coupled);
   cm.bcast(cm_mod, &lEq.maxItr);
   cm.bcast(cm_mod, &lEq.minItr);
+  cm.bcast(cm_mod, &lEq.nAssmThreads);
+  cm.bcast(cm_mod, &lEq.nIonThreads);
+  cm.bcast(cm_mod, &lEq.batchAssm);
   cm.bcast(cm_mod, &lEq.roInf);
   cm.bcast_enum(cm_mod, &lEq.phys);
   cm.bcast(cm_mod, &lEq.nDmn);
@@ -1498,6 +1535,8 @@ void dist_eq(ComMod& com_mod, const CmMod& cm_mod, const cmType& cm, const std::
   cm.bcast(cm_mod, &lEq.FSILS.RI.sD);
   cm.bcast(cm_mod, &lEq.FSILS.GM.sD);
   cm.bcast(cm_mod, &lEq.FSILS.CG.sD);
+  cm.bcast(cm_mod, &lEq.FSILS.precReuse);
+  cm.bcast(cm_mod, &lEq.FSILS.precReuseItrRatio);
 
   cm.bcast_enum(cm_mod, &lEq.ls.LS_type);
 
@@ -1539,6 +1578,8 @@ void dist_eq(ComMod& com_mod, const CmMod& cm_mod, const cmType& cm, const std::
       cm.bcast(cm_mod, &cep.dt);
       cm.bcast(cm_mod, &cep.Ksac);
       cm.bcast(cm_mod, &cep.Diso);
+      cm.bcast(cm_mod, &cep.lutResolution);
+      cm.bcast(cm_mod, &cep.lutValidate);
 
       if (cm.slv(cm_mod)) {
         cep.Dani.resize(cep.nFn);
@@ -1557,6 +1598,11 @@ void dist_eq(ComMod& com_mod, const CmMod& cm_mod, const cmType& cm, const std::
         cm.bcast(cm_mod, &cep.odes.relTol);
       }
 
+      if (cep.odes.tIntType == TimeIntegratioType::RL_ADAPTIVE) {
+        cm.bcast(cm_mod, &cep.odes.dVmax);
+        cm.bcast(cm_mod, &cep.odes.dtMin);
+      }
+
       cm.bcast(cm_mod, &cep_mod.ttp.G_Na);
       cm.bcast(cm_mod, &cep_mod.ttp.G_CaL);
       cm.bcast(cm_mod, &cep_mod.ttp.G_Kr);
@@ -2607,25 +2653,4 @@ void part_msh(Simulation* simulation, int iM, mshType& lM, Vector<int>& gmtl, in
      MPI_SCATTERV(tempIEN, sCount, disp, mpint, lM%INN,  nEl*insd, mpint, master, cm%com(), ierr)
     */
   }
-  // If necessary, distribute precomputed state-variable data.
-  //
-  flag = (lM.Ys.size() != 0);
-  cm.bcast(cm_mod, &flag);
-  if (flag){
-    #ifdef dbg_part_msh
-    dmsg << "Distributing precomputed state-variable data " << " ...";
-    #endif
-    Array3<double> tmpYs;
-    int nsYs = lM.Ys.nslices();
-    if (cm.mas(cm_mod)) {
-      tmpYs.resize(lM.Ys.nrows(), lM.Ys.ncols(), nsYs);
-      tmpYs = lM.Ys;
-      lM.Ys.clear();
-    } else {
-      tmpYs.clear();
-    }
-    lM.Ys.resize(com_mod.nsd, com_mod.tnNo, nsYs);
-    lM.Ys = all_fun::local(com_mod, cm_mod, cm, tmpYs);
-    tmpYs.clear();
-  }
 }
\ No newline at end of file
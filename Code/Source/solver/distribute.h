@@ -28,6 +28,8 @@ void dist_fluid_visc_model(const ComMod& com_mod, const CmMod& cm_mod, const cmT
 
 void dist_solid_visc_model(const ComMod& com_mod, const CmMod& cm_mod, const cmType& cm, solidViscModelType& lVis);
 
+void dist_vtk_write_options(const CmMod& cm_mod, const cmType& cm);
+
 void part_face(Simulation* simulation, mshType& lM, faceType& lFa, faceType& gFa, Vector<int>& gmtl);
 
 void part_msh(Simulation* simulation, int iM, mshType& lM, Vector<int>& mtl, int nP, Vector<float>& wgt);
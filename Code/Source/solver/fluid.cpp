@@ -11,12 +11,54 @@
 #include "utils.h"
 #include "ris.h"
 
+#include <algorithm>
 #include <array>
+#include <cstring>
 #include <iomanip>
+#include <limits>
 #include <math.h>
 
 namespace fluid {
 
+/// @brief Assemble the local residuals and tangent matrices of a batch of 
+/// linear tetrahedral fluid elements computed by construct_fluid_tet4().
+///
+/// The element arrays are copied into 'ws.ptr', 'ws.lR' and 'ws.lK' which 
+/// must have been sized using set_element_arrays().
+//
+void assemble_fluid_tet4(ComMod& com_mod, const mshType& lM, const FluidTet4Batch& batch, AssemblyWorkspace& ws)
+{
+  const auto& eq = com_mod.eq[com_mod.cEq];
+  auto& ptr = ws.ptr;
+  auto& lR = ws.lR;
+  auto& lK = ws.lK;
+
+  for (int k = 0; k < batch.num_elems; k++) {
+    int e = batch.elems[k];
+
+    for (int a = 0; a < 4; a++) {
+      ptr(a) = lM.IEN(a,e);
+
+      for (int i = 0; i < 4; i++) {
+        lR(i,a) = batch.lR[i][a][k];
+      }
+
+      for (int b = 0; b < 4; b++) {
+        for (int i = 0; i < 16; i++) {
+          lK(i,a,b) = batch.lK[i][a][b][k];
+        }
+      }
+    }
+
+    eq.linear_algebra->assemble(com_mod, lM, e, ptr, lK, lR);
+    if (com_mod.risFlag) {
+      if (!std::all_of(com_mod.ris.clsFlg.begin(), com_mod.ris.clsFlg.end(), [](bool v) { return v; })) {
+        ris::doassem_ris(com_mod, 4, ptr, lK, lR);
+      }
+    }
+  }
+}
+
 void b_fluid(ComMod& com_mod, const int eNoN, const double w, const Vector<double>& N, const Vector<double>& y, 
     const double h, const Vector<double>& nV, Array<double>& lR, Array3<double>& lK)
 {
@@ -516,31 +558,69 @@ void construct_fluid(ComMod& com_mod, const mshType& lM, const Array<double>& Ag
   dmsg << "dof: " << dof;
   dmsg << "lM.nEl: " <<  lM.nEl;
   dmsg << "nsd: " <<  nsd;
+  dmsg << "eq.nAssmThreads: " <<  eq.nAssmThreads;
   #endif
 
+  // Assemble elements concurrently using threads. 
+  //
+  // RIS assembly adds element contributions to the rows of projected 
+  // nodes which are not accounted for by the element coloring so it 
+  // is always performed serially.
+  //
+  if ((eq.nAssmThreads > 1) && (lM.eColor.size() != 0) && !com_mod.risFlag) {
+    construct_fluid_threaded(com_mod, lM, vmsStab, Ag, Yg);
+    return;
+  }
+
   // FLUID: dof = nsd+1
-  Vector<int> ptr(eNoN); 
-  Array<double> xl(nsd,eNoN); 
-  
-  // local acceleration vector (for a single element)
-  Array<double> al(tDof,eNoN);
-  
-  // local velocity vector (for a single element)
-  Array<double> yl(tDof,eNoN);
-  Array<double> bfl(nsd,eNoN);
-  
-  // local (weak form) residual vector (for a single element) 
-  Array<double> lR(dof,eNoN);
-  
-  // local tangent matrix (for a single element)
-  Array3<double> lK(dof*dof,eNoN,eNoN);
+  //
+  // The local element arrays (ptr, xl, al, yl, bfl, lR, lK) are taken 
+  // from the thread's assembly workspace.
+  //
+  auto& ws = AssemblyWorkspace::get();
+  ws.set_element_arrays(com_mod, eNoN);
 
-  double DDir = 0.0;
+  // Linear tetrahedral elements are computed in batches of consecutive 
+  // elements belonging to the same domain.
+  //
+  if (use_tet4_batch(com_mod, lM, vmsStab)) {
+    FluidTet4Batch batch;
+    int batch_dmn = -1;
+
+    auto assemble_batch = [&]() {
+      cDmn = batch_dmn;
+      construct_fluid_tet4(com_mod, lM, Ag, Yg, batch);
+      assemble_fluid_tet4(com_mod, lM, batch, ws);
+      batch.num_elems = 0;
+    };
+
+    for (int e = 0; e < lM.nEl; e++) {
+      int iDmn = all_fun::domain(com_mod, lM, cEq, e);
+      if (eq.dmn[iDmn].phys != EquationType::phys_fluid) {
+        continue;
+      }
+
+      if ((batch.num_elems == TET4_BATCH_SIZE) || ((batch.num_elems != 0) && (iDmn != batch_dmn))) {
+        assemble_batch();
+      }
+
+      batch.elems[batch.num_elems] = e;
+      batch.num_elems += 1;
+      batch_dmn = iDmn;
+    }
+
+    if (batch.num_elems != 0) {
+      assemble_batch();
+    }
+
+    return;
+  }
+
+  ws.set_thood_fs(com_mod, lM, vmsStab);
+  ws.set_thood_arrays(com_mod);
 
   // Loop over all elements of mesh
   //
-  int num_c = lM.nEl / 10;
-
   for (int e = 0; e < lM.nEl; e++) {
     #ifdef debug_construct_fluid
     dmsg << "---------- e: " << e+1;
@@ -551,212 +631,461 @@ void construct_fluid(ComMod& com_mod, const mshType& lM, const Array<double>& Ag
     if (cPhys != EquationType::phys_fluid) {
       continue;
     }
-    
-    double K_inverse_darcy_permeability = eq.dmn[cDmn].prop.at(PhysicalProperyType::inverse_darcy_permeability);
 
-    //  Update shape functions for NURBS
-    if (lM.eType == ElementType::NRB) {
-      //CALL NRBNNX(lM, e)
+    construct_fluid_element(com_mod, lM, e, vmsStab, Ag, Yg, ws);
+
+    eq.linear_algebra->assemble(com_mod, lM, e, ws.ptr, ws.lK, ws.lR);
+    if (com_mod.risFlag) {
+      if (!std::all_of(com_mod.ris.clsFlg.begin(), com_mod.ris.clsFlg.end(), [](bool v) { return v; })) {
+        ris::doassem_ris(com_mod, eNoN, ws.ptr, ws.lK, ws.lR);
+      }
     }
 
-    // Create local copies
-    for (int a = 0; a < eNoN; a++) {
-      int Ac = lM.IEN(a,e);
-      ptr(a) = Ac;
+  } // e: loop
 
-      for (int i = 0; i < xl.nrows(); i++) {
-        xl(i,a) = com_mod.x(i,Ac);
-        bfl(i,a) = com_mod.Bf(i,Ac);
-     }
-      for (int i = 0; i < al.nrows(); i++) {
-        al(i,a) = Ag(i,Ac);
-        yl(i,a) = Yg(i,Ac);
-      }
+  #ifdef debug_construct_fluid
+  double end_time = utils::cput();
+  double etime = end_time - start_time;
+  #endif
+}
+
+/// @brief Compute the local residual 'lR' and tangent matrix 'lK' for 
+/// the fluid element 'e'. 
+///
+/// The element domain must have been set in com_mod.cDmn. The workspace
+/// 'ws' must have been sized for the mesh using set_element_arrays(),
+/// set_thood_fs() and set_thood_arrays().
+///
+/// Modifies: ws.ptr, ws.xl, ws.al, ws.yl, ws.bfl, ws.lR, ws.lK
+//
+void construct_fluid_element(ComMod& com_mod, const mshType& lM, const int e, const bool vmsStab, 
+    const Array<double>& Ag, const Array<double>& Yg, AssemblyWorkspace& ws)
+{
+  #define n_debug_construct_fluid_element
+  #ifdef debug_construct_fluid_element
+  DebugMsg dmsg(__func__, com_mod.cm.idcm());
+  dmsg.banner();
+  dmsg << "e: " << e+1;
+  #endif
+
+  using namespace consts;
+
+  const int eNoN = lM.eNoN;
+
+  // l = 3, if nsd==2 ; else 6;
+  const int l = com_mod.nsymd;
+  const int nsd  = com_mod.nsd;
+  const int cEq = com_mod.cEq;
+  const auto& eq = com_mod.eq[cEq];
+  const int cDmn = com_mod.cDmn;
+
+  double DDir = 0.0;
+  double K_inverse_darcy_permeability = eq.dmn[cDmn].prop.at(PhysicalProperyType::inverse_darcy_permeability);
+
+  auto& ptr = ws.ptr;
+  auto& xl = ws.xl;
+  auto& al = ws.al;
+  auto& yl = ws.yl;
+  auto& bfl = ws.bfl;
+  auto& lR = ws.lR;
+  auto& lK = ws.lK;
+
+  //  Update shape functions for NURBS
+  if (lM.eType == ElementType::NRB) {
+    //CALL NRBNNX(lM, e)
+  }
+
+  // Create local copies
+  for (int a = 0; a < eNoN; a++) {
+    int Ac = lM.IEN(a,e);
+    ptr(a) = Ac;
+
+    for (int i = 0; i < xl.nrows(); i++) {
+      xl(i,a) = com_mod.x(i,Ac);
+      bfl(i,a) = com_mod.Bf(i,Ac);
+   }
+    for (int i = 0; i < al.nrows(); i++) {
+      al(i,a) = Ag(i,Ac);
+      yl(i,a) = Yg(i,Ac);
     }
+  }
+
+  // Initialize residual and tangents
+  lR = 0.0;
+  lK = 0.0;
+
+  // Function spaces for velocity and pressure.
+  const auto& fs = ws.fs_1;
 
-    // Initialize residual and tangents
-    lR = 0.0;
-    lK = 0.0;
-    std::array<fsType,2> fs;
+  // Element coordinates appropriate for function spaces
+  auto& xwl = ws.xwl;
+  auto& Nwx = ws.Nwx;
+  auto& Nwxx = ws.Nwxx;
+  auto& xql = ws.xql;
+  auto& Nqx = ws.Nqx;
 
-    // Set function spaces for velocity and pressure.
-    fs::get_thood_fs(com_mod, fs, lM, vmsStab, 1);
+  #ifdef debug_construct_fluid_element
+  dmsg;
+  dmsg << "l: " << l;
+  dmsg << "fs[0].eNoN: " << fs[0].eNoN;
+  dmsg << "fs[1].eNoN: " << fs[1].eNoN;
+  #endif
 
-    // Define element coordinates appropriate for function spaces
-    Array<double> xwl(nsd,fs[0].eNoN); 
-    Array<double> Nwx(nsd,fs[0].eNoN); 
-    Array<double> Nwxx(l,fs[0].eNoN);
+  xwl = xl;
 
-    Array<double> xql(nsd,fs[1].eNoN); 
-    Array<double> Nqx(nsd,fs[1].eNoN);
+  for (int i = 0; i < xql.nrows(); i++) { 
+    for (int j = 0; j < fs[1].eNoN; j++) { 
+      xql(i,j) = xl(i,j);
+    }
+  }
 
-    #ifdef debug_construct_fluid
-    dmsg;
-    dmsg << "l: " << l;
-    dmsg << "fs[0].eNoN: " << fs[0].eNoN;
-    dmsg << "fs[1].eNoN: " << fs[1].eNoN;
-    #endif
+  // Gauss integration 1
+  //
+  #ifdef debug_construct_fluid_element
+  dmsg;
+  dmsg << "Gauss integration 1 ... " << "";
+  dmsg << "fs[1].nG: " << fs[0].nG;
+  dmsg << "fs[1].lShpF: " << fs[0].lShpF;
+  dmsg << "fs[2].nG: " << fs[1].nG;
+  dmsg << "fs[2].lShpF: " << fs[1].lShpF;
+  #endif
 
-    xwl = xl;
+  double Jac{0.0};
+  auto& ksix = ws.ksix;
 
-    for (int i = 0; i < xql.nrows(); i++) { 
-      for (int j = 0; j < fs[1].eNoN; j++) { 
-        xql(i,j) = xl(i,j);
+  for (int g = 0; g < fs[0].nG; g++) {
+    #ifdef debug_construct_fluid_element
+    dmsg << "===== g: " << g+1;
+    #endif
+    if (g == 0 || !fs[1].lShpF) {
+      auto Nx = fs[1].Nx.rslice(g);
+      nn::gnn(fs[1].eNoN, nsd, nsd, Nx, xql, Nqx, Jac, ksix);
+      if (utils::is_zero(Jac)) {
+         throw std::runtime_error("[construct_fluid] Jacobian for element " + std::to_string(e) + " is < 0.");
       }
     }
 
-    // Gauss integration 1
-    //
-    #ifdef debug_construct_fluid
-    dmsg;
-    dmsg << "Gauss integration 1 ... " << "";
-    dmsg << "fs[1].nG: " << fs[0].nG;
-    dmsg << "fs[1].lShpF: " << fs[0].lShpF;
-    dmsg << "fs[2].nG: " << fs[1].nG;
-    dmsg << "fs[2].lShpF: " << fs[1].lShpF;
+    if (g == 0 || !fs[0].lShpF) {
+      auto Nx = fs[0].Nx.rslice(g);
+      nn::gnn(fs[0].eNoN, nsd, nsd, Nx, xwl, Nwx, Jac, ksix);
+      if (utils::is_zero(Jac)) {
+         throw std::runtime_error("[construct_fluid] Jacobian for element " + std::to_string(e) + " is < 0.");
+      }
+
+      auto Nxx = fs[0].Nxx.rslice(g);
+      nn::gn_nxx(l, fs[0].eNoN, nsd, nsd, Nx, Nxx, xwl, Nwx, Nwxx); 
+    }
+
+    double w = fs[0].w(g) * Jac;
+    #ifdef debug_construct_fluid_element
+    dmsg << "Jac: " << Jac;
+    dmsg << "w: " << w;
     #endif
 
-    double Jac{0.0};
-    Array<double> ksix(nsd,nsd);
-
-    for (int g = 0; g < fs[0].nG; g++) {
-      #ifdef debug_construct_fluid
-      dmsg << "===== g: " << g+1;
-      #endif
-      if (g == 0 || !fs[1].lShpF) {
-        auto Nx = fs[1].Nx.rslice(g);
-        nn::gnn(fs[1].eNoN, nsd, nsd, Nx, xql, Nqx, Jac, ksix);
-        if (utils::is_zero(Jac)) {
-           throw std::runtime_error("[construct_fluid] Jacobian for element " + std::to_string(e) + " is < 0.");
+    // Plot the coordinates of the quad point in the current configuration
+    if (com_mod.urisFlag) {
+      auto& distSrf = ws.distSrf;
+      distSrf = 0.0;
+      for (int a = 0; a < eNoN; a++) {
+        int Ac = lM.IEN(a,e);
+        for (int iUris = 0; iUris < com_mod.nUris; iUris++) {
+          distSrf(iUris) += fs[0].N(a,g) * std::fabs(com_mod.uris[iUris].sdf(Ac));
         }
       }
 
-      if (g == 0 || !fs[0].lShpF) {
-        auto Nx = fs[0].Nx.rslice(g);
-        nn::gnn(fs[0].eNoN, nsd, nsd, Nx, xwl, Nwx, Jac, ksix);
-        if (utils::is_zero(Jac)) {
-           throw std::runtime_error("[construct_fluid] Jacobian for element " + std::to_string(e) + " is < 0.");
+      DDir = 0.0;
+      double DDirTmp = 0.0;
+      double sdf_deps_temp = 0.0;
+      for (int iUris = 0; iUris < com_mod.nUris; iUris++) {
+        if (com_mod.uris[iUris].clsFlg) {
+          sdf_deps_temp = com_mod.uris[iUris].sdf_deps_close;
+        } else {
+          sdf_deps_temp = com_mod.uris[iUris].sdf_deps;
+        }
+        if (distSrf(iUris) <= sdf_deps_temp) {
+          DDirTmp = (1 + cos(pi*distSrf(iUris)/sdf_deps_temp))/
+                    (2*sdf_deps_temp*sdf_deps_temp);
+          if (DDirTmp > DDir) {DDir = DDirTmp;}
         }
-
-        auto Nxx = fs[0].Nxx.rslice(g);
-        nn::gn_nxx(l, fs[0].eNoN, nsd, nsd, Nx, Nxx, xwl, Nwx, Nwxx); 
       }
 
-      double w = fs[0].w(g) * Jac;
-      #ifdef debug_construct_fluid
-      dmsg << "Jac: " << Jac;
-      dmsg << "w: " << w;
-      #endif
-
-      // Plot the coordinates of the quad point in the current configuration
-      if (com_mod.urisFlag) {
-        Vector<double> distSrf(com_mod.nUris);
-        distSrf = 0.0;
-        for (int a = 0; a < eNoN; a++) {
-          int Ac = lM.IEN(a,e);
-          for (int iUris = 0; iUris < com_mod.nUris; iUris++) {
-            distSrf(iUris) += fs[0].N(a,g) * std::fabs(com_mod.uris[iUris].sdf(Ac));
-          }
-        }
+      if (!com_mod.urisActFlag) {DDir = 0.0;}
+    }
 
-        DDir = 0.0;
-        double DDirTmp = 0.0;
-        double sdf_deps_temp = 0.0;
-        for (int iUris = 0; iUris < com_mod.nUris; iUris++) {
-          if (com_mod.uris[iUris].clsFlg) {
-            sdf_deps_temp = com_mod.uris[iUris].sdf_deps_close;
-          } else {
-            sdf_deps_temp = com_mod.uris[iUris].sdf_deps;
-          }
-          if (distSrf(iUris) <= sdf_deps_temp) {
-            DDirTmp = (1 + cos(pi*distSrf(iUris)/sdf_deps_temp))/
-                      (2*sdf_deps_temp*sdf_deps_temp);
-            if (DDirTmp > DDir) {DDir = DDirTmp;}
-          }
-        }
+    // Compute momentum residual and tangent matrix.
+    //
+    if (nsd == 3) {
+      auto N0 = fs[0].N.rcol(g); 
+      auto N1 = fs[1].N.rcol(g); 
+      fluid_3d_m(com_mod, vmsStab, fs[0].eNoN, fs[1].eNoN, w, ksix, N0, N1, 
+          Nwx, Nqx, Nwxx, al, yl, bfl, lR, lK, K_inverse_darcy_permeability, DDir);
+
+    } else if (nsd == 2) {
+      auto N0 = fs[0].N.rcol(g); 
+      auto N1 = fs[1].N.rcol(g); 
+      fluid_2d_m(com_mod, vmsStab, fs[0].eNoN, fs[1].eNoN, w, ksix, N0, N1, 
+          Nwx, Nqx, Nwxx, al, yl, bfl, lR, lK, K_inverse_darcy_permeability);
+    }
+  } // g: loop
 
-        if (!com_mod.urisActFlag) {DDir = 0.0;}
+  // Gauss integration 2 uses the function spaces 'ws.fs_2'.
+  //
+  #ifdef debug_construct_fluid_element
+  dmsg;
+  dmsg << "Gauss integration 2 ... " << "";
+  dmsg << "fs[1].nG: " << ws.fs_2[0].nG;
+  dmsg << "fs[1].lShpF: " << ws.fs_2[0].lShpF;
+  dmsg << "fs[2].nG: " << ws.fs_2[1].nG;
+  dmsg << "fs[2].lShpF: " << ws.fs_2[1].lShpF;
+  #endif
+
+  for (int g = 0; g < ws.fs_2[1].nG; g++) {
+    const auto& fs = ws.fs_2;
+
+    if (g == 0 || !fs[0].lShpF) {
+      auto Nx = fs[0].Nx.rslice(g);
+      nn::gnn(fs[0].eNoN, nsd, nsd, Nx, xwl, Nwx, Jac, ksix);
+
+      if (utils::is_zero(Jac)) {
+         throw std::runtime_error("[construct_fluid] Jacobian for element " + std::to_string(e) + " is < 0.");
       }
+    }
+
+    if (g == 0 || !fs[1].lShpF) {
+      auto Nx = fs[1].Nx.rslice(g);
+      nn::gnn(fs[1].eNoN, nsd, nsd, Nx, xql, Nqx, Jac, ksix);
 
-      // Compute momentum residual and tangent matrix.
-      //
-      if (nsd == 3) {
-        auto N0 = fs[0].N.rcol(g); 
-        auto N1 = fs[1].N.rcol(g); 
-        fluid_3d_m(com_mod, vmsStab, fs[0].eNoN, fs[1].eNoN, w, ksix, N0, N1, 
-            Nwx, Nqx, Nwxx, al, yl, bfl, lR, lK, K_inverse_darcy_permeability, DDir);
-
-      } else if (nsd == 2) {
-        auto N0 = fs[0].N.rcol(g); 
-        auto N1 = fs[1].N.rcol(g); 
-        fluid_2d_m(com_mod, vmsStab, fs[0].eNoN, fs[1].eNoN, w, ksix, N0, N1, 
-            Nwx, Nqx, Nwxx, al, yl, bfl, lR, lK, K_inverse_darcy_permeability);
+      if (utils::is_zero(Jac)) {
+         throw std::runtime_error("[construct_fluid] Jacobian for element " + std::to_string(e) + " is < 0.");
       }
-    } // g: loop
+    }
+    double w = fs[1].w(g) * Jac;
 
-    // Set function spaces for velocity and pressure.
+    // Compute continuity residual and tangent matrix.
     //
-    fs::get_thood_fs(com_mod, fs, lM, vmsStab, 2);
+    if (nsd == 3) {
+      auto N0 = fs[0].N.rcol(g); 
+      auto N1 = fs[1].N.rcol(g); 
+      fluid_3d_c(com_mod, vmsStab, fs[0].eNoN, fs[1].eNoN, w, ksix, N0, N1, Nwx, Nqx, Nwxx, al, yl, bfl, lR, lK, K_inverse_darcy_permeability, DDir);
+
+    } else if (nsd == 2) {
+      auto N0 = fs[0].N.rcol(g); 
+      auto N1 = fs[1].N.rcol(g); 
+      fluid_2d_c(com_mod, vmsStab, fs[0].eNoN, fs[1].eNoN, w, ksix, N0, N1, Nwx, Nqx, Nwxx, al, yl, bfl, lR, lK, K_inverse_darcy_permeability);
+    }
 
-    // Gauss integration 2
-    //
-    #ifdef debug_construct_fluid
-    dmsg;
-    dmsg << "Gauss integration 2 ... " << "";
-    dmsg << "fs[1].nG: " << fs[0].nG;
-    dmsg << "fs[1].lShpF: " << fs[0].lShpF;
-    dmsg << "fs[2].nG: " << fs[1].nG;
-    dmsg << "fs[2].lShpF: " << fs[1].lShpF;
-    #endif
+  } // g: loop
+}
 
-    for (int g = 0; g < fs[1].nG; g++) {
-      if (g == 0 || !fs[0].lShpF) {
-        auto Nx = fs[0].Nx.rslice(g);
-        nn::gnn(fs[0].eNoN, nsd, nsd, Nx, xwl, Nwx, Jac, ksix);
+/// @brief Compute the local residuals 'batch.lR' and tangent matrices 
+/// 'batch.lK' for the batch of linear tetrahedral (TET4) P1P1 fluid 
+/// elements 'batch.elems'.
+///
+/// This gives the same element arrays as construct_fluid_element() for 
+/// elements with a single VMS stabilized function space. The elements 
+/// must all belong to the domain set in com_mod.cDmn.
+///
+/// Modifies: batch.xl, batch.al, batch.yl, batch.bfl, batch.Nx, batch.Kxi,
+///   batch.Jac, batch.lR, batch.lK
+//
+void construct_fluid_tet4(ComMod& com_mod, const mshType& lM, const Array<double>& Ag, const Array<double>& Yg, 
+    FluidTet4Batch& batch)
+{
+  constexpr int B = FluidTet4Batch::B;
+  const int num_elems = batch.num_elems;
+  const auto& fs = lM.fs[0];
 
-        if (utils::is_zero(Jac)) {
-           throw std::runtime_error("[construct_fluid] Jacobian for element " + std::to_string(e) + " is < 0.");
-        }
+  // Mesh velocity is stored in yl(4:6,:).
+  const int nyl = com_mod.mvMsh ? 7 : 4;
+
+  // Create local copies. Unused batch entries are filled with the last 
+  // element so that all loops run over the full batch.
+  //
+  for (int k = 0; k < B; k++) {
+    int e = batch.elems[std::min(k, num_elems-1)];
+
+    for (int a = 0; a < 4; a++) {
+      int Ac = lM.IEN(a,e);
+
+      for (int i = 0; i < 3; i++) {
+        batch.xl[i][a][k] = com_mod.x(i,Ac);
+        batch.bfl[i][a][k] = com_mod.Bf(i,Ac);
+        batch.al[i][a][k] = Ag(i,Ac);
       }
 
-      if (g == 0 || !fs[1].lShpF) {
-        auto Nx = fs[1].Nx.rslice(g);
-        nn::gnn(fs[1].eNoN, nsd, nsd, Nx, xql, Nqx, Jac, ksix);
+      for (int i = 0; i < nyl; i++) {
+        batch.yl[i][a][k] = Yg(i,Ac);
+      }
+    }
+  }
+
+  // Shape function derivatives, Kxi and Jacobian, computed as in nn::gnn(). 
+  // These are constant over linear tetrahedra so the shape function 
+  // derivatives for the first Gauss point are used.
+  //
+  double xXi[3][3][B] = {};
 
-        if (utils::is_zero(Jac)) {
-           throw std::runtime_error("[construct_fluid] Jacobian for element " + std::to_string(e) + " is < 0.");
+  for (int a = 0; a < 4; a++) {
+    for (int i = 0; i < 3; i++) {
+      for (int j = 0; j < 3; j++) {
+        const double Nxi = fs.Nx(j,a,0);
+        for (int k = 0; k < B; k++) {
+          xXi[i][j][k] = xXi[i][j][k] + batch.xl[i][a][k]*Nxi;
         }
       }
-      double w = fs[1].w(g) * Jac;
-
-      // Compute continuity residual and tangent matrix.
-      //
-      if (nsd == 3) {
-        auto N0 = fs[0].N.rcol(g); 
-        auto N1 = fs[1].N.rcol(g); 
-        fluid_3d_c(com_mod, vmsStab, fs[0].eNoN, fs[1].eNoN, w, ksix, N0, N1, Nwx, Nqx, Nwxx, al, yl, bfl, lR, lK, K_inverse_darcy_permeability, DDir);
-
-      } else if (nsd == 2) {
-        auto N0 = fs[0].N.rcol(g); 
-        auto N1 = fs[1].N.rcol(g); 
-        fluid_2d_c(com_mod, vmsStab, fs[0].eNoN, fs[1].eNoN, w, ksix, N0, N1, Nwx, Nqx, Nwxx, al, yl, bfl, lR, lK, K_inverse_darcy_permeability);
+    }
+  }
+
+  auto& Jac = batch.Jac;
+  auto& Kxi = batch.Kxi;
+  double xiX[3][3][B];
+
+  for (int k = 0; k < B; k++) {
+    Jac[k] = xXi[0][0][k]*xXi[1][1][k]*xXi[2][2][k] + xXi[0][1][k]*xXi[1][2][k]*xXi[2][0][k] + 
+             xXi[0][2][k]*xXi[1][0][k]*xXi[2][1][k] - xXi[0][0][k]*xXi[1][2][k]*xXi[2][1][k] - 
+             xXi[0][1][k]*xXi[1][0][k]*xXi[2][2][k] - xXi[0][2][k]*xXi[1][1][k]*xXi[2][0][k];
+
+    xiX[0][0][k] = (xXi[1][1][k]*xXi[2][2][k] - xXi[1][2][k]*xXi[2][1][k])/Jac[k];
+    xiX[0][1][k] = (xXi[2][1][k]*xXi[0][2][k] - xXi[2][2][k]*xXi[0][1][k])/Jac[k];
+    xiX[0][2][k] = (xXi[0][1][k]*xXi[1][2][k] - xXi[0][2][k]*xXi[1][1][k])/Jac[k];
+    xiX[1][0][k] = (xXi[1][2][k]*xXi[2][0][k] - xXi[1][0][k]*xXi[2][2][k])/Jac[k];
+    xiX[1][1][k] = (xXi[2][2][k]*xXi[0][0][k] - xXi[2][0][k]*xXi[0][2][k])/Jac[k];
+    xiX[1][2][k] = (xXi[0][2][k]*xXi[1][0][k] - xXi[0][0][k]*xXi[1][2][k])/Jac[k];
+    xiX[2][0][k] = (xXi[1][0][k]*xXi[2][1][k] - xXi[1][1][k]*xXi[2][0][k])/Jac[k];
+    xiX[2][1][k] = (xXi[2][0][k]*xXi[0][1][k] - xXi[2][1][k]*xXi[0][0][k])/Jac[k];
+    xiX[2][2][k] = (xXi[0][0][k]*xXi[1][1][k] - xXi[0][1][k]*xXi[1][0][k])/Jac[k];
+
+    Kxi[0][0][k] = xiX[0][0][k]*xiX[0][0][k] + xiX[1][0][k]*xiX[1][0][k] + xiX[2][0][k]*xiX[2][0][k];
+    Kxi[0][1][k] = xiX[0][1][k]*xiX[0][0][k] + xiX[1][1][k]*xiX[1][0][k] + xiX[2][1][k]*xiX[2][0][k];
+    Kxi[0][2][k] = xiX[0][2][k]*xiX[0][0][k] + xiX[1][2][k]*xiX[1][0][k] + xiX[2][2][k]*xiX[2][0][k];
+    Kxi[1][1][k] = xiX[0][1][k]*xiX[0][1][k] + xiX[1][1][k]*xiX[1][1][k] + xiX[2][1][k]*xiX[2][1][k];
+    Kxi[1][2][k] = xiX[0][1][k]*xiX[0][2][k] + xiX[1][1][k]*xiX[1][2][k] + xiX[2][1][k]*xiX[2][2][k];
+    Kxi[2][2][k] = xiX[0][2][k]*xiX[0][2][k] + xiX[1][2][k]*xiX[1][2][k] + xiX[2][2][k]*xiX[2][2][k];
+    Kxi[1][0][k] = Kxi[0][1][k];
+    Kxi[2][0][k] = Kxi[0][2][k];
+    Kxi[2][1][k] = Kxi[1][2][k];
+  }
+
+  for (int a = 0; a < 4; a++) {
+    const double Nxi[3] = {fs.Nx(0,a,0), fs.Nx(1,a,0), fs.Nx(2,a,0)};
+    for (int i = 0; i < 3; i++) {
+      for (int k = 0; k < B; k++) {
+        batch.Nx[i][a][k] = Nxi[0]*xiX[0][i][k] + Nxi[1]*xiX[1][i][k] + Nxi[2]*xiX[2][i][k];
       }
+    }
+  }
 
-    } // g: loop
+  for (int k = 0; k < num_elems; k++) {
+    if (utils::is_zero(Jac[k])) {
+      throw std::runtime_error("[construct_fluid] Jacobian for element " + std::to_string(batch.elems[k]) + " is < 0.");
+    }
+  }
 
-    eq.linear_algebra->assemble(com_mod, eNoN, ptr, lK, lR);
-    if (com_mod.risFlag) {
-      if (!std::all_of(com_mod.ris.clsFlg.begin(), com_mod.ris.clsFlg.end(), [](bool v) { return v; })) {
-        ris::doassem_ris(com_mod, eNoN, ptr, lK, lR);
+  // Initialize residual and tangents
+  std::memset(batch.lR, 0, sizeof batch.lR);
+  std::memset(batch.lK, 0, sizeof batch.lK);
+
+  for (int g = 0; g < fs.nG; g++) {
+    fluid_3d_tet4(com_mod, g, fs, batch);
+  }
+}
+
+/// @brief Assemble the fluid equation for the mesh 'lM' using threads.
+///
+/// The elements of a color (see lhsa_ns::color_elements()) do not share 
+/// any nodes and are therefore assembled concurrently without write 
+/// conflicts into com_mod.R and com_mod.Val. The elements of a color are 
+/// further grouped by domain because the element routines access domain 
+/// properties through com_mod.cDmn.
+//
+void construct_fluid_threaded(ComMod& com_mod, const mshType& lM, const bool vmsStab, const Array<double>& Ag, 
+    const Array<double>& Yg)
+{
+  using namespace consts;
+
+  const int eNoN = lM.eNoN;
+  const int cEq = com_mod.cEq;
+  const auto& eq = com_mod.eq[cEq];
+  const int nDmn = eq.nDmn;
+  const int num_colors = lM.eColor.size();
+
+  // Group the elements of each color by domain.
+  //
+  std::vector<std::vector<std::vector<int>>> color_elems(num_colors, std::vector<std::vector<int>>(nDmn));
+
+  for (int iClr = 0; iClr < num_colors; iClr++) {
+    for (int e : lM.eColor[iClr]) {
+      int iDmn = all_fun::domain(com_mod, lM, cEq, e);
+      if (eq.dmn[iDmn].phys == EquationType::phys_fluid) {
+        color_elems[iClr][iDmn].push_back(e);
       }
     }
+  }
 
-  } // e: loop
+  // Exceptions can't propagate out of a parallel region so the first 
+  // error message is saved and rethrown after all threads are done.
+  std::string error_msg;
 
-  #ifdef debug_construct_fluid
-  double end_time = utils::cput();
-  double etime = end_time - start_time;
-  #endif
+  const bool use_batch = use_tet4_batch(com_mod, lM, vmsStab);
+
+  #pragma omp parallel num_threads(eq.nAssmThreads)
+  {
+    auto& ws = AssemblyWorkspace::get();
+    ws.set_element_arrays(com_mod, eNoN);
+    ws.set_thood_fs(com_mod, lM, vmsStab);
+    ws.set_thood_arrays(com_mod);
+    FluidTet4Batch batch;
+
+    for (int iClr = 0; iClr < num_colors; iClr++) {
+      for (int iDmn = 0; iDmn < nDmn; iDmn++) {
+        const auto& elems = color_elems[iClr][iDmn];
+        const int num_elems = elems.size();
+        if (num_elems == 0) {
+          continue;
+        }
+
+        #pragma omp single
+        com_mod.cDmn = iDmn;
+
+        // Linear tetrahedral elements are computed in batches.
+        if (use_batch) {
+          #pragma omp for schedule(static)
+          for (int i = 0; i < num_elems; i += TET4_BATCH_SIZE) {
+            batch.num_elems = std::min(TET4_BATCH_SIZE, num_elems - i);
+            std::copy(elems.begin() + i, elems.begin() + i + batch.num_elems, batch.elems);
+            try {
+              construct_fluid_tet4(com_mod, lM, Ag, Yg, batch);
+              assemble_fluid_tet4(com_mod, lM, batch, ws);
+            } catch (const std::exception& exception) {
+              #pragma omp critical
+              if (error_msg.empty()) {
+                error_msg = exception.what();
+              }
+            }
+          }
+          continue;
+        }
+
+        #pragma omp for schedule(static)
+        for (int i = 0; i < num_elems; i++) {
+          int e = elems[i];
+          try {
+            construct_fluid_element(com_mod, lM, e, vmsStab, Ag, Yg, ws);
+            eq.linear_algebra->assemble(com_mod, lM, e, ws.ptr, ws.lK, ws.lR);
+          } catch (const std::exception& exception) {
+            #pragma omp critical
+            if (error_msg.empty()) {
+              error_msg = exception.what();
+            }
+          }
+        }
+      }
+    }
+  }
+
+  if (!error_msg.empty()) {
+    throw std::runtime_error(error_msg);
+  }
 }
 
 /// @brief Reproduces Fortran 'FLUID2D_C()'.
@@ -2248,6 +2577,284 @@ void fluid_3d_m(ComMod& com_mod, const int vmsFlag, const int eNoNw, const int e
 
 }
 
+/// @brief Element momentum and continuity residuals and tangent matrices 
+/// at Gauss point 'g' for a batch of linear tetrahedral P1P1 elements.
+///
+/// This is fluid_3d_m() followed by fluid_3d_c() with VMS stabilization, 
+/// simplified using the shape function second derivatives being zero and 
+/// the velocity and pressure sharing the same shape functions.
+///
+///  Modifies:
+///    batch.lR(dof,eNoN,B)  - Residual
+///    batch.lK(dof*dof,eNoN,eNoN,B) - Stiffness matrix
+//
+void fluid_3d_tet4(ComMod& com_mod, const int g, const fsType& fs, FluidTet4Batch& batch)
+{
+  constexpr int B = FluidTet4Batch::B;
+
+  using namespace consts;
+
+  int cEq = com_mod.cEq;
+  auto& eq = com_mod.eq[cEq];
+  int cDmn = com_mod.cDmn;
+  auto& dmn = eq.dmn[cDmn];
+  const double dt = com_mod.dt;
+
+  const double ctM  = 1.0;
+  const double ctC  = 36.0;
+
+  const double rho = dmn.prop[PhysicalProperyType::fluid_density];
+  const double K_inverse_darcy_permeability = dmn.prop[PhysicalProperyType::inverse_darcy_permeability];
+  double f[3];
+  f[0] = dmn.prop[PhysicalProperyType::f_x];
+  f[1] = dmn.prop[PhysicalProperyType::f_y];
+  f[2] = dmn.prop[PhysicalProperyType::f_z];
+
+  const double T1 = eq.af * eq.gam * dt;
+  const double amd = eq.am / T1;
+  const double kT0 = 4.0 * ((ctM/dt) * (ctM/dt));
+  const double eps = std::numeric_limits<double>::epsilon();
+
+  double N[4];
+  for (int a = 0; a < 4; a++) {
+    N[a] = fs.N(a,g);
+  }
+
+  const auto& Nx = batch.Nx;
+  const auto& Kxi = batch.Kxi;
+  const auto& al = batch.al;
+  const auto& yl = batch.yl;
+  const auto& bfl = batch.bfl;
+  auto& lR = batch.lR;
+  auto& lK = batch.lK;
+
+  double w[B], wl[B], wr[B];
+
+  for (int k = 0; k < B; k++) {
+    w[k] = fs.w(g) * batch.Jac[k];
+    wl[k] = w[k]*T1;
+    wr[k] = w[k]*rho;
+  }
+
+  // Velocity and its gradients, inertia (acceleration & body force), 
+  // pressure and its gradient
+  //
+  double ud[3][B], u[3][B] = {}, ux[3][3][B] = {};
+  double p[B] = {}, px[3][B] = {};
+
+  for (int i = 0; i < 3; i++) {
+    for (int k = 0; k < B; k++) {
+      ud[i][k] = -f[i];
+    }
+  }
+
+  for (int a = 0; a < 4; a++) {
+    for (int i = 0; i < 3; i++) {
+      for (int k = 0; k < B; k++) {
+        ud[i][k] = ud[i][k] + N[a]*(al[i][a][k]-bfl[i][a][k]);
+        u[i][k] = u[i][k] + N[a]*yl[i][a][k];
+        px[i][k] = px[i][k] + Nx[i][a][k]*yl[3][a][k];
+        for (int j = 0; j < 3; j++) {
+          ux[i][j][k] += Nx[i][a][k]*yl[j][a][k];
+        }
+      }
+    }
+
+    for (int k = 0; k < B; k++) {
+      p[k] = p[k] + N[a]*yl[3][a][k];
+    }
+  }
+
+  // Update convection velocity relative to mesh velocity
+  //
+  if (com_mod.mvMsh) {
+    for (int a = 0; a < 4; a++) {
+      for (int i = 0; i < 3; i++) {
+        for (int k = 0; k < B; k++) {
+          u[i][k] = u[i][k] - N[a]*yl[4+i][a][k];
+        }
+      }
+    }
+  }
+
+  // Strain rate tensor 2*e_ij := (u_i,j + u_j,i) and shear-rate := (2*e_ij*e_ij)^.5
+  //
+  double divU[B], es[3][3][B], gam[B];
+
+  for (int k = 0; k < B; k++) {
+    divU[k] = ux[0][0][k] + ux[1][1][k] + ux[2][2][k];
+
+    for (int i = 0; i < 3; i++) {
+      for (int j = 0; j < 3; j++) {
+        es[i][j][k] = ux[i][j][k] + ux[j][i][k];
+      }
+    }
+
+    gam[k] = es[0][0][k]*es[0][0][k] + es[1][0][k]*es[1][0][k] + es[2][0][k]*es[2][0][k]
+           + es[0][1][k]*es[0][1][k] + es[1][1][k]*es[1][1][k] + es[2][1][k]*es[2][1][k]
+           + es[0][2][k]*es[0][2][k] + es[1][2][k]*es[1][2][k] + es[2][2][k]*es[2][2][k];
+    gam[k] = sqrt(0.5*gam[k]);
+  }
+
+  double esNx[3][4][B];
+
+  for (int a = 0; a < 4; a++) {
+    for (int i = 0; i < 3; i++) {
+      for (int k = 0; k < B; k++) {
+        esNx[i][a][k] = es[0][i][k]*Nx[0][a][k] + es[1][i][k]*Nx[1][a][k] + es[2][i][k]*Nx[2][a][k];
+      }
+    }
+  }
+
+  // Compute viscosity based on shear-rate and chosen viscosity model
+  // The returned mu_g := (d\mu / d\gamma)
+  //
+  double mu[B], mu_g[B];
+
+  for (int k = 0; k < B; k++) {
+    double mu_s;
+    get_viscosity(com_mod, dmn, gam[k], mu[k], mu_s, mu_g[k]);
+
+    if (utils::is_zero(gam[k])) {
+      mu_g[k] = 0.0;
+    } else {
+      mu_g[k] = mu_g[k] / gam[k];
+    }
+  }
+
+  // Stabilization parameters
+  //
+  double tauM[B], tauC[B], tauB[B], up[3][B];
+
+  for (int k = 0; k < B; k++) {
+    double kT = kT0 + (K_inverse_darcy_permeability*mu[k]/rho) * (K_inverse_darcy_permeability*mu[k]/rho);
+
+    double kU = u[0][k]*u[0][k]*Kxi[0][0][k] + u[1][k]*u[0][k]*Kxi[1][0][k] + u[2][k]*u[0][k]*Kxi[2][0][k]
+              + u[0][k]*u[1][k]*Kxi[0][1][k] + u[1][k]*u[1][k]*Kxi[1][1][k] + u[2][k]*u[1][k]*Kxi[2][1][k]
+              + u[0][k]*u[2][k]*Kxi[0][2][k] + u[1][k]*u[2][k]*Kxi[1][2][k] + u[2][k]*u[2][k]*Kxi[2][2][k];
+
+    double kS = Kxi[0][0][k]*Kxi[0][0][k] + Kxi[1][0][k]*Kxi[1][0][k] + Kxi[2][0][k]*Kxi[2][0][k]
+              + Kxi[0][1][k]*Kxi[0][1][k] + Kxi[1][1][k]*Kxi[1][1][k] + Kxi[2][1][k]*Kxi[2][1][k]
+              + Kxi[0][2][k]*Kxi[0][2][k] + Kxi[1][2][k]*Kxi[1][2][k] + Kxi[2][2][k]*Kxi[2][2][k];
+    kS = ctC * kS * ((mu[k]/rho) * (mu[k]/rho));
+    tauM[k] = 1.0 / (rho * sqrt( kT + kU + kS ));
+
+    for (int i = 0; i < 3; i++) {
+      double rV = ud[i][k] + u[0][k]*ux[0][i][k] + u[1][k]*ux[1][i][k] + u[2][k]*ux[2][i][k];
+      up[i][k] = -tauM[k]*(rho*rV + px[i][k] + mu[k]*K_inverse_darcy_permeability * u[i][k]);
+    }
+
+    tauC[k] = 1.0 / (tauM[k] * (Kxi[0][0][k] + Kxi[1][1][k] + Kxi[2][2][k]));
+    tauB[k] = up[0][k]*up[0][k]*Kxi[0][0][k] + up[1][k]*up[0][k]*Kxi[1][0][k]
+            + up[2][k]*up[0][k]*Kxi[2][0][k] + up[0][k]*up[1][k]*Kxi[0][1][k]
+            + up[1][k]*up[1][k]*Kxi[1][1][k] + up[2][k]*up[1][k]*Kxi[2][1][k]
+            + up[0][k]*up[2][k]*Kxi[0][2][k] + up[1][k]*up[2][k]*Kxi[1][2][k]
+            + up[2][k]*up[2][k]*Kxi[2][2][k];
+  }
+
+  for (int k = 0; k < B; k++) {
+    if (utils::is_zero(tauB[k])) {
+      tauB[k] = eps;
+    }
+    tauB[k] = rho / sqrt(tauB[k]);
+  }
+
+  double rV[3][B], rM[3][3][B];
+
+  for (int k = 0; k < B; k++) {
+    double ua[3];
+    for (int i = 0; i < 3; i++) {
+      ua[i] = u[i][k] + up[i][k];
+    }
+    double pa = p[k] - tauC[k]*divU[k];
+
+    for (int j = 0; j < 3; j++) {
+      double rVp = tauB[k]*(up[0][k]*ux[0][j][k] + up[1][k]*ux[1][j][k] + up[2][k]*ux[2][j][k]);
+      for (int i = 0; i < 3; i++) {
+        rM[i][j][k] = mu[k]*es[i][j][k] - rho*up[j][k]*ua[i] + rVp*up[i][k];
+      }
+      rM[j][j][k] = rM[j][j][k] - pa;
+    }
+
+    for (int i = 0; i < 3; i++) {
+      rV[i][k] = ud[i][k] + ua[0]*ux[0][i][k] + ua[1]*ux[1][i][k] + ua[2]*ux[2][i][k];
+    }
+  }
+
+  // Local residual
+  //
+  double uNx[4][B], upNx[4][B], uaNx[4][B], updu[4][B];
+
+  for (int a = 0; a < 4; a++) {
+    for (int k = 0; k < B; k++) {
+      for (int i = 0; i < 3; i++) {
+        lR[i][a][k] = lR[i][a][k] + wr[k]*N[a]*rV[i][k] 
+                    + w[k]*(Nx[0][a][k]*rM[0][i][k] + Nx[1][a][k]*rM[1][i][k] + Nx[2][a][k]*rM[2][i][k]);
+      }
+
+      // Quantities used for stiffness matrix
+      uNx[a][k]  = u[0][k]*Nx[0][a][k]  + u[1][k]*Nx[1][a][k]  + u[2][k]*Nx[2][a][k];
+      upNx[a][k] = up[0][k]*Nx[0][a][k] + up[1][k]*Nx[1][a][k] + up[2][k]*Nx[2][a][k];
+      uaNx[a][k] = uNx[a][k] + upNx[a][k];
+
+      // The diagonal of updu, its off-diagonal terms are zero. 
+      updu[a][k] = -rho*uNx[a][k] - mu[k]*K_inverse_darcy_permeability*N[a];
+
+      // Continuity residual
+      lR[3][a][k] = lR[3][a][k] + w[k]*(N[a]*divU[k] - upNx[a][k]);
+    }
+  }
+
+  // Tangent (stiffness) matrices
+  //
+  for (int b = 0; b < 4; b++) {
+    for (int a = 0; a < 4; a++) {
+      for (int k = 0; k < B; k++) {
+        double NxNx = Nx[0][a][k]*Nx[0][b][k] + Nx[1][a][k]*Nx[1][b][k] + Nx[2][a][k]*Nx[2][b][k];
+        double T1 = mu[k]*NxNx + rho*amd*N[b]*(N[a] + rho*tauM[k]*uaNx[a][k]) + rho*N[a]*(uNx[b][k]+upNx[b][k]) 
+                  + tauB[k]*upNx[a][k]*upNx[b][k];
+        double T3 = rho*tauM[k]*uaNx[a][k];
+
+        for (int i = 0; i < 3; i++) {
+          // dRm_ai/du_bi
+          double T2 = (mu[k] + tauC[k])*(Nx[i][a][k]*Nx[i][b][k]) + esNx[i][a][k]*mu_g[k]*esNx[i][b][k] 
+                    - rho*tauM[k]*uaNx[a][k]*updu[b][k];
+          lK[5*i][a][b][k] = lK[5*i][a][b][k] + wl[k]*(T2 + T1);
+          lK[5*i][a][b][k] = lK[5*i][a][b][k] + mu[k]*K_inverse_darcy_permeability*wl[k]*N[b]*N[a];
+
+          // dRm_ai/du_bj
+          for (int j = 0; j < 3; j++) {
+            if (j != i) {
+              T2 = mu[k]*(Nx[j][a][k]*Nx[i][b][k]) + tauC[k]*(Nx[i][a][k]*Nx[j][b][k]) 
+                 + esNx[i][a][k]*mu_g[k]*esNx[j][b][k];
+              lK[4*i+j][a][b][k] = lK[4*i+j][a][b][k] + wl[k]*(T2);
+            }
+          }
+
+          // dRm_ai/dp_b
+          lK[4*i+3][a][b][k] = lK[4*i+3][a][b][k] - wl[k]*(Nx[i][a][k]*N[b] - Nx[i][b][k]*T3);
+
+          // dRc_a/dU_bi
+          T2 = Nx[i][a][k]*(updu[b][k] - rho*amd*N[b]);
+          lK[12+i][a][b][k] = lK[12+i][a][b][k] + wl[k]*(N[a]*Nx[i][b][k] - tauM[k]*T2);
+        }
+
+        // dC/dP
+        lK[15][a][b][k] = lK[15][a][b][k] + wl[k]*tauM[k]*NxNx;
+      }
+    }
+  }
+
+  // Residual contribution Birkman term 
+  //
+  for (int a = 0; a < 4; a++) {
+    for (int i = 0; i < 3; i++) {
+      for (int k = 0; k < B; k++) {
+        lR[i][a][k] = lR[i][a][k] + mu[k]*K_inverse_darcy_permeability*w[k]*N[a]*(u[i][k]+up[i][k]);
+      }
+    }
+  }
+}
 
 void get_viscosity(const ComMod& com_mod, const dmnType& lDmn, double& gamma, double& mu, double& mu_s, double& mu_x)
 {
@@ -2309,4 +2916,20 @@ void get_viscosity(const ComMod& com_mod, const dmnType& lDmn, double& gamma, do
   } 
 }
 
+/// @brief Check if the elements of mesh 'lM' are assembled in batches 
+/// using construct_fluid_tet4().
+///
+/// Batched assembly is used for linear tetrahedral P1P1 (VMS stabilized)
+/// meshes if it is enabled for the equation. Unfitted RIS (uris) adds 
+/// element dependent terms at each Gauss point so it uses the 
+/// element-by-element routines.
+//
+bool use_tet4_batch(const ComMod& com_mod, const mshType& lM, const bool vmsStab)
+{
+  const auto& eq = com_mod.eq[com_mod.cEq];
+
+  return eq.batchAssm && vmsStab && (com_mod.nsd == 3) && (lM.eType == consts::ElementType::TET4) && 
+      !com_mod.urisFlag;
+}
+
 };
@@ -4,12 +4,52 @@
 #ifndef FLUID_H 
 #define FLUID_H 
 
+#include "AssemblyWorkspace.h"
 #include "ComMod.h"
 
 #include "consts.h"
 
 namespace fluid {
 
+/// @brief Number of elements computed at once by the batched linear
+/// tetrahedral element kernel construct_fluid_tet4().
+constexpr int TET4_BATCH_SIZE = 8;
+
+/// @brief The FluidTet4Batch struct stores the element arrays for a batch
+/// of linear tetrahedral (TET4) P1P1 fluid elements.
+///
+/// Arrays are stored in structure-of-arrays layout: the last index of each
+/// array is the element in the batch so that the loops over the batch
+/// elements can be vectorized. Unused batch entries are copies of the last
+/// element of the batch.
+///
+///   elems - mesh element IDs
+///   xl, al, yl, bfl - element coordinates, acceleration, velocity (and
+///                     mesh velocity) and body force
+///   Nx, Kxi, Jac - shape function derivatives, Kxi and Jacobian
+///   lR, lK - element residual and tangent matrices
+//
+struct FluidTet4Batch {
+  static constexpr int B = TET4_BATCH_SIZE;
+
+  int num_elems = 0;
+  int elems[B];
+
+  double xl[3][4][B];
+  double al[3][4][B];
+  double yl[7][4][B];
+  double bfl[3][4][B];
+
+  double Nx[3][4][B];
+  double Kxi[3][3][B];
+  double Jac[B];
+
+  double lR[4][4][B];
+  double lK[16][4][4][B];
+};
+
+void assemble_fluid_tet4(ComMod& com_mod, const mshType& lM, const FluidTet4Batch& batch, AssemblyWorkspace& ws);
+
 void b_fluid(ComMod& com_mod, const int eNoN, const double w, const Vector<double>& N, const Vector<double>& y,   
     const double h, const Vector<double>& nV, Array<double>& lR, Array3<double>& lK);
 
@@ -23,6 +63,15 @@ void bw_fluid_3d(ComMod& com_mod, const int eNoNw, const int eNoNq, const double
 
 void construct_fluid(ComMod& com_mod, const mshType& lM, const Array<double>& Ag, const Array<double>& Yg);
 
+void construct_fluid_element(ComMod& com_mod, const mshType& lM, const int e, const bool vmsStab, 
+    const Array<double>& Ag, const Array<double>& Yg, AssemblyWorkspace& ws);
+
+void construct_fluid_tet4(ComMod& com_mod, const mshType& lM, const Array<double>& Ag, const Array<double>& Yg, 
+    FluidTet4Batch& batch);
+
+void construct_fluid_threaded(ComMod& com_mod, const mshType& lM, const bool vmsStab, const Array<double>& Ag, 
+    const Array<double>& Yg);
+
 void fluid_2d_c(ComMod& com_mod, const int vmsFlag, const int eNoNw, const int eNoNq, const double w, const Array<double>& Kxi, 
     const Vector<double>& Nw, const Vector<double>& Nq, const Array<double>& Nwx, const Array<double>& Nqx, 
     const Array<double>& Nwxx, const Array<double>& al, const Array<double>& yl, const Array<double>& bfl, 
@@ -43,8 +92,12 @@ void fluid_3d_m(ComMod& com_mod, const int vmsFlag, const int eNoNw, const int e
     const Array<double>& Nwxx, const Array<double>& al, const Array<double>& yl, const Array<double>& bfl, 
     Array<double>& lR, Array3<double>& lK, double K_inverse_darcy_permeability, double DDir=0.0);
 
+void fluid_3d_tet4(ComMod& com_mod, const int g, const fsType& fs, FluidTet4Batch& batch);
+
 void get_viscosity(const ComMod& com_mod, const dmnType& lDmn, double& gamma, double& mu, double& mu_s, double& mu_x);
 
+bool use_tet4_batch(const ComMod& com_mod, const mshType& lM, const bool vmsStab);
+
 };
 
 #endif
@@ -13,22 +13,44 @@ namespace fs {
 /// @brief Allocates arrays within the function space type. Assumes that 
 /// fs%eNoN and fs%nG are already defined
 ///
+/// Arrays are only reallocated if their size changes so a function space 
+/// can be reset (e.g. by get_thood_fs()) without allocating memory.
+///
 /// Replicates 'SUBROUTINE ALLOCFS(fs, insd)'.
 //
 void alloc_fs(fsType& fs, const int nsd, const int insd)
 {
   int nG = fs.nG;
   int eNoN = fs.eNoN;
+  int ind2 = std::max(3*(insd-1), 1);
 
-  fs.w.resize(nG); 
-  fs.xi.resize(insd,nG); 
-  fs.xib.resize(2,nsd); 
-  fs.N.resize(eNoN,nG); 
-  fs.Nb.resize(2,eNoN); 
-  fs.Nx.resize(insd,eNoN,nG);
+  if (fs.w.size() != nG) {
+    fs.w.resize(nG); 
+  }
 
-  int ind2 = std::max(3*(insd-1), 1);
-  fs.Nxx.resize(ind2,eNoN,nG);
+  if ((fs.xi.nrows() != insd) || (fs.xi.ncols() != nG)) {
+    fs.xi.resize(insd,nG); 
+  }
+
+  if ((fs.xib.nrows() != 2) || (fs.xib.ncols() != nsd)) {
+    fs.xib.resize(2,nsd); 
+  }
+
+  if ((fs.N.nrows() != eNoN) || (fs.N.ncols() != nG)) {
+    fs.N.resize(eNoN,nG); 
+  }
+
+  if ((fs.Nb.nrows() != 2) || (fs.Nb.ncols() != eNoN)) {
+    fs.Nb.resize(2,eNoN); 
+  }
+
+  if ((fs.Nx.nrows() != insd) || (fs.Nx.ncols() != eNoN) || (fs.Nx.nslices() != nG)) {
+    fs.Nx.resize(insd,eNoN,nG);
+  }
+
+  if ((fs.Nxx.nrows() != ind2) || (fs.Nxx.ncols() != eNoN) || (fs.Nxx.nslices() != nG)) {
+    fs.Nxx.resize(ind2,eNoN,nG);
+  }
 }
 
 
@@ -98,6 +120,7 @@ void get_thood_fs(ComMod& com_mod, std::array<fsType,2>& fs, const mshType& lM,
 
       fs[1].w = lM.fs[0].w;
       fs[1].xi = lM.fs[0].xi;
+      fs[1].Nxx = 0.0;
 
       for (int g = 0; g < fs[1].nG; g++) {
         nn::get_gnn(nsd, fs[1].eType, fs[1].eNoN, g, fs[1].xi, fs[1].N, fs[1].Nx);
@@ -128,6 +151,7 @@ void get_thood_fs(ComMod& com_mod, std::array<fsType,2>& fs, const mshType& lM,
 
       fs[0].w = lM.fs[1].w;
       fs[0].xi = lM.fs[1].xi;
+      fs[0].Nxx = 0.0;
 
       for (int g = 0; g < fs[0].nG; g++) {
         nn::get_gnn(nsd, fs[0].eType, fs[0].eNoN, g, fs[0].xi, fs[0].N, fs[0].Nx);
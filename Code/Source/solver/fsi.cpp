@@ -345,7 +345,7 @@ void construct_fsi(ComMod& com_mod, CepMod& cep_mod, const mshType& lM, const Ar
     }
     else 
     {
-      eq.linear_algebra->assemble(com_mod, eNoN, ptr, lK, lR);
+      eq.linear_algebra->assemble(com_mod, lM, e, ptr, lK, lR);
     }
 
     if (com_mod.risFlag) {
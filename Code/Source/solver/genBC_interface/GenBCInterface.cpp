@@ -0,0 +1,80 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#include "GenBCInterface.h"
+#include <dlfcn.h>
+#include <stdexcept>
+#include <string>
+
+//----------------
+// GenBCInterface
+//----------------
+//
+GenBCInterface::GenBCInterface()
+{
+  genbc_integ_x_name_ = "genbc_integ_x";
+}
+
+GenBCInterface::~GenBCInterface()
+{
+  if (library_handle_ != nullptr) {
+    dlclose(library_handle_);
+  }
+}
+
+//--------------
+// load_library
+//--------------
+// Load the genBC shared library and get a pointer to its interface function.
+//
+void GenBCInterface::load_library(const std::string& interface_lib)
+{
+  library_handle_ = dlopen(interface_lib.c_str(), RTLD_LAZY);
+
+  if (!library_handle_) {
+    throw std::runtime_error("Error loading the genBC shared library '" + interface_lib + "' with error: " +
+        std::string(dlerror()));
+  }
+
+  *(void**)(&genbc_integ_x_) = dlsym(library_handle_, genbc_integ_x_name_.c_str());
+
+  if (!genbc_integ_x_) {
+    std::string error = dlerror();
+    dlclose(library_handle_);
+    library_handle_ = nullptr;
+    throw std::runtime_error("Error loading the function '" + genbc_integ_x_name_ + "' from the genBC shared library '" +
+        interface_lib + "' with error: " + error);
+  }
+}
+
+//---------
+// integ_x
+//---------
+// Integrate the 0D model over a time step of the 3D solver.
+//
+// Parameters:
+//
+//   flag: I (initializing), T (iteration loop), L (last iteration), D (derivative)
+//         or U (update the state without writing files)
+//
+//   P: The old and new pressures of the Dirichlet faces, P[2*i] and P[2*i+1].
+//
+//   Q: The old and new flow rates of the Neumann faces, Q[2*i] and Q[2*i+1].
+//
+//   y: The flow rates of the Dirichlet faces followed by the pressures of the
+//      Neumann faces.
+//
+void GenBCInterface::integ_x(const std::string& flag, const double dt, const int nDir, const int nNeu,
+    const std::vector<double>& P, const std::vector<double>& Q, std::vector<double>& y)
+{
+  y.resize(nDir + nNeu);
+  int ierr = 0;
+
+  genbc_integ_x_(flag.c_str(), &dt, &nDir, &nNeu, P.data(), Q.data(), y.data(), &ierr);
+
+  if (ierr != 0) {
+    throw std::runtime_error("The genBC shared library failed with error code " + std::to_string(ierr) +
+        " for the flag '" + flag + "'.");
+  }
+}
+
@@ -0,0 +1,65 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#include <string>
+#include <vector>
+
+#ifndef GenBCInterface_h
+#define GenBCInterface_h
+
+//----------------
+// GenBCInterface
+//----------------
+// Interface to a genBC 0D model built as a shared library.
+//
+// The library is loaded once and stays in the solver process so the 0D model
+// is integrated by a function call instead of running the genBC executable
+// and exchanging data through the GenBC.int file for every call.
+//
+// The library must export the C function
+//
+//   void genbc_integ_x(const char* flag, const double* dt, const int* nDir, const int* nNeu,
+//       const double* P, const double* Q, double* y, int* ierr)
+//
+// where
+//
+//   flag: I (initializing), T (iteration loop), L (last iteration), D (derivative)
+//         or U (update the state like L without writing any files)
+//   dt: The time step of the 3D solver
+//   P(2,nDir): The old and new pressures of the Dirichlet faces
+//   Q(2,nNeu): The old and new flow rates of the Neumann faces
+//   y(nDir+nNeu): The flow rates of the Dirichlet faces followed by the pressures
+//                 of the Neumann faces
+//   ierr: Nonzero if the 0D model failed
+//
+// This is the data written to and read from GenBC.int by the genBC executable.
+//
+// The library is loaded by all processes. The master process integrates the
+// 0D model and saves its state with the L flag. The other processes keep a
+// copy of the state, updated with the U flag, so they can compute perturbed
+// solutions with the D flag in parallel.
+//
+class GenBCInterface
+{
+  public:
+    GenBCInterface();
+    ~GenBCInterface();
+
+    GenBCInterface(const GenBCInterface&) = delete;
+    GenBCInterface& operator=(const GenBCInterface&) = delete;
+
+    bool loaded() const { return library_handle_ != nullptr; };
+    void load_library(const std::string& interface_lib);
+    void integ_x(const std::string& flag, const double dt, const int nDir, const int nNeu,
+        const std::vector<double>& P, const std::vector<double>& Q, std::vector<double>& y);
+
+    // Interface function.
+    std::string genbc_integ_x_name_;
+    void (*genbc_integ_x_)(const char*, const double*, const int*, const int*, const double*,
+        const double*, double*, int*) = nullptr;
+
+    void* library_handle_ = nullptr;
+};
+
+#endif
+
@@ -126,7 +126,7 @@ void construct_heatf(ComMod& com_mod, const mshType& lM, const Array<double>& Ag
       }
     } // for g = 0
 
-    eq.linear_algebra->assemble(com_mod, eNoN, ptr, lK, lR);
+    eq.linear_algebra->assemble(com_mod, lM, e, ptr, lK, lR);
 
   } // for e = 0
 }
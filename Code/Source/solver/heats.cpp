@@ -102,7 +102,7 @@ void construct_heats(ComMod& com_mod, const mshType& lM, const Array<double>& Ag
       }
     }
 
-    eq.linear_algebra->assemble(com_mod, eNoN, ptr, lK, lR);
+    eq.linear_algebra->assemble(com_mod, lM, e, ptr, lK, lR);
   }
 }
 
@@ -17,6 +17,7 @@
 #include "nn.h"
 #include "output.h"
 #include "post.h"
+#include "restart_io.h"
 #include "set_bc.h"
 #include "txt.h"
 #include "utils.h"
@@ -75,6 +76,13 @@ void init_from_bin(Simulation* simulation, const std::string& fName, std::array<
   com_mod.timeP[1] = timeP[1];
   com_mod.timeP[2] = timeP[2];
 
+  // Files keyed by global node ID can be read by any number of processes.
+  //
+  if (restart_io::is_global_restart_file(fName)) {
+    restart_io::read_global_restart(simulation, fName, timeP);
+    return;
+  }
+
   #ifdef debug_init_from_bin 
   dmsg << "dFlag: " << dFlag;
   dmsg << "sstEq: " << sstEq;
@@ -601,6 +609,17 @@ void initialize(Simulation* simulation, Vector<double>& timeP)
   int gnnz = nnz;
   MPI_Allreduce(&nnz, &gnnz, 1, cm_mod::mpint, MPI_SUM, cm.com());
 
+  // Color mesh elements for threaded assembly.
+  //
+  bool threaded_assembly = std::any_of(com_mod.eq.begin(), com_mod.eq.end(), 
+      [](const eqType& eq) { return eq.nAssmThreads > 1; });
+
+  if (threaded_assembly) {
+    for (auto& msh : com_mod.msh) {
+      lhsa_ns::color_elements(com_mod.tnNo, msh);
+    }
+  }
+
   // Initialize FSILS structures
   //
   fsi_linear_solver::FSILS_commuType communicator;
@@ -662,6 +681,18 @@ void initialize(Simulation* simulation, Vector<double>& timeP)
     }
   }
 
+  // Precomputed state-variables
+  //
+  if (com_mod.usePrecomp) {
+    com_mod.precompSol.open(com_mod.precompBinFileName, com_mod.ltg);
+
+    if (com_mod.precompSol.num_nodes() != com_mod.gtnNo) {
+      throw std::runtime_error("The number of nodes " + std::to_string(com_mod.precompSol.num_nodes()) +
+          " in the precomputed solution file '" + com_mod.precompBinFileName +
+          "' is not equal to the number of mesh nodes " + std::to_string(com_mod.gtnNo) + ".");
+    }
+  }
+
   // Setup data for remeshing.
   //
   auto& rmsh = com_mod.rmsh;
@@ -870,15 +901,8 @@ void zero_init(Simulation* simulation)
   //
 
   if (com_mod.usePrecomp) {
-    for (int l = 0; l < com_mod.nMsh; l++) {
-      auto& msh = com_mod.msh[l];
-      for (int a = 0; a < com_mod.tnNo; a++) {
-        // In the future this should depend on the equation type.
-        for (int i = 0; i < nsd; i++) {
-          com_mod.Yo(i,a) = msh.Ys(i,a,0);
-        }
-      }
-    }
+    // In the future this should depend on the equation type.
+    com_mod.precompSol.copy(0, nsd, com_mod.Yo);
   }
 
   // Load any explicitly provided solution variables
@@ -137,7 +137,7 @@ void construct_l_elas(ComMod& com_mod, const mshType& lM, const Array<double>& A
       }
     }
 
-    eq.linear_algebra->assemble(com_mod, eNoN, ptr, lK, lR);
+    eq.linear_algebra->assemble(com_mod, lM, e, ptr, lK, lR);
   }
 }
 
@@ -8,6 +8,8 @@
 #include "consts.h"
 #include "utils.h"
 
+#include <algorithm>
+
 namespace lhsa_ns {
 
 void add_col(const int tnNo, const int row, const int col, int& mnnzeic, Array<int>& uInd)
@@ -53,6 +55,90 @@ void add_col(const int tnNo, const int row, const int col, int& mnnzeic, Array<i
   } 
 }
 
+/// @brief Color the elements of the mesh 'lM' so that the elements of 
+/// a color do not share any nodes. 
+///
+/// The elements of a color can then be assembled concurrently into the 
+/// global residual and stiffness matrix without write conflicts. A greedy 
+/// algorithm is used, each element is given the smallest color that is not 
+/// used by the elements it shares a node with.
+///
+/// Modifies:
+///   lM.eColor - The element IDs of each color
+//
+void color_elements(const int tnNo, mshType& lM)
+{
+  const int eNoN = lM.eNoN;
+  const int nEl = lM.nEl;
+
+  lM.eColor.clear();
+
+  if (nEl == 0) {
+    return;
+  }
+
+  // Create the node to element adjacency.
+  //
+  Vector<int> nodePtr(tnNo+1);
+
+  for (int e = 0; e < nEl; e++) {
+    for (int a = 0; a < eNoN; a++) {
+      nodePtr(lM.IEN(a,e)+1) += 1;
+    }
+  }
+
+  for (int Ac = 0; Ac < tnNo; Ac++) {
+    nodePtr(Ac+1) += nodePtr(Ac);
+  }
+
+  Vector<int> nodeElems(nodePtr(tnNo));
+  Vector<int> next(tnNo);
+
+  for (int Ac = 0; Ac < tnNo; Ac++) {
+    next(Ac) = nodePtr(Ac);
+  }
+
+  for (int e = 0; e < nEl; e++) {
+    for (int a = 0; a < eNoN; a++) {
+      int Ac = lM.IEN(a,e);
+      nodeElems(next(Ac)) = e;
+      next(Ac) += 1;
+    }
+  }
+
+  // Greedy coloring, 'used[c] == e' marks that color 'c' is used by 
+  // an element sharing a node with element 'e'.
+  //
+  Vector<int> eColor(nEl);
+  eColor = -1;
+  std::vector<int> used;
+
+  for (int e = 0; e < nEl; e++) {
+    for (int a = 0; a < eNoN; a++) {
+      int Ac = lM.IEN(a,e);
+      for (int i = nodePtr(Ac); i < nodePtr(Ac+1); i++) {
+        int c = eColor(nodeElems(i));
+        if (c != -1) {
+          used[c] = e;
+        }
+      }
+    }
+
+    int c = 0;
+    while ((c < used.size()) && (used[c] == e)) {
+      c += 1;
+    }
+
+    if (c == used.size()) {
+      used.push_back(-1);
+      lM.eColor.emplace_back();
+    }
+
+    eColor(e) = c;
+    lM.eColor[c].push_back(e);
+  }
+}
+
 /// @brief This subroutine assembles the element stiffness matrix into the 
 /// global stiffness matrix (Val sparse matrix formatted as a vector). Also
 /// assembles the element residual into the global residual (R).
@@ -113,6 +199,58 @@ void do_assem(ComMod& com_mod, const int d, const Vector<int>& eqN, const Array3
   }
 }
 
+/// @brief Assemble the element stiffness matrix and residual of element 'e' 
+/// of mesh 'lM' using the precomputed positions lM.eValPtr of its node pairs 
+/// in the sparse matrix instead of searching colPtr.
+///
+/// The nodes 'eqN' must be the nodes lM.IEN(:,e) of the element. If the 
+/// positions have not been computed for the mesh or 'eqN' contains -1
+/// (a node that is not assembled) then do_assem() is used.
+///
+/// Modifies
+///   com_mod.R - Residual
+///   com_mod.Val - LHS matrix
+//
+void do_assem(ComMod& com_mod, const mshType& lM, const int e, const Vector<int>& eqN, 
+    const Array3<double>& lK, const Array<double>& lR)
+{
+  const int d = lM.eNoN;
+
+  if (lM.eValPtr.size() == 0) {
+    do_assem(com_mod, d, eqN, lK, lR);
+    return;
+  }
+
+  for (int a = 0; a < d; a++) {
+    if (eqN(a) == -1) {
+      do_assem(com_mod, d, eqN, lK, lR);
+      return;
+    }
+  }
+
+  auto& R = com_mod.R;
+  auto& Val = com_mod.Val;
+  const int nR = R.nrows();
+  const int nV = Val.nrows();
+  const int* valPtr = &lM.eValPtr(0,e);
+
+  for (int a = 0; a < d; a++) {
+    int rowN = eqN(a);
+
+    for (int i = 0; i < nR; i++) {
+      R(i,rowN) = R(i,rowN) + lR(i,a);
+    }
+
+    for (int b = 0; b < d; b++) {
+      int ptr = valPtr[a+b*d];
+
+      for (int i = 0; i < nV; i++) {
+        Val(i,ptr) = Val(i,ptr) + lK(i,a,b);
+      }
+    }
+  }
+}
+
 //------
 // lhsa
 //------
@@ -122,6 +260,7 @@ void do_assem(ComMod& com_mod, const int d, const Vector<int>& eqN, const Array3
 //   com_mod.idMap
 //   com_mod.colPtr.resize(nnz); 
 //   com_mod.rowPtr.resize(tnNo+1);
+//   com_mod.msh[].eValPtr
 //
 void lhsa(Simulation* simulation, int& nnz)
 {
@@ -378,6 +517,62 @@ void lhsa(Simulation* simulation, int& nnz)
     }
     com_mod.rowPtr(rowN+1) = j;
   }
+
+  // Set the positions of the element node pairs in colPtr used by 
+  // do_assem() to avoid searching colPtr for each element assembly.
+  //
+  for (auto& msh : com_mod.msh) {
+    set_val_ptr(com_mod, msh);
+  }
+}
+
+/// @brief Set the position in colPtr (and Val) of each (a,b) node pair 
+/// of the elements of mesh 'lM'.
+///
+/// The CSR structure (rowPtr, colPtr) is fixed once it has been created by 
+/// lhsa() so the positions are computed once and then reused for every 
+/// element assembly.
+///
+/// Shell meshes with triangular elements are assembled using the extended 
+/// connectivity eIEN so positions are not computed for them.
+///
+/// Modifies:
+///   lM.eValPtr - (eNoN*eNoN, nEl)
+//
+void set_val_ptr(const ComMod& com_mod, mshType& lM)
+{
+  using namespace consts;
+
+  const auto& rowPtr = com_mod.rowPtr;
+  const auto& colPtr = com_mod.colPtr;
+  const int eNoN = lM.eNoN;
+
+  if ((com_mod.shlEq && lM.eType == ElementType::TRI3) || (lM.nEl == 0)) {
+    lM.eValPtr.clear();
+    return;
+  }
+
+  lM.eValPtr.resize(eNoN*eNoN, lM.nEl);
+
+  for (int e = 0; e < lM.nEl; e++) {
+    for (int a = 0; a < eNoN; a++) {
+      int rowN = lM.IEN(a,e);
+
+      for (int b = 0; b < eNoN; b++) {
+        int colN = lM.IEN(b,e);
+        auto first = &colPtr(rowPtr(rowN));
+        auto last = first + (rowPtr(rowN+1) - rowPtr(rowN));
+        auto col = std::lower_bound(first, last, colN);
+
+        if ((col == last) || (*col != colN)) {
+          throw std::runtime_error("[set_val_ptr] The column " + std::to_string(colN) + 
+              " was not found in row " + std::to_string(rowN) + " of the sparse matrix.");
+        }
+
+        lM.eValPtr(a+b*eNoN,e) = rowPtr(rowN) + (col - first);
+      }
+    }
+  }
 }
 
 //-------
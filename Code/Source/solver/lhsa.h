@@ -11,12 +11,19 @@ namespace lhsa_ns {
 
   void add_col(const int tnNo, const int rowN, const int colN, int& mnnzeic, Array<int>& uInd);
 
+  void color_elements(const int tnNo, mshType& lM);
+
   void do_assem(ComMod& com_mod, const int d, const Vector<int>& eqN, const Array3<double>& lK, const Array<double>& lR);
 
+  void do_assem(ComMod& com_mod, const mshType& lM, const int e, const Vector<int>& eqN, 
+      const Array3<double>& lK, const Array<double>& lR);
+
   void lhsa(Simulation* simulation, int& nnz);
 
   void resiz(const int tnNo, int& mnnzeic, Array<int>& uInd);
 
+  void set_val_ptr(const ComMod& com_mod, mshType& lM);
+
 };
 
 #endif
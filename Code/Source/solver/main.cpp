@@ -120,49 +120,21 @@ void iterate_precomputed_time(Simulation* simulation) {
 #ifdef debug_iterate_solution
         dmsg << "Use precomputed values ..." << std::endl;
 #endif
-    // This loop is used to interpolate between known time values of the precomputed
+    // Interpolate between known time values of the precomputed
     // state-variable solution
-    for (int l = 0; l < com_mod.nMsh; l++) {
-      auto lM = com_mod.msh[l];
-      if (lM.Ys.nslices() > 1) {
-        // If there is only one temporal slice, then the solution is assumed constant
-        // in time and no interpolation is performed
-        // If there are multiple temporal slices, then the solution is linearly interpolated
-        // between the known time values and the current time.
-        double precompDt = com_mod.precompDt;
-        double preTT = precompDt * (lM.Ys.nslices() - 1);
-        double cT = cTS * dt;
-        double rT = std::fmod(cT, preTT);
-        int n1, n2;
-        double alpha;
-        if (precompDt == dt) {
-          alpha =  0.0;
-          if (cTS < lM.Ys.nslices()) {
-            n1 = cTS - 1;
-          } else {
-            n1 = cTS % lM.Ys.nslices() - 1;
-          }
-        } else {
-          n1 = static_cast<int>(rT / precompDt) - 1;
-          alpha = std::fmod(rT, precompDt);
-        }
-        n2 = n1 + 1;
-        for (int i = 0; i < tnNo; i++) {
-          for (int j = 0; j < nsd; j++) {
-            if (alpha == 0.0) {
-              Yn(j, i) = lM.Ys(j, i, n2);
-            } else {
-              Yn(j, i) = (1.0 - alpha) * lM.Ys(j, i, n1) + alpha * lM.Ys(j, i, n2);
-            }
-          }
-        }
-      } else {
-        for (int i = 0; i < tnNo; i++) {
-          for (int j = 0; j < nsd; j++) {
-            Yn(j, i) = lM.Ys(j, i, 0);
-          }
-        }
-      }
+    auto& precompSol = com_mod.precompSol;
+    int nslices = precompSol.num_slices();
+    if (nslices > 1) {
+      // If there is only one temporal slice, then the solution is assumed constant
+      // in time and no interpolation is performed
+      // If there are multiple temporal slices, then the solution is linearly interpolated
+      // between the known time values and the current time.
+      int n1, n2;
+      double alpha;
+      PrecomputedSolution::time_step_slices(cTS, dt, com_mod.precompDt, nslices, n1, n2, alpha);
+      precompSol.interpolate(n1, n2, alpha, nsd, Yn);
+    } else {
+      precompSol.copy(0, nsd, Yn);
     }
   }
 }
@@ -721,6 +693,9 @@ void iterate_solution(Simulation* simulation)
        output::write_restart(simulation, com_mod.timeP);
     }
 
+    // Finish a restart file written on a background thread if all processes are done.
+    output::finish_restart(simulation, false);
+
     // Writing results into the disk with VTU format
     //
     #ifdef debug_iterate_solution
@@ -814,6 +789,10 @@ void iterate_solution(Simulation* simulation)
   dmsg << "End of outer loop" << std::endl;
   #endif
 
+  // Finish writing VTK and restart files written on a background thread.
+  vtk_xml::flush_vtus();
+  output::finish_restart(simulation, true);
+
   //#ifdef debug_iterate_solution
   //dmsg << "=======  Simulation Finished   ========== " << std::endl;
   //#endif
@@ -846,10 +825,13 @@ int main(int argc, char *argv[])
 
   std::cout << std::scientific << std::setprecision(16);
 
-  // Initialize MPI.
+  // Initialize MPI. 
   //
-  int mpi_rank, mpi_size;
-  MPI_Init(&argc, &argv);
+  // MPI is only called from the main thread when threads are used 
+  // for assembly.
+  //
+  int mpi_rank, mpi_size, mpi_thread_support;
+  MPI_Init_thread(&argc, &argv, MPI_THREAD_FUNNELED, &mpi_thread_support);
   MPI_Comm_rank(MPI_COMM_WORLD, &mpi_rank);
   MPI_Comm_size(MPI_COMM_WORLD, &mpi_size);
   //std::cout << "[svFSI] MPI rank: " << mpi_rank << std::endl;
@@ -880,6 +862,20 @@ int main(int argc, char *argv[])
     dmsg << "Read files " << " ... ";
     #endif
     read_files(simulation, file_name);
+
+    // Threads can only be used if the MPI library supports calling MPI
+    // from the main thread of a threaded process.
+    //
+    if (mpi_thread_support < MPI_THREAD_FUNNELED) {
+      for (auto& eq : simulation->com_mod.eq) {
+        if ((eq.nAssmThreads > 1 || eq.nIonThreads > 1) && cm.mas(simulation->cm_mod)) {
+          std::cout << "[svMultiPhysics] WARNING: The MPI library does not support threads, "
+              "using one assembly and ionic model thread." << std::endl;
+        }
+        eq.nAssmThreads = 1;
+        eq.nIonThreads = 1;
+      }
+    }
     
     // Distribute data to processors.
     #ifdef debug_main
@@ -428,8 +428,8 @@ void get_xi(const int nsd, consts::ElementType eType, const int eNoN, const Arra
 void gnn(const int eNoN, const int nsd, const int insd, Array<double>& Nxi, Array<double>& x, Array<double>& Nx, 
     double& Jac, Array<double>& ks)
 {
-  Array<double> xXi(nsd,insd);   
-  Array<double> xiX(insd,nsd);
+  double xXi[3][3] = {};
+  double xiX[3][3] = {};
 
   Jac = 0.0;
   Nx  = 0.0;
@@ -439,11 +439,16 @@ void gnn(const int eNoN, const int nsd, const int insd, Array<double>& Nxi, Arra
   if (insd == 1) {
     for (int a = 0; a < eNoN; a++) {
       for (int i = 0; i < nsd; i++) {
-        xXi(i,0) = xXi(i,0) + x(i,a)*Nxi(0,a);
+        xXi[i][0] = xXi[i][0] + x(i,a)*Nxi(0,a);
       }
     }
 
-    Jac = sqrt(utils::norm(xXi)) + 1.E+3*eps;
+    double xXi_norm = 0.0;
+    for (int i = 0; i < nsd; i++) {
+      xXi_norm += xXi[i][0]*xXi[i][0];
+    }
+
+    Jac = sqrt(xXi_norm) + 1.E+3*eps;
     for (int a = 0; a < eNoN; a++) {
       Nx(0,a) = Nxi(0,a) / Jac;
     }
@@ -451,64 +456,64 @@ void gnn(const int eNoN, const int nsd, const int insd, Array<double>& Nxi, Arra
   } else if (insd == 2) {
     for (int a = 0; a < eNoN; a++) {
       for (int i = 0; i < nsd; i++) {
-        xXi(i,0) = xXi(i,0) + x(i,a)*Nxi(0,a);
-        xXi(i,1) = xXi(i,1) + x(i,a)*Nxi(1,a);
+        xXi[i][0] = xXi[i][0] + x(i,a)*Nxi(0,a);
+        xXi[i][1] = xXi[i][1] + x(i,a)*Nxi(1,a);
       }
     }
 
-    Jac = xXi(0,0)*xXi(1,1) - xXi(0,1)*xXi(1,0);
+    Jac = xXi[0][0]*xXi[1][1] - xXi[0][1]*xXi[1][0];
 
-    xiX(0,0) =  xXi(1,1) / Jac;
-    xiX(0,1) = -xXi(0,1) / Jac;
-    xiX(1,0) = -xXi(1,0) / Jac;
-    xiX(1,1) =  xXi(0,0) / Jac;
+    xiX[0][0] =  xXi[1][1] / Jac;
+    xiX[0][1] = -xXi[0][1] / Jac;
+    xiX[1][0] = -xXi[1][0] / Jac;
+    xiX[1][1] =  xXi[0][0] / Jac;
 
-    ks(0,0) = xiX(0,0)*xiX(0,0) + xiX(1,0)*xiX(1,0);
-    ks(0,1) = xiX(0,0)*xiX(0,1) + xiX(1,0)*xiX(1,1);
-    ks(1,1) = xiX(0,1)*xiX(0,1) + xiX(1,1)*xiX(1,1);
+    ks(0,0) = xiX[0][0]*xiX[0][0] + xiX[1][0]*xiX[1][0];
+    ks(0,1) = xiX[0][0]*xiX[0][1] + xiX[1][0]*xiX[1][1];
+    ks(1,1) = xiX[0][1]*xiX[0][1] + xiX[1][1]*xiX[1][1];
     ks(1,0) = ks(0,1);
 
     for (int a = 0; a < eNoN; a++) {
-      Nx(0,a) = Nx(0,a)+ Nxi(0,a)*xiX(0,0) + Nxi(1,a)*xiX(1,0);
-      Nx(1,a) = Nx(1,a)+ Nxi(0,a)*xiX(0,1) + Nxi(1,a)*xiX(1,1);
+      Nx(0,a) = Nx(0,a)+ Nxi(0,a)*xiX[0][0] + Nxi(1,a)*xiX[1][0];
+      Nx(1,a) = Nx(1,a)+ Nxi(0,a)*xiX[0][1] + Nxi(1,a)*xiX[1][1];
     }
 
   } else if (insd == 3) {
     for (int a = 0; a < eNoN; a++) {
-      for (int i = 0; i < xXi.nrows(); i++) {
-        xXi(i,0) = xXi(i,0) + x(i,a)*Nxi(0,a);
-        xXi(i,1) = xXi(i,1) + x(i,a)*Nxi(1,a);
-        xXi(i,2) = xXi(i,2) + x(i,a)*Nxi(2,a);
+      for (int i = 0; i < nsd; i++) {
+        xXi[i][0] = xXi[i][0] + x(i,a)*Nxi(0,a);
+        xXi[i][1] = xXi[i][1] + x(i,a)*Nxi(1,a);
+        xXi[i][2] = xXi[i][2] + x(i,a)*Nxi(2,a);
       }
     }
 
-    Jac = xXi(0,0)*xXi(1,1)*xXi(2,2) + xXi(0,1)*xXi(1,2)*xXi(2,0) + xXi(0,2)*xXi(1,0)*xXi(2,1) - 
-          xXi(0,0)*xXi(1,2)*xXi(2,1) - xXi(0,1)*xXi(1,0)*xXi(2,2) - xXi(0,2)*xXi(1,1)*xXi(2,0);
-
-    xiX(0,0) = (xXi(1,1)*xXi(2,2) - xXi(1,2)*xXi(2,1))/Jac;
-    xiX(0,1) = (xXi(2,1)*xXi(0,2) - xXi(2,2)*xXi(0,1))/Jac;
-    xiX(0,2) = (xXi(0,1)*xXi(1,2) - xXi(0,2)*xXi(1,1))/Jac;
-    xiX(1,0) = (xXi(1,2)*xXi(2,0) - xXi(1,0)*xXi(2,2))/Jac;
-    xiX(1,1) = (xXi(2,2)*xXi(0,0) - xXi(2,0)*xXi(0,2))/Jac;
-    xiX(1,2) = (xXi(0,2)*xXi(1,0) - xXi(0,0)*xXi(1,2))/Jac;
-    xiX(2,0) = (xXi(1,0)*xXi(2,1) - xXi(1,1)*xXi(2,0))/Jac;
-    xiX(2,1) = (xXi(2,0)*xXi(0,1) - xXi(2,1)*xXi(0,0))/Jac;
-    xiX(2,2) = (xXi(0,0)*xXi(1,1) - xXi(0,1)*xXi(1,0))/Jac;
-
-    ks(0,0) = xiX(0,0)*xiX(0,0)+xiX(1,0)*xiX(1,0)+xiX(2,0)*xiX(2,0);
-    ks(0,1) = xiX(0,1)*xiX(0,0)+xiX(1,1)*xiX(1,0)+xiX(2,1)*xiX(2,0);
-    ks(0,2) = xiX(0,2)*xiX(0,0)+xiX(1,2)*xiX(1,0)+xiX(2,2)*xiX(2,0);
-    ks(1,1) = xiX(0,1)*xiX(0,1)+xiX(1,1)*xiX(1,1)+xiX(2,1)*xiX(2,1);
-    ks(1,2) = xiX(0,1)*xiX(0,2)+xiX(1,1)*xiX(1,2)+xiX(2,1)*xiX(2,2);
-    ks(2,2) = xiX(0,2)*xiX(0,2)+xiX(1,2)*xiX(1,2)+xiX(2,2)*xiX(2,2);
+    Jac = xXi[0][0]*xXi[1][1]*xXi[2][2] + xXi[0][1]*xXi[1][2]*xXi[2][0] + xXi[0][2]*xXi[1][0]*xXi[2][1] - 
+          xXi[0][0]*xXi[1][2]*xXi[2][1] - xXi[0][1]*xXi[1][0]*xXi[2][2] - xXi[0][2]*xXi[1][1]*xXi[2][0];
+
+    xiX[0][0] = (xXi[1][1]*xXi[2][2] - xXi[1][2]*xXi[2][1])/Jac;
+    xiX[0][1] = (xXi[2][1]*xXi[0][2] - xXi[2][2]*xXi[0][1])/Jac;
+    xiX[0][2] = (xXi[0][1]*xXi[1][2] - xXi[0][2]*xXi[1][1])/Jac;
+    xiX[1][0] = (xXi[1][2]*xXi[2][0] - xXi[1][0]*xXi[2][2])/Jac;
+    xiX[1][1] = (xXi[2][2]*xXi[0][0] - xXi[2][0]*xXi[0][2])/Jac;
+    xiX[1][2] = (xXi[0][2]*xXi[1][0] - xXi[0][0]*xXi[1][2])/Jac;
+    xiX[2][0] = (xXi[1][0]*xXi[2][1] - xXi[1][1]*xXi[2][0])/Jac;
+    xiX[2][1] = (xXi[2][0]*xXi[0][1] - xXi[2][1]*xXi[0][0])/Jac;
+    xiX[2][2] = (xXi[0][0]*xXi[1][1] - xXi[0][1]*xXi[1][0])/Jac;
+
+    ks(0,0) = xiX[0][0]*xiX[0][0]+xiX[1][0]*xiX[1][0]+xiX[2][0]*xiX[2][0];
+    ks(0,1) = xiX[0][1]*xiX[0][0]+xiX[1][1]*xiX[1][0]+xiX[2][1]*xiX[2][0];
+    ks(0,2) = xiX[0][2]*xiX[0][0]+xiX[1][2]*xiX[1][0]+xiX[2][2]*xiX[2][0];
+    ks(1,1) = xiX[0][1]*xiX[0][1]+xiX[1][1]*xiX[1][1]+xiX[2][1]*xiX[2][1];
+    ks(1,2) = xiX[0][1]*xiX[0][2]+xiX[1][1]*xiX[1][2]+xiX[2][1]*xiX[2][2];
+    ks(2,2) = xiX[0][2]*xiX[0][2]+xiX[1][2]*xiX[1][2]+xiX[2][2]*xiX[2][2];
     ks(1,0) = ks(0,1);
     ks(2,0) = ks(0,2);
     ks(2,1) = ks(1,2);
 
     for (int a = 0; a < eNoN; a++) {
-      Nx(0,a) = Nx(0,a) + Nxi(0,a)*xiX(0,0) + Nxi(1,a)*xiX(1,0) + Nxi(2,a)*xiX(2,0);
-      Nx(1,a) = Nx(1,a) + Nxi(0,a)*xiX(0,1) + Nxi(1,a)*xiX(1,1) + Nxi(2,a)*xiX(2,1);
-      Nx(2,a) = Nx(2,a) + Nxi(0,a)*xiX(0,2) + Nxi(1,a)*xiX(1,2) + Nxi(2,a)*xiX(2,2);
+      Nx(0,a) = Nx(0,a) + Nxi(0,a)*xiX[0][0] + Nxi(1,a)*xiX[1][0] + Nxi(2,a)*xiX[2][0];
+      Nx(1,a) = Nx(1,a) + Nxi(0,a)*xiX[0][1] + Nxi(1,a)*xiX[1][1] + Nxi(2,a)*xiX[2][1];
+      Nx(2,a) = Nx(2,a) + Nxi(0,a)*xiX[0][2] + Nxi(1,a)*xiX[1][2] + Nxi(2,a)*xiX[2][2];
     }
   }
 }
@@ -782,117 +787,128 @@ void gnns(const int nsd, const int eNoN, const Array<double>& Nxi, Array<double>
 void gn_nxx(const int l, const int eNoN, const int nsd, const int insd, Array<double>& Nxi, Array<double>& Nxi2, Array<double>& lx,
     Array<double>& Nx, Array<double>& Nxx)
 {
-  Array<double> xXi(nsd,insd); 
-  Array<double> xXi2(nsd,l); 
-  Array<double> K(l,l); 
-  Array<double> B(l,eNoN);
+  // The right-hand side B is stored in Nxx and overwritten with the
+  // solution by dgesv_().
+  //
+  if ((Nxx.nrows() != l) || (Nxx.ncols() != eNoN)) {
+    Nxx.resize(l,eNoN);
+  }
+
+  double xXi[3][3] = {};
+  double xXi2[3][6] = {};
+  double K[6*6];
+  int IPIV[6];
+  auto& B = Nxx;
+
+  // Set a row of the column-major l x l matrix K.
+  auto set_K_row = [&K, l](const int row, std::initializer_list<double> values) {
+    int col = 0;
+    for (double value : values) {
+      K[row + col*l] = value;
+      col += 1;
+    }
+  };
 
   double t = 2.0;
 
   if (insd == 2) {
     for (int a = 0; a < eNoN; a++) {
       for (int i = 0; i < nsd; i++) {
-        xXi(i,0) = xXi(i,0) + lx(i,a)*Nxi(0,a);
-        xXi(i,1) = xXi(i,1) + lx(i,a)*Nxi(1,a);
-        xXi2(i,0) = xXi2(i,0) + lx(i,a)*Nxi2(0,a);
-        xXi2(i,1) = xXi2(i,1) + lx(i,a)*Nxi2(1,a);
-        xXi2(i,2) = xXi2(i,2) + lx(i,a)*Nxi2(2,a);
+        xXi[i][0] = xXi[i][0] + lx(i,a)*Nxi(0,a);
+        xXi[i][1] = xXi[i][1] + lx(i,a)*Nxi(1,a);
+        xXi2[i][0] = xXi2[i][0] + lx(i,a)*Nxi2(0,a);
+        xXi2[i][1] = xXi2[i][1] + lx(i,a)*Nxi2(1,a);
+        xXi2[i][2] = xXi2[i][2] + lx(i,a)*Nxi2(2,a);
       }
     }
 
-    K.set_row(0, {xXi(0,0)*xXi(0,0), xXi(1,0)*xXi(1,0), t*xXi(0,0)*xXi(1,0)});
-    K.set_row(1, {xXi(0,1)*xXi(0,1), xXi(1,1)*xXi(1,1), t*xXi(0,1)*xXi(1,1)});
-    K.set_row(2, {xXi(0,0)*xXi(0,1), xXi(1,0)*xXi(1,1), xXi(0,0)*xXi(1,1) + xXi(0,1)*xXi(1,0)});
+    set_K_row(0, {xXi[0][0]*xXi[0][0], xXi[1][0]*xXi[1][0], t*xXi[0][0]*xXi[1][0]});
+    set_K_row(1, {xXi[0][1]*xXi[0][1], xXi[1][1]*xXi[1][1], t*xXi[0][1]*xXi[1][1]});
+    set_K_row(2, {xXi[0][0]*xXi[0][1], xXi[1][0]*xXi[1][1], xXi[0][0]*xXi[1][1] + xXi[0][1]*xXi[1][0]});
 
     for (int a = 0; a < eNoN; a++) {
-      B(0,a) = Nxi2(0,a) - Nx(0,a)*xXi2(0,0) - Nx(1,a)*xXi2(1,0);
-      B(1,a) = Nxi2(1,a) - Nx(0,a)*xXi2(0,1) - Nx(1,a)*xXi2(1,1);
-      B(2,a) = Nxi2(2,a) - Nx(0,a)*xXi2(0,2) - Nx(1,a)*xXi2(1,2);
+      B(0,a) = Nxi2(0,a) - Nx(0,a)*xXi2[0][0] - Nx(1,a)*xXi2[1][0];
+      B(1,a) = Nxi2(1,a) - Nx(0,a)*xXi2[0][1] - Nx(1,a)*xXi2[1][1];
+      B(2,a) = Nxi2(2,a) - Nx(0,a)*xXi2[0][2] - Nx(1,a)*xXi2[1][2];
     }
 
     // Compute the solution to the linear equations K * X = B.
     //
-    Vector<int> IPIV(l);
     int INFO;
 
-    dgesv_(&l, &eNoN, K.data(), &l, IPIV.data(), B.data(), &l, &INFO);
+    dgesv_(&l, &eNoN, K, &l, IPIV, B.data(), &l, &INFO);
 
     if (INFO != 0) {
       throw std::runtime_error("[gn_nxx] Error in Lapack");
     }
 
-    Nxx = B;
-
   } else if (insd == 3) {
 
     for (int a = 0; a < eNoN; a++) {
       for (int i = 0; i < nsd; i++) {
-        xXi(i,0) = xXi(i,0) + lx(i,a)*Nxi(0,a);
-        xXi(i,1) = xXi(i,1) + lx(i,a)*Nxi(1,a);
-        xXi(i,2) = xXi(i,2) + lx(i,a)*Nxi(2,a);
-
-        xXi2(i,0) = xXi2(i,0) + lx(i,a)*Nxi2(0,a);
-        xXi2(i,1) = xXi2(i,1) + lx(i,a)*Nxi2(1,a);
-        xXi2(i,2) = xXi2(i,2) + lx(i,a)*Nxi2(2,a);
-        xXi2(i,3) = xXi2(i,3) + lx(i,a)*Nxi2(3,a);
-        xXi2(i,4) = xXi2(i,4) + lx(i,a)*Nxi2(4,a);
-        xXi2(i,5) = xXi2(i,5) + lx(i,a)*Nxi2(5,a);
+        xXi[i][0] = xXi[i][0] + lx(i,a)*Nxi(0,a);
+        xXi[i][1] = xXi[i][1] + lx(i,a)*Nxi(1,a);
+        xXi[i][2] = xXi[i][2] + lx(i,a)*Nxi(2,a);
+
+        xXi2[i][0] = xXi2[i][0] + lx(i,a)*Nxi2(0,a);
+        xXi2[i][1] = xXi2[i][1] + lx(i,a)*Nxi2(1,a);
+        xXi2[i][2] = xXi2[i][2] + lx(i,a)*Nxi2(2,a);
+        xXi2[i][3] = xXi2[i][3] + lx(i,a)*Nxi2(3,a);
+        xXi2[i][4] = xXi2[i][4] + lx(i,a)*Nxi2(4,a);
+        xXi2[i][5] = xXi2[i][5] + lx(i,a)*Nxi2(5,a);
       }
     }
 
     for (int i = 0; i < 3; i++) { 
-      K.set_row(i, { xXi(0,i)*xXi(0,i), xXi(1,i)*xXi(1,i), xXi(2,i)*xXi(2,i), 
-                     t*xXi(0,i)*xXi(1,i), t*xXi(1,i)*xXi(2,i), t*xXi(0,i)*xXi(2,i) 
+      set_K_row(i, { xXi[0][i]*xXi[0][i], xXi[1][i]*xXi[1][i], xXi[2][i]*xXi[2][i], 
+                     t*xXi[0][i]*xXi[1][i], t*xXi[1][i]*xXi[2][i], t*xXi[0][i]*xXi[2][i] 
                    } );
     }
 
     int i = 0;
     int j = 1;
 
-    K.set_row(3, { xXi(0,i)*xXi(0,j), xXi(1,i)*xXi(1,j),
-                   xXi(2,i)*xXi(2,j),
-                   xXi(0,i)*xXi(1,j) + xXi(0,j)*xXi(1,i),
-                   xXi(1,i)*xXi(2,j) + xXi(1,j)*xXi(2,i),
-                   xXi(0,i)*xXi(2,j) + xXi(0,j)*xXi(2,i) 
+    set_K_row(3, { xXi[0][i]*xXi[0][j], xXi[1][i]*xXi[1][j],
+                   xXi[2][i]*xXi[2][j],
+                   xXi[0][i]*xXi[1][j] + xXi[0][j]*xXi[1][i],
+                   xXi[1][i]*xXi[2][j] + xXi[1][j]*xXi[2][i],
+                   xXi[0][i]*xXi[2][j] + xXi[0][j]*xXi[2][i] 
                  } );
 
      i = 1;
      j = 2;
-     K.set_row(4, { xXi(0,i)*xXi(0,j), xXi(1,i)*xXi(1,j),
-                    xXi(2,i)*xXi(2,j),
-                    xXi(0,i)*xXi(1,j) + xXi(0,j)*xXi(1,i),
-                    xXi(1,i)*xXi(2,j) + xXi(1,j)*xXi(2,i),
-                    xXi(0,i)*xXi(2,j) + xXi(0,j)*xXi(2,i) 
+     set_K_row(4, { xXi[0][i]*xXi[0][j], xXi[1][i]*xXi[1][j],
+                    xXi[2][i]*xXi[2][j],
+                    xXi[0][i]*xXi[1][j] + xXi[0][j]*xXi[1][i],
+                    xXi[1][i]*xXi[2][j] + xXi[1][j]*xXi[2][i],
+                    xXi[0][i]*xXi[2][j] + xXi[0][j]*xXi[2][i] 
                   } );
 
      i = 0;
      j = 2;
-     K.set_row(5, { xXi(0,i)*xXi(0,j), xXi(1,i)*xXi(1,j),
-                    xXi(2,i)*xXi(2,j),
-                    xXi(0,i)*xXi(1,j) + xXi(0,j)*xXi(1,i),
-                    xXi(1,i)*xXi(2,j) + xXi(1,j)*xXi(2,i),
-                    xXi(0,i)*xXi(2,j) + xXi(0,j)*xXi(2,i) 
+     set_K_row(5, { xXi[0][i]*xXi[0][j], xXi[1][i]*xXi[1][j],
+                    xXi[2][i]*xXi[2][j],
+                    xXi[0][i]*xXi[1][j] + xXi[0][j]*xXi[1][i],
+                    xXi[1][i]*xXi[2][j] + xXi[1][j]*xXi[2][i],
+                    xXi[0][i]*xXi[2][j] + xXi[0][j]*xXi[2][i] 
                   } );
 
 
     for (int a = 0; a < eNoN; a++) {
       for (int i = 0; i < 6; i++) {
-        B(i,a) = Nxi2(i,a) - Nx(0,a)*xXi2(0,i) - Nx(1,a)*xXi2(1,i) - Nx(2,a)*xXi2(2,i);
+        B(i,a) = Nxi2(i,a) - Nx(0,a)*xXi2[0][i] - Nx(1,a)*xXi2[1][i] - Nx(2,a)*xXi2[2][i];
       }
     }
 
     // Compute the solution to the linear equations K * X = B.
     //
-    Vector<int> IPIV(l);
     int INFO;
 
-    dgesv_(&l, &eNoN, K.data(), &l, IPIV.data(), B.data(), &l, &INFO);
+    dgesv_(&l, &eNoN, K, &l, IPIV, B.data(), &l, &INFO);
 
     if (INFO != 0) {
       throw std::runtime_error("[gn_nxx] Error in Lapack");
     }
-
-    Nxx = B;
   }
 }
 
@@ -5,12 +5,27 @@
 // desined to interface with user.
 
 #include "output.h"
+#include "restart_io.h"
 #include "utils.h"
+#include "vtk_xml.h"
 
+#include <chrono>
+#include <filesystem>
+#include <future>
 #include <math.h>
+#include <sstream>
 
 namespace output {
 
+/// @brief The restart file being written on a background thread.
+static struct {
+  std::future<void> write;
+  std::string tmp_name;
+  std::string file_name;
+  std::string last_name;
+  bool pending = false;
+} restart_write;
+
 /// @brief Prepares the output of svFSI to the standard output.
 ///
 /// Modifies: timeP
@@ -170,6 +185,68 @@ void read_restart_header(ComMod& com_mod, std::array<int,7>& tStamp, double& tim
   }
 }
 
+/// @brief Rename a restart file written to a temporary file and link the
+/// restart file for the last time step to it.
+///
+/// Renaming is atomic so a simulation stopped while the restart file is
+/// written never leaves an incomplete restart file.
+//
+static void commit_restart_file(ComMod& com_mod, CmMod& cm_mod, const std::string& tmpName, 
+    const std::string& fName, const std::string& lastName)
+{
+  if (com_mod.cm.slv(cm_mod)) {
+    return;
+  }
+
+  std::filesystem::rename(tmpName, fName);
+
+  if (fName != lastName) {
+    auto tmpLink = lastName + ".tmp";
+    std::filesystem::remove(tmpLink);
+    std::filesystem::create_hard_link(fName, tmpLink);
+    std::filesystem::rename(tmpLink, lastName);
+  }
+}
+
+/// @brief Finish writing the restart file written by write_restart(). 
+///
+/// If 'wait' is true then wait until all processes have written their data,
+/// otherwise only finish if all processes are done. This must be called by
+/// all processes.
+//
+void finish_restart(Simulation* simulation, const bool wait)
+{
+  if (!restart_write.pending) {
+    return;
+  }
+
+  auto& com_mod = simulation->com_mod;
+  auto& cm_mod = simulation->cm_mod;
+  auto& cm = com_mod.cm;
+
+  if (!wait) {
+    int done = (restart_write.write.wait_for(std::chrono::seconds(0)) == std::future_status::ready);
+    if (cm.reduce(cm_mod, done, MPI_MIN) == 0) {
+      return;
+    }
+  }
+
+  std::string error;
+  try {
+    restart_write.write.get();
+  } catch (const std::exception& exception) {
+    error = exception.what();
+  }
+  restart_write.pending = false;
+
+  int success = error.empty() ? 1 : 0;
+  if (cm.reduce(cm_mod, success, MPI_MIN) == 0) {
+    throw std::runtime_error("Failed to write the restart file '" + restart_write.file_name + "'. " + error);
+  }
+
+  commit_restart_file(com_mod, cm_mod, restart_write.tmp_name, restart_write.file_name, restart_write.last_name);
+}
+
 /// @brief Reproduces the Fortran 'WRITERESTART' subroutine.
 //
 void write_restart(Simulation* simulation, std::array<double,3>& timeP)
@@ -219,6 +296,10 @@ void write_restart(Simulation* simulation, std::array<double,3>& timeP)
   dmsg << "stFileRepl: " << stFileRepl;
   #endif 
 
+  // Finish writing the VTK files of previous time steps so the results
+  // on disk are complete when the simulation is restarted from this file.
+  vtk_xml::flush_vtus();
+
   int fid = 27;
   int myID = cm.tF(cm_mod);
 
@@ -248,11 +329,26 @@ void write_restart(Simulation* simulation, std::array<double,3>& timeP)
     fName = stFileName + "_" + fName_num + ".bin";
   }
 
+  // The file is written to a temporary file that is renamed when complete.
+  auto tmpName = fName + ".tmp";
+
+  // Wait until the previous restart file has been written.
+  finish_restart(simulation, true);
+
+  // Write a file keyed by global node ID that can be read by any number
+  // of processes.
+  //
+  if (com_mod.stFileGlob) {
+    restart_io::write_global_restart(simulation, timeP, tmpName);
+    commit_restart_file(com_mod, cm_mod, tmpName, fName, tmpS);
+    return;
+  }
+
   // Create the file.
   //
   if (cm.mas(cm_mod)) {
     int np = cm.np();
-    std::ofstream restart_file(fName, std::ios::out | std::ios::binary);
+    std::ofstream restart_file(tmpName, std::ios::out | std::ios::binary);
     char data{0};
     for (int i = 0; i < np * recLn; i++) {
       //restart_file.write((char*)&data, sizeof(char));
@@ -263,9 +359,10 @@ void write_restart(Simulation* simulation, std::array<double,3>& timeP)
   // This call is to block all processors
   cm.bcast(cm_mod, &fid);
 
-  std::ofstream restart_file(fName, std::ios::out | std::ios::binary | std::ios::in);
+  // Copy the data for this process into a buffer that is written to the 
+  // file when complete.
+  std::ostringstream restart_file(std::ios::out | std::ios::binary);
   std::streampos write_pos = (myID - 1) * recLn;
-  restart_file.seekp(write_pos);
 
   write_restart_header(com_mod, timeP, restart_file);
   restart_file.write((char*)cplBC.xn.data(), cplBC.xn.msize());
@@ -364,17 +461,32 @@ void write_restart(Simulation* simulation, std::array<double,3>& timeP)
     }
   }
 
-  restart_file.close();
+  auto write_record = [tmpName, write_pos, record = restart_file.str()]() {
+    std::ofstream restart_file(tmpName, std::ios::out | std::ios::binary | std::ios::in);
+    restart_file.seekp(write_pos);
+    restart_file.write(record.data(), record.size());
+    restart_file.close();
+    if (!restart_file) {
+      throw std::runtime_error("Failed to write to the file '" + tmpName + "'.");
+    }
+  };
 
-  // Create a soft link to the bin file for the last time step.
+  // Write the file on a background thread, the file is renamed by 
+  // finish_restart() once all processes have written their data.
   //
-  if (!com_mod.stFileRepl && cm.mas(cm_mod)) {
-    std::string cmd = "ln -f " + fName + " " + tmpS;
-    std::system(cmd.c_str());
+  auto policy = com_mod.stFileAsync ? std::launch::async : std::launch::deferred;
+  restart_write.write = std::async(policy, write_record);
+  restart_write.tmp_name = tmpName;
+  restart_write.file_name = fName;
+  restart_write.last_name = tmpS;
+  restart_write.pending = true;
+
+  if (!com_mod.stFileAsync) {
+    finish_restart(simulation, true);
   }
 }
 
-void write_restart_header(ComMod& com_mod, std::array<double,3>& timeP, std::ofstream& restart_file)
+void write_restart_header(ComMod& com_mod, std::array<double,3>& timeP, std::ostream& restart_file)
 {
   auto const cTS = com_mod.cTS;
   auto const time = com_mod.time;
@@ -173,6 +173,9 @@ void petsc_create_linearsolver(const consts::SolverType lsType, const consts::Pr
         case SolverType::lSolver_BICGS:
             KSPSetType(psol[cEq].ksp, KSPBCGS);
             break;
+        case SolverType::lSolver_PGMRES:
+            KSPSetType(psol[cEq].ksp, KSPPGMRES);
+            break;
         default:
             PetscPrintf(MPI_COMM_WORLD, "ERROR <PETSC_CREATE_LINEARSOLVER>: "
             "linear solver type not supported through svFSI input file.\n"
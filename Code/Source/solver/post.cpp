@@ -1173,6 +1173,7 @@ void ppbin2vtk(Simulation* simulation)
     }
   }
 
+  vtk_xml::flush_vtus();
   finalize(simulation);
   
   MPI_Finalize();
@@ -1065,6 +1065,42 @@ void read_cep_domain(Simulation* simulation, EquationParameters* eq_params, Doma
     lDmn.cep.odes.relTol = domain_params->relative_tolerance.value();
   }
 
+  // Rush-Larsen integration of the gating variables.
+  if ((lDmn.cep.odes.tIntType == TimeIntegratioType::RL) || (lDmn.cep.odes.tIntType == TimeIntegratioType::RL_ADAPTIVE)) {
+    if ((lDmn.cep.cepType != ElectrophysiologyModelType::BO) && (lDmn.cep.cepType != ElectrophysiologyModelType::TTP)) {
+      throw std::runtime_error("[read_cep_domain] Rush-Larsen time integration is only implemented for the Bueno-Orovio and tenTusscher-Panfilov models.");
+    }
+  }
+
+  if (lDmn.cep.odes.tIntType == TimeIntegratioType::RL_ADAPTIVE) {
+    lDmn.cep.odes.dVmax = domain_params->maximum_voltage_change.value();
+    if (lDmn.cep.odes.dVmax <= 0.0) {
+      throw std::runtime_error("[read_cep_domain] The maximum voltage change for adaptive time integration must be greater than zero.");
+    }
+
+    if (domain_params->minimum_time_step_for_integration.defined()) {
+      lDmn.cep.odes.dtMin = domain_params->minimum_time_step_for_integration.value();
+      if ((lDmn.cep.odes.dtMin <= 0.0) || (lDmn.cep.odes.dtMin > lDmn.cep.dt)) {
+        throw std::runtime_error("[read_cep_domain] The minimum time step for adaptive time integration must be greater than zero "
+            "and not greater than the time step for integration.");
+      }
+    } else {
+      lDmn.cep.odes.dtMin = std::min(domain_params->minimum_time_step_for_integration.value(), lDmn.cep.dt);
+    }
+  }
+
+  // Lookup tables for the functions of the membrane potential.
+  if (domain_params->lookup_table_resolution.defined()) {
+    if ((lDmn.cep.cepType != ElectrophysiologyModelType::BO) && (lDmn.cep.cepType != ElectrophysiologyModelType::TTP)) {
+      throw std::runtime_error("[read_cep_domain] Lookup tables are only implemented for the Bueno-Orovio and tenTusscher-Panfilov models.");
+    }
+    lDmn.cep.lutResolution = domain_params->lookup_table_resolution.value();
+    if (lDmn.cep.lutResolution <= 0.0) {
+      throw std::runtime_error("[read_cep_domain] The lookup table resolution must be greater than zero.");
+    }
+    lDmn.cep.lutValidate = domain_params->validate_lookup_table.value();
+  }
+
   if (domain_params->feedback_parameter_for_stretch_activated_currents.defined() && cep_mod.cem.cpld) { 
     lDmn.cep.Ksac = domain_params->feedback_parameter_for_stretch_activated_currents.value();
   } else {
@@ -1382,6 +1418,17 @@ void read_eq(Simulation* simulation, EquationParameters* eq_params, eqType& lEq)
   lEq.maxItr = eq_params->max_iterations.value();
   lEq.tol = eq_params->tolerance.value();
 
+  lEq.nAssmThreads = eq_params->number_of_assembly_threads.value();
+  if (lEq.nAssmThreads < 1) {
+    throw std::runtime_error("The number of assembly threads must be greater than zero.");
+  }
+
+  lEq.nIonThreads = eq_params->number_of_ionic_model_threads.value();
+  if (lEq.nIonThreads < 1) {
+    throw std::runtime_error("The number of ionic model threads must be greater than zero.");
+  }
+  lEq.batchAssm = eq_params->batched_element_assembly.value();
+
   // Initialize coupled BC.
   //
   auto& chnl_mod = simulation->chnl_mod;
@@ -1414,8 +1461,11 @@ void read_eq(Simulation* simulation, EquationParameters* eq_params, eqType& lEq)
 
     if (cplBC.schm != consts::CplBCType::cplBC_NA) { 
       if (cplBC.useGenBC) {
-        if (cplBC.binPath.size() == 0){
-          cplBC.binPath = eq_params->couple_to_genBC.zerod_code_file_path.value();
+        auto& genBC_params = eq_params->couple_to_genBC;
+        if (genBC_params.shared_library_file_path.defined()) {
+          cplBC.libPath = genBC_params.shared_library_file_path.value();
+        } else if (cplBC.binPath.size() == 0){
+          cplBC.binPath = genBC_params.zerod_code_file_path.value();
         }
         cplBC.commuName = "GenBC.int";
         cplBC.nX = 0;
@@ -1459,6 +1509,12 @@ void read_eq(Simulation* simulation, EquationParameters* eq_params, eqType& lEq)
 
   set_equation_properties(simulation, eq_params, lEq, propL, outPuts, nDOP);
 
+  // Threaded assembly writes directly into the FSILS sparse matrix.
+  if ((lEq.nAssmThreads > 1) && (lEq.linear_algebra_type == LinearAlgebraType::trilinos) && 
+      (lEq.linear_algebra_assembly_type != LinearAlgebraType::fsils)) {
+    throw std::runtime_error("Threaded assembly (Number_of_assembly_threads > 1) requires fsils assembly.");
+  }
+
   // Read VTK files or boundaries. [TODO:DaveP] this is not a correct comment.
   read_outputs(simulation, eq_params, lEq, nDOP, outPuts);
 
@@ -2037,6 +2093,7 @@ void read_ls(Simulation* simulation, EquationParameters* eq_params, consts::Solv
     {SolverType::lSolver_GMRES, LinearSolverType::LS_TYPE_GMRES},
     {SolverType::lSolver_CG, LinearSolverType::LS_TYPE_CG},
     {SolverType::lSolver_BICGS, LinearSolverType::LS_TYPE_BICGS},
+    {SolverType::lSolver_PGMRES, LinearSolverType::LS_TYPE_PGMRES},
   };
 
   // Get solver type.
@@ -2120,6 +2177,14 @@ void read_ls(Simulation* simulation, EquationParameters* eq_params, consts::Solv
     lEq.FSILS.RI.sD = linear_solver.krylov_space_dimension.value();
   }
 
+  // Number of solves the FSILS preconditioner is reused for.
+  lEq.FSILS.precReuse = linear_solver.preconditioner_reuse.value();
+  lEq.FSILS.precReuseItrRatio = linear_solver.preconditioner_reuse_iteration_ratio.value();
+
+  if (lEq.FSILS.precReuse < 1) {
+    throw std::runtime_error("The number of solves a preconditioner is reused for must be greater than zero.");
+  }
+
   if (solver_type == SolverType::lSolver_NS) {
     lEq.FSILS.GM.mItr = linear_solver.ns_gm_max_iterations.value();
     lEq.FSILS.CG.mItr = linear_solver.ns_cg_max_iterations.value(); 
@@ -1150,6 +1150,22 @@ void read_msh(Simulation* simulation)
       }
     }
 
+    // Read the precomputed state-variables and write them to a binary
+    // file that is memory mapped by all processes, see PrecomputedSolution.
+    // A binary file written by a previous simulation can also be used.
+    //
+    if (com_mod.usePrecomp) {
+      auto& file_name = com_mod.precompFileName;
+      if (file_name.substr(file_name.find_last_of(".") + 1) == "bin") {
+        com_mod.precompBinFileName = file_name;
+      } else {
+        Array3<double> Ys;
+        vtk_xml::read_precomputed_solution_vtu(file_name, com_mod.precompFieldName, Ys);
+        com_mod.precompBinFileName = simulation->chnl_mod.appPath + "precomputed_" + com_mod.precompFieldName + ".bin";
+        PrecomputedSolution::write(com_mod.precompBinFileName, Ys);
+      }
+    }
+
     // Create global nodal coordinate array. 
     //
     // Scale the nodal coordinates. 
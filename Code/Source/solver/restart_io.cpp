@@ -0,0 +1,350 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#include "restart_io.h"
+
+#include "utils.h"
+
+#include "mpi.h"
+
+#include <algorithm>
+#include <cstring>
+#include <fstream>
+#include <stdexcept>
+#include <utility>
+#include <vector>
+
+namespace restart_io {
+
+/// @brief Identifies a restart file keyed by global node ID.
+const std::array<char,8> file_id{'S','V','R','S','T','G','N','1'};
+
+/// @brief The names of the sizes stored in the header, used for error messages.
+const std::vector<std::string> size_names = {
+  "number of nodes",
+  "number of equations",
+  "number of meshes",
+  "number of cplBC.x",
+  "number of dof",
+  "dFlag specification",
+  "node record length",
+  "number of RIS/URIS flags",
+  "number of URIS counters"
+};
+
+/// @brief A nodal array stored in the node records.
+struct NodalField {
+  double* data;
+  int nrows;
+};
+
+/// @brief The data that is not stored per node.
+struct GlobalData {
+  std::vector<int> counts;
+  std::vector<char> flags;
+};
+
+template<typename T>
+void append(std::vector<char>& buffer, const T* data, const size_t n)
+{
+  auto bytes = reinterpret_cast<const char*>(data);
+  buffer.insert(buffer.end(), bytes, bytes + n*sizeof(T));
+}
+
+template<typename T>
+void extract(const std::vector<char>& buffer, size_t& pos, T* data, const size_t n)
+{
+  if (pos + n*sizeof(T) > buffer.size()) {
+    throw std::runtime_error("The restart file header is truncated.");
+  }
+  std::memcpy(data, buffer.data() + pos, n*sizeof(T));
+  pos += n*sizeof(T);
+}
+
+/// @brief Get the nodal arrays stored in the restart file, Y/A/D are the
+/// old or new solution arrays.
+//
+static std::vector<NodalField>
+nodal_fields(Simulation* simulation, Array<double>& Y, Array<double>& A, Array<double>& D)
+{
+  auto& com_mod = simulation->com_mod;
+  auto& cep_mod = simulation->cep_mod;
+  std::vector<NodalField> fields{ {Y.data(), Y.nrows()}, {A.data(), A.nrows()} };
+
+  if (com_mod.dFlag) {
+    fields.push_back({D.data(), D.nrows()});
+
+    if (com_mod.pstEq) {
+      fields.push_back({com_mod.pS0.data(), com_mod.pS0.nrows()});
+    }
+
+    if (com_mod.sstEq) {
+      fields.push_back({com_mod.Ad.data(), com_mod.Ad.nrows()});
+    }
+  }
+
+  if (cep_mod.cepEq) {
+    fields.push_back({cep_mod.Xion.data(), cep_mod.Xion.nrows()});
+
+    if (com_mod.dFlag && cep_mod.cem.cpld) {
+      fields.push_back({cep_mod.cem.Ya.data(), 1});
+    }
+  }
+
+  return fields;
+}
+
+/// @brief Get the RIS and URIS data.
+//
+static GlobalData global_data(ComMod& com_mod)
+{
+  GlobalData data;
+
+  if (com_mod.risFlag) {
+    for (const bool flag : com_mod.ris.clsFlg) {
+      data.flags.push_back(flag ? 1 : 0);
+    }
+  }
+
+  if (com_mod.urisFlag) {
+    for (int i = 0; i < com_mod.nUris; i++) {
+      data.counts.push_back(com_mod.uris[i].cnt);
+      data.flags.push_back(com_mod.uris[i].clsFlg ? 1 : 0);
+    }
+  }
+
+  return data;
+}
+
+/// @brief Get the sizes stored in the header, in the order of 'size_names'.
+//
+static std::vector<int> header_sizes(Simulation* simulation, const std::vector<NodalField>& fields, const GlobalData& data)
+{
+  auto& com_mod = simulation->com_mod;
+  int rec_len = 0;
+  for (auto& field : fields) {
+    rec_len += field.nrows;
+  }
+
+  return { com_mod.gtnNo, com_mod.nEq, com_mod.nMsh, com_mod.cplBC.xn.size(), com_mod.tDof, com_mod.dFlag,
+      rec_len, static_cast<int>(data.flags.size()), static_cast<int>(data.counts.size()) };
+}
+
+/// @brief Get the (global node ID, process node ID) pairs, sorted by global
+/// node ID, for the process nodes.
+///
+/// If 'owned' is true then only nodes owned by this process are returned,
+/// using the ownership of the linear solver: a node shared by several
+/// processes is owned by the one that numbers it below lhs.mynNo.
+//
+static std::vector<std::pair<int,int>> process_nodes(ComMod& com_mod, const bool owned)
+{
+  const auto& lhs = com_mod.lhs;
+  const int tnNo = com_mod.tnNo;
+
+  std::vector<std::pair<int,int>> nodes;
+  nodes.reserve(tnNo);
+
+  for (int a = 0; a < tnNo; a++) {
+    if (!owned || lhs.map(a) < lhs.mynNo) {
+      nodes.push_back({com_mod.ltg(a), a});
+    }
+  }
+
+  std::sort(nodes.begin(), nodes.end());
+  return nodes;
+}
+
+/// @brief Set the file view to the records of the given nodes.
+//
+static void set_node_view(MPI_File fh, const MPI_Offset header_size, const int rec_len,
+    const std::vector<std::pair<int,int>>& nodes)
+{
+  std::vector<int> displacements(nodes.size());
+  for (size_t i = 0; i < nodes.size(); i++) {
+    displacements[i] = nodes[i].first;
+  }
+
+  MPI_Datatype rec_type, file_type;
+  MPI_Type_contiguous(rec_len, MPI_DOUBLE, &rec_type);
+  MPI_Type_commit(&rec_type);
+  MPI_Type_create_indexed_block(displacements.size(), 1, displacements.data(), rec_type, &file_type);
+  MPI_Type_commit(&file_type);
+
+  MPI_File_set_view(fh, header_size, MPI_DOUBLE, file_type, "native", MPI_INFO_NULL);
+
+  MPI_Type_free(&file_type);
+  MPI_Type_free(&rec_type);
+}
+
+/// @brief Check if a file is a restart file keyed by global node ID.
+//
+bool is_global_restart_file(const std::string& fName)
+{
+  std::ifstream file(fName, std::ios::binary | std::ios::in);
+  std::array<char,8> id{};
+  file.read(id.data(), id.size());
+  return file && (id == file_id);
+}
+
+/// @brief Read a restart file keyed by global node ID, the nodal data is
+/// read for the process nodes so the file can be read by any number of
+/// processes.
+///
+/// Sets: cTS, time, timeP[0], eq.iNorm, cplBC.xo, Yo, Ao, Do, pS0, Ad, Xion,
+/// cem.Ya and the RIS/URIS data.
+//
+void read_global_restart(Simulation* simulation, const std::string& fName, std::array<double,3>& timeP)
+{
+  auto& com_mod = simulation->com_mod;
+  auto& cm = com_mod.cm;
+
+  auto fields = nodal_fields(simulation, com_mod.Yo, com_mod.Ao, com_mod.Do);
+  auto data = global_data(com_mod);
+  auto sizes = header_sizes(simulation, fields, data);
+  const int rec_len = sizes[6];
+
+  MPI_File fh;
+  if (MPI_File_open(cm.com(), fName.c_str(), MPI_MODE_RDONLY, MPI_INFO_NULL, &fh) != MPI_SUCCESS) {
+    throw std::runtime_error("Failed to open the restart file '" + fName + "'.");
+  }
+
+  // Check the sizes of the data in the file.
+  //
+  std::vector<char> header(file_id.size() + sizes.size()*sizeof(int));
+  MPI_File_read_at_all(fh, 0, header.data(), header.size(), MPI_BYTE, MPI_STATUS_IGNORE);
+
+  size_t pos = 0;
+  std::array<char,8> id;
+  std::vector<int> file_sizes(sizes.size());
+  extract(header, pos, id.data(), id.size());
+  extract(header, pos, file_sizes.data(), file_sizes.size());
+
+  if (id != file_id) {
+    MPI_File_close(&fh);
+    throw std::runtime_error("The file '" + fName + "' is not a restart file keyed by global node ID.");
+  }
+
+  for (size_t i = 0; i < sizes.size(); i++) {
+    if (file_sizes[i] != sizes[i]) {
+      MPI_File_close(&fh);
+      throw std::runtime_error("The " + size_names[i] + " " + std::to_string(file_sizes[i]) + " read from '" +
+          fName + "' does not match the simulation value " + std::to_string(sizes[i]) + ".");
+    }
+  }
+
+  // Read the data that is not stored per node.
+  //
+  size_t data_size = sizeof(int) + sizeof(double) * (2 + com_mod.nEq + com_mod.cplBC.xo.size()) +
+      sizeof(int) * data.counts.size() + data.flags.size();
+  header.resize(header.size() + data_size);
+  MPI_File_read_at_all(fh, pos, header.data() + pos, data_size, MPI_BYTE, MPI_STATUS_IGNORE);
+
+  extract(header, pos, &com_mod.cTS, 1);
+  extract(header, pos, &com_mod.time, 1);
+  extract(header, pos, &timeP[0], 1);
+  for (auto& eq : com_mod.eq) {
+    extract(header, pos, &eq.iNorm, 1);
+  }
+  extract(header, pos, com_mod.cplBC.xo.data(), com_mod.cplBC.xo.size());
+  extract(header, pos, data.counts.data(), data.counts.size());
+  extract(header, pos, data.flags.data(), data.flags.size());
+
+  if (com_mod.risFlag) {
+    for (size_t i = 0; i < com_mod.ris.clsFlg.size(); i++) {
+      com_mod.ris.clsFlg[i] = data.flags[i];
+    }
+  }
+
+  if (com_mod.urisFlag) {
+    int offset = data.flags.size() - com_mod.nUris;
+    for (int i = 0; i < com_mod.nUris; i++) {
+      com_mod.uris[i].cnt = data.counts[i];
+      com_mod.uris[i].clsFlg = data.flags[offset+i];
+    }
+  }
+
+  // Read the records of the process nodes.
+  //
+  auto nodes = process_nodes(com_mod, false);
+  std::vector<double> buffer(nodes.size() * rec_len);
+
+  // The file is only read once so an independent read is used, collective
+  // reads with this view sometimes miss the last record with Open MPI 4.1 OMPIO.
+  set_node_view(fh, pos, rec_len, nodes);
+  MPI_File_read(fh, buffer.data(), buffer.size(), MPI_DOUBLE, MPI_STATUS_IGNORE);
+  MPI_File_close(&fh);
+
+  for (size_t n = 0; n < nodes.size(); n++) {
+    int a = nodes[n].second;
+    double* rec = buffer.data() + n*rec_len;
+    for (auto& field : fields) {
+      std::copy(rec, rec + field.nrows, field.data + a*field.nrows);
+      rec += field.nrows;
+    }
+  }
+}
+
+/// @brief Write a restart file keyed by global node ID, each process writes
+/// the records of the nodes it owns with a collective MPI-IO write.
+//
+void write_global_restart(Simulation* simulation, std::array<double,3>& timeP, const std::string& fName)
+{
+  auto& com_mod = simulation->com_mod;
+  auto& cm_mod = simulation->cm_mod;
+  auto& cm = com_mod.cm;
+
+  auto fields = nodal_fields(simulation, com_mod.Yn, com_mod.An, com_mod.Dn);
+  auto data = global_data(com_mod);
+  auto sizes = header_sizes(simulation, fields, data);
+  const int rec_len = sizes[6];
+
+  // The header, written by the master process.
+  //
+  std::vector<char> header;
+  double cpu_time = utils::cput() - timeP[0];
+
+  append(header, file_id.data(), file_id.size());
+  append(header, sizes.data(), sizes.size());
+  append(header, &com_mod.cTS, 1);
+  append(header, &com_mod.time, 1);
+  append(header, &cpu_time, 1);
+  for (auto& eq : com_mod.eq) {
+    append(header, &eq.iNorm, 1);
+  }
+  append(header, com_mod.cplBC.xn.data(), com_mod.cplBC.xn.size());
+  append(header, data.counts.data(), data.counts.size());
+  append(header, data.flags.data(), data.flags.size());
+
+  // The records of the nodes owned by this process.
+  //
+  auto nodes = process_nodes(com_mod, true);
+  std::vector<double> buffer(nodes.size() * rec_len);
+
+  for (size_t n = 0; n < nodes.size(); n++) {
+    int a = nodes[n].second;
+    double* rec = buffer.data() + n*rec_len;
+    for (auto& field : fields) {
+      std::copy(field.data + a*field.nrows, field.data + (a+1)*field.nrows, rec);
+      rec += field.nrows;
+    }
+  }
+
+  MPI_File fh;
+  if (MPI_File_open(cm.com(), fName.c_str(), MPI_MODE_WRONLY | MPI_MODE_CREATE, MPI_INFO_NULL, &fh) != MPI_SUCCESS) {
+    throw std::runtime_error("Failed to open the restart file '" + fName + "' to write.");
+  }
+
+  MPI_File_set_size(fh, 0);
+
+  if (cm.mas(cm_mod)) {
+    MPI_File_write_at(fh, 0, header.data(), header.size(), MPI_BYTE, MPI_STATUS_IGNORE);
+  }
+
+  set_node_view(fh, header.size(), rec_len, nodes);
+  MPI_File_write_all(fh, buffer.data(), buffer.size(), MPI_DOUBLE, MPI_STATUS_IGNORE);
+  MPI_File_close(&fh);
+}
+
+};
+
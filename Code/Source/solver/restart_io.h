@@ -0,0 +1,40 @@
+// SPDX-FileCopyrightText: Copyright (c) Stanford University, The Regents of the University of California, and others.
+// SPDX-License-Identifier: BSD-3-Clause
+
+#include "Simulation.h"
+
+#include <array>
+#include <string>
+
+#ifndef RESTART_IO_H
+#define RESTART_IO_H
+
+/// @brief Functions used to write and read restart files keyed by global
+/// node ID.
+///
+/// The restart files written by output::write_restart() store a record of
+/// process-local data for each process, so they can only be read back by a
+/// simulation using the same number of processes and mesh partition.
+///
+/// The files written here store the nodal data for each global node, written
+/// collectively with MPI-IO, so they can be read back by a simulation using
+/// any number of processes. The file contains
+///
+///   header: a file identifier, the sizes of the data, cTS, time, the CPU
+///     time, eq.iNorm, cplBC.xn, RIS/URIS data
+///
+///   gtnNo node records ordered by global node ID: Yn, An, Dn, pS0, Ad,
+///     Xion and cem.Ya for the node, depending on the equations solved
+//
+namespace restart_io {
+
+bool is_global_restart_file(const std::string& fName);
+
+void read_global_restart(Simulation* simulation, const std::string& fName, std::array<double,3>& timeP);
+
+void write_global_restart(Simulation* simulation, std::array<double,3>& timeP, const std::string& fName);
+
+};
+
+#endif
+
@@ -18,9 +18,69 @@
 #include "utils.h"
 #include <math.h>
 #include "svZeroD_subroutines.h"
+#include "genBC_interface/GenBCInterface.h"
 
 namespace set_bc {
 
+/// @brief The genBC shared library, loaded by the first call to
+/// genBC_Integ_X() when a genBC shared library is used.
+///
+/// The library is loaded on all processes. The other processes keep a copy
+/// of the 0D state so they can compute the perturbed solutions used to
+/// compute the resistances in calc_der_cpl_bc() in parallel.
+static GenBCInterface genbc_interface;
+
+/// @brief Integrate the 0D model with the genBC shared library on this
+/// process and set cplBC.fa[].y.
+//
+static void genbc_library_integ_x(ComMod& com_mod, const std::string& genFlag)
+{
+  using namespace consts;
+
+  auto& cplBC = com_mod.cplBC;
+  int nDir = 0;
+  int nNeu = 0;
+
+  if (!genbc_interface.loaded()) {
+    genbc_interface.load_library(cplBC.libPath);
+  }
+
+  std::vector<double> P, Q, y;
+
+  for (int iFa = 0; iFa < cplBC.nFa; iFa++) {
+    auto& fa = cplBC.fa[iFa];
+    if (fa.bGrp == CplBCType::cplBC_Dir) {
+      P.push_back(fa.Po);
+      P.push_back(fa.Pn);
+      nDir = nDir + 1;
+    }
+  }
+
+  for (int iFa = 0; iFa < cplBC.nFa; iFa++) {
+    auto& fa = cplBC.fa[iFa];
+    if (fa.bGrp == CplBCType::cplBC_Neu) {
+      Q.push_back(fa.Qo);
+      Q.push_back(fa.Qn);
+      nNeu = nNeu + 1;
+    }
+  }
+
+  genbc_interface.integ_x(genFlag, com_mod.dt, nDir, nNeu, P, Q, y);
+
+  int i = 0;
+  for (int iFa = 0; iFa < cplBC.nFa; iFa++) {
+    if (cplBC.fa[iFa].bGrp == CplBCType::cplBC_Dir) {
+      cplBC.fa[iFa].y = y[i++];
+    }
+  }
+
+  for (int iFa = 0; iFa < cplBC.nFa; iFa++) {
+    if (cplBC.fa[iFa].bGrp == CplBCType::cplBC_Neu) {
+      cplBC.fa[iFa].y = y[i++];
+    }
+  }
+}
+
 /// @brief This function calculates updated cplBC pressures or flowrates from 0D,
 /// as well as the resistance matrix M ~ dP/dQ from 0D using finite difference.
 /// Updates the pressure or flowrates stored in cplBC.fa[i].y and the resistance
@@ -180,6 +240,79 @@ void calc_der_cpl_bc(ComMod& com_mod, const CmMod& cm_mod)
     orgQ[i] = cplBC.fa[i].Qn;
   }
 
+  // The RCR faces are not coupled so dP/dQ is diagonal, the resistances of
+  // all faces are computed by perturbing all flowrates in a single call.
+  //
+  if (!cplBC.useGenBC && !cplBC.useSvZeroD) {
+    auto orgXn = cplBC.xn;
+    auto orgXp = cplBC.xp;
+
+    for (auto& bc : eq.bc) {
+      int i = bc.cplBCptr;
+      if (i != -1 && utils::btest(bc.bType, iBC_Neu)) {
+        cplBC.fa[i].Qn = orgQ[i] + diff;
+      }
+    }
+
+    set_bc::cplBC_Integ_X(com_mod, cm_mod, RCRflag);
+
+    for (auto& bc : eq.bc) {
+      int i = bc.cplBCptr;
+      if (i != -1 && utils::btest(bc.bType, iBC_Neu)) {
+        bc.r = (cplBC.fa[i].y - orgY[i]) / diff;
+      }
+    }
+
+    for (size_t j = 0; j < cplBC.fa.size(); j++) {
+      cplBC.fa[j].y = orgY[j];
+      cplBC.fa[j].Qn = orgQ[j];
+    }
+    cplBC.xn = orgXn;
+    cplBC.xp = orgXp;
+
+    return;
+  }
+
+  // Each process computes the perturbed solutions for a subset of the faces
+  // with its copy of the genBC shared library, the resistances are then
+  // summed over all processes.
+  //
+  if (cplBC.useGenBC && (cplBC.libPath.size() != 0) && !com_mod.cm.seq()) {
+    auto& cm = com_mod.cm;
+    Vector<double> r(eq.nBc);
+    int k = 0;
+
+    for (int iBc = 0; iBc < eq.nBc; iBc++) {
+      auto& bc = eq.bc[iBc];
+      int i = bc.cplBCptr;
+
+      if (i != -1 && utils::btest(bc.bType, iBC_Neu)) {
+        if (k % cm.np() == cm.id()) {
+          cplBC.fa[i].Qn = orgQ[i] + diff;
+          genbc_library_integ_x(com_mod, "D");
+          r(iBc) = (cplBC.fa[i].y - orgY[i]) / diff;
+
+          for (size_t j = 0; j < cplBC.fa.size(); j++) {
+            cplBC.fa[j].y = orgY[j];
+            cplBC.fa[j].Qn = orgQ[j];
+          }
+        }
+        k = k + 1;
+      }
+    }
+
+    r = cm.reduce(cm_mod, r);
+
+    for (int iBc = 0; iBc < eq.nBc; iBc++) {
+      auto& bc = eq.bc[iBc];
+      if (bc.cplBCptr != -1 && utils::btest(bc.bType, iBC_Neu)) {
+        bc.r = r(iBc);
+      }
+    }
+
+    return;
+  }
+
   for (int iBc = 0; iBc < eq.nBc; iBc++) {
     auto& bc = eq.bc[iBc];
     int i = bc.cplBCptr;
@@ -314,8 +447,32 @@ void genBC_Integ_X(ComMod& com_mod, const CmMod& cm_mod, const std::string& genF
   strcat(command, " ");
   strcat(command, cplBC.commuName.c_str());
 
+  // Integrate the 0D model with the genBC shared library, the data is
+  // passed directly instead of through the GenBC.int file.
+  //
+  // The other processes initialize their copy of the genBC library state
+  // and advance it with the 'U' flag (update the state without writing
+  // files) when the master process saves the state with the 'L' flag.
+  // They read the InitialData file after the master process has created it
+  // and before it is overwritten by the master process with the 'L' flag.
+  //
+  if (cplBC.libPath.size() != 0) {
+    if (cm.mas(cm_mod)) {
+      genbc_library_integ_x(com_mod, genFlag);
+    }
+
+    if (genFlag == "I") {
+      MPI_Barrier(cm.com());
+      if (cm.slv(cm_mod)) {
+        genbc_library_integ_x(com_mod, "I");
+      }
+      MPI_Barrier(cm.com());
+    } else if ((genFlag == "L") && cm.slv(cm_mod)) {
+      genbc_library_integ_x(com_mod, "U");
+    }
+
   // If this process is the master process on the communicator
-  if (cm.mas(cm_mod)) {
+  } else if (cm.mas(cm_mod)) {
     for (int iFa = 0; iFa < cplBC.nFa; iFa++) {
       auto& fa = cplBC.fa[iFa];
 
@@ -6,6 +6,7 @@
 
 #include "shells.h"
 
+#include "AssemblyWorkspace.h"
 #include "all_fun.h"
 #include "consts.h"
 #include "lhsa.h"
@@ -58,10 +59,20 @@ void construct_shell(ComMod& com_mod, const mshType& lM, const Array<double>& Ag
 
   // SHELLS: dof = nsd
   //
-  Vector<int> ptr(eNoN);
-  Array<double> xl(nsd,eNoN), al(tDof,eNoN), yl(tDof,eNoN), dl(tDof,eNoN),
-                bfl(nsd,eNoN), fN(3,nFn), lR(dof,eNoN);
-  Array3<double> lK(dof*dof,eNoN,eNoN); 
+  // The local element arrays are taken from the thread's assembly workspace.
+  //
+  auto& ws = AssemblyWorkspace::get();
+  ws.set_element_arrays(com_mod, eNoN, nFn);
+
+  auto& ptr = ws.ptr;
+  auto& xl = ws.xl;
+  auto& al = ws.al;
+  auto& yl = ws.yl;
+  auto& dl = ws.dl;
+  auto& bfl = ws.bfl;
+  auto& fN = ws.fN;
+  auto& lR = ws.lR;
+  auto& lK = ws.lK;
 
   // Loop over all elements of mesh
   //
@@ -199,7 +199,7 @@ void construct_stokes(ComMod& com_mod, const mshType& lM, const Array<double>& A
 
     } // g: loop
 
-    eq.linear_algebra->assemble(com_mod, eNoN, ptr, lK, lR);
+    eq.linear_algebra->assemble(com_mod, lM, e, ptr, lK, lR);
 
   } // e: loop
 
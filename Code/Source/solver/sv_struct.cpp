@@ -8,6 +8,7 @@
 
 #include "sv_struct.h"
 
+#include "AssemblyWorkspace.h"
 #include "all_fun.h"
 #include "consts.h"
 #include "lhsa.h"
@@ -219,12 +220,27 @@ void construct_dsolid(ComMod& com_mod, CepMod& cep_mod, const mshType& lM, const
   #endif
 
   // STRUCT: dof = nsd
-
-  Vector<int> ptr(eNoN);
-  Vector<double> pSl(nsymd), ya_l(eNoN), N(eNoN);
-  Array<double> xl(nsd,eNoN), al(tDof,eNoN), yl(tDof,eNoN), dl(tDof,eNoN), 
-                bfl(nsd,eNoN), fN(nsd,nFn), pS0l(nsymd,eNoN), Nx(nsd,eNoN), lR(dof,eNoN);
-  Array3<double> lK(dof*dof,eNoN,eNoN);
+  //
+  // The local element arrays are taken from the thread's assembly workspace.
+  //
+  auto& ws = AssemblyWorkspace::get();
+  ws.set_element_arrays(com_mod, eNoN, nFn);
+
+  auto& ptr = ws.ptr;
+  auto& pSl = ws.pSl;
+  auto& ya_l = ws.ya_l;
+  auto& N = ws.N;
+  auto& xl = ws.xl;
+  auto& al = ws.al;
+  auto& yl = ws.yl;
+  auto& dl = ws.dl;
+  auto& bfl = ws.bfl;
+  auto& fN = ws.fN;
+  auto& pS0l = ws.pS0l;
+  auto& Nx = ws.Nx;
+  auto& ksix = ws.ksix;
+  auto& lR = ws.lR;
+  auto& lK = ws.lK;
 
   // Loop over all elements of mesh
 
@@ -270,7 +286,7 @@ void construct_dsolid(ComMod& com_mod, CepMod& cep_mod, const mshType& lM, const
       }
 
       if (pS0.size() != 0) { 
-        pS0l.set_col(a, pS0.col(Ac));
+        pS0l.set_col(a, pS0.rcol(Ac));
       }
 
       if (cem.cpld) {
@@ -284,18 +300,17 @@ void construct_dsolid(ComMod& com_mod, CepMod& cep_mod, const mshType& lM, const
     lK = 0.0;
 
     double Jac{0.0};
-    Array<double> ksix(nsd,nsd);
 
     for (int g = 0; g < lM.nG; g++) {
       if (g == 0 || !lM.lShpF) {
-        auto Nx_g = lM.Nx.slice(g);
+        auto Nx_g = lM.Nx.rslice(g);
         nn::gnn(eNoN, nsd, nsd, Nx_g, xl, Nx, Jac, ksix);
         if (utils::is_zero(Jac)) {
           throw std::runtime_error("[construct_dsolid] Jacobian for element " + std::to_string(e) + " is < 0.");
         }
       }
       double w = lM.w(g) * Jac;
-      N = lM.N.col(g);
+      N = lM.N.rcol(g);
       pSl = 0.0;
 
       if (nsd == 3) {
@@ -327,7 +342,7 @@ void construct_dsolid(ComMod& com_mod, CepMod& cep_mod, const mshType& lM, const
       }
     } 
 
-    eq.linear_algebra->assemble(com_mod, eNoN, ptr, lK, lR);
+    eq.linear_algebra->assemble(com_mod, lM, e, ptr, lK, lR);
   } 
 }
 
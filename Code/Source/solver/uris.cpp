@@ -14,9 +14,107 @@
 #include "vtk_xml.h"
 #include "read_msh.h"
 #include "VtkData.h"
+#include "KdTree.h"
+#include "SpatialGrid.h"
 
 namespace uris { 
 
+/// @brief Spatial index of the fluid mesh elements used by uris_find_tetra()
+/// to find the elements containing the URIS nodes.
+///
+/// The element centroids of each fluid mesh are binned in a SpatialGrid, and
+/// the elements connected to each node are stored so the elements around the
+/// element found by the previous search can be checked first.
+//
+class FluidElementIndex
+{
+  public:
+    void build(const ComMod& com_mod);
+    bool built() const { return !meshes.empty(); }
+
+    class MeshIndex
+    {
+      public:
+        // Element centroids (nsd, nEl)
+        Array<double> xc;
+
+        // Grid of the element centroids
+        SpatialGrid grid;
+
+        // Distance from a centroid beyond which a point can't be found
+        // inside the element by inside_tet()
+        double reach = 0.0;
+
+        // Elements connected to node Ac: node_elems[node_ptr[Ac]:node_ptr[Ac+1]-1]
+        std::vector<int> node_ptr;
+        std::vector<int> node_elems;
+    };
+
+    std::vector<MeshIndex> meshes;
+};
+
+/// @brief Build the index of the elements of the fluid meshes.
+//
+void FluidElementIndex::build(const ComMod& com_mod)
+{
+  const int nsd = com_mod.nsd;
+  meshes.resize(com_mod.nMsh);
+
+  for (int iM = 0; iM < com_mod.nMsh; iM++) {
+    auto& mesh = com_mod.msh[iM];
+    auto& index = meshes[iM];
+    index.xc.resize(nsd, mesh.nEl);
+
+    // inside_tet() only checks points within 0.1 of the element bounding box.
+    double extent = 0.0;
+
+    for (int e = 0; e < mesh.nEl; e++) {
+      for (int i = 0; i < nsd; i++) {
+        double xmin = std::numeric_limits<double>::max();
+        double xmax = std::numeric_limits<double>::lowest();
+        double sum = 0.0;
+        for (int a = 0; a < mesh.eNoN; a++) {
+          double x = com_mod.x(i, mesh.IEN(a,e));
+          xmin = std::min(xmin, x);
+          xmax = std::max(xmax, x);
+          sum += x;
+        }
+        index.xc(i,e) = sum / static_cast<double>(mesh.eNoN);
+        extent = std::max(extent, xmax - xmin);
+      }
+    }
+
+    index.reach = extent + 0.1;
+
+    if (mesh.nEl > 0) {
+      index.grid.build(index.xc, index.reach);
+    }
+
+    index.node_ptr.assign(com_mod.tnNo+1, 0);
+    for (int e = 0; e < mesh.nEl; e++) {
+      for (int a = 0; a < mesh.eNoN; a++) {
+        index.node_ptr[mesh.IEN(a,e)+1] += 1;
+      }
+    }
+    for (int Ac = 0; Ac < com_mod.tnNo; Ac++) {
+      index.node_ptr[Ac+1] += index.node_ptr[Ac];
+    }
+
+    index.node_elems.resize(index.node_ptr[com_mod.tnNo]);
+    auto pos = index.node_ptr;
+    for (int e = 0; e < mesh.nEl; e++) {
+      for (int a = 0; a < mesh.eNoN; a++) {
+        index.node_elems[pos[mesh.IEN(a,e)]++] = e;
+      }
+    }
+  }
+}
+
+/// @brief The fluid element index, built by the first call to
+/// uris_find_tetra().
+static FluidElementIndex fluid_element_index;
+
+
 /// @brief This subroutine computes the mean pressure and flux on the 
 /// immersed surface 
 void uris_meanp(ComMod& com_mod, CmMod& cm_mod, const int iUris) {
@@ -268,13 +366,14 @@ void uris_update_disp(ComMod& com_mod, CmMod& cm_mod) {
   // = find the fluid element that contains the node
   // Since the fluid element could be on another processor, we need to
   // gather the displacement values at the end      
-  // [FK] it's probably better to save the element ids so that we don't
-  // have to run the search every time step, only during open or close 
+  // uris_find_tetra() is called at every time step. It returns without a
+  // search once the valve has finished opening or closing, the elements
+  // it saved are then reused. While the valve moves the search starts from
+  // the elements found at the previous time step.
 
-  Array<double> localYd, xl, Nxi;
+  Array<double> localYd, Nxi;
   Vector<double> N;
-  Vector<double> xp(nsd), xi(nsd), d(nsd);
-  bool fl;
+  Vector<double> xi(nsd), d(nsd);
 
   for (int iUris = 0; iUris < nUris; iUris++) {
     auto& uris_obj = uris[iUris];
@@ -283,30 +382,18 @@ void uris_update_disp(ComMod& com_mod, CmMod& cm_mod) {
     localYd = 0.0;
     for (int nd = 0; nd < uris_obj.tnNo; nd++) {
       int jM = uris_obj.elemId(0, nd);
-      auto& mesh = msh[jM];
       // If the fluid mesh element is not on the current proc
       if (jM == -1) {continue;}
 
+      auto& mesh = msh[jM];
       int iEln = uris_obj.elemId(1, nd);
-      Vector<double> xp = uris_obj.x.col(nd);
-      xl.resize(nsd, mesh.eNoN);
       N.resize(mesh.eNoN);
       Nxi.resize(nsd, mesh.eNoN);
 
-      for (int a = 0; a < mesh.eNoN; a++) {
-        int Ac = mesh.IEN(a, iEln);
-        for (int i = 0; i < nsd; i++) {
-          xl(i, a) = com_mod.x(i, Ac);
-        }
-      }
       // Get displacement  
-      // Localize p inside the parent element
-      nn::get_xi(nsd, mesh.eType, mesh.eNoN, xl, xp, xi, fl);
-      if (!fl) {
-        if (cm.mas(cm_mod)) {
-          std::cout << "[WARNING] URIS get_xi not converging!" << std::endl;
-        }
-      }
+      // The parametric coordinates of p inside the parent element are
+      // saved by uris_find_tetra()
+      xi = uris_obj.elemXi.col(nd);
       // evaluate N at xi 
       nn::get_gnn(nsd, mesh.eType, mesh.eNoN, xi, N, Nxi);
       // use this to compute disp al node xp
@@ -366,12 +453,24 @@ void uris_find_tetra(ComMod& com_mod, CmMod& cm_mod, const int iUris) {
   // = find the fluid element that contains the node
   // Since the fluid element could be on another processor, we need to
   // gather the displacement values at the end      
-  // [FK] it's probably better to save the element ids so that we don't
-  // have to run the search every time step, only during open or close      
+  //
+  // The element found for each node and the parametric coordinates of the
+  // node in it are saved, the search starts from the element found by the
+  // previous search and its neighbors before using the element index.
+
+  if (!fluid_element_index.built()) {
+    fluid_element_index.build(com_mod);
+  }
 
   bool ultra = true;
+  Array<int> prevId;
   if (!uris_obj.elemId.allocated()) {
     uris_obj.elemId.resize(2, uris_obj.tnNo);
+  } else {
+    prevId = uris_obj.elemId;
+  }
+  if (!uris_obj.elemXi.allocated()) {
+    uris_obj.elemXi.resize(nsd, uris_obj.tnNo);
   }
   if (!uris_obj.elemCounter.allocated()) {
     uris_obj.elemCounter.resize(uris_obj.tnNo);
@@ -380,34 +479,114 @@ void uris_find_tetra(ComMod& com_mod, CmMod& cm_mod, const int iUris) {
   local_counter = 0;
   uris_obj.elemId = -1;
   uris_obj.elemCounter = 0;
-  int flag;
   Array<double> xl;
+  std::vector<int> elems;
+
+  // Check if the node is inside element iEln of mesh jM, the node may be
+  // slightly outside the element if 'ext' is true.
+  auto inside = [&](const int jM, const int iEln, Vector<double>& xp, bool ext) -> bool {
+    auto& mesh = com_mod.msh[jM];
+    int eNoN = mesh.eNoN;
+    int flag = 0;
+    xl.resize(nsd, eNoN);
+    for (int a = 0; a < eNoN; a++) {
+      int Ac = mesh.IEN(a, iEln);
+      for(int i = 0; i < nsd; i++) {
+        xl(i,a) = com_mod.x(i,Ac);
+      }
+    }
+    inside_tet(com_mod, eNoN, xp, xl, flag, ext);
+    return (flag == 1);
+  };
+
+  bool xi_converged = true;
+
   for (int nd = 0; nd < uris_obj.tnNo; nd++) {
-    flag = 0;
     // Check if we were able to find the tetra.
     // [FK] if not, the tetra is on another processor 
     Vector<double> xp = uris_obj.x.col(nd);
-    bool found = false;
-
-    for (int jM = 0; jM < com_mod.nMsh && !found; jM++) {
-      auto& mesh = com_mod.msh[jM];
-      xl.resize(nsd, mesh.eNoN);
-      for (int iEln = 0; iEln < mesh.nEl && !found; iEln++) {
+    int jM = -1;
+    int iEln = -1;
+
+    // Check the element found by the previous search and the elements
+    // sharing a node with it. The node must be strictly inside the element,
+    // the tolerance used by inside_tet() spans neighboring elements.
+    if (prevId.allocated() && prevId(0,nd) != -1) {
+      int pM = prevId(0,nd);
+      int pEln = prevId(1,nd);
+      if (inside(pM, pEln, xp, false)) {
+        jM = pM;
+        iEln = pEln;
+      } else {
+        auto& mesh = com_mod.msh[pM];
+        auto& index = fluid_element_index.meshes[pM];
+        elems.clear();
         for (int a = 0; a < mesh.eNoN; a++) {
-          int Ac = mesh.IEN(a, iEln);
-          for(int i = 0; i < nsd; i++) {
-            xl(i,a) = com_mod.x(i,Ac);
+          int Ac = mesh.IEN(a, pEln);
+          for (int k = index.node_ptr[Ac]; k < index.node_ptr[Ac+1]; k++) {
+            elems.push_back(index.node_elems[k]);
           }
         }
-        inside_tet(com_mod, mesh.eNoN, xp, xl, flag, ultra);
-        if (flag == 1) {
-          uris_obj.elemId(0, nd) = jM;
-          uris_obj.elemId(1, nd) = iEln;
-          local_counter(nd) += 1;
-          found = true;
+        std::sort(elems.begin(), elems.end());
+        elems.erase(std::unique(elems.begin(), elems.end()), elems.end());
+        for (int e : elems) {
+          if (e != pEln && inside(pM, e, xp, false)) {
+            jM = pM;
+            iEln = e;
+            break;
+          }
+        }
+      }
+    }
+
+    // Otherwise check the elements whose centroid is near the node in
+    // element order.
+    for (int kM = 0; kM < com_mod.nMsh && jM == -1; kM++) {
+      auto& index = fluid_element_index.meshes[kM];
+      if (index.grid.size() == 0) {
+        continue;
+      }
+      Vector<double> xmin = xp - index.reach;
+      Vector<double> xmax = xp + index.reach;
+      index.grid.find(index.xc, xmin, xmax, elems);
+      std::sort(elems.begin(), elems.end());
+      for (int e : elems) {
+        if (inside(kM, e, xp, ultra)) {
+          jM = kM;
+          iEln = e;
+          break;
         }
       }
     }
+
+    if (jM == -1) {
+      continue;
+    }
+
+    uris_obj.elemId(0, nd) = jM;
+    uris_obj.elemId(1, nd) = iEln;
+    local_counter(nd) += 1;
+
+    // Localize p inside the parent element
+    auto& mesh = com_mod.msh[jM];
+    xl.resize(nsd, mesh.eNoN);
+    for (int a = 0; a < mesh.eNoN; a++) {
+      int Ac = mesh.IEN(a, iEln);
+      for (int i = 0; i < nsd; i++) {
+        xl(i,a) = com_mod.x(i,Ac);
+      }
+    }
+    Vector<double> xi(nsd);
+    bool fl;
+    nn::get_xi(nsd, mesh.eType, mesh.eNoN, xl, xp, xi, fl);
+    if (!fl) {
+      xi_converged = false;
+    }
+    uris_obj.elemXi.set_col(nd, xi);
+  }
+
+  if (!xi_converged && cm.mas(cm_mod)) {
+    std::cout << "[WARNING] URIS get_xi not converging!" << std::endl;
   }
 
   MPI_Allreduce(local_counter.data(), uris_obj.elemCounter.data(), 
@@ -521,6 +700,7 @@ void uris_read_msh(Simulation* simulation) {
     uris_obj.sdf_default = uris_obj.sdf_default * uris_obj.scF;
     uris_obj.sdf_deps = param->thickness() * uris_obj.scF;
     uris_obj.sdf_deps_close = param->close_thickness() * uris_obj.scF;
+    uris_obj.sdf_band = param->sdf_narrow_band_width() * uris_obj.scF;
     uris_obj.clsFlg = param->valve_starts_as_closed();
 
     // uris_obj.tnNo = 0;
@@ -961,66 +1141,27 @@ void uris_calc_sdf(ComMod& com_mod) {
       extra(i) = (maxb(i) - minb(i)) * extra_val;
     }
 
-    // The SDF is computed on the reference configuration, which
-    // means that the valves will be morphed based on the fluid mesh
-    // motion. If the fluid mesh stretches near the valve, the valve
-    // leaflets will also be streched. Note that
-    // this is a simplifying assumption. 
-    Vector<double> xp(nsd);
-    for (int ca = 0; ca < com_mod.tnNo; ca++) {
-      double minS = std::numeric_limits<double>::max();
-      for (int i = 0; i < nsd; i++) {
-        xp(i) = com_mod.x(i,ca);
-      }
-      // Is the node inside the BBox?
-      bool inside = true;
-      for (int i = 0; i < nsd; i++) {
-        if (xp(i) < (minb(i) - extra(i)) || xp(i) > (maxb(i) + extra(i))) {
-          inside = false;
-          break;
-        }
-      }
-      if (inside) {
-        // This point is inside the BBox
-        // Find the closest URIS face centroid
-        int Ec = -1;
-        int jM = -1;
-        Vector<double> xb(nsd);
-        for (int iM = 0; iM < uris_obj.nFa; iM++) {
-          auto& mesh = uris_obj.msh[iM];
-          for (int e = 0; e < mesh.nEl; e++) {
-            xb = 0.0;
-            for (int a = 0; a < mesh.eNoN; a++) {
-              int Ac = mesh.IEN(a,e);
-              for (int i = 0; i < nsd; i++) {
-                xb(i) += uris_obj.x(i,Ac);
-              }
-            }
-            for (int i = 0; i < nsd; i++) {
-              xb(i) /= static_cast<double>(mesh.eNoN);
-            }
-            double dS = 0.0;
-            for (int i = 0; i < nsd; i++) {
-              dS += (xp[i] - xb[i]) * (xp[i] - xb[i]);
-            }
-            dS = std::sqrt(dS);
+    // Compute the centroid and unit normal of each URIS element and build
+    // a k-d tree of the centroids used to find the element nearest to
+    // a node.
+    int nEl = 0;
+    for (int iM = 0; iM < uris_obj.nFa; iM++) {
+      nEl += uris_obj.msh[iM].nEl;
+    }
 
-            if (dS < minS) {
-              minS = dS;
-              Ec = e;
-              jM = iM;
-            }
-          }
-        }
+    Array<double> xc(nsd, nEl);
+    Array<double> nc(nsd, nEl);
+    Vector<double> xb(nsd);
+    int ec = 0;
 
-        // We also need to compute the sign (above or below the valve).
-        // Compute the element normal
-        auto& mesh = uris_obj.msh[jM];
+    for (int iM = 0; iM < uris_obj.nFa; iM++) {
+      auto& mesh = uris_obj.msh[iM];
+      for (int e = 0; e < mesh.nEl; e++, ec++) {
         xXi = 0.0;
         lX = 0.0;
         xb = 0.0;
         for (int a = 0; a < mesh.eNoN; a++) {
-          int Ac = mesh.IEN(a,Ec);
+          int Ac = mesh.IEN(a,e);
           for (int i = 0; i < nsd; i++) {
             xb(i) += uris_obj.x(i,Ac);
             lX(i,a) = uris_obj.x(i,Ac);
@@ -1041,6 +1182,56 @@ void uris_calc_sdf(ComMod& com_mod) {
         auto nV = utils::cross(xXi);
         auto Jac = sqrt(utils::norm(nV));
         nV = nV / Jac;
+
+        for (int i = 0; i < nsd; i++) {
+          xc(i,ec) = xb(i);
+          nc(i,ec) = nV(i);
+        }
+      }
+    }
+
+    KdTree tree;
+    tree.build(xc);
+
+    // Only search for the elements within the narrow band around the
+    // valve if it is used, the other nodes keep the default value.
+    double max_dist_sq = std::numeric_limits<double>::max();
+    if (uris_obj.sdf_band > 0.0) {
+      max_dist_sq = uris_obj.sdf_band * uris_obj.sdf_band;
+    }
+
+    // The SDF is computed on the reference configuration, which
+    // means that the valves will be morphed based on the fluid mesh
+    // motion. If the fluid mesh stretches near the valve, the valve
+    // leaflets will also be streched. Note that
+    // this is a simplifying assumption. 
+    Vector<double> xp(nsd);
+    for (int ca = 0; ca < com_mod.tnNo; ca++) {
+      for (int i = 0; i < nsd; i++) {
+        xp(i) = com_mod.x(i,ca);
+      }
+      // Is the node inside the BBox?
+      bool inside = true;
+      for (int i = 0; i < nsd; i++) {
+        if (xp(i) < (minb(i) - extra(i)) || xp(i) > (maxb(i) + extra(i))) {
+          inside = false;
+          break;
+        }
+      }
+      if (inside) {
+        // This point is inside the BBox
+        // Find the closest URIS face centroid
+        double dist_sq = 0.0;
+        int Ec = tree.nearest(xp, dist_sq, max_dist_sq);
+        if (Ec == -1) {
+          continue;
+        }
+        double minS = std::sqrt(dist_sq);
+
+        // We also need to compute the sign (above or below the valve)
+        // using the element normal.
+        xb = xc.col(Ec);
+        auto nV = nc.col(Ec);
         auto dotP = utils::norm(xp-xb, nV);
 
         // if (dotP < 0.0) {
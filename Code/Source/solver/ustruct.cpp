@@ -21,6 +21,7 @@
 
 #include "ustruct.h"
 
+#include "AssemblyWorkspace.h"
 #include "all_fun.h"
 #include "fs.h"
 #include "mat_fun.h"
@@ -246,11 +247,33 @@ void construct_usolid(ComMod& com_mod, CepMod& cep_mod, const mshType& lM, const
   #endif
 
   // USTRUCT: dof = nsd+1
-  Vector<int> ptr(eNoN);
-  Vector<double> pSl(nsymd), ya_l(eNoN), N(eNoN);
-  Array<double> xl(nsd,eNoN), al(tDof,eNoN), yl(tDof,eNoN), dl(tDof,eNoN),
-                bfl(nsd,eNoN), fN(nsd,nFn), pS0l(nsymd,eNoN), Nx(nsd,eNoN), lR(dof,eNoN);
-  Array3<double> lK(dof*dof,eNoN,eNoN), lKd(dof*nsd,eNoN,eNoN);
+  //
+  // The local element arrays and the function spaces for velocity and 
+  // pressure are taken from the thread's assembly workspace.
+  //
+  auto& ws = AssemblyWorkspace::get();
+  ws.set_element_arrays(com_mod, eNoN, nFn);
+  ws.set_thood_fs(com_mod, lM, vmsStab);
+  ws.set_thood_arrays(com_mod);
+
+  auto& ptr = ws.ptr;
+  auto& ya_l = ws.ya_l;
+  auto& xl = ws.xl;
+  auto& al = ws.al;
+  auto& yl = ws.yl;
+  auto& dl = ws.dl;
+  auto& bfl = ws.bfl;
+  auto& fN = ws.fN;
+  auto& lR = ws.lR;
+  auto& lK = ws.lK;
+  auto& lKd = ws.lKd;
+
+  // Element coordinates appropriate for function spaces
+  auto& xwl = ws.xwl;
+  auto& Nwx = ws.Nwx;
+  auto& xql = ws.xql;
+  auto& Nqx = ws.Nqx;
+  auto& ksix = ws.ksix;
 
   for (int e = 0; e < lM.nEl; e++) {
     // Change the current domain which will be used in later function calls.
@@ -296,16 +319,9 @@ void construct_usolid(ComMod& com_mod, CepMod& cep_mod, const mshType& lM, const
     lR = 0.0;
     lK = 0.0;
     lKd = 0.0;
-    std::array<fsType,2> fs;
-
-    // Set function spaces for velocity and pressure.
-    fs::get_thood_fs(com_mod, fs, lM, vmsStab, 1);
 
-    // Define element coordinates appropriate for function spaces
-    Array<double> xwl(nsd,fs[0].eNoN);
-    Array<double> Nwx(nsd,fs[0].eNoN);
-    Array<double> xql(nsd,fs[1].eNoN);
-    Array<double> Nqx(nsd,fs[1].eNoN);
+    // Function spaces for velocity and pressure.
+    const auto& fs = ws.fs_1;
 
     xwl = xl;
 
@@ -318,11 +334,10 @@ void construct_usolid(ComMod& com_mod, CepMod& cep_mod, const mshType& lM, const
     // Gauss integration 1
     //
     double Jac{0.0};
-    Array<double> ksix(nsd,nsd);
 
     for (int g = 0; g < fs[0].nG; g++) {
       if (g == 0 || !fs[0].lShpF) {
-        auto Nx = fs[0].Nx.slice(g);
+        auto Nx = fs[0].Nx.rslice(g);
         nn::gnn(fs[0].eNoN, nsd, nsd, Nx, xwl, Nwx, Jac, ksix);
         if (utils::is_zero(Jac)) {
            throw std::runtime_error("[construct_usolid] Jacobian for element " + std::to_string(e) + " is < 0.");
@@ -332,26 +347,26 @@ void construct_usolid(ComMod& com_mod, CepMod& cep_mod, const mshType& lM, const
       double w = fs[0].w(g) * Jac;
 
       if (nsd == 3) {
-        auto N0 = fs[0].N.col(g);
-        auto N1 = fs[1].N.col(g);
+        auto N0 = fs[0].N.rcol(g);
+        auto N1 = fs[1].N.rcol(g);
         ustruct_3d_m(com_mod, cep_mod, vmsStab, fs[0].eNoN, fs[1].eNoN, nFn, w, Jac, N0, N1, Nwx, al, yl, dl, bfl, fN, ya_l, lR, lK, lKd);
 
       } else if (nsd == 2) {
-        auto N0 = fs[0].N.col(g);
-        auto N1 = fs[1].N.col(g);
+        auto N0 = fs[0].N.rcol(g);
+        auto N1 = fs[1].N.rcol(g);
         ustruct_2d_m(com_mod, cep_mod, vmsStab, fs[0].eNoN, fs[1].eNoN, nFn, w, Jac, N0, N1, Nwx, al, yl, dl, bfl, fN, ya_l, lR, lK, lKd);
       }
 
     } // for g = 0 to fs[0].nG
 
-    // Set function spaces for velocity/displacement and pressure.
-    fs::get_thood_fs(com_mod, fs, lM, vmsStab, 2);
-
-    // Gauss integration 2
+    // Gauss integration 2 uses the function spaces 'ws.fs_2' for 
+    // velocity/displacement and pressure.
     //
-    for (int g = 0; g < fs[1].nG; g++) {
+    for (int g = 0; g < ws.fs_2[1].nG; g++) {
+      const auto& fs = ws.fs_2;
+
       if (g == 0 || !fs[0].lShpF) {
-        auto Nx = fs[0].Nx.slice(g);
+        auto Nx = fs[0].Nx.rslice(g);
         nn::gnn(fs[0].eNoN, nsd, nsd, Nx, xwl, Nwx, Jac, ksix);
         if (utils::is_zero(Jac)) {
            throw std::runtime_error("[construct_usolid] Jacobian for element " + std::to_string(e) + " is < 0.");
@@ -359,7 +374,7 @@ void construct_usolid(ComMod& com_mod, CepMod& cep_mod, const mshType& lM, const
       }
 
       if (g == 0 || !fs[1].lShpF) {
-        auto Nx = fs[1].Nx.slice(g);
+        auto Nx = fs[1].Nx.rslice(g);
         nn::gnn(fs[1].eNoN, nsd, nsd, Nx, xql, Nqx, Jac, ksix);
         if (utils::is_zero(Jac)) {
            throw std::runtime_error("[construct_usolid] Jacobian for element " + std::to_string(e) + " is < 0.");
@@ -369,14 +384,14 @@ void construct_usolid(ComMod& com_mod, CepMod& cep_mod, const mshType& lM, const
       double w = fs[1].w(g) * Jac;
 
       if (nsd == 3) {
-        auto N0 = fs[0].N.col(g);
-        auto N1 = fs[1].N.col(g);
+        auto N0 = fs[0].N.rcol(g);
+        auto N1 = fs[1].N.rcol(g);
         ustruct_3d_c(com_mod, cep_mod, vmsStab, fs[0].eNoN, fs[1].eNoN, w, Jac, N0, N1, Nwx, 
             Nqx, al, yl, dl, bfl, lR, lK, lKd);
 
       } else if (nsd == 2) {
-        auto N0 = fs[0].N.col(g);
-        auto N1 = fs[1].N.col(g);
+        auto N0 = fs[0].N.rcol(g);
+        auto N1 = fs[1].N.rcol(g);
         ustruct_2d_c(com_mod, cep_mod, vmsStab, fs[0].eNoN, fs[1].eNoN, w, Jac, N0, N1, Nwx, 
             Nqx, al, yl, dl, bfl, lR, lK, lKd);
       }
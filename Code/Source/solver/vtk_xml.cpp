@@ -6,11 +6,15 @@
 #include "vtk_xml.h"
 #include "vtk_xml_parser.h"
 #include "VtkData.h"
+#include "VtkWriteQueue.h"
 
 #include "all_fun.h"
 #include "consts.h"
 #include "post.h"
 
+#include <filesystem>
+#include <fstream>
+#include <functional>
 #include <iomanip>
 #include <sstream>
 #include <stdio.h>
@@ -24,6 +28,10 @@ namespace vtk_xml {
 #define dbg_vtk_xml
 #define n_dbg_read_vtu_pdata 
 
+/// @brief Results written by write_vtus() on a background thread, used when
+/// com_mod.saveAsync is true.
+static VtkWriteQueue vtus_write_queue;
+
 void do_test()
 {
 
@@ -109,6 +117,256 @@ void do_test()
 
 }
 
+/// @brief Wait until the results written by write_vtus() on a background
+/// thread are written to disk.
+//
+void flush_vtus()
+{
+  vtus_write_queue.flush();
+}
+
+//----------------
+// vtus_file_name
+//----------------
+// The name of the results file of the current time step, without extension.
+//
+static std::string vtus_file_name(const ComMod& com_mod, const bool lAve)
+{
+  std::string fName;
+
+  if (com_mod.cTS > 1000 || lAve) {
+    fName = std::to_string(com_mod.cTS);
+  } else { 
+    std::ostringstream ss;
+    ss << std::setw(3) << std::setfill('0') << com_mod.cTS;
+    fName = ss.str();
+  }
+
+  return com_mod.saveName + "_" + fName;
+}
+
+//------------------
+// write_vtu_pieces
+//------------------
+// Write the results as a partitioned VTK file: each process writes the 
+// nodes and elements of its partition to 'fName/fName_<process ID>.vtu' 
+// and the master writes the 'fName.pvtu' file listing them.
+//
+// d[iM].x(outDof,msh.nNo) stores the local nodal results of each mesh and
+// d[iM].xe(nOute,msh.nEl) the local element results.
+//
+// Nodes shared by partitions are written by each process sharing them.
+//
+static void write_vtu_pieces(ComMod& com_mod, const CmMod& cm_mod, const std::vector<dataType>& d, 
+    const std::vector<std::string>& outNames, const std::vector<int>& outS, const std::vector<std::string>& outNamesE,
+    const int nOute, const bool lIbl, const std::string& fName)
+{
+  using namespace consts;
+
+  auto& cm = com_mod.cm;
+  const int nsd = com_mod.nsd;
+  const int nMsh = com_mod.nMsh;
+  const int nOut = outNames.size();
+  const auto& meshes = com_mod.msh;
+
+  // Element variables written only once if there is a single mesh.
+  const bool lIds = !com_mod.savedOnce || nMsh > 1;
+  const bool lDmn = lIds && com_mod.dmnId.size() != 0;
+
+  auto slash = fName.find_last_of('/');
+  std::string baseName = (slash == std::string::npos) ? fName : fName.substr(slash+1);
+  std::filesystem::create_directories(fName);
+
+  int nNo = 0;
+  int nEl = 0;
+
+  for (int iM = 0; iM < nMsh; iM++) {
+    if (meshes[iM].eType != ElementType::NRB) {
+      nNo = nNo + meshes[iM].nNo;
+      nEl = nEl + meshes[iM].nEl;
+    }
+  }
+
+  auto pName = fName + "/" + baseName + "_" + std::to_string(cm.id()) + ".vtu";
+  auto vtk_writer = VtkData::create_writer(pName);
+
+  // Writing the position data
+  //
+  Array<double> tmpV(consts::maxNSD, nNo);
+  int nSh = 0;
+
+  for (int iM = 0; iM < nMsh; iM++) {
+    if (meshes[iM].eType == ElementType::NRB) {
+      continue;
+    }
+    for (int a = 0; a < meshes[iM].nNo; a++) {
+      for (int i = 0; i < nsd; i++) {
+        tmpV(i,a+nSh) = d[iM].x(i,a);
+      }
+    }
+    nSh = nSh + meshes[iM].nNo;
+  }
+
+  vtk_writer->set_points(tmpV);
+
+  // Writing the connectivity data, IEN maps to the process nodes and
+  // lN maps these to the mesh nodes.
+  //
+  nSh = 0;
+
+  for (int iM = 0; iM < nMsh; iM++) {
+    auto& msh = meshes[iM];
+    if (msh.eType == ElementType::NRB) {
+      continue;
+    }
+    Array<int> tmpI(msh.eNoN, msh.nEl);
+
+    for (int e = 0; e < msh.nEl; e++) {
+      for (int i = 0; i < msh.eNoN; i++) {
+        tmpI(i,e) = msh.lN(msh.IEN(i,e)) + nSh;
+      }
+    }
+
+    vtk_writer->set_connectivity(nsd, tmpI);
+    nSh = nSh + msh.nNo;
+  }
+
+  // Writing all solutions
+  //
+  for (int iOut = 1; iOut < nOut; iOut++) {
+    int s = outS[iOut];
+    int l = outS[iOut+1] - s;
+    Array<double> tmpV(l, nNo);
+    int nSh = 0;
+
+    for (int iM = 0; iM < nMsh; iM++) {
+      if (meshes[iM].eType == ElementType::NRB) {
+        continue;
+      }
+      for (int a = 0; a < meshes[iM].nNo; a++) {
+        for (int i = 0; i < l; i++) {
+          tmpV(i,a+nSh) = d[iM].x(i+s,a);
+        }
+      }
+      nSh = nSh + meshes[iM].nNo;
+    }
+
+    vtk_writer->set_point_data(outNames[iOut], tmpV);
+  }
+
+  // Write element-based variables
+  //
+  std::vector<std::pair<std::string,std::string>> elemArrays;
+
+  // The type of a double array in the pieces.
+  auto float_type = [](const std::string& name) -> std::string {
+    return VtkData::write_options.float32_data.count(name) ? "Float32" : "Float64";
+  };
+
+  auto set_int_element_data = [&](const std::string& name, std::function<int(const int, const int)> value) {
+    Array<int> tmpI(1, nEl);
+    int Ec = 0;
+    for (int iM = 0; iM < nMsh; iM++) {
+      if (meshes[iM].eType == ElementType::NRB) {
+        continue;
+      }
+      for (int e = 0; e < meshes[iM].nEl; e++) {
+        tmpI(0,Ec) = value(iM, e);
+        Ec = Ec + 1;
+      }
+    }
+    vtk_writer->set_element_data(name, tmpI);
+    elemArrays.push_back({name, "Int32"});
+  };
+
+  if (lDmn) {
+    set_int_element_data("Domain_ID", [&](const int iM, const int e) { return meshes[iM].eId(e); });
+  }
+
+  if (lIds) {
+    const int id = cm.id();
+    set_int_element_data("Proc_ID", [&](const int iM, const int e) { return id; });
+  }
+
+  if (lIds && nMsh > 1) {
+    set_int_element_data("Mesh_ID", [&](const int iM, const int e) { return iM; });
+  }
+
+  // Write element Jacobian and von Mises stress if necessary
+  //
+  for (int l = 0; l < nOute; l++) {
+    Array<double> tmpVe(1,nEl);
+    int Ec = 0;
+
+    for (int iM = 0; iM < nMsh; iM++) {
+      if (meshes[iM].eType == ElementType::NRB) {
+        continue;
+      }
+      for (int e = 0; e < meshes[iM].nEl; e++) {
+        tmpVe(0,Ec) = (d[iM].xe.size() != 0) ? d[iM].xe(l,e) : 0.0;
+        Ec = Ec + 1;
+      }
+    }
+
+    vtk_writer->set_element_data(outNamesE[l], tmpVe);
+    elemArrays.push_back({outNamesE[l], float_type(outNamesE[l])});
+  }
+
+  // Write element ghost cells if necessary
+  //
+  if (lIbl) {
+    set_int_element_data("EGHOST", [&](const int iM, const int e) { 
+      return (meshes[iM].iGC.size() != 0) ? meshes[iM].iGC(e) : 0; });
+  }
+
+  if (com_mod.saveAsync) {
+    vtus_write_queue.push(vtk_writer);
+  } else {
+    vtk_writer->write();
+    delete vtk_writer;
+  }
+
+  if (cm.slv(cm_mod)) {
+    return;
+  }
+
+  // Write the .pvtu file listing the files written by each process.
+  //
+  std::ofstream pvtu(fName + ".pvtu");
+
+  if (!pvtu.is_open()) {
+    throw std::runtime_error("Failed to open the results file '" + fName + ".pvtu' to write.");
+  }
+
+  pvtu << "<?xml version=\"1.0\"?>\n";
+  pvtu << "<VTKFile type=\"PUnstructuredGrid\" version=\"0.1\" byte_order=\"LittleEndian\">\n";
+  pvtu << "  <PUnstructuredGrid GhostLevel=\"0\">\n";
+
+  pvtu << "    <PPointData>\n";
+  for (int iOut = 1; iOut < nOut; iOut++) {
+    pvtu << "      <PDataArray type=\"" << float_type(outNames[iOut]) << "\" Name=\"" << outNames[iOut] << "\" NumberOfComponents=\"" 
+         << outS[iOut+1] - outS[iOut] << "\"/>\n";
+  }
+  pvtu << "    </PPointData>\n";
+
+  pvtu << "    <PCellData>\n";
+  for (auto& [name, type] : elemArrays) {
+    pvtu << "      <PDataArray type=\"" << type << "\" Name=\"" << name << "\" NumberOfComponents=\"1\"/>\n";
+  }
+  pvtu << "    </PCellData>\n";
+
+  pvtu << "    <PPoints>\n";
+  pvtu << "      <PDataArray type=\"Float32\" NumberOfComponents=\"3\"/>\n";
+  pvtu << "    </PPoints>\n";
+
+  for (int i = 0; i < cm.np(); i++) {
+    pvtu << "    <Piece Source=\"" << baseName << "/" << baseName << "_" << i << ".vtu\"/>\n";
+  }
+
+  pvtu << "  </PUnstructuredGrid>\n";
+  pvtu << "</VTKFile>\n";
+}
+
 /// @brief This routine prepares data array of a regular mesh
 ///
 /// Parameters:
@@ -573,12 +831,11 @@ void read_vtu(const std::string& file_name, mshType& mesh)
 // read_precomputed_solution_vtu
 //----------
 
-/// @brief Read a mesh file with state-variable solution fields from a .vtu or .vtp file.
+/// @brief Read the time slices of a state-variable solution field from a .vtu or .vtp file.
 ///
-///  Mesh variables set
-///   mesh.Ys = precomputed state-variable solutions (e.g. velocity, pressure, etc.)
+///  Ys = precomputed state-variable solutions (e.g. velocity, pressure, etc.)
 
-void read_precomputed_solution_vtu(const std::string& file_name, const std::string& field_name, mshType& mesh)
+void read_precomputed_solution_vtu(const std::string& file_name, const std::string& field_name, Array3<double>& Ys)
 {
   using namespace vtk_xml_parser;
 
@@ -590,29 +847,12 @@ void read_precomputed_solution_vtu(const std::string& file_name, const std::stri
 
   // Read data from a VTK file.
   //
-  #define n_read_vtu_use_VtkData
-  #ifdef read_vtu_use_VtkData
-  auto vtk_data = VtkData::create_reader(file_name);
-  int num_elems = vtk_data->num_elems();
-  int np_elem = vtk_data->np_elem();
-
-  // Set mesh data.
-  mesh.nEl = num_elems;
-  mesh.eNoN = np_elem;
-  mesh.IEN = vtk_data->get_connectivity();
-  mesh.x = vtk_data->get_points();
-
-  delete vtk_data;
-
-  #else
-
   auto file_ext = file_name.substr(file_name.find_last_of(".") + 1);
   if (file_ext == "vtp") {
-    vtk_xml_parser::load_time_varying_field_vtu(file_name, field_name, mesh);
+    vtk_xml_parser::load_time_varying_field_vtu(file_name, field_name, Ys);
   } else if (file_ext == "vtu") {
-    vtk_xml_parser::load_time_varying_field_vtu(file_name, field_name, mesh);
+    vtk_xml_parser::load_time_varying_field_vtu(file_name, field_name, Ys);
   }
-  #endif
 }
 
 //----------------
@@ -1301,6 +1541,14 @@ void write_vtus(Simulation* simulation, const Array<double>& lA, const Array<dou
 
   } // iM for loop 
 
+  // Each process writes its part of the results, without gathering
+  // them on the master.
+  //
+  if (com_mod.savePVTU) {
+    write_vtu_pieces(com_mod, cm_mod, d, outNames, outS, outNamesE, nOute, lIbl, vtus_file_name(com_mod, lAve));
+    com_mod.savedOnce = true;
+    return;
+  }
 
   // Integrate data from all processors
   //
@@ -1327,17 +1575,7 @@ void write_vtus(Simulation* simulation, const Array<double>& lA, const Array<dou
 
   // Writing to vtu file (master only)
   //
-  std::string fName;
-
-  if (com_mod.cTS > 1000 || lAve) {
-    fName = std::to_string(com_mod.cTS);
-  } else { 
-    std::ostringstream ss;
-    ss << std::setw(3) << std::setfill('0') << com_mod.cTS;
-    fName = ss.str();
-  }
-
-  fName = com_mod.saveName + "_" + fName + ".vtu";
+  auto fName = vtus_file_name(com_mod, lAve) + ".vtu";
   auto vtk_writer = VtkData::create_writer(fName);
 
   // Writing the position data
@@ -1485,8 +1723,16 @@ void write_vtus(Simulation* simulation, const Array<double>& lA, const Array<dou
      }
      vtk_writer->set_element_data("EGHOST", tmpI);
   }
-  vtk_writer->write();
-  delete vtk_writer;
+
+  // The writer has a copy of all the data so it can be encoded and 
+  // written to disk on a background thread while the simulation continues.
+  //
+  if (com_mod.saveAsync) {
+    vtus_write_queue.push(vtk_writer);
+  } else {
+    vtk_writer->write();
+    delete vtk_writer;
+  }
 }
 
 };
@@ -12,6 +12,8 @@ namespace vtk_xml {
 
 void do_test();
 
+void flush_vtus();
+
 void int_msh_data(const ComMod& com_mod, const CmMod& cm_mod, const mshType& lM, dataType& d, const int outDof, const int nOute);
 
 void read_vtp(const std::string& file_name, faceType& face);
@@ -20,7 +22,7 @@ void read_vtp_pdata(const std::string& fName, const std::string& kwrd, const int
 
 void read_vtu(const std::string& file_name, mshType& mesh);
 
-void read_precomputed_solution_vtu(const std::string& file_name, const std::string& field_name, mshType& mesh);
+void read_precomputed_solution_vtu(const std::string& file_name, const std::string& field_name, Array3<double>& Ys);
 
 void read_vtu_pdata(const std::string& fName, const std::string& kwrd, const int nsd, const int m, const int idx, mshType& mesh);
 
@@ -911,11 +911,11 @@ void load_vtu(const std::string& file_name, faceType& face)
 
 /// @brief Read a time series field from a VTK .vtu file.
 ///
-/// Mesh variables set
-///   mesh.Ys - time series field data (num_components, num_nodes, num_time_steps)
+/// Variables set
+///   Ys - time series field data (num_components, num_nodes, num_time_steps)
 ///
 //
-void load_time_varying_field_vtu(const std::string file_name, const std::string field_name, mshType& mesh)
+void load_time_varying_field_vtu(const std::string file_name, const std::string field_name, Array3<double>& Ys)
 {
   #define n_debug_load_vtu
   #ifdef debug_load_vtu
@@ -962,7 +962,7 @@ void load_time_varying_field_vtu(const std::string file_name, const std::string
     });
     // Get the expected number of state-variable components
     int num_components = vtk_ugrid->GetPointData()->GetArray(array_names[0].first.c_str())->GetNumberOfComponents();
-    mesh.Ys.resize(num_components, num_nodes, array_count);
+    Ys.resize(num_components, num_nodes, array_count);
 
     for (int i = 0; i < array_count; i++) {
       auto array = vtk_ugrid->GetPointData()->GetArray(array_names[i].first.c_str());
@@ -974,7 +974,7 @@ void load_time_varying_field_vtu(const std::string file_name, const std::string
       }
       for (int j = 0; j < num_nodes; j++) {
         for (int k = 0; k < num_components; k++) {
-          mesh.Ys(k, j, i) = array->GetComponent(j, k);
+          Ys(k, j, i) = array->GetComponent(j, k);
         }
       }
     }
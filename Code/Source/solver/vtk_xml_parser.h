@@ -30,7 +30,7 @@ void load_vtu(const std::string& file_name, mshType& mesh);
 
 void load_vtu(const std::string& file_name, faceType& face);
 
-void load_time_varying_field_vtu(const std::string file_name, const std::string field_name, mshType& mesh);
+void load_time_varying_field_vtu(const std::string file_name, const std::string field_name, Array3<double>& Ys);
 
 };
 
@@ -0,0 +1,294 @@
+c     Integration of the 0D model shared by the genBC executable and
+c     the genBC shared library
+
+c####################################################################
+c Checking the number of surfaces received from the 3D solver, ierr is
+c set to a nonzero value if they do not match the ones in USER.f
+      SUBROUTINE CHECKSRFS(nDir, nNeu, ierr)
+      USE COM
+      IMPLICIT NONE
+
+      INTEGER, INTENT(IN) :: nDir, nNeu
+      INTEGER, INTENT(OUT) :: ierr
+
+      ierr = 0
+      IF (nDir .NE. nDirichletSrfs) THEN
+         PRINT *, 'Error: Number of Dirichlet Surfaces from Phasta is:',
+     2      nDir
+         PRINT *, 'While nDirichletSrfs is equal to:', nDirichletSrfs
+         PRINT *
+         PRINT *, 'Number of Dirichlet surfaces defined in solver.inp',
+     2      ' should match with nDirichletSrfs defined in USER.f'
+         ierr = 1
+         RETURN
+      END IF
+      IF (nNeu .NE. nNeumannSrfs) THEN
+         PRINT *, 'Error: Number of Neumann Surfaces from Phasta is:',
+     2      nNeu
+         PRINT *, 'While nNeumannSrfs is equal to:', nNeumannSrfs
+         PRINT *
+         PRINT *, 'Number of Neumann surfaces defined in solver.inp',
+     2      ' should match with nNeumannSrfs defined in USER.f'
+         ierr = 2
+         RETURN
+      END IF
+      IF (nDirichletSrfs .GT. 0) THEN
+         IF (qCorr .OR. pCorr) THEN
+            PRINT *, 'You should only use P/Q correction when all',
+     2         ' the surfaces are Neumann surfaces'
+            ierr = 3
+            RETURN
+         END IF
+      END IF
+
+      END SUBROUTINE CHECKSRFS
+
+c####################################################################
+c Integrating the unknowns Xo at time t over the time step tFinal of
+c the 3D solver. Y returns the flowrates of the Dirichlet surfaces
+c followed by the pressures of the Neumann surfaces, ierr is set to a
+c nonzero value if a NAN is encountered
+      SUBROUTINE INTEGX(flag, tFinal, nTimeStep, Pi, Pf, Qi, Qf, t, Xo,
+     2   Y, ierr)
+      USE COM
+      USE, INTRINSIC :: IEEE_ARITHMETIC
+      IMPLICIT NONE
+
+      CHARACTER, INTENT(IN) :: flag
+      INTEGER, INTENT(IN) :: nTimeStep
+      INTEGER, INTENT(OUT) :: ierr
+      REAL(KIND=8), INTENT(IN) :: tFinal, Pi(nDirichletSrfs),
+     2   Pf(nDirichletSrfs), Qi(nNeumannSrfs), Qf(nNeumannSrfs)
+      REAL(KIND=8), INTENT(INOUT) :: t, Xo(nUnknowns)
+      REAL(KIND=8), INTENT(OUT) :: Y(nDirichletSrfs+nNeumannSrfs)
+
+      INTEGER i, n, nStep
+      REAL(KIND=8) dt, pMin, temp
+
+      REAL(KIND=8), ALLOCATABLE :: Qa(:), Qb(:), Pa(:), Pb(:), X(:),
+     2   f(:,:)
+
+c     flag = I : Initializing
+c     flag = T : Iteration loop
+c     flag = L : Last iteration
+c     flag = D : Derivative
+c
+c   Here is the period of time that you should integrate for
+c   each of these flags:
+c
+c Flags              I                                            D&T&L
+c                    ^                                              ^
+c 3D code time step: N.............................................N+1
+c 0D code time step: 1......................................nTimeStep+1
+c Flowrates:         Qi............................ ................Qf
+c Time, t:         tInitial..............................tInitial+tFinal
+
+      ierr = 0
+
+      IF (.NOT.ALLOCATED(PDirichlet)) THEN
+         ALLOCATE (PDirichlet(nDirichletSrfs,4),
+     2      QNeumann(nNeumannSrfs,4), offset(nUnknowns),
+     3      Xprint(nXprint))
+      END IF
+      ALLOCATE (Pa(nDirichletSrfs), Pb(nDirichletSrfs),
+     2   Qa(nNeumannSrfs), Qb(nNeumannSrfs), X(nUnknowns),
+     3   f(nUnknowns,4))
+      Xprint = 0D0
+
+      Pa = Pi/pConv
+      Pb = Pf/pConv
+      Qa = Qi/qConv
+      Qb = Qf/qConv
+
+c********************************************************************
+c Block for initializing the unknowns
+
+      IF (flag .EQ. 'I') THEN
+         nStep = 0
+      ELSE
+         nStep = nTimeStep
+         dt = tFinal/REAL(nStep,8)
+      END IF
+
+c********************************************************************
+c Setting up the system of equations
+      offset = 0D0
+      DO n=1, nStep
+         DO i=1, 4
+            temp = (REAL(n-1,8) + REAL(i-1,8)/3D0)/REAL(nStep,8)
+
+            QNeumann(:,i)   = Qa + (Qb-Qa)*temp
+            PDirichlet(:,i) = Pa + (Pb-Pa)*temp
+
+            IF (qCorr) THEN
+               temp = SUM(QNeumann(:,i))/REAL(nNeumannSrfs,8)
+               QNeumann(:,i) = QNeumann(:,i) - temp
+            END IF
+         END DO
+
+         X = Xo
+         CALL FINDF (t, X, f(:,1), QNeumann(:,1),
+     2      PDirichlet(:,1))
+         X = Xo + dt*f(:,1)/3D0
+
+         CALL FINDF (t+dt/3D0, X, f(:,2), QNeumann(:,2),
+     2      PDirichlet(:,2))
+         X = Xo - dt*f(:,1)/3D0 + dt*f(:,2)
+
+         CALL FINDF (t+dt*2D0/3D0, X, f(:,3), QNeumann(:,3),
+     2      PDirichlet(:,3))
+         X = Xo + dt*f(:,1) - dt*f(:,2) + dt*f(:,3)
+
+         CALL FINDF (t+dt, X, f(:,4), QNeumann(:,4),
+     2      PDirichlet(:,4))
+
+         f(:,1) = (f(:,1) + 3D0*f(:,2) + 3D0*f(:,3) + f(:,4))/8D0
+         Xo = Xo + dt*f(:,1)
+         t = t + dt
+      END DO
+
+c********************************************************************
+c Time to set the results
+      X = Xo
+      IF (pCorr .AND. flag.NE.'D') THEN
+         pMin = X(srfToXPtr(1))
+         DO i=2, nNeumannSrfs
+            IF (X(srfToXPtr(i)) .LT. pMin) THEN
+               pMin = X(srfToXPtr(i))
+            END IF
+         END DO
+      ELSE
+         pMin = 0D0
+      END IF
+
+c nDirichlet flowrates here
+      DO i=1, nDirichletSrfs
+         IF(IEEE_IS_NAN(X(srfToXdPtr(i)))) THEN
+            PRINT*, 'Error! NAN encountered..'
+            ierr = 4
+         END IF
+         Y(i) = X(srfToXdPtr(i))*qConv
+      END DO
+
+c nNeumannSrfs pressures here
+      DO i=1, nNeumannSrfs
+         IF(IEEE_IS_NAN(X(srfToXPtr(i)))) THEN
+            PRINT*, 'Error! NAN encountered..'
+            ierr = 4
+         END IF
+         Y(nDirichletSrfs+i) = (X(srfToXPtr(i)) - pMin
+     2      + offset(srfToXPtr(i)))*pConv
+      END DO
+
+      DEALLOCATE (Pa)
+      DEALLOCATE (Pb)
+      DEALLOCATE (Qa)
+      DEALLOCATE (Qb)
+      DEALLOCATE (X)
+      DEALLOCATE (f)
+
+      END SUBROUTINE INTEGX
+
+c####################################################################
+c Writing the unknowns X at time t to InitialData, used to start the
+c next time step, and appending them to AllData
+      SUBROUTINE SAVESTATE(t, X)
+      USE COM
+      IMPLICIT NONE
+
+      REAL(KIND=8), INTENT(IN) :: t, X(nUnknowns)
+
+      INTEGER i
+      CHARACTER(LEN=2048) string
+      CHARACTER(LEN=32) sTmp
+
+      OPEN(1, FILE='InitialData', STATUS='OLD', FORM='UNFORMATTED');
+      WRITE (1) t
+      DO i=1,nUnknowns
+         WRITE (1) X(i)
+      END DO
+      CLOSE(1)
+
+      OPEN(1, FILE='AllData', STATUS='UNKNOWN', ACCESS='APPEND');
+      string = ''
+      DO i=1, nUnknowns
+         WRITE (sTmp,"(ES14.6E2)") X(i)
+         string = TRIM(string)//sTmp
+      END DO
+      DO i=1, nXprint
+         WRITE (sTmp,"(ES14.6E2)") Xprint(i)
+         string = TRIM(string)//sTmp
+      END DO
+      WRITE (1,"(A)") TRIM(string)
+      CLOSE(1)
+
+      END SUBROUTINE SAVESTATE
+
+c####################################################################
+c Entry point of the genBC shared library (libgenBC.so), called by the
+c 3D solver with the data that the genBC executable exchanges through
+c GenBC.int: P(2,nDir) and Q(2,nNeu) are the pressures and flowrates
+c at the beginning and at the end of the time step and Y(nDir+nNeu)
+c returns the results. The library stays loaded, so the unknowns are
+c read from InitialData only by the first call and are kept in memory
+c afterwards; they are still written to InitialData and AllData for
+c the last iteration (flag = L) of every time step. The flag U updates
+c the unknowns in memory like L without writing any files, it is used
+c by the solver processes that keep a copy of the 0D state.
+      SUBROUTINE GENBC_INTEG_X(flag, tFinal, nDir, nNeu, P, Q, Y, ierr)
+     2   BIND(C, NAME='genbc_integ_x')
+      USE, INTRINSIC :: ISO_C_BINDING
+      USE COM
+      IMPLICIT NONE
+
+      CHARACTER(KIND=C_CHAR), INTENT(IN) :: flag
+      REAL(C_DOUBLE), INTENT(IN) :: tFinal
+      INTEGER(C_INT), INTENT(IN) :: nDir, nNeu
+      REAL(C_DOUBLE), INTENT(IN) :: P(2,*), Q(2,*)
+      REAL(C_DOUBLE), INTENT(OUT) :: Y(*)
+      INTEGER(C_INT), INTENT(OUT) :: ierr
+
+      INTEGER i
+      REAL(KIND=8) t
+      CHARACTER integFlag
+
+      LOGICAL, SAVE :: initialized = .FALSE.
+      INTEGER, SAVE :: nTimeStep
+      REAL(KIND=8), SAVE :: tSaved
+      REAL(KIND=8), ALLOCATABLE, SAVE :: XSaved(:)
+
+      REAL(KIND=8), ALLOCATABLE :: Xo(:)
+
+      IF (.NOT.initialized) THEN
+         CALL INITIALIZE(nTimeStep)
+         ALLOCATE (XSaved(nUnknowns))
+         OPEN (1, FILE='InitialData', STATUS='OLD', FORM='UNFORMATTED')
+         READ (1) tSaved
+         DO i=1,nUnknowns
+            READ (1) XSaved(i)
+         END DO
+         CLOSE (1)
+         initialized = .TRUE.
+      END IF
+
+      CALL CHECKSRFS(nDir, nNeu, ierr)
+      IF (ierr .NE. 0) RETURN
+
+      integFlag = flag
+      IF (flag .EQ. 'U') integFlag = 'L'
+
+      ALLOCATE (Xo(nUnknowns))
+      t  = tSaved
+      Xo = XSaved
+      CALL INTEGX(integFlag, tFinal, nTimeStep, P(1,1:nDir),
+     2   P(2,1:nDir), Q(1,1:nNeu), Q(2,1:nNeu), t, Xo, Y(1:nDir+nNeu),
+     3   ierr)
+
+      IF (ierr.EQ.0 .AND. integFlag.EQ.'L') THEN
+         tSaved = t
+         XSaved = Xo
+         IF (flag .EQ. 'L') CALL SAVESTATE(t, Xo)
+      END IF
+      DEALLOCATE (Xo)
+
+      END SUBROUTINE GENBC_INTEG_X
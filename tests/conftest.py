@@ -44,7 +44,7 @@ def n_proc(request):
     return request.param
 
 
-def run_by_name(folder, name, t_max, n_proc=1):
+def run_by_name(folder, name, t_max, n_proc=1, restart_file=None):
     """
     Run a test case and return results
     Args:
@@ -52,6 +52,7 @@ def run_by_name(folder, name, t_max, n_proc=1):
         name: name of svMultiPhysics input file (.xml)
         t_max: time step to compare
         n_proc: number of processors
+        restart_file: restart file (.bin) to continue the simulation from
 
     Returns:
     Simulation results
@@ -62,6 +63,11 @@ def run_by_name(folder, name, t_max, n_proc=1):
     if os.path.exists(dir_path):
         shutil.rmtree(dir_path)
 
+    # copy the restart file to where the simulation looks for it
+    if restart_file:
+        os.makedirs(dir_path)
+        shutil.copy(restart_file, os.path.join(dir_path, "stFile_last.bin"))
+
     # run simulation
     if is_not_Darwin:
         if "petsc" in folder:
@@ -151,6 +157,17 @@ def run_with_reference(
     ref = meshio.read(fname)
 
     # check results
+    compare_results(res, ref, fields)
+
+
+def compare_results(res, ref, fields):
+    """
+    Compare simulation results to reference results
+    Args:
+        res: simulation results
+        ref: reference results
+        fields: array fields to compare (e.g. ["Pressure", "Velocity"])
+    """
     msg = ""
     for f in fields:
         # extract field
@@ -205,3 +222,42 @@ def run_with_reference(
     # check all fields first and then throw error if any failed
     if msg:
         raise AssertionError(msg)
+
+
+def run_with_restart(
+    base_folder,
+    test_folder,
+    fields,
+    n_proc=1,
+    t_max=1,
+    t_restart=1,
+    name_inp="solver.xml",
+    name_inp_restart="solver_restart.xml",
+):
+    """
+    Run a test case, restart it on a different number of processors and
+    compare the results of the restarted simulation to those of the run
+    without restart
+    Args:
+        folder: location from which test will be executed
+        fields: array fields to compare (e.g. ["Pressure", "Velocity"])
+        n_proc: number of processors
+        t_max: time step to compare
+        t_restart: time step of the restart file
+        name_inp: name of svMultiPhysics input file (.xml) saving restart files
+        name_inp_restart: name of svMultiPhysics input file (.xml) continuing the simulation
+    """
+    folder = os.path.join("cases", base_folder, test_folder)
+
+    # run simulation without restart
+    res = run_by_name(folder, name_inp, t_max, n_proc)
+
+    # restart simulation with the next number of processors
+    n_proc_restart = PROCS[(PROCS.index(n_proc) + 1) % len(PROCS)]
+    restart_file = os.path.join(
+        folder, str(n_proc) + "-procs", "stFile_" + str(t_restart).zfill(3) + ".bin"
+    )
+    res_restart = run_by_name(folder, name_inp_restart, t_max, n_proc_restart, restart_file)
+
+    # check results
+    compare_results(res_restart, res, fields)
@@ -17,6 +17,11 @@ def test_cable_TTP_1d(n_proc):
     run_with_reference(base_folder, test_folder, fields, n_proc)
 
 
+def test_cable_TTP_1d_threaded_ionic_model(n_proc):
+    test_folder = "cable_TTP_1d_threaded_ionic_model"
+    run_with_reference(base_folder, test_folder, fields, n_proc)
+
+
 def test_spiral_BO_2d(n_proc):
     test_folder = "spiral_BO_2d"
     run_with_reference(base_folder, test_folder, fields, n_proc)
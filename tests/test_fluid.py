@@ -1,4 +1,4 @@
-from .conftest import run_with_reference
+from .conftest import run_with_reference, run_with_restart
 import os
 import subprocess
 
@@ -14,6 +14,22 @@ def test_pipe_RCR_3d(n_proc):
     t_max = 2
     run_with_reference(base_folder, test_folder, fields, n_proc, t_max)
 
+def test_pipe_RCR_3d_threaded_assembly(n_proc):
+    test_folder = "pipe_RCR_3d_threaded_assembly"
+    t_max = 2
+    run_with_reference(base_folder, test_folder, fields, n_proc, t_max)
+
+def test_pipe_RCR_3d_batched_assembly(n_proc):
+    test_folder = "pipe_RCR_3d_batched_assembly"
+    t_max = 2
+    run_with_reference(base_folder, test_folder, fields, n_proc, t_max)
+
+def test_pipe_RCR_3d_restart(n_proc):
+    test_folder = "pipe_RCR_3d_restart"
+    t_max = 4
+    t_restart = 2
+    run_with_restart(base_folder, test_folder, fields, n_proc, t_max, t_restart)
+
 def test_pipe_RCR_3d_fourier_coeff(n_proc):
     test_folder = "pipe_RCR_3d_fourier_coeff"
     t_max = 2
@@ -59,6 +75,26 @@ def test_pipe_RCR_genBC(n_proc):
 
     run_with_reference(base_folder, test_folder, fields, n_proc, t_max)
 
+def test_pipe_RCR_genBC_library(n_proc):
+    test_folder = "pipe_RCR_genBC"
+    t_max = 2
+
+    # Remove old genBC output
+    os.chdir(os.path.join("cases", base_folder, test_folder))
+    for name in ["AllData", "InitialData", "GenBC.int"]:
+        if os.path.isfile(name):
+            os.remove(name)
+
+    # Compile the genBC shared library
+    os.chdir("genBC")
+    subprocess.run(["make", "clean"], check=True)
+    subprocess.run(["make", "libgenBC.so"], check=True)
+
+    # Change back to original directory
+    os.chdir("../../../..")
+
+    run_with_reference(base_folder, test_folder, fields, n_proc, t_max, name_inp="solver_library.xml")
+
 def test_pipe_RCR_sv0D(n_proc):
     test_folder = "pipe_RCR_sv0D"
     t_max = 2
@@ -0,0 +1,200 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#include "AssemblyWorkspace.h"
+#include "fluid.h"
+#include "fs.h"
+#include "nn.h"
+#include "../test_common.h"
+
+#include <random>
+
+class AssemblyWorkspaceTest : public ::testing::Test {
+protected:
+    ComMod com_mod;
+
+    void SetUp() override {
+        com_mod.nsd = 3;
+        com_mod.nsymd = 6;
+        com_mod.dof = 4;
+        com_mod.tDof = 4;
+    }
+
+    void TearDown() override {}
+
+    long NumAllocations() {
+        return Vector<int>::num_data_allocations + Vector<double>::num_data_allocations + 
+               Array<double>::num_data_allocations + Array3<double>::num_data_allocations;
+    }
+};
+
+TEST_F(AssemblyWorkspaceTest, DataAllocationsAreCounted) {
+    long num_allocs = NumAllocations();
+
+    Vector<double> v(4);
+    Array<double> a(3,4);
+    Array3<double> a3(2,3,4);
+    ASSERT_EQ(NumAllocations(), num_allocs + 3);
+
+    // Copying data into an array of the same size does not allocate memory.
+    Array<double> b(3,4);
+    b = a;
+    ASSERT_EQ(NumAllocations(), num_allocs + 4);
+}
+
+// Arrays allocated by several threads, like the per-thread workspaces of
+// the assembly, are all counted.
+TEST_F(AssemblyWorkspaceTest, ThreadAllocationsAreCounted) {
+    const int num_arrays = 1000;
+    int num_allocated = Array<double>::num_allocated;
+    int active = Vector<double>::active;
+    long memory_in_use = Array3<double>::memory_in_use;
+
+    #pragma omp parallel for num_threads(4)
+    for (int i = 0; i < num_arrays; i++) {
+        Vector<double> v(4);
+        Array<double> a(3,4);
+        Array3<double> a3(2,3,4);
+    }
+
+    ASSERT_EQ(Array<double>::num_allocated, num_allocated + num_arrays);
+    ASSERT_EQ(Vector<double>::active, active);
+    ASSERT_EQ(Array3<double>::memory_in_use, memory_in_use);
+}
+
+TEST_F(AssemblyWorkspaceTest, ElementArraysAreReused) {
+    auto& ws = AssemblyWorkspace::get();
+    const int eNoN = 4;
+
+    ws.set_element_arrays(com_mod, eNoN);
+
+    ASSERT_EQ(ws.ptr.size(), eNoN);
+    ASSERT_EQ(ws.xl.nrows(), com_mod.nsd);
+    ASSERT_EQ(ws.xl.ncols(), eNoN);
+    ASSERT_EQ(ws.lR.nrows(), com_mod.dof);
+    ASSERT_EQ(ws.lK.nrows(), com_mod.dof*com_mod.dof);
+    ASSERT_EQ(ws.lK.nslices(), eNoN);
+
+    ws.xl(1,2) = 1.0;
+    ws.lK(3,1,2) = 1.0;
+
+    // Setting the arrays again for the same element type does not 
+    // allocate memory and resets the arrays to zero.
+    long num_allocs = NumAllocations();
+    ws.set_element_arrays(com_mod, eNoN);
+
+    ASSERT_EQ(NumAllocations(), num_allocs);
+    ASSERT_EQ(ws.xl(1,2), 0.0);
+    ASSERT_EQ(ws.lK(3,1,2), 0.0);
+
+    // A different element type reallocates the arrays.
+    ws.set_element_arrays(com_mod, 2*eNoN);
+
+    ASSERT_GT(NumAllocations(), num_allocs);
+    ASSERT_EQ(ws.xl.ncols(), 2*eNoN);
+    ASSERT_EQ(ws.lK.nslices(), 2*eNoN);
+}
+
+TEST_F(AssemblyWorkspaceTest, FluidElementLoopDoesNotAllocate) {
+    using namespace consts;
+
+    com_mod.tDof = 4;
+    com_mod.dt = 0.01;
+    com_mod.cEq = 0;
+    com_mod.cDmn = 0;
+
+    com_mod.eq.resize(1);
+    auto& eq = com_mod.eq[0];
+    eq.af = 1.0 / 1.2;
+    eq.am = 0.5 * (3.0 - 0.2) / 1.2;
+    eq.gam = 0.5 + eq.am - eq.af;
+    eq.dmn.resize(1);
+
+    auto& dmn = eq.dmn[0];
+    dmn.phys = EquationType::phys_fluid;
+    dmn.prop[PhysicalProperyType::fluid_density] = 1.06;
+    dmn.prop[PhysicalProperyType::inverse_darcy_permeability] = 0.0;
+    dmn.fluid_visc.viscType = FluidViscosityModelType::viscType_Const;
+    dmn.fluid_visc.mu_i = 0.04;
+
+    // Create a mesh of distorted tetrahedra that do not share nodes.
+    const double xi[4][3] = {{0.0, 0.0, 0.0}, {1.0, 0.0, 0.0}, {0.0, 1.0, 0.0}, {0.0, 0.0, 1.0}};
+    const int num_elems = 5;
+    const int num_nodes = 4 * num_elems;
+    std::mt19937 generator(1);
+    std::uniform_real_distribution<double> distribution(-0.2, 0.2);
+
+    mshType mesh;
+    mesh.eType = ElementType::TET4;
+    mesh.eNoN = 4;
+    mesh.nEl = num_elems;
+    mesh.nFs = 1;
+    mesh.IEN.resize(4, num_elems);
+
+    com_mod.x.resize(3, num_nodes);
+    com_mod.Bf.resize(3, num_nodes);
+    Array<double> Ag(com_mod.tDof, num_nodes);
+    Array<double> Yg(com_mod.tDof, num_nodes);
+
+    for (int e = 0; e < num_elems; e++) {
+        for (int a = 0; a < 4; a++) {
+            int Ac = 4*e + a;
+            mesh.IEN(a,e) = Ac;
+            for (int i = 0; i < 3; i++) {
+                com_mod.x(i,Ac) = 0.1 * (xi[a][i] + distribution(generator));
+            }
+            for (int i = 0; i < com_mod.tDof; i++) {
+                Ag(i,Ac) = distribution(generator);
+                Yg(i,Ac) = distribution(generator);
+            }
+        }
+    }
+
+    nn::select_ele(com_mod, mesh);
+    fs::init_fs_msh(com_mod, mesh);
+
+    // The element loop of construct_fluid() without assembly.
+    auto element_loop = [&]() {
+        auto& ws = AssemblyWorkspace::get();
+        ws.set_element_arrays(com_mod, mesh.eNoN);
+        ws.set_thood_fs(com_mod, mesh, true);
+        ws.set_thood_arrays(com_mod);
+
+        for (int e = 0; e < mesh.nEl; e++) {
+            fluid::construct_fluid_element(com_mod, mesh, e, true, Ag, Yg, ws);
+        }
+    };
+
+    // The first loop sizes the workspace arrays, later loops reuse them.
+    element_loop();
+    long num_allocs = NumAllocations();
+    element_loop();
+
+    ASSERT_EQ(NumAllocations(), num_allocs);
+}
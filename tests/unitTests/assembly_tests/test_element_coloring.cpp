@@ -0,0 +1,101 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#include "lhsa.h"
+#include "../test_common.h"
+
+#include <set>
+
+class ElementColoringTest : public ::testing::Test {
+protected:
+    void SetUp() override {}
+
+    void TearDown() override {}
+
+    // Create a structured mesh of nx x ny quadrilateral elements.
+    void CreateQuadMesh(int nx, int ny, mshType& mesh, int& num_nodes) {
+        num_nodes = (nx + 1) * (ny + 1);
+        mesh.eNoN = 4;
+        mesh.nEl = nx * ny;
+        mesh.IEN.resize(mesh.eNoN, mesh.nEl);
+
+        for (int j = 0; j < ny; j++) {
+            for (int i = 0; i < nx; i++) {
+                int e = i + j*nx;
+                int n0 = i + j*(nx + 1);
+                mesh.IEN(0,e) = n0;
+                mesh.IEN(1,e) = n0 + 1;
+                mesh.IEN(2,e) = n0 + nx + 2;
+                mesh.IEN(3,e) = n0 + nx + 1;
+            }
+        }
+    }
+};
+
+TEST_F(ElementColoringTest, ElementsOfAColorDoNotShareNodes) {
+    mshType mesh;
+    int num_nodes;
+    CreateQuadMesh(8, 5, mesh, num_nodes);
+
+    lhsa_ns::color_elements(num_nodes, mesh);
+
+    // Each element must be given exactly one color.
+    std::vector<int> num_times_colored(mesh.nEl, 0);
+
+    for (auto& color : mesh.eColor) {
+        ASSERT_FALSE(color.empty()) << "A color has no elements";
+        std::set<int> color_nodes;
+
+        for (int e : color) {
+            num_times_colored[e] += 1;
+            for (int a = 0; a < mesh.eNoN; a++) {
+                auto inserted = color_nodes.insert(mesh.IEN(a,e));
+                ASSERT_TRUE(inserted.second) << "Node " << mesh.IEN(a,e) << " is shared by elements of the same color";
+            }
+        }
+    }
+
+    for (int e = 0; e < mesh.nEl; e++) {
+        ASSERT_EQ(num_times_colored[e], 1) << "Element " << e << " is not colored once";
+    }
+
+    // A greedy coloring of a structured quad mesh needs four colors.
+    ASSERT_EQ(mesh.eColor.size(), 4);
+}
+
+TEST_F(ElementColoringTest, EmptyMesh) {
+    mshType mesh;
+    mesh.eNoN = 4;
+    mesh.nEl = 0;
+
+    lhsa_ns::color_elements(0, mesh);
+
+    ASSERT_TRUE(mesh.eColor.empty());
+}
@@ -0,0 +1,219 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#include "lhsa.h"
+#include "../test_common.h"
+
+#include <set>
+
+class ElementValPtrTest : public ::testing::Test {
+protected:
+    ComMod com_mod;
+    mshType mesh;
+    int num_nodes = 0;
+
+    void SetUp() override {
+        CreateQuadMesh(6, 4);
+        CreateSparsity();
+    }
+
+    void TearDown() override {}
+
+    // Create a structured mesh of nx x ny quadrilateral elements.
+    void CreateQuadMesh(int nx, int ny) {
+        num_nodes = (nx + 1) * (ny + 1);
+        mesh.eNoN = 4;
+        mesh.nEl = nx * ny;
+        mesh.IEN.resize(mesh.eNoN, mesh.nEl);
+
+        for (int j = 0; j < ny; j++) {
+            for (int i = 0; i < nx; i++) {
+                int e = i + j*nx;
+                int n0 = i + j*(nx + 1);
+                mesh.IEN(0,e) = n0;
+                mesh.IEN(1,e) = n0 + 1;
+                mesh.IEN(2,e) = n0 + nx + 2;
+                mesh.IEN(3,e) = n0 + nx + 1;
+            }
+        }
+    }
+
+    // Create the sorted CSR structure from the mesh connectivity.
+    void CreateSparsity() {
+        std::vector<std::set<int>> cols(num_nodes);
+
+        for (int e = 0; e < mesh.nEl; e++) {
+            for (int a = 0; a < mesh.eNoN; a++) {
+                for (int b = 0; b < mesh.eNoN; b++) {
+                    cols[mesh.IEN(a,e)].insert(mesh.IEN(b,e));
+                }
+            }
+        }
+
+        int nnz = 0;
+        for (auto& row : cols) {
+            nnz += row.size();
+        }
+
+        com_mod.tnNo = num_nodes;
+        com_mod.rowPtr.resize(num_nodes+1);
+        com_mod.colPtr.resize(nnz);
+        int j = 0;
+
+        for (int rowN = 0; rowN < num_nodes; rowN++) {
+            com_mod.rowPtr(rowN) = j;
+            for (int colN : cols[rowN]) {
+                com_mod.colPtr(j) = colN;
+                j += 1;
+            }
+        }
+        com_mod.rowPtr(num_nodes) = j;
+    }
+
+    // Set element arrays with values depending on the element.
+    void SetElementArrays(const int e, const int dof, Vector<int>& ptr, Array3<double>& lK, Array<double>& lR) {
+        for (int a = 0; a < mesh.eNoN; a++) {
+            ptr(a) = mesh.IEN(a,e);
+            for (int i = 0; i < dof; i++) {
+                lR(i,a) = 1.0 + i + 10.0*a + 0.1*e;
+            }
+            for (int b = 0; b < mesh.eNoN; b++) {
+                for (int i = 0; i < dof*dof; i++) {
+                    lK(i,a,b) = 1.0 + i + 10.0*a + 100.0*b + 0.1*e;
+                }
+            }
+        }
+    }
+};
+
+TEST_F(ElementValPtrTest, PositionsMatchColumns) {
+    lhsa_ns::set_val_ptr(com_mod, mesh);
+
+    ASSERT_EQ(mesh.eValPtr.nrows(), mesh.eNoN*mesh.eNoN);
+    ASSERT_EQ(mesh.eValPtr.ncols(), mesh.nEl);
+
+    for (int e = 0; e < mesh.nEl; e++) {
+        for (int a = 0; a < mesh.eNoN; a++) {
+            int rowN = mesh.IEN(a,e);
+            for (int b = 0; b < mesh.eNoN; b++) {
+                int ptr = mesh.eValPtr(a+b*mesh.eNoN,e);
+                ASSERT_GE(ptr, com_mod.rowPtr(rowN));
+                ASSERT_LT(ptr, com_mod.rowPtr(rowN+1));
+                ASSERT_EQ(com_mod.colPtr(ptr), mesh.IEN(b,e));
+            }
+        }
+    }
+}
+
+TEST_F(ElementValPtrTest, AssemblyMatchesSearch) {
+    const int dof = 3;
+    const int nnz = com_mod.colPtr.size();
+    lhsa_ns::set_val_ptr(com_mod, mesh);
+
+    Vector<int> ptr(mesh.eNoN);
+    Array3<double> lK(dof*dof, mesh.eNoN, mesh.eNoN);
+    Array<double> lR(dof, mesh.eNoN);
+
+    // Assemble by searching colPtr.
+    com_mod.Val.resize(dof*dof, nnz);
+    com_mod.R.resize(dof, num_nodes);
+
+    for (int e = 0; e < mesh.nEl; e++) {
+        SetElementArrays(e, dof, ptr, lK, lR);
+        lhsa_ns::do_assem(com_mod, mesh.eNoN, ptr, lK, lR);
+    }
+
+    Array<double> Val_search = com_mod.Val;
+    Array<double> R_search = com_mod.R;
+
+    // Assemble using the precomputed positions.
+    com_mod.Val = 0.0;
+    com_mod.R = 0.0;
+
+    for (int e = 0; e < mesh.nEl; e++) {
+        SetElementArrays(e, dof, ptr, lK, lR);
+        lhsa_ns::do_assem(com_mod, mesh, e, ptr, lK, lR);
+    }
+
+    for (int j = 0; j < nnz; j++) {
+        for (int i = 0; i < dof*dof; i++) {
+            ASSERT_EQ(com_mod.Val(i,j), Val_search(i,j));
+        }
+    }
+
+    for (int j = 0; j < num_nodes; j++) {
+        for (int i = 0; i < dof; i++) {
+            ASSERT_EQ(com_mod.R(i,j), R_search(i,j));
+        }
+    }
+}
+
+TEST_F(ElementValPtrTest, AssemblySkipsMaskedNodes) {
+    const int dof = 2;
+    const int nnz = com_mod.colPtr.size();
+    lhsa_ns::set_val_ptr(com_mod, mesh);
+
+    Vector<int> ptr(mesh.eNoN);
+    Array3<double> lK(dof*dof, mesh.eNoN, mesh.eNoN);
+    Array<double> lR(dof, mesh.eNoN);
+
+    com_mod.Val.resize(dof*dof, nnz);
+    com_mod.R.resize(dof, num_nodes);
+
+    // Nodes set to -1 are not assembled.
+    for (int e = 0; e < mesh.nEl; e++) {
+        SetElementArrays(e, dof, ptr, lK, lR);
+        ptr(e % mesh.eNoN) = -1;
+        lhsa_ns::do_assem(com_mod, mesh.eNoN, ptr, lK, lR);
+    }
+
+    Array<double> Val_search = com_mod.Val;
+    Array<double> R_search = com_mod.R;
+
+    com_mod.Val = 0.0;
+    com_mod.R = 0.0;
+
+    for (int e = 0; e < mesh.nEl; e++) {
+        SetElementArrays(e, dof, ptr, lK, lR);
+        ptr(e % mesh.eNoN) = -1;
+        lhsa_ns::do_assem(com_mod, mesh, e, ptr, lK, lR);
+    }
+
+    for (int j = 0; j < nnz; j++) {
+        for (int i = 0; i < dof*dof; i++) {
+            ASSERT_EQ(com_mod.Val(i,j), Val_search(i,j));
+        }
+    }
+
+    for (int j = 0; j < num_nodes; j++) {
+        for (int i = 0; i < dof; i++) {
+            ASSERT_EQ(com_mod.R(i,j), R_search(i,j));
+        }
+    }
+}
@@ -0,0 +1,168 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#include "fluid.h"
+#include "fs.h"
+#include "nn.h"
+#include "../test_common.h"
+
+class FluidTet4BatchTest : public ::testing::Test {
+protected:
+    ComMod com_mod;
+    mshType mesh;
+    Array<double> Ag, Yg;
+
+    void SetUp() override {
+        using namespace consts;
+
+        com_mod.nsd = 3;
+        com_mod.nsymd = 6;
+        com_mod.dof = 4;
+        com_mod.tDof = 7;
+        com_mod.dt = 0.01;
+        com_mod.cEq = 0;
+        com_mod.cDmn = 0;
+
+        com_mod.eq.resize(1);
+        auto& eq = com_mod.eq[0];
+        eq.af = 1.0 / 1.2;
+        eq.am = 0.5 * (3.0 - 0.2) / 1.2;
+        eq.gam = 0.5 + eq.am - eq.af;
+        eq.dmn.resize(1);
+
+        auto& dmn = eq.dmn[0];
+        dmn.phys = EquationType::phys_fluid;
+        dmn.prop[PhysicalProperyType::fluid_density] = 1.06;
+        dmn.prop[PhysicalProperyType::inverse_darcy_permeability] = 0.5;
+        dmn.prop[PhysicalProperyType::f_x] = 0.1;
+        dmn.prop[PhysicalProperyType::f_y] = -0.2;
+        dmn.prop[PhysicalProperyType::f_z] = 0.3;
+        dmn.fluid_visc.viscType = FluidViscosityModelType::viscType_Const;
+        dmn.fluid_visc.mu_i = 0.04;
+
+        CreateTetMesh(11);
+    }
+
+    void TearDown() override {}
+
+    // Create a mesh of distorted tetrahedra that do not share nodes.
+    void CreateTetMesh(const int num_elems) {
+        const double xi[4][3] = {{0.0, 0.0, 0.0}, {1.0, 0.0, 0.0}, {0.0, 1.0, 0.0}, {0.0, 0.0, 1.0}};
+        const int num_nodes = 4 * num_elems;
+        std::mt19937 generator(1);
+        std::uniform_real_distribution<double> distribution(-0.2, 0.2);
+
+        mesh.eNoN = 4;
+        mesh.nEl = num_elems;
+        mesh.nFs = 1;
+        mesh.IEN.resize(4, num_elems);
+
+        com_mod.x.resize(3, num_nodes);
+        com_mod.Bf.resize(3, num_nodes);
+        Ag.resize(com_mod.tDof, num_nodes);
+        Yg.resize(com_mod.tDof, num_nodes);
+
+        for (int e = 0; e < num_elems; e++) {
+            for (int a = 0; a < 4; a++) {
+                int Ac = 4*e + a;
+                mesh.IEN(a,e) = Ac;
+                for (int i = 0; i < 3; i++) {
+                    com_mod.x(i,Ac) = 0.1 * (xi[a][i] + distribution(generator));
+                    com_mod.Bf(i,Ac) = distribution(generator);
+                }
+                for (int i = 0; i < com_mod.tDof; i++) {
+                    Ag(i,Ac) = 10.0 * distribution(generator);
+                    Yg(i,Ac) = 10.0 * distribution(generator);
+                }
+            }
+        }
+
+        nn::select_ele(com_mod, mesh);
+        fs::init_fs_msh(com_mod, mesh);
+    }
+
+    // Check that the batched element arrays match those computed by 
+    // construct_fluid_element().
+    void CheckBatches() {
+        using namespace fluid;
+        const double rtol = 1.0e-12;
+
+        auto& ws = AssemblyWorkspace::get();
+        ws.set_element_arrays(com_mod, mesh.eNoN);
+        ws.set_thood_fs(com_mod, mesh, true);
+        ws.set_thood_arrays(com_mod);
+
+        FluidTet4Batch batch;
+
+        for (int e0 = 0; e0 < mesh.nEl; e0 += TET4_BATCH_SIZE) {
+            batch.num_elems = std::min(TET4_BATCH_SIZE, mesh.nEl - e0);
+            for (int k = 0; k < batch.num_elems; k++) {
+                batch.elems[k] = e0 + k;
+            }
+
+            construct_fluid_tet4(com_mod, mesh, Ag, Yg, batch);
+
+            for (int k = 0; k < batch.num_elems; k++) {
+                construct_fluid_element(com_mod, mesh, batch.elems[k], true, Ag, Yg, ws);
+
+                for (int a = 0; a < 4; a++) {
+                    for (int i = 0; i < 4; i++) {
+                        EXPECT_NEAR(batch.lR[i][a][k], ws.lR(i,a), rtol * std::abs(ws.lR(i,a)) + 1.0e-14);
+                    }
+                    for (int b = 0; b < 4; b++) {
+                        for (int i = 0; i < 16; i++) {
+                            EXPECT_NEAR(batch.lK[i][a][b][k], ws.lK(i,a,b), rtol * std::abs(ws.lK(i,a,b)) + 1.0e-14);
+                        }
+                    }
+                }
+            }
+        }
+    }
+};
+
+TEST_F(FluidTet4BatchTest, ConstantViscosity) {
+    CheckBatches();
+}
+
+TEST_F(FluidTet4BatchTest, CarreauYasudaViscosity) {
+    using namespace consts;
+    auto& fluid_visc = com_mod.eq[0].dmn[0].fluid_visc;
+    fluid_visc.viscType = FluidViscosityModelType::viscType_CY;
+    fluid_visc.mu_o = 0.16;
+    fluid_visc.mu_i = 0.0035;
+    fluid_visc.lam = 8.2;
+    fluid_visc.a = 0.64;
+    fluid_visc.n = 0.2128;
+    CheckBatches();
+}
+
+TEST_F(FluidTet4BatchTest, MovingMesh) {
+    com_mod.mvMsh = true;
+    CheckBatches();
+}
@@ -0,0 +1,92 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#include "CepModBo.h"
+#include "../test_common.h"
+
+class BoRushLarsenTest : public ::testing::Test {
+protected:
+    CepModBo bo;
+    static constexpr int nX = 4;
+
+    // Integrate an action potential from 0 to t_end using integ_rl() or
+    // integ_rk() with a stimulus over the first two milliseconds.
+    Vector<double> Integrate(const int imyo, const bool use_rl, const double dt, const double t_end) {
+        Vector<double> X(nX);
+        Vector<double> RPAR(5);
+        bo.init(nX, X);
+
+        int num_steps = static_cast<int>(t_end / dt + 0.5);
+        for (int n = 0; n < num_steps; n++) {
+            double t = n * dt;
+            double Istim = (t < 2.0) ? -52.0 : 0.0;
+            if (use_rl) {
+                bo.integ_rl(imyo, nX, X, t, dt, Istim, 0.0, RPAR);
+            } else {
+                bo.integ_rk(imyo, nX, X, t, dt, Istim, 0.0, RPAR);
+            }
+        }
+
+        return X;
+    }
+};
+
+// The Rush-Larsen solution converges to the Runge-Kutta solution.
+TEST_F(BoRushLarsenTest, Convergence) {
+    for (int imyo = 1; imyo <= 3; imyo++) {
+        auto X_ref = Integrate(imyo, false, 1.0e-3, 20.0);
+        auto X_rl = Integrate(imyo, true, 1.0e-3, 20.0);
+
+        // The cell is depolarized.
+        EXPECT_GT(X_ref(0), 0.0);
+
+        EXPECT_NEAR(X_rl(0), X_ref(0), 0.1);
+        for (int i = 1; i < nX; i++) {
+            EXPECT_NEAR(X_rl(i), X_ref(i), 1.0e-3);
+        }
+    }
+}
+
+// The gating variables stay in [0,1] for a large time step.
+TEST_F(BoRushLarsenTest, LargeTimeStep) {
+    for (int imyo = 1; imyo <= 3; imyo++) {
+        Vector<double> X(nX);
+        Vector<double> RPAR(5);
+        bo.init(nX, X);
+
+        for (int n = 0; n < 1600; n++) {
+            double Istim = (n < 8) ? -52.0 : 0.0;
+            bo.integ_rl(imyo, nX, X, 0.0, 0.25, Istim, 0.0, RPAR);
+            for (int i = 1; i < nX; i++) {
+                EXPECT_GE(X(i), 0.0);
+                EXPECT_LE(X(i), 1.0);
+            }
+        }
+    }
+}
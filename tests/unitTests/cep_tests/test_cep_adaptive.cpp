@@ -0,0 +1,223 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#include "cep_ion.h"
+#include "../test_common.h"
+
+/// @brief Test the adaptive time integration of the tenTusscher-Panfilov
+/// and Bueno-Orovio models.
+///
+/// Solutions computed with adaptive time steps are compared with solutions
+/// computed with a small fixed time step.
+//
+class CepAdaptiveTest : public ::testing::Test {
+protected:
+    CepMod cep_mod;
+
+    // Time step of the fine fixed step solutions, a power of 2 so that an
+    // integer number of steps is taken over each call.
+    static constexpr double fine_dt = 1.0 / 1024.0;
+
+    // Time step of the calls to cep_integ_l() and cep_integ_ttp_batch().
+    static constexpr double call_dt = 0.5;
+
+    // Maximum time step and membrane potential change per step of the
+    // adaptive solutions compared with the fine solutions.
+    static constexpr double max_dt = 0.125;
+    static constexpr double dVmax = 0.1;
+
+    cepModelType MakeModel(const ElectrophysiologyModelType type, const int imyo, const TimeIntegratioType tint,
+        const double dt, const double stimulus) {
+      cepModelType cep;
+      cep.cepType = type;
+      cep.imyo = imyo;
+      if (type == ElectrophysiologyModelType::TTP) {
+        cep.nX = TtpBatch::nX;
+        cep.nG = TtpBatch::nG;
+      } else {
+        cep.nX = 4;
+        cep.nG = 0;
+      }
+      cep.dt = dt;
+      cep.odes.tIntType = tint;
+      cep.odes.dVmax = dVmax;
+      cep.odes.dtMin = 1.0e-3;
+      cep.Istim.A = stimulus;
+      cep.Istim.Ts = 0.0;
+      cep.Istim.Td = 1.0;
+      cep.Istim.CL = 1000.0;
+      return cep;
+    }
+
+    // Set the initial state of a cell, the membrane potential is varied by
+    // 'dV' so that cells are at different stages of the action potential.
+    void InitCell(cepModelType& cep, const double dV, Vector<double>& X, Vector<double>& Xg) {
+      X.resize(cep.nX);
+      Xg.resize(cep.nG);
+      cep_ion::cep_init_l(cep_mod, cep, cep.nX, cep.nG, X, Xg);
+      X(0) += dV;
+    }
+
+    // Integrate a cell from 0 to t_end, the membrane potential is saved
+    // every 'save_dt' in V.
+    void IntegrateCell(cepModelType& cep, const double dV, const double t_end, const double save_dt,
+        std::vector<double>& V) {
+      Vector<double> X, Xg;
+      InitCell(cep, dV, X, Xg);
+      double yl = 0.0;
+      int num_calls = static_cast<int>(t_end / call_dt + 0.5);
+      int save_calls = static_cast<int>(save_dt / call_dt + 0.5);
+
+      V.clear();
+      for (int n = 0; n < num_calls; n++) {
+        cep_ion::cep_integ_l(cep_mod, cep, cep.nX, cep.nG, X, Xg, n * call_dt, yl, 1.0, call_dt);
+        if ((n+1) % save_calls == 0) {
+          V.push_back(X(0));
+        }
+      }
+    }
+
+    // Integrate a batch of tenTusscher-Panfilov cells from 0 to t_end, the
+    // membrane potential of cell c is varied by dV[c] and is saved every
+    // 'save_dt' in V[c].
+    void IntegrateBatch(cepModelType& cep, const std::vector<double>& dV, const double t_end, const double save_dt,
+        std::vector<std::vector<double>>& V) {
+      int num_cells = dV.size();
+      TtpBatch batch;
+      batch.num_cells = num_cells;
+      double yl[TtpBatch::B], I4f[TtpBatch::B];
+
+      for (int c = 0; c < TtpBatch::B; c++) {
+        Vector<double> X, Xg;
+        InitCell(cep, dV[std::min(c, num_cells-1)], X, Xg);
+        for (int i = 0; i < TtpBatch::nX; i++) {
+          batch.X[i][c] = X(i);
+        }
+        for (int i = 0; i < TtpBatch::nG; i++) {
+          batch.Xg[i][c] = Xg(i);
+        }
+        yl[c] = 0.0;
+        I4f[c] = 1.0;
+      }
+
+      int num_calls = static_cast<int>(t_end / call_dt + 0.5);
+      int save_calls = static_cast<int>(save_dt / call_dt + 0.5);
+
+      V.assign(num_cells, {});
+      for (int n = 0; n < num_calls; n++) {
+        cep_ion::cep_integ_ttp_batch(cep_mod, cep, batch, n * call_dt, yl, I4f, call_dt);
+        if ((n+1) % save_calls == 0) {
+          for (int c = 0; c < num_cells; c++) {
+            V[c].push_back(batch.X[0][c]);
+          }
+        }
+      }
+    }
+
+    void ExpectNear(const std::vector<double>& V, const std::vector<double>& V_ref, const double tol) {
+      ASSERT_EQ(V.size(), V_ref.size());
+      for (size_t n = 0; n < V.size(); n++) {
+        EXPECT_NEAR(V[n], V_ref[n], tol) << "sample " << n;
+      }
+    }
+};
+
+// A batch of tenTusscher-Panfilov cells integrated with adaptive time steps
+// is close to the fine fixed step solution of each cell.
+TEST_F(CepAdaptiveTest, TenTusscherPanfilovBatch) {
+  const double t_end = 400.0;
+  const double save_dt = 10.0;
+  std::vector<double> dV{0.0, 4.0, 40.0, 80.0};
+
+  for (int imyo = 1; imyo <= 3; imyo++) {
+    auto cep = MakeModel(ElectrophysiologyModelType::TTP, imyo, TimeIntegratioType::RL_ADAPTIVE, max_dt, -52.0);
+    std::vector<std::vector<double>> V;
+    IntegrateBatch(cep, dV, t_end, save_dt, V);
+
+    for (size_t c = 0; c < dV.size(); c++) {
+      auto cep_ref = MakeModel(ElectrophysiologyModelType::TTP, imyo, TimeIntegratioType::FE, fine_dt, -52.0);
+      std::vector<double> V_ref, V_cell;
+      IntegrateCell(cep_ref, dV[c], t_end, save_dt, V_ref);
+      ExpectNear(V[c], V_ref, 1.0);
+
+      // The batch and the single cell adaptive integration are the same.
+      IntegrateCell(cep, dV[c], t_end, save_dt, V_cell);
+      ExpectNear(V[c], V_cell, 1.0e-10);
+    }
+  }
+}
+
+// A Bueno-Orovio cell integrated with adaptive time steps is close to the
+// fine fixed step solution.
+TEST_F(CepAdaptiveTest, BuenoOrovio) {
+  const double t_end = 400.0;
+  const double save_dt = 10.0;
+
+  for (int imyo = 1; imyo <= 3; imyo++) {
+    auto cep = MakeModel(ElectrophysiologyModelType::BO, imyo, TimeIntegratioType::RL_ADAPTIVE, max_dt, -52.0);
+    auto cep_ref = MakeModel(ElectrophysiologyModelType::BO, imyo, TimeIntegratioType::RL, fine_dt, -52.0);
+    std::vector<double> V, V_ref;
+    IntegrateCell(cep, 0.0, t_end, save_dt, V);
+    IntegrateCell(cep_ref, 0.0, t_end, save_dt, V_ref);
+
+    // The cell is depolarized.
+    EXPECT_GT(*std::max_element(V_ref.begin(), V_ref.end()), 0.5);
+    ExpectNear(V, V_ref, 1.0);
+  }
+}
+
+// Cells near rest take adaptive steps of size Time_step_for_integration,
+// the solution is the same as the fixed step solution with that step. The
+// cells start slightly below the resting potential so that the solution
+// depends on the time step.
+TEST_F(CepAdaptiveTest, StepsAtRest) {
+  const double t_end = 50.0;
+  const double save_dt = 5.0;
+  const double dV = -2.0;
+  std::vector<double> V, V_ref;
+
+  for (auto type : {ElectrophysiologyModelType::TTP, ElectrophysiologyModelType::BO}) {
+    auto cep = MakeModel(type, 1, TimeIntegratioType::RL_ADAPTIVE, max_dt, 0.0);
+    auto cep_ref = MakeModel(type, 1, TimeIntegratioType::RL, max_dt, 0.0);
+    cep.odes.dVmax = 1.0;
+    IntegrateCell(cep, dV, t_end, save_dt, V);
+    IntegrateCell(cep_ref, dV, t_end, save_dt, V_ref);
+    ExpectNear(V, V_ref, 1.0e-12);
+  }
+
+  auto cep = MakeModel(ElectrophysiologyModelType::TTP, 1, TimeIntegratioType::RL_ADAPTIVE, max_dt, 0.0);
+  auto cep_ref = MakeModel(ElectrophysiologyModelType::TTP, 1, TimeIntegratioType::RL, max_dt, 0.0);
+  cep.odes.dVmax = 1.0;
+  std::vector<std::vector<double>> V_batch, V_batch_ref;
+  IntegrateBatch(cep, {dV, 0.5*dV}, t_end, save_dt, V_batch);
+  IntegrateBatch(cep_ref, {dV, 0.5*dV}, t_end, save_dt, V_batch_ref);
+  for (size_t c = 0; c < V_batch.size(); c++) {
+    ExpectNear(V_batch[c], V_batch_ref[c], 1.0e-12);
+  }
+}
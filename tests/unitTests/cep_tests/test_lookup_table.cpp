@@ -0,0 +1,215 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#include "CepLookupTable.h"
+#include "CepModBo.h"
+#include "CepModTtp.h"
+#include "cep_ion.h"
+#include "../test_common.h"
+
+// Linear functions are interpolated exactly.
+TEST(CepLookupTableTest, LinearFunctions) {
+    CepLookupTable table;
+    EXPECT_FALSE(table.is_built());
+
+    auto evaluate = [](const double v, double values[]) {
+        values[0] = 2.0 * v + 1.0;
+        values[1] = -0.5 * v;
+    };
+    table.build(-10.0, 10.0, 0.3, 2, evaluate);
+
+    EXPECT_TRUE(table.is_built());
+    EXPECT_EQ(table.num_functions(), 2);
+    EXPECT_EQ(table.num_points(), 68);
+
+    double values[2];
+    for (double v = -10.0; v < 10.0; v += 0.17) {
+        ASSERT_TRUE(table.interpolate(v, values));
+        EXPECT_NEAR(values[0], 2.0 * v + 1.0, 1.0e-12);
+        EXPECT_NEAR(values[1], -0.5 * v, 1.0e-12);
+    }
+
+    for (double error : table.max_error(evaluate)) {
+        EXPECT_LT(error, 1.0e-12);
+    }
+}
+
+// Potentials outside of the table are not interpolated.
+TEST(CepLookupTableTest, OutOfRange) {
+    CepLookupTable table;
+    double values[1];
+    EXPECT_FALSE(table.interpolate(0.0, values));
+
+    table.build(-1.0, 1.0, 0.5, 1, [](const double v, double values[]) { values[0] = v; });
+    EXPECT_TRUE(table.interpolate(-1.0, values));
+    EXPECT_FALSE(table.interpolate(-1.01, values));
+    EXPECT_FALSE(table.interpolate(1.01, values));
+    EXPECT_FALSE(table.interpolate(std::nan(""), values));
+
+    EXPECT_THROW(table.build(1.0, -1.0, 0.5, 1, [](const double v, double values[]) { values[0] = v; }),
+        std::runtime_error);
+}
+
+class CepModLookupTableTest : public ::testing::Test {
+protected:
+    static constexpr double resolution = 0.05;
+
+    // Integrate an action potential of the tenTusscher-Panfilov model with
+    // forward Euler and a stimulus over the first millisecond.
+    Vector<double> IntegrateTtp(CepModTtp& ttp, const int imyo, const double dt, const double t_end) {
+        const int nX = 7;
+        const int nG = 12;
+        Vector<double> X(nX), Xg(nG), RPAR(18);
+        ttp.init(imyo, nX, nG, X, Xg);
+
+        int num_steps = static_cast<int>(t_end / dt + 0.5);
+        for (int n = 0; n < num_steps; n++) {
+            double Istim = (n * dt < 1.0) ? -52.0 : 0.0;
+            ttp.integ_fe(imyo, nX, nG, X, Xg, n * dt, dt, Istim, 0.0, RPAR);
+        }
+
+        return X;
+    }
+
+    // Integrate an action potential of the Bueno-Orovio model with
+    // Rush-Larsen and a stimulus over the first two milliseconds.
+    Vector<double> IntegrateBo(CepModBo& bo, const int imyo, const double dt, const double t_end) {
+        const int nX = 4;
+        Vector<double> X(nX), RPAR(5);
+        bo.init(nX, X);
+
+        int num_steps = static_cast<int>(t_end / dt + 0.5);
+        for (int n = 0; n < num_steps; n++) {
+            double Istim = (n * dt < 2.0) ? -52.0 : 0.0;
+            bo.integ_rl(imyo, nX, X, n * dt, dt, Istim, 0.0, RPAR);
+        }
+
+        return X;
+    }
+};
+
+// The tenTusscher-Panfilov model tables are accurate and give an action
+// potential close to the one computed without tables.
+TEST_F(CepModLookupTableTest, TenTusscherPanfilov) {
+    const double dt = 0.02;
+    CepModTtp ttp, ttp_lut;
+    ttp_lut.init_lookup_tables(resolution, dt);
+
+    // The time constants of the h and j gates are discontinuous at -40 mV
+    // so their error does not decrease with the resolution.
+    for (double error : ttp_lut.lookup_table_errors()) {
+        EXPECT_LT(error, 5.0e-3);
+    }
+
+    for (int imyo = 1; imyo <= 3; imyo++) {
+        for (double t_end : {5.0, 100.0, 400.0}) {
+            auto X = IntegrateTtp(ttp, imyo, dt, t_end);
+            auto X_lut = IntegrateTtp(ttp_lut, imyo, dt, t_end);
+            EXPECT_NEAR(X_lut(0), X(0), 0.5);
+        }
+    }
+}
+
+// The I_CaL current interpolated from the tables stays accurate close to
+// 15 mV where its driving factor is 0/0.
+TEST_F(CepModLookupTableTest, TenTusscherPanfilovCalciumCurrent) {
+    const int nX = 7;
+    const int nG = 12;
+    CepModTtp ttp, ttp_lut;
+    ttp_lut.init_lookup_tables(resolution, 0.02);
+
+    Vector<double> X(nX), Xg(nG), dX(nX), dX_lut(nX), RPAR(18);
+    ttp.init(1, nX, nG, X, Xg);
+
+    // Open the d, f, f2 and fCass gates of the L-type channels.
+    for (int i = 6; i < 10; i++) {
+        Xg(i) = 1.0;
+    }
+
+    for (double dV : {-1.0e-1, -1.0e-3, 1.0e-5, 1.0e-3, 1.0e-1}) {
+        X(0) = 15.0 + dV;
+        ttp.getf(1, nX, nG, X, Xg, dX, 0.0, 0.0, RPAR);
+        ttp_lut.getf(1, nX, nG, X, Xg, dX_lut, 0.0, 0.0, RPAR);
+        for (int i = 0; i < nX; i++) {
+            EXPECT_NEAR(dX_lut(i), dX(i), 1.0e-6 * std::max(1.0, fabs(dX(i))));
+        }
+    }
+}
+
+// The Bueno-Orovio model tables are accurate and give an action potential
+// close to the one computed without tables.
+TEST_F(CepModLookupTableTest, BuenoOrovio) {
+    const double dt = 0.01;
+    CepModBo bo, bo_lut;
+    bo_lut.init_lookup_table(resolution);
+
+    for (double error : bo_lut.lookup_table_errors()) {
+        EXPECT_LT(error, 1.0e-3);
+    }
+
+    for (int imyo = 1; imyo <= 3; imyo++) {
+        for (double t_end : {5.0, 100.0, 300.0}) {
+            auto X = IntegrateBo(bo, imyo, dt, t_end);
+            auto X_lut = IntegrateBo(bo_lut, imyo, dt, t_end);
+            EXPECT_NEAR(X_lut(0), X(0), 0.01);
+            for (int i = 1; i < 4; i++) {
+                EXPECT_NEAR(X_lut(i), X(i), 1.0e-2);
+            }
+        }
+    }
+}
+
+// The domains using a model share its tables so they must all use the
+// same table resolution.
+TEST(CepLookupTableSettingsTest, DomainsSharingModel) {
+    using namespace consts;
+    eqType eq;
+    eq.nDmn = 3;
+    eq.dmn.resize(eq.nDmn);
+
+    for (auto& dmn : eq.dmn) {
+        dmn.phys = EquationType::phys_CEP;
+        dmn.cep.cepType = ElectrophysiologyModelType::TTP;
+        dmn.cep.lutResolution = 0.1;
+    }
+    eq.dmn[2].cep.cepType = ElectrophysiologyModelType::BO;
+    eq.dmn[2].cep.lutResolution = 0.0;
+    EXPECT_NO_THROW(cep_ion::check_lookup_table_settings(eq));
+
+    // A domain without tables would use the tables of another domain.
+    eq.dmn[1].cep.lutResolution = 0.0;
+    EXPECT_THROW(cep_ion::check_lookup_table_settings(eq), std::runtime_error);
+
+    eq.dmn[1].cep.lutResolution = 0.2;
+    EXPECT_THROW(cep_ion::check_lookup_table_settings(eq), std::runtime_error);
+
+    // Domains of other physics are not checked.
+    eq.dmn[1].phys = EquationType::phys_struct;
+    EXPECT_NO_THROW(cep_ion::check_lookup_table_settings(eq));
+}
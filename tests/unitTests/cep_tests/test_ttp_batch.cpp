@@ -0,0 +1,125 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#include "CepModTtp.h"
+#include "../test_common.h"
+
+class TtpBatchTest : public ::testing::Test {
+protected:
+    CepModTtp ttp;
+    static constexpr int nX = TtpBatch::nX;
+    static constexpr int nG = TtpBatch::nG;
+
+    // Set the initial state of a cell, the membrane potential is varied
+    // so that cells are at different stages of the action potential.
+    void InitCell(const int imyo, const int cell, Vector<double>& X, Vector<double>& Xg) {
+        X.resize(nX);
+        Xg.resize(nG);
+        ttp.init(imyo, nX, nG, X, Xg);
+        X(0) += 12.0 * (cell % 10);
+    }
+
+    // Check that integrating a batch of cells gives the same values as
+    // integrating each cell with integ_fe() or integ_rk(). The cells of a
+    // forward Euler batch use different time steps.
+    void CheckBatches(const int imyo, const bool use_rk, const int num_cells) {
+        const double rtol = 1.0e-12;
+        const double dt = 0.02;
+        const int num_steps = 400;
+
+        std::vector<Vector<double>> X(num_cells), Xg(num_cells);
+        Vector<double> RPAR(18);
+        for (int c = 0; c < num_cells; c++) {
+            InitCell(imyo, c, X[c], Xg[c]);
+        }
+
+        TtpBatch batch;
+        batch.num_cells = num_cells;
+        for (int c = 0; c < TtpBatch::B; c++) {
+            int cell = std::min(c, num_cells-1);
+            for (int i = 0; i < nX; i++) {
+                batch.X[i][c] = X[cell](i);
+            }
+            for (int i = 0; i < nG; i++) {
+                batch.Xg[i][c] = Xg[cell](i);
+            }
+            batch.Ksac[c] = 0.01 * cell;
+        }
+
+        double dt_c[TtpBatch::B], Istim_c[TtpBatch::B];
+        for (int c = 0; c < TtpBatch::B; c++) {
+            dt_c[c] = dt * (1.0 - 0.1 * (std::min(c, num_cells-1) % 4));
+        }
+
+        for (int n = 0; n < num_steps; n++) {
+            double Istim = (n < 50) ? -52.0 : 0.0;
+            std::fill(Istim_c, Istim_c + TtpBatch::B, Istim);
+
+            for (int c = 0; c < num_cells; c++) {
+                if (use_rk) {
+                    ttp.integ_rk(imyo, nX, nG, X[c], Xg[c], 0.0, dt, Istim, batch.Ksac[c], RPAR);
+                } else {
+                    ttp.integ_fe(imyo, nX, nG, X[c], Xg[c], 0.0, dt_c[c], Istim, batch.Ksac[c], RPAR);
+                }
+            }
+
+            if (use_rk) {
+                ttp.integ_rk_batch(imyo, batch, dt, Istim);
+            } else {
+                ttp.integ_fe_batch(imyo, batch, dt_c, Istim_c);
+            }
+        }
+
+        for (int c = 0; c < num_cells; c++) {
+            for (int i = 0; i < nX; i++) {
+                EXPECT_NEAR(batch.X[i][c], X[c](i), rtol * std::abs(X[c](i)) + 1.0e-14);
+            }
+            for (int i = 0; i < nG; i++) {
+                EXPECT_NEAR(batch.Xg[i][c], Xg[c](i), rtol * std::abs(Xg[c](i)) + 1.0e-14);
+            }
+        }
+    }
+};
+
+TEST_F(TtpBatchTest, ForwardEuler) {
+    for (int imyo = 1; imyo <= 3; imyo++) {
+        CheckBatches(imyo, false, TtpBatch::B);
+    }
+}
+
+TEST_F(TtpBatchTest, RungeKutta) {
+    for (int imyo = 1; imyo <= 3; imyo++) {
+        CheckBatches(imyo, true, TtpBatch::B);
+    }
+}
+
+TEST_F(TtpBatchTest, PartialBatch) {
+    CheckBatches(1, false, 3);
+    CheckBatches(2, true, 5);
+}
@@ -0,0 +1,163 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#include "KdTree.h"
+#include "../test_common.h"
+
+#include <random>
+
+/// @brief Test finding the nearest point with a KdTree against checking all
+/// of the points.
+//
+class KdTreeTest : public ::testing::Test {
+protected:
+    int nNo = 3000;
+    Array<double> x;
+    std::mt19937 gen{2468};
+    std::uniform_real_distribution<double> dist{-1.0, 1.0};
+
+    void SetUp() override {
+      // Points on a curved surface, like the elements of a valve leaflet.
+      x.resize(3, nNo);
+      for (int a = 0; a < nNo; a++) {
+        x(0,a) = dist(gen);
+        x(1,a) = dist(gen);
+        x(2,a) = 0.2 * x(0,a) * x(0,a);
+      }
+    }
+
+    int NearestBruteForce(const Vector<double>& xp, double& dist_sq) {
+      int point = -1;
+      dist_sq = std::numeric_limits<double>::max();
+      for (int a = 0; a < nNo; a++) {
+        double d = 0.0;
+        for (int i = 0; i < 3; i++) {
+          d += (xp(i) - x(i,a)) * (xp(i) - x(i,a));
+        }
+        if (d < dist_sq) {
+          dist_sq = d;
+          point = a;
+        }
+      }
+      return point;
+    }
+};
+
+TEST_F(KdTreeTest, NearestPoint) {
+  KdTree tree;
+  tree.build(x);
+  EXPECT_EQ(tree.size(), nNo);
+
+  Vector<double> xp(3);
+
+  for (int n = 0; n < 500; n++) {
+    for (int i = 0; i < 3; i++) {
+      xp(i) = 1.5 * dist(gen);
+    }
+
+    double expected_dist_sq = 0.0;
+    int expected = NearestBruteForce(xp, expected_dist_sq);
+
+    double dist_sq = 0.0;
+    EXPECT_EQ(tree.nearest(xp, dist_sq), expected);
+    EXPECT_EQ(dist_sq, expected_dist_sq);
+  }
+}
+
+TEST_F(KdTreeTest, NearestPointOnGrid) {
+  // Points on a regular grid have many equal coordinates.
+  int n = 0;
+  for (int i = 0; i < 30; i++) {
+    for (int j = 0; j < 100; j++, n++) {
+      x(0,n) = i / 29.0;
+      x(1,n) = j / 99.0;
+      x(2,n) = 0.0;
+    }
+  }
+
+  KdTree tree;
+  tree.build(x);
+
+  Vector<double> xp(3);
+
+  // Points near the grid points.
+  for (int n = 0; n < 2000; n++) {
+    int a = static_cast<int>(0.5 * (dist(gen) + 1.0) * (nNo - 1));
+    for (int i = 0; i < 3; i++) {
+      xp(i) = x(i,a) + 0.02 * dist(gen);
+    }
+
+    double expected_dist_sq = 0.0;
+    NearestBruteForce(xp, expected_dist_sq);
+
+    double dist_sq = 0.0;
+    tree.nearest(xp, dist_sq);
+    EXPECT_EQ(dist_sq, expected_dist_sq);
+  }
+}
+
+TEST_F(KdTreeTest, NearestPointWithinDistance) {
+  KdTree tree;
+  tree.build(x);
+
+  Vector<double> xp(3);
+  double max_dist = 0.1;
+
+  for (int n = 0; n < 500; n++) {
+    for (int i = 0; i < 3; i++) {
+      xp(i) = 1.5 * dist(gen);
+    }
+
+    double expected_dist_sq = 0.0;
+    int expected = NearestBruteForce(xp, expected_dist_sq);
+    if (expected_dist_sq > max_dist * max_dist) {
+      expected = -1;
+    }
+
+    double dist_sq = 0.0;
+    EXPECT_EQ(tree.nearest(xp, dist_sq, max_dist * max_dist), expected);
+  }
+}
+
+TEST_F(KdTreeTest, DuplicatePoints) {
+  // The lowest index is returned for points at the same distance.
+  for (int a = 0; a < nNo; a++) {
+    x(0,a) = static_cast<double>(a % 3);
+    x(1,a) = 0.0;
+    x(2,a) = 0.0;
+  }
+
+  KdTree tree;
+  tree.build(x);
+
+  Vector<double> xp(3);
+  xp(0) = 2.2;
+  double dist_sq = 0.0;
+  EXPECT_EQ(tree.nearest(xp, dist_sq), 2);
+}
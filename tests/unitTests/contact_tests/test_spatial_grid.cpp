@@ -0,0 +1,127 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#include "SpatialGrid.h"
+#include "../test_common.h"
+
+#include <algorithm>
+#include <random>
+
+/// @brief Test finding the points in a box with a SpatialGrid against
+/// checking all of the points.
+//
+class SpatialGridTest : public ::testing::Test {
+protected:
+    int nNo = 2000;
+    Array<double> x;
+    std::mt19937 gen{12345};
+    std::uniform_real_distribution<double> dist{-1.0, 1.0};
+
+    void SetUp() override {
+      x.resize(3, nNo);
+      for (int a = 0; a < nNo; a++) {
+        for (int i = 0; i < 3; i++) {
+          x(i,a) = dist(gen);
+        }
+      }
+    }
+
+    void CheckBoxes(const SpatialGrid& grid, const double size) {
+      Vector<double> xmin(3), xmax(3);
+      std::vector<int> points;
+
+      for (int n = 0; n < 200; n++) {
+        for (int i = 0; i < 3; i++) {
+          double c = 1.2*dist(gen);
+          xmin(i) = c - size;
+          xmax(i) = c + size;
+        }
+
+        std::vector<int> expected;
+        for (int a = 0; a < nNo; a++) {
+          if ((x(0,a) >= xmin(0)) && (x(0,a) <= xmax(0)) && (x(1,a) >= xmin(1)) && (x(1,a) <= xmax(1)) &&
+              (x(2,a) >= xmin(2)) && (x(2,a) <= xmax(2))) {
+            expected.push_back(a);
+          }
+        }
+
+        grid.find(x, xmin, xmax, points);
+        std::sort(points.begin(), points.end());
+        EXPECT_EQ(points, expected);
+      }
+    }
+};
+
+TEST_F(SpatialGridTest, FindPointsInBox) {
+  SpatialGrid grid;
+  grid.build(x, 0.1);
+  EXPECT_EQ(grid.size(), nNo);
+
+  CheckBoxes(grid, 0.05);
+  CheckBoxes(grid, 0.3);
+
+  // Boxes covering more cells than the number of cells containing points.
+  CheckBoxes(grid, 5.0);
+}
+
+TEST_F(SpatialGridTest, UpdateDisplacedPoints) {
+  SpatialGrid grid;
+  grid.build(x, 0.1);
+
+  // Small displacements only move some of the points to another cell.
+  for (int a = 0; a < nNo; a++) {
+    for (int i = 0; i < 3; i++) {
+      x(i,a) += 0.01*dist(gen);
+    }
+  }
+
+  int num_moved = grid.update(x);
+  EXPECT_GT(num_moved, 0);
+  EXPECT_LT(num_moved, nNo);
+  CheckBoxes(grid, 0.05);
+
+  EXPECT_EQ(grid.update(x), 0);
+
+  // Large displacements.
+  for (int a = 0; a < nNo; a++) {
+    x(0,a) += 3.0*dist(gen);
+  }
+
+  grid.update(x);
+  CheckBoxes(grid, 0.2);
+}
+
+TEST_F(SpatialGridTest, InvalidArguments) {
+  SpatialGrid grid;
+  EXPECT_THROW(grid.build(x, 0.0), std::runtime_error);
+
+  grid.build(x, 0.1);
+  Array<double> y(3, nNo-1);
+  EXPECT_THROW(grid.update(y), std::runtime_error);
+}
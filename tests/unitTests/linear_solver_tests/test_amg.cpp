@@ -0,0 +1,238 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#include "amg.h"
+#include "cgrad.h"
+#include "dot.h"
+#include "ns_solver.h"
+#include "../test_common.h"
+
+#include <algorithm>
+
+/// @brief Test the AMG preconditioner on a single processor.
+///
+/// The matrix is the bilinear finite element Laplacian on a square grid of
+/// N x N nodes, coupled between degrees of freedom by a constant symmetric 
+/// matrix. The rows and columns of the boundary nodes are zero, like those 
+/// of Dirichlet nodes after the FSILS diagonal scaling.
+//
+class AmgTest : public ::testing::TestWithParam<int> {
+protected:
+    fsi_linear_solver::FSILS_lhsType lhs;
+    fsi_linear_solver::FSILS_subLsType ls;
+    int N = 33;
+    int nNo = N*N;
+    int dof = 0;
+    Array<double> Val, R;
+
+    bool boundary(const int a) {
+      int i = a / N;
+      int j = a % N;
+      return (i == 0) || (j == 0) || (i == N-1) || (j == N-1);
+    }
+
+    void SetUp() override {
+      dof = GetParam();
+      std::vector<int> cols;
+
+      lhs.nNo = nNo;
+      lhs.mynNo = nNo;
+      lhs.nFaces = 0;
+      lhs.commu.nTasks = 1;
+      lhs.rowPtr.resize(2, nNo);
+      lhs.diagPtr.resize(nNo);
+
+      for (int a = 0; a < nNo; a++) {
+        int i = a / N;
+        int j = a % N;
+        lhs.rowPtr(0,a) = cols.size();
+        for (int ii = std::max(i-1,0); ii <= std::min(i+1,N-1); ii++) {
+          for (int jj = std::max(j-1,0); jj <= std::min(j+1,N-1); jj++) {
+            if (ii*N+jj == a) {
+              lhs.diagPtr(a) = cols.size();
+            }
+            cols.push_back(ii*N+jj);
+          }
+        }
+        lhs.rowPtr(1,a) = cols.size() - 1;
+      }
+
+      lhs.nnz = cols.size();
+      lhs.colPtr.resize(cols.size());
+      for (int i = 0; i < cols.size(); i++) {
+        lhs.colPtr(i) = cols[i];
+      }
+
+      double B[3][3] = {{1.0, 0.3, 0.1}, {0.3, 1.0, 0.2}, {0.1, 0.2, 1.0}};
+      Val.resize(dof*dof, lhs.nnz);
+      R.resize(dof, nNo);
+      Val = 0.0;
+
+      for (int a = 0; a < nNo; a++) {
+        for (int i = lhs.rowPtr(0,a); i <= lhs.rowPtr(1,a); i++) {
+          int b = lhs.colPtr(i);
+          if (boundary(a) || boundary(b)) {
+            continue;
+          }
+          int dist = std::abs(a/N - b/N) + std::abs(a%N - b%N);
+          double value = (dist == 0) ? 8.0/3.0 : -1.0/3.0;
+          for (int k = 0; k < dof; k++) {
+            for (int m = 0; m < dof; m++) {
+              Val(k*dof+m,i) = value * B[k][m];
+            }
+          }
+        }
+        for (int k = 0; k < dof; k++) {
+          R(k,a) = boundary(a) ? 0.0 : 1.0 + 0.3*cos(0.11*a + k);
+        }
+      }
+
+      ls.relTol = 1e-10;
+      ls.absTol = 1e-14;
+      ls.mItr = 2000;
+    }
+};
+
+TEST_P(AmgTest, BuildsCoarseLevels) {
+  fsi_linear_solver::FSILS_amgType amg;
+  amg.coarseSize = 20;
+  amg::amg_setup(lhs, amg, dof, Val);
+
+  ASSERT_GT(amg.levels.size(), 2);
+  EXPECT_LE(amg.levels.back().nNo*dof, amg.coarseSize);
+  EXPECT_EQ(amg.coarseLU.nrows(), amg.levels.back().nNo*dof);
+
+  for (int l = 1; l < amg.levels.size(); l++) {
+    EXPECT_LT(amg.levels[l].nNo, amg.levels[l-1].nNo);
+  }
+}
+
+TEST_P(AmgTest, PreconditionerIsSymmetric) {
+  fsi_linear_solver::FSILS_amgType amg;
+  amg.coarseSize = 20;
+  amg::amg_setup(lhs, amg, dof, Val);
+
+  Array<double> X(dof,nNo), Y(dof,nNo), MX(dof,nNo), MY(dof,nNo);
+  for (int a = 0; a < nNo; a++) {
+    for (int k = 0; k < dof; k++) {
+      X(k,a) = sin(1.3*a + k);
+      Y(k,a) = cos(0.7*a*a + k);
+    }
+  }
+
+  amg::amg_apply(lhs, amg, dof, X, MX);
+  amg::amg_apply(lhs, amg, dof, Y, MY);
+
+  double xMy = dot::fsils_dot_v(dof, nNo, lhs.commu, X, MY);
+  double yMx = dot::fsils_dot_v(dof, nNo, lhs.commu, Y, MX);
+
+  EXPECT_NEAR(xMy, yMx, 1e-12 * std::abs(xMy));
+  EXPECT_GT(dot::fsils_dot_v(dof, nNo, lhs.commu, X, MX), 0.0);
+}
+
+TEST_P(AmgTest, ReducesConjugateGradientIterations) {
+  fsi_linear_solver::FSILS_amgType amg, no_amg;
+  amg.active = true;
+  amg.coarseSize = 20;
+  amg::amg_setup(lhs, amg, dof, Val);
+
+  Array<double> X(R), X_ref(R);
+  auto ls_ref = ls;
+
+  cgrad::cgrad_v(lhs, ls, amg, dof, Val, X);
+  cgrad::cgrad_v(lhs, ls_ref, no_amg, dof, Val, X_ref);
+
+  EXPECT_TRUE(ls.suc);
+  EXPECT_TRUE(ls_ref.suc);
+  EXPECT_LT(4*ls.itr, ls_ref.itr);
+
+  for (int i = 0; i < X.size(); i++) {
+    EXPECT_NEAR(X(i), X_ref(i), 1e-7 * std::abs(X_ref(i)) + 1e-10);
+  }
+}
+
+/// @brief Test the AMG preconditioner of the Schur complement solves
+/// of the NS solver.
+//
+class AmgSchurTest : public AmgTest { };
+
+TEST_P(AmgSchurTest, PreconditionsSchurComplement) {
+  // Schur complement L - D*G of a 2D saddle point problem, with G a 
+  // difference operator and D = -G^T.
+  //
+  const int nsd = 2;
+  const int nnz = lhs.nnz;
+  Array<double> mG(nsd,nnz), Gt(nsd,nnz);
+  Vector<double> mL(nnz);
+
+  for (int a = 0; a < nNo; a++) {
+    for (int i = lhs.rowPtr(0,a); i <= lhs.rowPtr(1,a); i++) {
+      int b = lhs.colPtr(i);
+      mG(0,i) = boundary(a) ? 0.0 : 0.25 * (b%N - a%N);
+      mG(1,i) = boundary(a) ? 0.0 : 0.25 * (b/N - a/N);
+      mL(i) = 0.1 * Val(0,i) + ((a == b) ? 0.01 : 0.0);
+    }
+  }
+
+  for (int a = 0; a < nNo; a++) {
+    for (int i = lhs.rowPtr(0,a); i <= lhs.rowPtr(1,a); i++) {
+      int b = lhs.colPtr(i);
+      for (int j = lhs.rowPtr(0,b); j <= lhs.rowPtr(1,b); j++) {
+        if (lhs.colPtr(j) == a) {
+          Gt(0,i) = -mG(0,j);
+          Gt(1,i) = -mG(1,j);
+        }
+      }
+    }
+  }
+
+  fsi_linear_solver::FSILS_amgType amg, no_amg;
+  Array<double> S(1,nnz);
+  ns_solver::schur_matrix(lhs, nsd, Gt, mG, mL, S);
+  amg.active = true;
+  amg::amg_setup(lhs, amg, 1, S);
+
+  Vector<double> X = R.row(0);
+  Vector<double> X_ref = R.row(0);
+  auto ls_ref = ls;
+
+  cgrad::schur(lhs, ls, amg, nsd, Gt, mG, mL, X);
+  cgrad::schur(lhs, ls_ref, no_amg, nsd, Gt, mG, mL, X_ref);
+
+  EXPECT_TRUE(ls.suc);
+  EXPECT_TRUE(ls_ref.suc);
+  EXPECT_LT(ls.itr, ls_ref.itr);
+
+  for (int i = 0; i < X.size(); i++) {
+    EXPECT_NEAR(X(i), X_ref(i), 1e-6 * std::abs(X_ref(i)) + 1e-8);
+  }
+}
+
+INSTANTIATE_TEST_SUITE_P(Dof, AmgTest, ::testing::Values(1, 2, 3));
+INSTANTIATE_TEST_SUITE_P(Dof, AmgSchurTest, ::testing::Values(1));
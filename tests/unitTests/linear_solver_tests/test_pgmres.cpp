@@ -0,0 +1,210 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#include "gmres.h"
+#include "pgmres.h"
+#include "spar_mul.h"
+#include "../test_common.h"
+
+#include <algorithm>
+
+/// @brief Test the pipelined GMRES solver on a single processor.
+///
+/// The matrix is a block tridiagonal, nonsymmetric convection-diffusion like 
+/// matrix on a 1D chain of nodes. Its solution is compared with the solution 
+/// computed using the standard GMRES solver.
+//
+class PipelinedGmresTest : public ::testing::TestWithParam<int> {
+protected:
+    fsi_linear_solver::FSILS_lhsType lhs;
+    fsi_linear_solver::FSILS_subLsType ls;
+    int nNo = 40;
+    int dof = 0;
+    Array<double> Val, R;
+
+    void SetUp() override {
+      dof = GetParam();
+      std::vector<int> cols;
+
+      lhs.nNo = nNo;
+      lhs.mynNo = nNo;
+      lhs.nFaces = 0;
+      lhs.commu.nTasks = 1;
+      lhs.rowPtr.resize(2, nNo);
+
+      for (int a = 0; a < nNo; a++) {
+        lhs.rowPtr(0,a) = cols.size();
+        for (int b = std::max(a-1,0); b <= std::min(a+1,nNo-1); b++) {
+          cols.push_back(b);
+        }
+        lhs.rowPtr(1,a) = cols.size() - 1;
+      }
+
+      lhs.nnz = cols.size();
+      lhs.colPtr.resize(cols.size());
+      for (int i = 0; i < cols.size(); i++) {
+        lhs.colPtr(i) = cols[i];
+      }
+
+      Val.resize(dof*dof, lhs.nnz);
+      R.resize(dof, nNo);
+
+      for (int a = 0; a < nNo; a++) {
+        for (int i = lhs.rowPtr(0,a); i <= lhs.rowPtr(1,a); i++) {
+          int b = lhs.colPtr(i);
+          for (int k = 0; k < dof; k++) {
+            for (int m = 0; m < dof; m++) {
+              double value = 0.1 / (1.0 + k + 2*m);
+              if (b == a) {
+                value += (k == m) ? 4.0 : 0.0;
+              } else if (k == m) {
+                value += (b < a) ? -1.3 : -0.7;
+              }
+              Val(k*dof+m,i) = value;
+            }
+          }
+        }
+        for (int k = 0; k < dof; k++) {
+          R(k,a) = 1.0 + sin(0.3*a + k);
+        }
+      }
+
+      ls.relTol = 1e-10;
+      ls.absTol = 1e-14;
+      ls.mItr = 20;
+    }
+};
+
+TEST_P(PipelinedGmresTest, SolutionMatchesGmres) {
+  ls.sD = 15;
+
+  Array<double> X(R), X_ref(R);
+  auto ls_ref = ls;
+
+  pgmres::pgmres_v(lhs, ls, dof, Val, X);
+  gmres::gmres_v(lhs, ls_ref, dof, Val, X_ref);
+
+  EXPECT_TRUE(ls.suc);
+  EXPECT_TRUE(ls_ref.suc);
+
+  Array<double> KX(dof, nNo);
+  spar_mul::fsils_spar_mul_vv(lhs, lhs.rowPtr, lhs.colPtr, dof, Val, X, KX);
+
+  double res_norm = 0.0;
+  double r_norm = 0.0;
+  for (int i = 0; i < R.size(); i++) {
+    res_norm += (R(i) - KX(i)) * (R(i) - KX(i));
+    r_norm += R(i) * R(i);
+  }
+  EXPECT_LT(sqrt(res_norm), 1e-9 * sqrt(r_norm));
+
+  for (int i = 0; i < X.size(); i++) {
+    EXPECT_NEAR(X(i), X_ref(i), 1e-8 * std::abs(X_ref(i)) + 1e-12);
+  }
+}
+
+TEST_P(PipelinedGmresTest, RestartsWithSmallKrylovSpace) {
+  ls.sD = 3;
+  ls.mItr = 200;
+
+  Array<double> X(R);
+  pgmres::pgmres_v(lhs, ls, dof, Val, X);
+
+  EXPECT_TRUE(ls.suc);
+  EXPECT_LE(ls.fNorm, ls.relTol * ls.iNorm);
+}
+
+// A coupled Neumann face adds res * v * v^T to the matrix. As in
+// gmres::gmres_v() the system is not preconditioned for the face.
+TEST_P(PipelinedGmresTest, CoupledFace) {
+  if (dof == 1) {
+    GTEST_SKIP() << "A coupled face needs velocity and pressure degrees of freedom.";
+  }
+
+  ls.sD = 15;
+  int nsd = dof - 1;
+
+  lhs.nFaces = 1;
+  lhs.face.resize(1);
+  auto& face = lhs.face[0];
+  face.coupledFlag = true;
+  face.sharedFlag = false;
+  face.nNo = 10;
+  face.dof = nsd;
+  face.res = 1.0e3;
+  face.glob.resize(face.nNo);
+  face.valM.resize(nsd, face.nNo);
+  for (int a = 0; a < face.nNo; a++) {
+    face.glob(a) = 5 + a;
+    for (int i = 0; i < nsd; i++) {
+      face.valM(i,a) = 0.1 * (1.0 + i + 0.5*a);
+    }
+  }
+
+  auto ls_ref = ls;
+  Array<double> X(R), X_ref(R);
+  pgmres::pgmres_v(lhs, ls, dof, Val, X);
+  gmres::gmres_v(lhs, ls_ref, dof, Val, X_ref);
+  EXPECT_TRUE(ls.suc);
+  EXPECT_TRUE(ls_ref.suc);
+
+  // The initial norm is the norm of the right-hand side.
+  EXPECT_DOUBLE_EQ(ls.iNorm, ls_ref.iNorm);
+
+  // The residual of the coupled system R - (K + res * v * v^T) * X.
+  Array<double> KX(dof, nNo);
+  spar_mul::fsils_spar_mul_vv(lhs, lhs.rowPtr, lhs.colPtr, dof, Val, X, KX);
+
+  double vX = 0.0;
+  for (int a = 0; a < face.nNo; a++) {
+    for (int i = 0; i < nsd; i++) {
+      vX += face.valM(i,a) * X(i,face.glob(a));
+    }
+  }
+  for (int a = 0; a < face.nNo; a++) {
+    for (int i = 0; i < nsd; i++) {
+      KX(i,face.glob(a)) += face.res * face.valM(i,a) * vX;
+    }
+  }
+
+  double res_norm = 0.0;
+  double r_norm = 0.0;
+  double diff_norm = 0.0;
+  double x_norm = 0.0;
+  for (int i = 0; i < R.size(); i++) {
+    res_norm += (R(i) - KX(i)) * (R(i) - KX(i));
+    r_norm += R(i) * R(i);
+    diff_norm += (X(i) - X_ref(i)) * (X(i) - X_ref(i));
+    x_norm += X_ref(i) * X_ref(i);
+  }
+  EXPECT_LT(sqrt(res_norm), 1e-7 * sqrt(r_norm));
+  EXPECT_LT(sqrt(diff_norm), 1e-6 * sqrt(x_norm));
+}
+
+INSTANTIATE_TEST_SUITE_P(Dof, PipelinedGmresTest, ::testing::Values(1, 3, 4));
@@ -0,0 +1,99 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#include "precond.h"
+#include "../test_common.h"
+
+#include <algorithm>
+
+/// @brief Test that the fused pre/post-multiplication pre_pos_mul() gives the
+/// same matrix as applying pre_mul() followed by pos_mul().
+///
+/// The sparsity pattern is a 1D chain of nodes where each node is connected
+/// to itself and its neighbors.
+//
+class PrecondTest : public ::testing::TestWithParam<int> {
+protected:
+    int nNo = 7;
+    Array<int> rowPtr;
+    Vector<int> colPtr;
+
+    void SetUp() override {
+      std::vector<int> cols;
+      rowPtr.resize(2, nNo);
+
+      for (int a = 0; a < nNo; a++) {
+        rowPtr(0,a) = cols.size();
+        for (int b = std::max(a-1,0); b <= std::min(a+1,nNo-1); b++) {
+          cols.push_back(b);
+        }
+        rowPtr(1,a) = cols.size() - 1;
+      }
+
+      colPtr.resize(cols.size());
+      for (int i = 0; i < cols.size(); i++) {
+        colPtr(i) = cols[i];
+      }
+    }
+};
+
+TEST_P(PrecondTest, FusedScalingMatchesPreAndPostMultiply) {
+  const int dof = GetParam();
+  const int nnz = colPtr.size();
+
+  Array<double> Val(dof*dof, nnz), Wr(dof, nNo), Wc(dof, nNo);
+
+  for (int i = 0; i < nnz; i++) {
+    for (int k = 0; k < dof*dof; k++) {
+      Val(k,i) = 1.0 + 0.1*k - 0.03*i;
+    }
+  }
+
+  for (int a = 0; a < nNo; a++) {
+    for (int k = 0; k < dof; k++) {
+      Wr(k,a) = 0.5 + 0.1*a + 0.01*k;
+      Wc(k,a) = 2.0 - 0.2*a + 0.03*k;
+    }
+  }
+
+  Array<double> Val_ref(Val);
+  precond::pre_mul(rowPtr, nNo, nnz, dof, Val_ref, Wr);
+  precond::pos_mul(rowPtr, colPtr, nNo, nnz, dof, Val_ref, Wc);
+
+  precond::pre_pos_mul(rowPtr, colPtr, nNo, dof, Val, Wr, Wc);
+
+  for (int i = 0; i < nnz; i++) {
+    for (int k = 0; k < dof*dof; k++) {
+      EXPECT_NEAR(Val(k,i), Val_ref(k,i), 1e-14 * std::abs(Val_ref(k,i)));
+    }
+  }
+}
+
+// dof = 5 is handled by the general case of pre_mul() and pos_mul().
+INSTANTIATE_TEST_SUITE_P(Dof, PrecondTest, ::testing::Values(1, 2, 3, 4, 5));
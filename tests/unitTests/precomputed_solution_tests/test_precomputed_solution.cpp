@@ -0,0 +1,192 @@
+/* Copyright (c) Stanford University, The Regents of the University of California, and others.
+ *
+ * All Rights Reserved.
+ *
+ * See Copyright-SimVascular.txt for additional details.
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject
+ * to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included
+ * in all copies or substantial portions of the Software.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+ * IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED
+ * TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A
+ * PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER
+ * OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+ * EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+ * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+ * PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+ * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+ * NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#include "PrecomputedSolution.h"
+#include "../test_common.h"
+
+#include <cstdio>
+#include <fstream>
+
+/// @brief Test reading the slices of a precomputed solution written to a
+/// binary file.
+//
+class PrecomputedSolutionTest : public ::testing::Test {
+protected:
+    int num_comp = 3;
+    int num_nodes = 50;
+    int num_slices = 6;
+    Array3<double> Ys;
+    std::string file_name;
+
+    void SetUp() override {
+      file_name = ::testing::TempDir() + "test_precomputed_solution.bin";
+      Ys.resize(num_comp, num_nodes, num_slices);
+      for (int n = 0; n < num_slices; n++) {
+        for (int a = 0; a < num_nodes; a++) {
+          for (int i = 0; i < num_comp; i++) {
+            Ys(i,a,n) = 1000.0*n + 10.0*a + i;
+          }
+        }
+      }
+      PrecomputedSolution::write(file_name, Ys);
+    }
+
+    void TearDown() override {
+      std::remove(file_name.c_str());
+    }
+
+    // Nodes in reverse order with every other node skipped.
+    Vector<int> local_nodes() {
+      Vector<int> nodes(num_nodes/2);
+      for (int a = 0; a < nodes.size(); a++) {
+        nodes(a) = num_nodes - 1 - 2*a;
+      }
+      return nodes;
+    }
+};
+
+TEST_F(PrecomputedSolutionTest, Open) {
+  PrecomputedSolution solution;
+  EXPECT_FALSE(solution.is_open());
+
+  solution.open(file_name, local_nodes());
+  EXPECT_TRUE(solution.is_open());
+  EXPECT_EQ(solution.num_components(), num_comp);
+  EXPECT_EQ(solution.num_nodes(), num_nodes);
+  EXPECT_EQ(solution.num_slices(), num_slices);
+
+  solution.close();
+  EXPECT_FALSE(solution.is_open());
+}
+
+TEST_F(PrecomputedSolutionTest, CopySlices) {
+  PrecomputedSolution solution;
+  auto nodes = local_nodes();
+  solution.open(file_name, nodes);
+
+  Array<double> Y(num_comp, nodes.size());
+
+  // Copy the slices in an order that uses the prefetched slices and
+  // replaces the copied slices.
+  for (int n : {0, 1, 2, 5, 0, 3, 3, 4}) {
+    solution.copy(n, num_comp, Y);
+    for (int a = 0; a < nodes.size(); a++) {
+      for (int i = 0; i < num_comp; i++) {
+        EXPECT_EQ(Y(i,a), Ys(i,nodes(a),n));
+      }
+    }
+  }
+}
+
+TEST_F(PrecomputedSolutionTest, Interpolate) {
+  PrecomputedSolution solution;
+  auto nodes = local_nodes();
+  solution.open(file_name, nodes);
+
+  // Only copy the first two components.
+  Array<double> Y(2, nodes.size());
+  double alpha = 0.25;
+
+  for (int n = 0; n < num_slices-1; n++) {
+    solution.interpolate(n, n+1, alpha, 2, Y);
+    for (int a = 0; a < nodes.size(); a++) {
+      for (int i = 0; i < 2; i++) {
+        EXPECT_DOUBLE_EQ(Y(i,a), (1.0 - alpha) * Ys(i,nodes(a),n) + alpha * Ys(i,nodes(a),n+1));
+      }
+    }
+  }
+}
+
+TEST_F(PrecomputedSolutionTest, Errors) {
+  PrecomputedSolution solution;
+  Vector<int> nodes(1);
+
+  nodes(0) = num_nodes;
+  EXPECT_THROW(solution.open(file_name, nodes), std::runtime_error);
+  EXPECT_FALSE(solution.is_open());
+
+  nodes(0) = 0;
+  solution.open(file_name, nodes);
+  Array<double> Y(num_comp+1, 1);
+  EXPECT_THROW(solution.copy(num_slices, num_comp, Y), std::runtime_error);
+  EXPECT_THROW(solution.copy(0, num_comp+1, Y), std::runtime_error);
+
+  std::ofstream file(file_name, std::ios::out | std::ios::binary | std::ios::trunc);
+  file << "not a precomputed solution file";
+  file.close();
+  EXPECT_THROW(solution.open(file_name, nodes), std::runtime_error);
+  EXPECT_THROW(solution.open(file_name + ".missing", nodes), std::runtime_error);
+}
+
+// Time steps at multiples of the precomputed time step use a single slice
+// and the slices advance at the precomputed time step.
+TEST_F(PrecomputedSolutionTest, TimeStepSlices) {
+  const double dt = 0.1;
+  int n1, n2;
+  double alpha;
+
+  for (int k : {2, 3, 4}) {
+    double precomp_dt = k * dt;
+    for (int cTS = 1; cTS <= 3 * k * (num_slices - 1); cTS++) {
+      PrecomputedSolution::time_step_slices(cTS, dt, precomp_dt, num_slices, n1, n2, alpha);
+
+      // The slice time of the solution is periodic, the end of a period
+      // may be rounded to the last slice instead of slice 0.
+      double slice_time = static_cast<double>(cTS) / k;
+      EXPECT_EQ(n2, n1 + 1);
+      EXPECT_GE(alpha, 0.0);
+      EXPECT_LT(alpha, 1.0 + 1.0e-12);
+      EXPECT_NEAR(std::remainder(n1 + alpha - slice_time, num_slices - 1), 0.0, 1.0e-10) << "k " << k << " cTS " << cTS;
+    }
+  }
+
+  for (int cTS = 1; cTS <= 2 * num_slices; cTS++) {
+    PrecomputedSolution::time_step_slices(cTS, dt, dt, num_slices, n1, n2, alpha);
+    EXPECT_EQ(n1, cTS % num_slices);
+    EXPECT_EQ(n2, n1);
+    EXPECT_EQ(alpha, 0.0);
+  }
+}
+
+// A zero weight uses the first slice.
+TEST_F(PrecomputedSolutionTest, InterpolateZeroWeight) {
+  PrecomputedSolution solution;
+  auto nodes = local_nodes();
+  solution.open(file_name, nodes);
+
+  Array<double> Y(num_comp, nodes.size());
+  for (int n = 0; n < num_slices-1; n++) {
+    solution.interpolate(n, n+1, 0.0, num_comp, Y);
+    for (int a = 0; a < nodes.size(); a++) {
+      for (int i = 0; i < num_comp; i++) {
+        EXPECT_EQ(Y(i,a), Ys(i,nodes(a),n));
+      }
+    }
+  }
+}